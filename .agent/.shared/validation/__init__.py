@@ -0,0 +1,8 @@
+"""
+Shared helpers for the Antigravity Kit validation scripts.
+
+Scripts under .agent/skills/*/scripts and .agent/scripts put .agent/.shared
+on sys.path and import from here, e.g.:
+
+    from validation.results import ResultWriter, slugify
+"""
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Offline Advisory Database - Antigravity Kit
+===========================================
+
+A local snapshot of npm security advisories, imported from an OSV dump and
+indexed by package name, so dependency audits need no network:
+
+    python .agent/.shared/validation/advisories.py import npm-all.zip
+    python .agent/.shared/validation/advisories.py stats
+
+    db = AdvisoryDB.load()
+    for advisory in db.lookup("lodash", "4.17.15"):
+        print(advisory["id"], advisory["severity"], advisory["fixed"])
+
+The OSV npm dump is https://osv-vulnerabilities.storage.googleapis.com/npm/all.zip
+(a zip of one JSON file per advisory); a directory of those files or a single
+JSON file/list works too. Only SEMVER ranges and explicit version lists are
+used. The index lives at .agent/.cache/advisories/npm.json unless a path is
+given.
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .filecache import CACHE_ROOT
+except ImportError:  # Run as a script: python .agent/.shared/validation/advisories.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from validation.filecache import CACHE_ROOT
+
+DB_PATH = CACHE_ROOT / "advisories" / "npm.json"
+DB_FORMAT = 1
+ECOSYSTEM = "npm"
+
+# OSV / GHSA severities -> protocol severities
+SEVERITY_MAP = {"critical": "critical", "high": "high", "moderate": "medium",
+                "medium": "medium", "low": "low"}
+
+_SEMVER = re.compile(r'^\s*[v=]*\s*(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?\s*$')
+
+
+def version_key(version: str) -> Optional[Tuple]:
+    """
+    Sort key following semver precedence (1.0.0-alpha < 1.0.0-alpha.1 <
+    1.0.0-beta < 1.0.0); None for anything that is not a version.
+    """
+    m = _SEMVER.match(version or "")
+    if not m:
+        return None
+    major, minor, patch, pre = m.groups()
+    core = (int(major), int(minor or 0), int(patch or 0))
+    if pre is None:
+        return core + (1, ())
+    ids = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in pre.split("."))
+    return core + (0, ids)
+
+
+def in_range(version: str, events: List[List[str]]) -> bool:
+    """
+    Whether version falls in an OSV SEMVER range, given its events
+    ([["introduced", "0"], ["fixed", "1.2.3"], ...]).
+    """
+    key = version_key(version)
+    if key is None:
+        return False
+    ordered = []
+    for kind, value in events:
+        bound = (0, 0, 0, 0, ()) if value == "0" else version_key(value)
+        if bound is not None:
+            ordered.append((bound, kind))
+    # Introductions sort before fixes at the same version
+    ordered.sort(key=lambda item: (item[0], item[1] != "introduced"))
+    affected = False
+    for bound, kind in ordered:
+        if kind == "introduced":
+            if bound > key:
+                break
+            affected = True
+        elif kind in ("fixed", "limit"):
+            if bound > key:
+                break
+            affected = False
+        elif kind == "last_affected":
+            if bound >= key:
+                break
+            affected = False
+    return affected
+
+
+def _severity(record: Dict[str, Any]) -> str:
+    specific = (record.get("database_specific") or {}).get("severity")
+    if isinstance(specific, str) and specific.lower() in SEVERITY_MAP:
+        return SEVERITY_MAP[specific.lower()]
+    for affected in record.get("affected") or []:
+        specific = (affected.get("database_specific") or {}).get("severity")
+        if isinstance(specific, str) and specific.lower() in SEVERITY_MAP:
+            return SEVERITY_MAP[specific.lower()]
+    return "medium"
+
+
+def index_records(records: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Compact per-package entries for the npm parts of OSV records."""
+    packages: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        if record.get("withdrawn"):
+            continue
+        severity = _severity(record)
+        for affected in record.get("affected") or []:
+            package = affected.get("package") or {}
+            if package.get("ecosystem") != ECOSYSTEM or not package.get("name"):
+                continue
+            ranges = [[[kind, value] for event in r.get("events", []) for kind, value in event.items()]
+                      for r in affected.get("ranges") or [] if r.get("type") == "SEMVER"]
+            versions = affected.get("versions") or []
+            if not ranges and not versions:
+                continue
+            fixed = sorted({value for r in ranges for kind, value in r if kind == "fixed"},
+                           key=lambda v: version_key(v) or ())
+            packages.setdefault(package["name"], []).append({
+                "id": record.get("id"),
+                "aliases": record.get("aliases") or [],
+                "summary": (record.get("summary") or record.get("details") or "")[:200],
+                "severity": severity,
+                "ranges": ranges,
+                "versions": versions,
+                "fixed": fixed,
+            })
+    return packages
+
+
+def read_osv(source: str) -> Iterator[Dict[str, Any]]:
+    """OSV records from a zip dump, a directory of JSON files, or one JSON file."""
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.rglob("*.json")):
+            yield from _records(json.loads(file.read_text(encoding="utf-8")))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield from _records(json.loads(archive.read(name)))
+    else:
+        yield from _records(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _records(data: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(data, list):
+        yield from (item for item in data if isinstance(item, dict))
+    elif isinstance(data, dict):
+        yield data
+
+
+def import_osv(source: str, db_path: Path = DB_PATH) -> Dict[str, Any]:
+    """Build the index from an OSV dump and write it atomically. Returns its metadata."""
+    packages = index_records(read_osv(source))
+    meta = {
+        "format": DB_FORMAT,
+        "source": os.path.basename(source.rstrip("/\\")),
+        "imported": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "packages": len(packages),
+        "advisories": sum(len(entries) for entries in packages.values()),
+    }
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(db_path.parent), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "packages": packages}, f, separators=(",", ":"))
+    os.replace(tmp, db_path)
+    return meta
+
+
+def fixed_version(advisory: Dict[str, Any], version: str) -> Optional[str]:
+    """Lowest fixed version above `version` in the advisory's ranges that contain it."""
+    key = version_key(version)
+    fixes = [value for r in advisory["ranges"] if in_range(version, r)
+             for kind, value in r if kind == "fixed" and (version_key(value) or ()) > key]
+    return min(fixes, key=version_key) if fixes else None
+
+
+class AdvisoryDB:
+    """A loaded snapshot: advisories by package name, matched by version."""
+
+    def __init__(self, packages: Dict[str, List[Dict[str, Any]]], meta: Dict[str, Any], path: str = ""):
+        self.packages = packages
+        self.meta = meta
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional["AdvisoryDB"]:
+        """The snapshot at path (default DB_PATH); None when it is missing or unreadable."""
+        path = str(path or DB_PATH)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        meta = data.get("meta") or {}
+        if meta.get("format") != DB_FORMAT:
+            return None
+        return cls(data.get("packages") or {}, meta, path)
+
+    def lookup(self, name: str, version: str) -> List[Dict[str, Any]]:
+        """Advisories whose ranges or version lists include name@version."""
+        hits = []
+        for advisory in self.packages.get(name, ()):
+            if version in advisory["versions"] or any(in_range(version, r) for r in advisory["ranges"]):
+                hits.append(advisory)
+        return hits
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2 or argv[1] not in ("import", "stats"):
+        print("Usage: python advisories.py import <osv-dump.zip|dir|file.json> [--db PATH]\n"
+              "       python advisories.py stats [--db PATH]")
+        return 1
+    db_path = Path(argv[argv.index("--db") + 1]) if "--db" in argv else DB_PATH
+    if argv[1] == "import":
+        if len(argv) < 3:
+            print("import needs an OSV dump path")
+            return 1
+        meta = import_osv(argv[2], db_path)
+        print(f"Imported {meta['advisories']} advisories for {meta['packages']} packages into {db_path}")
+        return 0
+    db = AdvisoryDB.load(str(db_path))
+    if db is None:
+        print(f"No advisory snapshot at {db_path}")
+        return 1
+    print(json.dumps(db.meta, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Finding Fingerprints & Baselines - Antigravity Kit
+==================================================
+
+Stable identities for findings so that known issues can be recorded once
+(--update-baseline) and filtered out of later runs (--baseline FILE).
+
+A fingerprint hashes the rule, file and normalised message (numbers and
+whitespace collapsed) - never the line number, so findings survive code
+moving around. Identical findings in the same file get an occurrence index.
+
+Baseline file format (one file may hold several tools):
+
+    {"version": 1,
+     "fingerprints": {"<sha256>": {"tool": "ux_audit", "rule": "ux/hicks-law",
+                                   "file": "src/App.tsx"}}}
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+BASELINE_VERSION = 1
+
+
+def _normalize_message(message: str) -> str:
+    text = re.sub(r"\d+(\.\d+)?", "#", message or "")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def fingerprint(record: Dict[str, Any], occurrence: int = 0) -> str:
+    """Stable hash for one finding (line/column deliberately excluded)."""
+    parts = [
+        record.get("tool") or "",
+        record.get("rule") or "",
+        (record.get("file") or "").replace("\\", "/"),
+        _normalize_message(record.get("message", "")),
+        str(occurrence),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def assign_fingerprints(findings: Iterable[Dict[str, Any]]) -> None:
+    """Set record["fingerprint"] in place, numbering repeated findings."""
+    seen: Dict[str, int] = {}
+    for record in findings:
+        base = fingerprint(record)
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        record["fingerprint"] = base if occurrence == 0 else fingerprint(record, occurrence)
+
+
+def _read(path: str) -> Dict[str, Any]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": BASELINE_VERSION, "fingerprints": {}}
+    if not isinstance(data.get("fingerprints"), dict):
+        data["fingerprints"] = {}
+    return data
+
+
+def load_baseline(path: str) -> Set[str]:
+    """Known fingerprints from a baseline file (empty set if missing)."""
+    return set(_read(path)["fingerprints"])
+
+
+def save_baseline(path: str, tool: str, findings: Iterable[Dict[str, Any]]) -> int:
+    """
+    Replace this tool's entries in the baseline with the current findings,
+    keeping entries recorded by other tools. Returns the number written.
+    """
+    data = _read(path)
+    entries = {fp: meta for fp, meta in data["fingerprints"].items() if meta.get("tool") != tool}
+    count = 0
+    for record in findings:
+        entries[record["fingerprint"]] = {
+            "tool": tool,
+            "rule": record.get("rule"),
+            "file": record.get("file"),
+        }
+        count += 1
+    data["version"] = BASELINE_VERSION
+    data["fingerprints"] = dict(sorted(entries.items(), key=lambda kv: (kv[1].get("tool") or "", kv[1].get("file") or "", kv[0])))
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    return count
+
+
+def split_baseline(findings: Iterable[Dict[str, Any]], known: Set[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Partition fingerprinted findings into (new, suppressed)."""
+    new, suppressed = [], []
+    for record in findings:
+        (suppressed if record.get("fingerprint") in known else new).append(record)
+    return new, suppressed
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Changed Files - Antigravity Kit
+===============================
+
+Which files a change touches, from git, for scripts that only need to look
+at what moved:
+
+    files = changed_files(project_root)                  # working tree vs HEAD + untracked
+    files = changed_files(project_root, since="main")   # ...plus commits since the merge base
+    if files is None:
+        ...                                              # not a git repo: check everything
+
+Paths are project-relative with forward slashes; deleted files are left out.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+
+def git(project_root: str, *args: str) -> Optional[str]:
+    """stdout of a git command, or None when it fails (no git, not a repo, bad ref)."""
+    try:
+        result = subprocess.run(["git", *args], cwd=project_root, capture_output=True,
+                                text=True, encoding="utf-8", errors="replace", timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def changed_files(project_root: str, since: Optional[str] = None) -> Optional[List[str]]:
+    """Files changed in the working tree (and since `since`, if given); None outside git."""
+    prefix = git(project_root, "rev-parse", "--show-prefix")
+    if prefix is None:
+        return None
+    commands = [
+        ("diff", "--name-only", "--diff-filter=d", "--relative", "HEAD"),
+        ("ls-files", "--others", "--exclude-standard"),
+    ]
+    if since:
+        commands.append(("diff", "--name-only", "--diff-filter=d", "--relative", f"{since}...HEAD"))
+    files = set()
+    for args in commands:
+        out = git(project_root, *args)
+        if out is None:
+            if args[0] == "diff" and since and args[-1].startswith(since):
+                return None  # Unknown ref: callers fall back to a full run
+            continue
+        files.update(line.strip() for line in out.splitlines() if line.strip())
+    root = Path(project_root)
+    return sorted(f for f in files if (root / f).is_file())
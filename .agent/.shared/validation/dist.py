@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Vite Build Output - Antigravity Kit
+===================================
+
+Reads a Vite dist/ directory offline: emitted file sizes, the build
+manifest when one was written (build.manifest: true), and the chunk a
+source module ended up in:
+
+    build = DistIndex.load(project_root)          # None without dist/
+    build.sizes["assets/Agenda-BxYz12aB.js"]      # bytes
+    build.chunks_for("src/pages/Agenda.tsx")      # ["assets/Agenda-BxYz12aB.js", "assets/Agenda-Dq0.css"]
+    build.initial_files()                         # what index.html loads before any import()
+
+Without a manifest, chunks are matched by Vite's default [name]-[hash]
+file names, which for lazily imported modules is the module's file stem,
+and the initial load is read from index.html and the chunks' static imports.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+DIST_DIRS = ("dist", "build")
+# Vite 5 writes .vite/manifest.json, Vite 4 manifest.json at the dist root
+MANIFEST_PATHS = (".vite/manifest.json", "manifest.json")
+CODE_SUFFIXES = (".js", ".mjs", ".css")
+
+_HASHED_NAME = re.compile(r"^(?P<name>.+)-[A-Za-z0-9_-]{8}\.(?:js|mjs|css)$")
+_HTML_ASSET = re.compile(r"""<(?:script\b[^>]*\bsrc|link\b[^>]*\brel=["']?(?:stylesheet|modulepreload)["']?[^>]*\bhref)=["']([^"']+)["']""")
+_HTML_ASSET_HREF_FIRST = re.compile(r"""<link\b[^>]*\bhref=["']([^"']+)["'][^>]*\brel=["']?(?:stylesheet|modulepreload)\b""")
+# Static imports in built chunks: import{a as b}from"./x.js" / import"./y.css" (not import())
+_STATIC_IMPORT = re.compile(r"""\bimport\s*(?:[\w$*{}\s,]+?\s*from\s*)?["']([^"']+)["']""")
+
+
+def find_dist(project_root: str) -> Optional[Path]:
+    """The build output directory (dist/, then build/) if it holds a build."""
+    for name in DIST_DIRS:
+        path = Path(project_root) / name
+        if (path / "index.html").is_file() or (path / "assets").is_dir():
+            return path
+    return None
+
+
+def load_manifest(dist: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    """The Vite build manifest, or None (not written, unreadable, or a PWA manifest)."""
+    for name in MANIFEST_PATHS:
+        try:
+            data = json.loads((dist / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and data and all(isinstance(v, dict) and "file" in v for v in data.values()):
+            return data
+    return None
+
+
+class DistIndex:
+    """File sizes and module -> chunk lookups for one build."""
+
+    def __init__(self, dist: Path, sizes: Dict[str, int], manifest: Optional[Dict[str, Dict[str, Any]]]):
+        self.dist = dist
+        self.sizes = sizes
+        self.manifest = manifest
+        self.by_name: Dict[str, List[str]] = {}
+        for file in sizes:
+            m = _HASHED_NAME.match(Path(file).name)
+            if m:
+                self.by_name.setdefault(m.group("name"), []).append(file)
+
+    @classmethod
+    def load(cls, project_root: str) -> Optional["DistIndex"]:
+        dist = find_dist(project_root)
+        if dist is None:
+            return None
+        sizes = {}
+        for path in dist.rglob("*"):
+            if path.is_file() and ".vite" not in path.parts:
+                sizes[path.relative_to(dist).as_posix()] = path.stat().st_size
+        return cls(dist, sizes, load_manifest(dist))
+
+    @property
+    def source(self) -> str:
+        """How chunks are attributed: "manifest" or "file-name"."""
+        return "manifest" if self.manifest else "file-name"
+
+    def code_files(self) -> List[str]:
+        return sorted(f for f in self.sizes if f.endswith(CODE_SUFFIXES))
+
+    def entry_keys(self) -> List[str]:
+        return [key for key, chunk in (self.manifest or {}).items() if chunk.get("isEntry")]
+
+    def closure(self, keys: Iterable[str]) -> Set[str]:
+        """Emitted files of the given manifest keys plus their static imports and CSS."""
+        files: Set[str] = set()
+        seen: Set[str] = set()
+        stack = [k for k in keys if k in (self.manifest or {})]
+        while stack:
+            key = stack.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            chunk = self.manifest[key]
+            files.add(chunk["file"])
+            files.update(chunk.get("css", []))
+            stack.extend(chunk.get("imports", []))
+        return files
+
+    def stable_name(self, file: str) -> str:
+        """File path without its content hash ("assets/Agenda.js"), stable across builds."""
+        path = Path(file)
+        m = _HASHED_NAME.match(path.name)
+        return (path.parent / f"{m.group('name')}{path.suffix}").as_posix() if m else file
+
+    def initial_files(self) -> Set[str]:
+        """Files loaded before any dynamic import: the manifest entries' closure, or index.html's."""
+        if self.manifest is not None:
+            return self.closure(self.entry_keys())
+        try:
+            html = (self.dist / "index.html").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return set()
+        stack = [self._dist_path(ref, "") for ref in _HTML_ASSET.findall(html) + _HTML_ASSET_HREF_FIRST.findall(html)]
+        files: Set[str] = set()
+        while stack:
+            file = stack.pop()
+            if file is None or file in files or file not in self.sizes:
+                continue
+            files.add(file)
+            if file.endswith((".js", ".mjs")):
+                try:
+                    code = (self.dist / file).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue
+                parent = str(Path(file).parent)
+                stack.extend(self._dist_path(ref, parent) for ref in _STATIC_IMPORT.findall(code))
+        return files
+
+    def _dist_path(self, ref: str, parent: str) -> Optional[str]:
+        if "://" in ref or ref.startswith(("data:", "//")):
+            return None
+        ref = ref.split("?", 1)[0].split("#", 1)[0]
+        base = Path(ref.lstrip("/")) if ref.startswith("/") else Path(parent) / ref
+        return Path(os.path.normpath(base)).as_posix()
+
+    def chunks_for(self, module: str) -> List[str]:
+        """Files emitted for a source module (project-relative path)."""
+        if self.manifest is not None:
+            chunk = self.manifest.get(module)
+            return [chunk["file"]] + list(chunk.get("css", [])) if chunk else []
+        return sorted(self.by_name.get(Path(module).stem, []))
+
+    def bytes_of(self, files: Iterable[str]) -> int:
+        return sum(self.sizes.get(f, 0) for f in files)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Per-File Result Cache - Antigravity Kit
+=======================================
+
+Remembers a small value per file (a classification, a parse summary) across
+runs so unchanged files need no reading at all:
+
+    cache = FileCache("mobile_audit/classify")
+    kind = cache.get(path)                 # None when missing or stale
+    if kind is None:
+        kind = classify(path)
+        cache.put(path, kind, digest=sha1_of_what_was_read)
+    cache.save()
+
+An entry is fresh while the file's size and mtime are unchanged. When they
+differ, callers can still reuse the value if the content they hashed matches
+the recorded digest (see get_by_digest), e.g. after a checkout touches a file
+without changing it. Cache files live under .agent/.cache/.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_ROOT = Path(__file__).resolve().parents[2] / ".cache"
+CACHE_VERSION = 1
+
+
+class FileCache:
+    def __init__(self, name: str, root: Path = CACHE_ROOT):
+        self.path = root / f"{name}.json"
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._entries: Dict[str, Dict[str, Any]] = data["entries"] if data.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            self._entries = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def get(self, path: str) -> Optional[Any]:
+        """Cached value if the file's size and mtime are unchanged."""
+        entry = self._entries.get(self._key(path))
+        if entry is not None and entry["stat"] == self._stat(path):
+            self.hits += 1
+            return entry["value"]
+        self.misses += 1
+        return None
+
+    def get_by_digest(self, path: str, digest: str) -> Optional[Any]:
+        """Cached value if the recorded content digest matches; refreshes the stat."""
+        entry = self._entries.get(self._key(path))
+        if entry is None or entry.get("digest") != digest:
+            return None
+        entry["stat"] = self._stat(path)
+        self._dirty = True
+        self.hits += 1
+        self.misses -= 1  # get() already counted this lookup as a miss
+        return entry["value"]
+
+    def put(self, path: str, value: Any, digest: Optional[str] = None) -> None:
+        self._entries[self._key(path)] = {"stat": self._stat(path), "digest": digest, "value": value}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back (best-effort, atomic)."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self._entries}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+JSX / HTML Element Trees - Antigravity Kit
+==========================================
+
+Parses TSX/JSX (and plain HTML-like templates) once into a compact element
+tree so rules can query elements and attributes instead of approximating
+markup with regexes such as <button[^>]*>[^<]*</button>:
+
+    tree = parse_markup(content, "src/App.tsx")
+    for img in tree.find("img"):
+        if not img.has_attr("alt"):
+            ...
+
+When the optional tree-sitter TSX grammar is installed
+(pip install tree-sitter tree-sitter-typescript) it parses JSX files;
+otherwise a small tokenizer that understands JS strings, comments, template
+literals and expression containers is used. Both build the same tree.
+
+Trees are cached by content hash in memory and under .agent/.cache/jsx/, so
+every auditor in a checklist run reuses the same parse of a file.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .filecache import CACHE_ROOT
+
+try:
+    import tree_sitter
+    import tree_sitter_typescript
+    _TSX_PARSER = tree_sitter.Parser(tree_sitter.Language(tree_sitter_typescript.language_tsx()))
+    TREE_SITTER_AVAILABLE = True
+except (ImportError, AttributeError, TypeError, ValueError):
+    _TSX_PARSER = None
+    TREE_SITTER_AVAILABLE = False
+
+PARSER_VERSION = 1
+CACHE_DIR = CACHE_ROOT / "jsx"
+MEMORY_CACHE_SIZE = 256
+
+JSX_SUFFIXES = {".jsx", ".tsx", ".js", ".mjs", ".cjs"}
+HTML_SUFFIXES = {".html", ".htm", ".vue", ".svelte", ".astro"}
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+                 "meta", "param", "source", "track", "wbr"}
+RAW_TEXT_ELEMENTS = {"script", "style"}
+
+# Words after which "<" starts JSX rather than a comparison or type argument
+_EXPRESSION_KEYWORDS = {"return", "yield", "await", "default", "case", "else", "do",
+                        "in", "of", "typeof", "void", "delete", "new", "throw"}
+
+_JS_SPECIAL = re.compile(r"[\"'`{}<]|//|/\*")
+_JSX_CHILD_SPECIAL = re.compile(r"[<{]")
+_HTML_CHILD_SPECIAL = re.compile(r"<")
+_TAG_NAME = re.compile(r"[A-Za-z_$][\w$.:-]*")
+_ATTR_NAME = re.compile(r"[A-Za-z_$@:#][\w$.:@#-]*")
+_CLOSE_TAG = re.compile(r"</\s*([A-Za-z_$][\w$.:-]*)?\s*>")
+_UNQUOTED = re.compile(r"[^\s>]+")
+_SPACE = re.compile(r"\s*")
+_WORD_BEFORE = re.compile(r"[\w$]+$")
+
+
+class Element:
+    """One element: tag, lower-cased attribute map and position."""
+
+    __slots__ = ("tag", "attrs", "start", "end", "line", "parent", "children", "text", "dynamic")
+
+    def __init__(self, tag: str, attrs: Dict[str, Optional[str]], start: int, line: int,
+                 parent: Optional[int]):
+        self.tag = tag
+        self.attrs = attrs          # name -> literal text, "{expr}" source, or None for bare flags
+        self.start = start
+        self.end = start
+        self.line = line
+        self.parent = parent
+        self.children: List[int] = []
+        self.text = ""              # Static text directly inside the element
+        self.dynamic = False        # Has {expression} children
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.attrs.get(name.lower(), default)
+
+    def has_attr(self, *names: str) -> bool:
+        return any(name.lower() in self.attrs for name in names)
+
+    @property
+    def class_name(self) -> str:
+        """class / className source ("" when absent)."""
+        return self.attrs.get("classname") or self.attrs.get("class") or ""
+
+    def __repr__(self) -> str:
+        return f"<{self.tag} line={self.line} attrs={sorted(self.attrs)}>"
+
+
+class JsxTree:
+    """All elements of one file in document order."""
+
+    def __init__(self, elements: List[Element], backend: str):
+        self.elements = elements
+        self.backend = backend
+        for index, element in enumerate(elements):
+            if element.parent is not None:
+                elements[element.parent].children.append(index)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def find(self, *tags: str) -> Iterator[Element]:
+        """Elements whose tag is one of `tags` (all elements when none given)."""
+        wanted = set(tags)
+        return (e for e in self.elements if not wanted or e.tag in wanted)
+
+    def with_attr(self, name: str) -> Iterator[Element]:
+        return (e for e in self.elements if e.has_attr(name))
+
+    def descendants(self, element: Element) -> Iterator[Element]:
+        stack = list(reversed(element.children))
+        while stack:
+            child = self.elements[stack.pop()]
+            yield child
+            stack.extend(reversed(child.children))
+
+    def text_of(self, element: Element) -> str:
+        """Static text of the element and everything inside it."""
+        parts = [element.text] + [d.text for d in self.descendants(element)]
+        return " ".join(p for p in parts if p)
+
+    def is_dynamic(self, element: Element) -> bool:
+        """True when the element or a descendant renders an {expression}."""
+        return element.dynamic or any(d.dynamic for d in self.descendants(element))
+
+    def to_list(self) -> list:
+        return [[e.tag, e.attrs, e.start, e.end, e.line, e.parent, e.text, e.dynamic]
+                for e in self.elements]
+
+    @classmethod
+    def from_list(cls, rows: list, backend: str) -> "JsxTree":
+        elements = []
+        for tag, attrs, start, end, line, parent, text, dynamic in rows:
+            element = Element(tag, attrs, start, line, parent)
+            element.end, element.text, element.dynamic = end, text, dynamic
+            elements.append(element)
+        return cls(elements, backend)
+
+
+def _collapse(parts: List[str]) -> str:
+    return " ".join("".join(parts).split())
+
+
+class _Tokenizer:
+    """Single-pass JSX/HTML tokenizer; JS between elements is skipped, not parsed."""
+
+    def __init__(self, src: str, html: bool):
+        self.s = src
+        self.n = len(src)
+        self.html = html
+        self.elements: List[Element] = []
+        self.texts: Dict[int, List[str]] = {}
+        self.stack: List[int] = []
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", src)]
+
+    def run(self) -> List[Element]:
+        try:
+            if self.html:
+                self._children(0, None, None)
+            else:
+                self._js(0, nested=False)
+        except RecursionError:
+            pass  # Keep what was parsed before the nesting got absurd
+        for index, parts in self.texts.items():
+            if index < len(self.elements):
+                self.elements[index].text = _collapse(parts)
+        return self.elements
+
+    # -- JavaScript -----------------------------------------------------
+
+    def _js(self, i: int, nested: bool) -> int:
+        """Skip JS from i. When nested, stop after the "}" closing this expression."""
+        s, depth = self.s, 0
+        while True:
+            m = _JS_SPECIAL.search(s, i)
+            if not m:
+                return self.n
+            pos, token = m.start(), m.group()
+            if token in ("'", '"'):
+                i = self._skip_string(pos)
+            elif token == "`":
+                i = self._skip_template(pos)
+            elif token == "//":
+                end = s.find("\n", pos)
+                i = self.n if end < 0 else end
+            elif token == "/*":
+                end = s.find("*/", pos + 2)
+                i = self.n if end < 0 else end + 2
+            elif token == "{":
+                depth += 1
+                i = pos + 1
+            elif token == "}":
+                if depth == 0 and nested:
+                    return pos + 1
+                depth = max(0, depth - 1)
+                i = pos + 1
+            else:  # "<"
+                end = self._element(pos) if self._starts_jsx(pos) else None
+                i = pos + 1 if end is None else end
+
+    def _skip_string(self, pos: int) -> int:
+        """Skip a quoted JS string; an unterminated one stops at the end of the line."""
+        s, quote, i = self.s, self.s[pos], pos + 1
+        while i < self.n:
+            c = s[i]
+            if c == "\\":
+                i += 2
+            elif c == quote:
+                return i + 1
+            elif c == "\n":
+                return i
+            else:
+                i += 1
+        return self.n
+
+    def _skip_template(self, pos: int) -> int:
+        s, i = self.s, pos + 1
+        while i < self.n:
+            c = s[i]
+            if c == "\\":
+                i += 2
+            elif c == "`":
+                return i + 1
+            elif c == "$" and s.startswith("${", i):
+                i = self._js(i + 2, nested=True)
+            else:
+                i += 1
+        return self.n
+
+    def _starts_jsx(self, pos: int) -> bool:
+        nxt = self.s[pos + 1:pos + 2]
+        if not (nxt.isalpha() or nxt == ">"):
+            return False
+        j = pos - 1
+        while j >= 0 and self.s[j].isspace():
+            j -= 1
+        if j < 0:
+            return True
+        prev = self.s[j]
+        if prev.isalnum() or prev in "_$":
+            word = _WORD_BEFORE.search(self.s, 0, j + 1)
+            return bool(word) and word.group() in _EXPRESSION_KEYWORDS
+        return prev not in ")]."
+
+    # -- Markup ---------------------------------------------------------
+
+    def _line(self, pos: int) -> int:
+        return bisect_right(self.line_starts, pos)
+
+    def _element(self, pos: int) -> Optional[int]:
+        """Parse an element starting at "<"; None when it is not one after all."""
+        mark = len(self.elements)
+        opened = self._open_tag(pos)
+        if opened is None:
+            del self.elements[mark:]
+            return None
+        tag, attrs, end, self_closing = opened
+        parent = self.stack[-1] if self.stack else None
+        index = len(self.elements)
+        element = Element(tag, attrs, pos, self._line(pos), parent)
+        self.elements.append(element)
+        if self_closing or (self.html and tag in VOID_ELEMENTS):
+            element.end = end
+            return end
+        if self.html and tag in RAW_TEXT_ELEMENTS:
+            close = re.compile(r"</\s*" + re.escape(tag) + r"\s*>", re.IGNORECASE).search(self.s, end)
+            element.end = close.end() if close else self.n
+            return element.end
+        self.stack.append(index)
+        try:
+            end, closed = self._children(end, element, index)
+        finally:
+            self.stack.pop()
+        if not closed and not self.html:
+            # An unclosed "element" in JS is a comparison or type argument: undo it
+            del self.elements[mark:]
+            for key in [k for k in self.texts if k >= mark]:
+                del self.texts[key]
+            return None
+        element.end = end
+        return end
+
+    def _open_tag(self, pos: int):
+        s = self.s
+        if s.startswith(">", pos + 1):
+            return "", {}, pos + 2, False  # Fragment
+        m = _TAG_NAME.match(s, pos + 1)
+        if not m:
+            return None
+        tag = m.group().lower() if self.html else m.group()
+        attrs: Dict[str, Optional[str]] = {}
+        i = m.end()
+        while True:
+            i = _SPACE.match(s, i).end()
+            if i >= self.n:
+                return None
+            if s.startswith("/>", i):
+                return tag, attrs, i + 2, True
+            c = s[i]
+            if c == ">":
+                return tag, attrs, i + 1, False
+            if c == "{" and not self.html:
+                i = self._js(i + 1, nested=True)  # {...spread}
+                continue
+            if c == "/" and s.startswith(("/*", "//"), i) and not self.html:
+                end = s.find("*/", i + 2) if s.startswith("/*", i) else s.find("\n", i)
+                if end < 0:
+                    return None
+                i = end + (2 if s.startswith("/*", i) else 1)
+                continue
+            am = _ATTR_NAME.match(s, i)
+            if not am:
+                return None
+            name, value = am.group().lower(), None
+            i = _SPACE.match(s, am.end()).end()
+            if s.startswith("=", i):
+                i = _SPACE.match(s, i + 1).end()
+                c = s[i:i + 1]
+                if c in ("'", '"'):
+                    end = s.find(c, i + 1)
+                    if end < 0:
+                        return None
+                    value, i = s[i + 1:end], end + 1
+                elif c == "{" and not self.html:
+                    end = self._js(i + 1, nested=True)
+                    value, i = s[i:end], end
+                elif c == "<" and not self.html:
+                    end = self._element(i)
+                    if end is None:
+                        return None
+                    value, i = s[i:end], end
+                elif self.html and c:
+                    um = _UNQUOTED.match(s, i)
+                    value, i = um.group(), um.end()
+                else:
+                    return None
+            attrs[name] = value
+
+    def _children(self, i: int, element: Optional[Element], index: Optional[int]):
+        """Parse children up to the matching close tag. Returns (end, closed)."""
+        s = self.s
+        special = _HTML_CHILD_SPECIAL if self.html else _JSX_CHILD_SPECIAL
+        while True:
+            m = special.search(s, i)
+            stop = m.start() if m else self.n
+            if index is not None and stop > i:
+                self.texts.setdefault(index, []).append(s[i:stop])
+            if not m:
+                return self.n, False
+            pos = m.start()
+            if s[pos] == "{":
+                end = self._js(pos + 1, nested=True)
+                inner = s[pos + 1:end - 1].strip()
+                if element is not None and not (inner.startswith("/*") and inner.endswith("*/")):
+                    element.dynamic = True
+                i = end
+                continue
+            if s.startswith("</", pos):
+                cm = _CLOSE_TAG.match(s, pos)
+                if not cm:
+                    i = pos + 1
+                    continue
+                name = cm.group(1) or ""
+                if self.html:
+                    name = name.lower()
+                if element is not None and name == element.tag:
+                    return cm.end(), True
+                if any(self.elements[k].tag == name for k in self.stack):
+                    return pos, True  # Closes an ancestor: this element ends implicitly
+                i = cm.end()
+                continue
+            if self.html and s.startswith("<!--", pos):
+                end = s.find("-->", pos + 4)
+                i = self.n if end < 0 else end + 3
+                continue
+            if self.html and s.startswith(("<!", "<?"), pos):
+                end = s.find(">", pos)
+                i = self.n if end < 0 else end + 1
+                continue
+            nxt = s[pos + 1:pos + 2]
+            end = self._element(pos) if (nxt.isalpha() or nxt == ">") else None
+            i = pos + 1 if end is None else end
+
+
+def _parse_tree_sitter(content: str) -> List[Element]:
+    """Build the element list from a tree-sitter TSX parse."""
+    data = content.encode("utf-8")
+    ascii_only = len(data) == len(content)
+
+    def char_offset(byte_offset: int) -> int:
+        return byte_offset if ascii_only else len(data[:byte_offset].decode("utf-8", "ignore"))
+
+    def text(node) -> str:
+        return data[node.start_byte:node.end_byte].decode("utf-8", "ignore")
+
+    elements: List[Element] = []
+    texts: Dict[int, List[str]] = {}
+    stack = [(_TSX_PARSER.parse(data).root_node, None)]
+    while stack:
+        node, parent = stack.pop()
+        kind = node.type
+        if kind in ("jsx_element", "jsx_self_closing_element"):
+            opening = node if kind == "jsx_self_closing_element" else node.child_by_field_name("open_tag")
+            name = opening.child_by_field_name("name") if opening is not None else None
+            attrs: Dict[str, Optional[str]] = {}
+            pending = []
+            for attribute in (opening.named_children if opening is not None else []):
+                if attribute.type != "jsx_attribute" or not attribute.named_children:
+                    continue
+                parts = attribute.named_children
+                value = None
+                if len(parts) > 1:
+                    value = text(parts[1])
+                    if parts[1].type == "string":
+                        value = value[1:-1]
+                    else:
+                        pending.append(parts[1])
+                attrs[text(parts[0]).lower()] = value
+            index = len(elements)
+            element = Element(text(name) if name is not None else "", attrs,
+                              char_offset(node.start_byte), node.start_point[0] + 1, parent)
+            element.end = char_offset(node.end_byte)
+            elements.append(element)
+            children = [c for c in node.named_children
+                        if c.type not in ("jsx_opening_element", "jsx_closing_element")]
+            if kind == "jsx_self_closing_element":
+                children = []
+            for child in reversed(children):
+                stack.append((child, index))
+            for value_node in reversed(pending):
+                stack.append((value_node, parent))
+        elif kind == "jsx_text" and parent is not None:
+            texts.setdefault(parent, []).append(text(node))
+        elif kind == "jsx_expression" and parent is not None and node.parent is not None \
+                and node.parent.type == "jsx_element":
+            if any(c.type != "comment" for c in node.named_children):
+                elements[parent].dynamic = True
+            for child in reversed(node.named_children):
+                stack.append((child, parent))
+        else:
+            for child in reversed(node.named_children):
+                stack.append((child, parent))
+    for index, parts in texts.items():
+        elements[index].text = _collapse(parts)
+    return elements
+
+
+_MEMORY: "OrderedDict[str, JsxTree]" = OrderedDict()
+
+
+def markup_kind(name: str) -> Optional[str]:
+    """"jsx", "html" or None (no markup to parse) from a file name."""
+    suffix = os.path.splitext(name)[1].lower()
+    if suffix in JSX_SUFFIXES:
+        return "jsx"
+    if suffix in HTML_SUFFIXES:
+        return "html"
+    return None
+
+
+def _read_cache(path: Path, backend: str) -> Optional[JsxTree]:
+    try:
+        return JsxTree.from_list(json.loads(path.read_text(encoding="utf-8")), backend)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(path: Path, tree: JsxTree) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tree.to_list(), f, separators=(",", ":"))
+        os.replace(tmp, path)  # Atomic, so concurrent auditors never read half a file
+    except OSError:
+        pass  # Caching is best-effort
+
+
+def parse_markup(content: str, name: str = "", kind: Optional[str] = None,
+                 cache: bool = True) -> JsxTree:
+    """
+    Element tree for a file's content. `kind` ("jsx" or "html") defaults to
+    one derived from `name`; files with no markup give an empty tree.
+    """
+    kind = kind or markup_kind(name)
+    if kind is None:
+        return JsxTree([], "none")
+    backend = "tree-sitter" if kind == "jsx" and TREE_SITTER_AVAILABLE else "tokenizer"
+    digest = hashlib.sha1(f"{PARSER_VERSION}\0{backend}\0{kind}\0".encode("utf-8")
+                          + content.encode("utf-8", "surrogatepass")).hexdigest()
+    tree = _MEMORY.get(digest)
+    if tree is not None:
+        _MEMORY.move_to_end(digest)
+        return tree
+
+    path = CACHE_DIR / digest[:2] / f"{digest}.json"
+    tree = _read_cache(path, backend) if cache else None
+    if tree is None:
+        if backend == "tree-sitter":
+            elements = _parse_tree_sitter(content)
+        else:
+            elements = _Tokenizer(content, html=(kind == "html")).run()
+        tree = JsxTree(elements, backend)
+        if cache:
+            _write_cache(path, tree)
+
+    _MEMORY[digest] = tree
+    if len(_MEMORY) > MEMORY_CACHE_SIZE:
+        _MEMORY.popitem(last=False)
+    return tree
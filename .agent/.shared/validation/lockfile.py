@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+npm Lockfile Graphs - Antigravity Kit
+=====================================
+
+Reads package-lock.json / npm-shrinkwrap.json (lockfileVersion 1, 2 and 3)
+and bun's text bun.lock into an in-memory dependency graph without running
+a package manager:
+
+    lock = load_lockfile("package-lock.json")
+    for pkg in lock.packages.values():
+        print(pkg.name, pkg.version, pkg.dev)
+    for child in lock.dependencies_of(lock.root):
+        ...
+
+Packages are keyed by their install path ("node_modules/a/node_modules/b";
+"" is the project itself). Edges follow Node's resolution rule: a dependency
+of path P is the nearest P/node_modules/<name>, walking up towards the root.
+find_lockfiles() returns the project's lockfile plus those of nested
+packages such as functions/. Projects with only a binary bun.lockb can be
+read from what is installed instead (load_installed).
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+LOCKFILE_NAMES = ("npm-shrinkwrap.json", "package-lock.json", "bun.lock")
+NESTED_SKIP_DIRS = {"node_modules", ".git", "dist", "build", ".next", ".cache", "android", "ios"}
+
+
+class LockfileError(Exception):
+    """The file is not a readable npm lockfile."""
+
+
+class Package:
+    """One installed package: where it lives, what it is and what it requires."""
+
+    __slots__ = ("path", "name", "version", "dev", "optional", "link", "resolved",
+                 "dependencies", "optional_dependencies", "peer_dependencies")
+
+    def __init__(self, path: str, name: str, version: str, dev: bool = False,
+                 optional: bool = False, link: bool = False, resolved: Optional[str] = None,
+                 dependencies: Optional[Dict[str, str]] = None,
+                 optional_dependencies: Optional[Dict[str, str]] = None,
+                 peer_dependencies: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.name = name
+        self.version = version
+        self.dev = dev
+        self.optional = optional
+        self.link = link
+        self.resolved = resolved
+        self.dependencies = dependencies or {}                    # name -> requested range
+        self.optional_dependencies = optional_dependencies or {}
+        self.peer_dependencies = peer_dependencies or {}
+
+    @property
+    def requires(self) -> Dict[str, str]:
+        """Everything this package asks to have installed next to it."""
+        return {**self.dependencies, **self.optional_dependencies}
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Package":
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return f"Package({self.name}@{self.version} at {self.path or '<root>'})"
+
+
+class Lockfile:
+    """Packages of one lockfile, keyed by install path, plus the root's direct deps."""
+
+    def __init__(self, path: str, version: int, packages: Dict[str, Package],
+                 direct: Dict[str, str], direct_dev: Dict[str, str]):
+        self.path = path
+        self.version = version
+        self.packages = packages
+        self.direct = direct            # dependencies (+ optional) of the project
+        self.direct_dev = direct_dev    # devDependencies of the project
+
+    @property
+    def root(self) -> Package:
+        return self.packages[""]
+
+    def resolve(self, from_path: str, name: str) -> Optional[Package]:
+        """The package `name` as seen from `from_path` (Node's nearest node_modules rule)."""
+        base = from_path
+        while True:
+            candidate = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+            pkg = self.packages.get(candidate)
+            if pkg is not None:
+                return pkg
+            if not base:
+                return None
+            cut = base.rfind("/node_modules/")
+            base = base[:cut] if cut >= 0 else ""
+
+    def dependencies_of(self, pkg: Package) -> Iterator[Package]:
+        requires = pkg.requires
+        if pkg.path == "":
+            requires = {**self.direct, **self.direct_dev}
+        for name in requires:
+            child = self.resolve(pkg.path, name)
+            if child is not None:
+                yield child
+
+    def edges(self) -> Dict[str, List[str]]:
+        """Resolved dependency edges, install path -> install paths."""
+        return {path: [child.path for child in self.dependencies_of(pkg)]
+                for path, pkg in self.packages.items()}
+
+    def by_name(self) -> Dict[str, List[Package]]:
+        grouped: Dict[str, List[Package]] = {}
+        for pkg in self.packages.values():
+            if pkg.path:
+                grouped.setdefault(pkg.name, []).append(pkg)
+        return grouped
+
+    def reachable(self, include_dev: bool = True) -> Dict[str, Package]:
+        """Packages reachable from the project's direct dependencies, by path."""
+        seen: Dict[str, Package] = {}
+        roots = dict(self.direct)
+        if include_dev:
+            roots.update(self.direct_dev)
+        stack = [pkg for pkg in (self.resolve("", name) for name in roots) if pkg is not None]
+        while stack:
+            pkg = stack.pop()
+            if pkg.path in seen:
+                continue
+            seen[pkg.path] = pkg
+            stack.extend(child for child in self.dependencies_of(pkg) if child.path not in seen)
+        return seen
+
+    def to_dict(self) -> Dict:
+        return {"path": self.path, "version": self.version, "direct": self.direct,
+                "direct_dev": self.direct_dev,
+                "packages": [pkg.to_dict() for pkg in self.packages.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Lockfile":
+        packages = {entry["path"]: Package.from_dict(entry) for entry in data["packages"]}
+        return cls(data["path"], data["version"], packages, data["direct"], data["direct_dev"])
+
+
+def _name_from_path(path: str) -> str:
+    return path.rsplit("node_modules/", 1)[-1]
+
+
+def _from_packages(data: Dict) -> Dict[str, Package]:
+    """lockfileVersion 2/3: a flat "packages" map keyed by install path."""
+    packages = {}
+    for key, entry in data["packages"].items():
+        packages[key] = Package(
+            path=key,
+            name=entry.get("name") or (_name_from_path(key) if key else data.get("name", "")),
+            version=entry.get("version", ""),
+            dev=bool(entry.get("dev") or entry.get("devOptional")),
+            optional=bool(entry.get("optional")),
+            link=bool(entry.get("link")),
+            resolved=entry.get("resolved"),
+            dependencies=entry.get("dependencies"),
+            optional_dependencies=entry.get("optionalDependencies"),
+            peer_dependencies=entry.get("peerDependencies"),
+        )
+    return packages
+
+
+def _from_dependencies(data: Dict) -> Dict[str, Package]:
+    """lockfileVersion 1: nested "dependencies" trees with "requires" maps."""
+    packages = {"": Package(path="", name=data.get("name", ""), version=data.get("version", ""))}
+    stack = [("", data.get("dependencies") or {})]
+    while stack:
+        parent, deps = stack.pop()
+        for name, entry in deps.items():
+            key = f"{parent}/node_modules/{name}" if parent else f"node_modules/{name}"
+            packages[key] = Package(
+                path=key,
+                name=name,
+                version=entry.get("version", ""),
+                dev=bool(entry.get("dev")),
+                optional=bool(entry.get("optional")),
+                resolved=entry.get("resolved"),
+                dependencies=entry.get("requires"),
+            )
+            if entry.get("dependencies"):
+                stack.append((key, entry["dependencies"]))
+    return packages
+
+
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+
+def _bun_install_path(key: str) -> str:
+    """bun.lock keys nest by name ("@babel/core/semver"); npm nests by node_modules/."""
+    parts = key.split("/")
+    names = []
+    while parts:
+        take = 2 if parts[0].startswith("@") and len(parts) > 1 else 1
+        names.append("/".join(parts[:take]))
+        parts = parts[take:]
+    return "/".join(f"node_modules/{name}" for name in names)
+
+
+def _from_bun_lock(data: Dict) -> Lockfile:
+    """bun.lock (text lockfile, bun >= 1.2): "packages" map to [name@version, registry, meta, integrity]."""
+    workspace = (data.get("workspaces") or {}).get("", {})
+    direct = {**(workspace.get("dependencies") or {}), **(workspace.get("optionalDependencies") or {})}
+    direct_dev = dict(workspace.get("devDependencies") or {})
+    packages = {"": Package(path="", name=workspace.get("name", ""), version="")}
+    for key, entry in (data.get("packages") or {}).items():
+        if not isinstance(entry, list) or not entry:
+            continue
+        name, _, version = entry[0].rpartition("@")
+        meta = next((item for item in entry[1:] if isinstance(item, dict)), {})
+        path = _bun_install_path(key)
+        packages[path] = Package(
+            path=path, name=name or key, version=version,
+            optional=bool(meta.get("optional")),
+            link=version.startswith(("workspace:", "link:")),
+            resolved=entry[1] if len(entry) > 1 and isinstance(entry[1], str) else None,
+            dependencies=meta.get("dependencies"),
+            optional_dependencies=meta.get("optionalDependencies"),
+            peer_dependencies=meta.get("peerDependencies"),
+        )
+    lock = Lockfile("", int(data.get("lockfileVersion", 0)), packages, direct, direct_dev)
+    # bun.lock has no dev flags: dev packages are those production cannot reach
+    production = lock.reachable(include_dev=False)
+    for path, pkg in packages.items():
+        pkg.dev = bool(path) and path not in production
+    return lock
+
+
+def _read_package_json(path: Path) -> Optional[Dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def load_installed(project_dir: str) -> Lockfile:
+    """
+    The graph of what is installed under project_dir/node_modules, for
+    projects whose only lockfile is binary (bun.lockb). npm's hidden lockfile
+    (node_modules/.package-lock.json) is used when present.
+    """
+    root = Path(project_dir)
+    manifest = _read_package_json(root / "package.json") or {}
+    direct = {**(manifest.get("dependencies") or {}), **(manifest.get("optionalDependencies") or {})}
+    direct_dev = dict(manifest.get("devDependencies") or {})
+    hidden = root / "node_modules" / ".package-lock.json"
+    packages: Dict[str, Package] = {}
+    if hidden.is_file():
+        data = _read_package_json(hidden) or {}
+        packages = _from_packages({"packages": data.get("packages") or {}})
+    else:
+        stack = [root / "node_modules"]
+        while stack:
+            modules = stack.pop()
+            try:
+                entries = sorted(os.scandir(modules), key=lambda e: e.name)
+            except OSError:
+                continue
+            dirs = []
+            for entry in entries:
+                if entry.name.startswith("@") and entry.is_dir():
+                    dirs.extend(sorted(os.scandir(entry.path), key=lambda e: e.name))
+                elif not entry.name.startswith("."):
+                    dirs.append(entry)
+            for entry in dirs:
+                pkg_json = _read_package_json(Path(entry.path) / "package.json")
+                if pkg_json is None:
+                    continue
+                key = Path(entry.path).relative_to(root).as_posix()
+                packages[key] = Package(
+                    path=key, name=pkg_json.get("name") or _name_from_path(key),
+                    version=pkg_json.get("version", ""),
+                    dependencies=pkg_json.get("dependencies"),
+                    optional_dependencies=pkg_json.get("optionalDependencies"),
+                    peer_dependencies=pkg_json.get("peerDependencies"),
+                )
+                stack.append(Path(entry.path) / "node_modules")
+    packages[""] = Package(path="", name=manifest.get("name", ""), version=manifest.get("version", ""))
+    lock = Lockfile(str(root / "node_modules"), 0, packages, direct, direct_dev)
+    production = lock.reachable(include_dev=False)
+    for path, pkg in packages.items():
+        pkg.dev = bool(path) and path not in production
+    return lock
+
+
+def load_lockfile(path: str) -> Lockfile:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if path.endswith("bun.lock"):
+            text = _TRAILING_COMMA.sub(r"\1", text)
+        data = json.loads(text)
+    except (OSError, ValueError) as e:
+        raise LockfileError(f"{path}: {e}") from e
+    if not isinstance(data, dict):
+        raise LockfileError(f"{path}: not a lockfile")
+    if path.endswith("bun.lock"):
+        lock = _from_bun_lock(data)
+        lock.path = path
+        return lock
+    version = int(data.get("lockfileVersion", 1))
+    if "packages" in data:
+        packages = _from_packages(data)
+    else:
+        packages = _from_dependencies(data)
+
+    root_entry = (data.get("packages") or {}).get("", {})
+    direct = dict(root_entry.get("dependencies") or {})
+    direct.update(root_entry.get("optionalDependencies") or {})
+    direct_dev = dict(root_entry.get("devDependencies") or {})
+    if not root_entry:
+        # v1 lockfiles do not record the manifest; read it from package.json
+        manifest = Path(path).with_name("package.json")
+        try:
+            pkg_json = json.loads(manifest.read_text(encoding="utf-8"))
+            direct = {**(pkg_json.get("dependencies") or {}), **(pkg_json.get("optionalDependencies") or {})}
+            direct_dev = dict(pkg_json.get("devDependencies") or {})
+        except (OSError, ValueError):
+            direct = {p.name: p.version for k, p in packages.items() if k.count("node_modules/") == 1}
+    return Lockfile(path, version, packages, direct, direct_dev)
+
+
+def find_lockfiles(project_path: str, max_depth: int = 2) -> List[str]:
+    """
+    The project's lockfile and those of nested packages (functions/,
+    apps/*), shallowest first. A shrinkwrap wins over package-lock.json in
+    the same directory, as with npm.
+    """
+    found = []
+    root_depth = Path(project_path).resolve().as_posix().count("/")
+    for root, dirs, files in os.walk(project_path):
+        depth = Path(root).resolve().as_posix().count("/") - root_depth
+        dirs[:] = sorted(d for d in dirs if d not in NESTED_SKIP_DIRS and depth < max_depth)
+        for name in LOCKFILE_NAMES:
+            if name in files:
+                found.append(os.path.join(root, name))
+                break
+    return found
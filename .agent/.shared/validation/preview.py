@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Local Preview Server - Antigravity Kit
+======================================
+
+Starts, probes and stops the project's preview server through
+.agent/scripts/auto_preview.py, for scripts that audit a running app:
+
+    url, started = ensure_preview(project_root, port=3000, mode="preview")
+    if url is None:
+        ...                                 # did not answer in time
+    try:
+        audit(url)
+    finally:
+        if started:
+            stop_preview(project_root, 3000)
+
+auto_preview.py returns only once the server answers over HTTP and reuses
+a server already running on the port; `started` is False in that case, so
+callers leave servers they did not start running.
+"""
+
+import json
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Tuple
+
+AUTO_PREVIEW = Path(__file__).resolve().parents[2] / "scripts" / "auto_preview.py"
+READY_TIMEOUT = 90
+
+
+def wait_for_url(url: str, timeout: float = READY_TIMEOUT) -> bool:
+    """Poll until the server answers any HTTP response (one attempt with timeout=0)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=5):
+                return True
+        except urllib.error.HTTPError:
+            return True  # It answered, just not with 2xx
+        except (urllib.error.URLError, OSError):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+
+def start_preview(project_root: str, port: int, mode: str = "auto",
+                  timeout: float = READY_TIMEOUT) -> Optional[dict]:
+    """auto_preview.py's start result ({url, pid, mode, reused}), or None if it failed."""
+    result = subprocess.run([sys.executable, str(AUTO_PREVIEW), "start", str(port), "--mode", mode,
+                             "--timeout", str(int(timeout)), "--json"],
+                            cwd=project_root, capture_output=True, text=True)
+    try:
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return None
+    return data if result.returncode == 0 and not data.get("error") else None
+
+
+def stop_preview(project_root: str, port: Optional[int] = None) -> None:
+    cmd = [sys.executable, str(AUTO_PREVIEW), "stop"] + ([str(port)] if port else [])
+    subprocess.run(cmd, cwd=project_root, capture_output=True)
+
+
+def ensure_preview(project_root: str, port: int, path: str = "/", mode: str = "auto",
+                   timeout: float = READY_TIMEOUT) -> Tuple[Optional[str], bool]:
+    """URL of a ready preview on `port` (None if it never answered) and whether we started it."""
+    server = start_preview(project_root, port, mode, timeout)
+    if server is None:
+        return None, False
+    return server["url"].rstrip("/") + path, not server.get("reused")
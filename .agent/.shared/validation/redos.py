@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+ReDoS Pattern Lint - Antigravity Kit
+====================================
+
+Static checks for regex shapes that backtrack catastrophically. Patterns are
+parsed with the stdlib regex parser; nothing is executed.
+
+    exponential  nested quantifier, e.g. (\\w+\\s?)*
+    exponential  quantified alternation whose branches overlap, e.g. (a|ab)*
+    polynomial   adjacent unbounded quantifiers over overlapping characters,
+                 e.g. \\w+.*? or \\s*\\s+ (quadratic when the match fails)
+    polynomial   a one-character start that a later unbounded repeat also
+                 consumes, e.g. ['"].*SELECT: every quote restarts the scan
+
+Usage:
+    python redos.py <script.py>...     # lint regex literals in source files
+"""
+
+import ast
+import re
+import sys
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from re import _constants as sre_constants  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants
+    import sre_parse
+
+MAXREPEAT = sre_constants.MAXREPEAT
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _POSSESSIVE = {sre_constants.POSSESSIVE_REPEAT}  # never backtracks
+else:
+    _POSSESSIVE = set()
+
+# Characters used to compare character classes for overlap
+_SAMPLE = [chr(c) for c in (9, 10, 13)] + [chr(c) for c in range(32, 127)] + ["é", " ", "中"]
+
+_CATEGORY_TESTS = {
+    sre_constants.CATEGORY_DIGIT: str.isdigit,
+    sre_constants.CATEGORY_NOT_DIGIT: lambda c: not c.isdigit(),
+    sre_constants.CATEGORY_SPACE: str.isspace,
+    sre_constants.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_constants.CATEGORY_WORD: lambda c: c.isalnum() or c == "_",
+    sre_constants.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == "_"),
+}
+
+Issue = Tuple[str, str]  # (severity, description)
+
+
+def _char_test(op, av, flags: int) -> Optional[Callable[[str], bool]]:
+    """Predicate for single-character items, None for anything wider."""
+    fold = bool(flags & re.IGNORECASE)
+
+    def eq(c: str, code: int) -> bool:
+        return c == chr(code) or (fold and c.lower() == chr(code).lower())
+
+    if op == sre_constants.LITERAL:
+        return lambda c: eq(c, av)
+    if op == sre_constants.NOT_LITERAL:
+        return lambda c: not eq(c, av)
+    if op == sre_constants.ANY:
+        return lambda c: c != "\n" or bool(flags & re.DOTALL)
+    if op == sre_constants.IN:
+        negate = any(o == sre_constants.NEGATE for o, _ in av)
+
+        def member(c: str) -> bool:
+            for o, a in av:
+                if o == sre_constants.LITERAL and eq(c, a):
+                    return True
+                if o == sre_constants.RANGE and (a[0] <= ord(c) <= a[1]
+                                                 or (fold and a[0] <= ord(c.swapcase()) <= a[1])):
+                    return True
+                if o == sre_constants.CATEGORY and _CATEGORY_TESTS.get(a, lambda _c: True)(c):
+                    return True
+            return False
+
+        return (lambda c: not member(c)) if negate else member
+    return None
+
+
+def _first_chars(items, flags: int) -> Optional[set]:
+    """Sample characters that can start a match of the item sequence."""
+    for op, av in items:
+        test = _char_test(op, av, flags)
+        if test is not None:
+            return {c for c in _SAMPLE if test(c)}
+        if op == sre_constants.SUBPATTERN:
+            return _first_chars(av[-1], flags)
+        if op in _REPEATS or op in _POSSESSIVE:
+            inner = _first_chars(av[2], flags)
+            if av[0] > 0 or inner is None:
+                return inner
+            continue  # Optional item - look further (approximation: union skipped)
+        if op == sre_constants.BRANCH:
+            out = set()
+            for branch in av[1]:
+                chars = _first_chars(branch, flags)
+                if chars is None:
+                    return None
+                out |= chars
+            return out
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+        return None
+    return None
+
+
+def _unbounded_repeat_chars(op, av, flags: int) -> Optional[set]:
+    """Character set of x* / x+ / x{n,} over a single-character item."""
+    if op not in _REPEATS or av[1] != MAXREPEAT:
+        return None
+    body = list(av[2])
+    if len(body) == 1:
+        test = _char_test(body[0][0], body[0][1], flags)
+        if test is not None:
+            return {c for c in _SAMPLE if test(c)}
+    return None
+
+
+def _contains_unbounded(items) -> bool:
+    for op, av in items:
+        if op in _REPEATS and av[1] == MAXREPEAT:
+            return True
+        if op == sre_constants.SUBPATTERN and _contains_unbounded(av[-1]):
+            return True
+        if op in _REPEATS and _contains_unbounded(av[2]):
+            return True
+        if op == sre_constants.BRANCH and any(_contains_unbounded(b) for b in av[1]):
+            return True
+    return False
+
+
+def _nullable(op, av) -> bool:
+    """True when the item can match the empty string (so it can never fail)."""
+    if op in _REPEATS or op in _POSSESSIVE:
+        return av[0] == 0
+    if op == sre_constants.SUBPATTERN:
+        return all(_nullable(o, a) for o, a in av[-1])
+    if op == sre_constants.BRANCH:
+        return any(all(_nullable(o, a) for o, a in b) for b in av[1])
+    return False
+
+
+def _quantified_branches(body) -> bool:
+    """True when a quantified body holds an alternation that can match ambiguously."""
+    for op, av in body:
+        if op == sre_constants.SUBPATTERN:
+            if _quantified_branches(av[-1]):
+                return True
+        elif op == sre_constants.BRANCH:
+            branches = av[1]
+            # sre_parse factors common prefixes: (a|aa) becomes a(?:|a)
+            if any(len(b) == 0 for b in branches):
+                return True
+            starts = [_first_chars(b, 0) for b in branches]
+            for i in range(len(starts)):
+                for j in range(i + 1, len(starts)):
+                    if starts[i] and starts[j] and starts[i] & starts[j]:
+                        return True
+    return False
+
+
+def _walk(items, flags: int, issues: List[Issue], tail_can_fail: bool = False) -> None:
+    items = list(items)
+    prev_chars = None
+    for index, (op, av) in enumerate(items):
+        # Adjacent overlapping repeats only cost anything if a later item can fail
+        rest_can_fail = tail_can_fail or any(not _nullable(o, a) for o, a in items[index + 1:])
+        if op in _REPEATS:
+            lo, hi, body = av
+            body = list(body)
+            if hi == MAXREPEAT or hi > 16:
+                if _contains_unbounded(body):
+                    issues.append(("exponential", "nested quantifier"))
+                if _quantified_branches(body):
+                    issues.append(("exponential", "quantified alternation with overlapping branches"))
+            chars = _unbounded_repeat_chars(op, av, flags)
+            if chars and prev_chars and chars & prev_chars and rest_can_fail:
+                issues.append(("polynomial", "adjacent unbounded quantifiers over overlapping characters"))
+            prev_chars = chars if chars else (prev_chars if lo == 0 else None)
+            _walk(body, flags, issues, True)
+            continue
+        if op == sre_constants.SUBPATTERN:
+            inner = list(av[-1])
+            # A group that is exactly one unbounded repeat continues the run: \w+(.*)
+            if len(inner) == 1:
+                chars = _unbounded_repeat_chars(inner[0][0], inner[0][1], flags)
+                if chars and prev_chars and chars & prev_chars and rest_can_fail:
+                    issues.append(("polynomial", "adjacent unbounded quantifiers over overlapping characters"))
+                _walk(inner, flags, issues, rest_can_fail)
+                prev_chars = chars
+                continue
+            _walk(inner, flags, issues, rest_can_fail)
+        elif op == sre_constants.BRANCH:
+            for b in av[1]:
+                _walk(b, flags, issues, rest_can_fail)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _walk(av[1], flags, issues, True)
+            continue  # Zero-width: does not break a run
+        prev_chars = None
+
+
+def _restarts(items, flags: int) -> bool:
+    """
+    True when an unanchored pattern starts with a single character that a
+    later unbounded repeat also matches, and that repeat can swallow the item
+    after it. Each occurrence of the first character then rescans the rest of
+    the input before failing.
+    """
+    items = list(items)
+    if len(items) < 2:
+        return False
+    test = _char_test(items[0][0], items[0][1], flags)
+    if test is None or items[1][0] == sre_constants.LITERAL:
+        return False  # Anchored, or a multi-character literal prefix keeps starts rare
+    start = {c for c in _SAMPLE if test(c)}
+    for index in range(1, len(items)):
+        chars = _unbounded_repeat_chars(items[index][0], items[index][1], flags)
+        if not chars or not start <= chars:
+            continue
+        rest = items[index + 1:]
+        following = _first_chars(rest, flags)
+        if any(not _nullable(o, a) for o, a in rest) and (following is None or following & chars):
+            return True
+    return False
+
+
+def lint_pattern(pattern: str, flags: int = 0) -> List[Issue]:
+    """Return (severity, description) pairs for risky shapes; empty when clean."""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error as e:
+        return [("error", f"invalid pattern: {e}")]
+    flags |= parsed.state.flags
+    issues: List[Issue] = []
+    _walk(parsed, flags, issues)
+    if _restarts(parsed, flags):
+        issues.append(("polynomial", "scan restarts at every occurrence of its first character"))
+    seen, unique = set(), []
+    for issue in issues:
+        if issue not in seen:
+            seen.add(issue)
+            unique.append(issue)
+    return unique
+
+
+def _literal_patterns(source: str):
+    """Yield (line, pattern) for string literals passed to re.*/scan.* calls."""
+    methods = {"search", "match", "fullmatch", "findall", "finditer", "sub", "subn", "split", "compile"}
+    modules = {"re", "regex", "scan"}
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in methods \
+                and isinstance(node.func.value, ast.Name) and node.func.value.id in modules:
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                yield node.lineno, node.args[0].value
+        # Rule tables: tuples whose first element is a pattern string, e.g. DANGEROUS_PATTERNS
+        if isinstance(node, ast.Tuple) and len(node.elts) >= 2 and isinstance(node.elts[0], ast.Constant) \
+                and isinstance(node.elts[0].value, str) and node.elts[0].value.startswith(("(", "\\", "[")):
+            yield node.lineno, node.elts[0].value
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print(__doc__)
+        return 1
+    flagged = 0
+    for path in argv:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        for line, pattern in _literal_patterns(source):
+            try:
+                re.compile(pattern)
+            except re.error:
+                continue  # Not a regex (e.g. a plain string in a tuple)
+            for severity, description in lint_pattern(pattern):
+                flagged += 1
+                print(f"{path}:{line}: [{severity}] {description}: {pattern[:80]}")
+    print(f"{flagged} risky pattern(s) found")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
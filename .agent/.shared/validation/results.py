@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Validation Results Protocol - Antigravity Kit
+=============================================
+
+Uniform, machine-readable results for every validation script.
+
+When a script is run with --jsonl, its human-readable output is moved to
+stderr (ResultWriter.claim_stdout) and stdout carries one JSON object per line:
+
+    {"type": "finding", "tool": "ux_audit", "rule": "ux/hicks-law",
+     "severity": "high", "file": "src/pages/Home.tsx", "line": null,
+     "column": null, "message": "12 nav items (Max 7)", "duration_ms": null}
+    ...
+    {"type": "summary", "tool": "ux_audit", "passed": false,
+     "duration_ms": 1834.2, "counts": {"critical": 0, "high": 1, ...},
+     "stats": {"files_checked": 441}}
+
+The summary record is always last. Orchestrators (checklist.py) use
+parse_records() to read the stream back.
+
+Every finding also carries a stable "fingerprint" (see baseline.py). Scripts
+built with ResultWriter.from_argv() additionally understand:
+
+    --sarif FILE         write a SARIF 2.1.0 log (see sarif.py)
+    --baseline FILE      drop findings already recorded in FILE; only new
+                         findings at FAIL_SEVERITY or above fail the run
+    --update-baseline    record the current findings into --baseline FILE
+"""
+
+import re
+import sys
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .baseline import assign_fingerprints, load_baseline, save_baseline, split_baseline
+from .sarif import write_sarif
+
+SCHEMA_VERSION = 1
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+# With a baseline, new findings at this severity or above fail the run
+FAIL_SEVERITY = "medium"
+
+# Severity spellings used across the existing scripts
+_SEVERITY_ALIASES = {
+    "error": "high",
+    "issue": "high",
+    "fail": "high",
+    "medium-high": "high",
+    "warning": "medium",
+    "warn": "medium",
+    "moderate": "medium",
+    "note": "low",
+    "notice": "low",
+    "pass": "info",
+}
+
+
+def normalize_severity(value: Optional[str]) -> str:
+    """Map any severity spelling used by the scripts onto SEVERITIES."""
+    if not value:
+        return "info"
+    sev = str(value).strip().lower()
+    if sev in SEVERITIES:
+        return sev
+    return _SEVERITY_ALIASES.get(sev, "medium")
+
+
+def slugify(text: str, max_words: int = 6) -> str:
+    """
+    Build a stable rule-id fragment from a human label or message.
+    Quoted values, bracketed values and numbers are dropped so that
+    "Model 'User' should be PascalCase" and "Model 'Post' should be
+    PascalCase" map to the same id.
+    """
+    text = re.sub(r"(['\"`]).*?\1", " ", text)
+    text = re.sub(r"\([^)]*\)|\[[^\]]*\]|\{[^}]*\}", " ", text)
+    words = re.findall(r"[a-z]+", text.lower())
+    return "-".join(words[:max_words]) or "general"
+
+
+def make_finding(tool: str, rule: str, severity: str, message: str,
+                 file: Optional[str] = None, line: Optional[int] = None,
+                 column: Optional[int] = None, duration_ms: Optional[float] = None,
+                 **extra: Any) -> Dict[str, Any]:
+    """Create a finding record in the protocol schema."""
+    record = {
+        "type": "finding",
+        "tool": tool,
+        "rule": rule,
+        "severity": normalize_severity(severity),
+        "file": file.replace("\\", "/") if file else None,
+        "line": line,
+        "column": column,
+        "message": message,
+        "duration_ms": duration_ms,
+    }
+    record.update(extra)
+    return record
+
+
+def finding_key(record: Dict[str, Any]) -> tuple:
+    """Identity of a finding, used to dedupe aggregated results."""
+    return (
+        record.get("rule"),
+        record.get("file"),
+        record.get("line"),
+        record.get("column"),
+        record.get("message"),
+    )
+
+
+class ResultWriter:
+    """Collects findings for one script run and emits them as JSON lines."""
+
+    def __init__(self, tool: str, enabled: bool = False, stream=None,
+                 sarif: Optional[str] = None, baseline: Optional[str] = None,
+                 update_baseline: bool = False):
+        if update_baseline and not baseline:
+            # Every script builds its writer straight from its arguments: fail like a usage error
+            print(f"usage error: {tool}: --update-baseline needs --baseline FILE", file=sys.stderr)
+            sys.exit(2)
+        self.tool = tool
+        self.enabled = enabled
+        self.sarif = sarif
+        self.baseline = baseline
+        self.update_baseline = update_baseline
+        # Capture the real stdout now, before claim_stdout() swaps it out
+        self.stream = stream or sys.stdout
+        self.findings: List[Dict[str, Any]] = []
+        self.suppressed: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+
+    @classmethod
+    def from_argv(cls, tool: str, argv: Optional[List[str]] = None) -> "ResultWriter":
+        """Build a writer from --jsonl / --sarif FILE / --baseline FILE / --update-baseline."""
+        argv = sys.argv if argv is None else argv
+
+        def value(flag: str) -> Optional[str]:
+            if flag in argv:
+                i = argv.index(flag)
+                if i + 1 < len(argv) and not argv[i + 1].startswith("--"):
+                    return argv[i + 1]
+            return None
+
+        return cls(tool, enabled="--jsonl" in argv, sarif=value("--sarif"),
+                   baseline=value("--baseline"), update_baseline="--update-baseline" in argv)
+
+    def claim_stdout(self) -> None:
+        """
+        Keep banners and progress text off stdout while emitting JSON lines.
+        Once claimed, print() goes to stderr for the rest of the run.
+        """
+        if self.enabled:
+            sys.stdout = sys.stderr
+
+    def add(self, rule: str, severity: str, message: str, **kwargs: Any) -> Dict[str, Any]:
+        record = make_finding(self.tool, rule, severity, message, **kwargs)
+        self.findings.append(record)
+        return record
+
+    def counts(self) -> Dict[str, int]:
+        counts = {sev: 0 for sev in SEVERITIES}
+        for f in self.findings:
+            counts[f["severity"]] += 1
+        return counts
+
+    def summary(self, passed: bool, **stats: Any) -> Dict[str, Any]:
+        return {
+            "type": "summary",
+            "schema": SCHEMA_VERSION,
+            "tool": self.tool,
+            "passed": passed,
+            "duration_ms": round((time.perf_counter() - self._start) * 1000, 1),
+            "counts": self.counts(),
+            "stats": stats,
+        }
+
+    def apply_baseline(self) -> Optional[bool]:
+        """
+        Fingerprint findings and split off those already in the baseline.
+        Returns the baseline verdict (no new findings at FAIL_SEVERITY or
+        above), or None when no baseline is in use.
+        """
+        assign_fingerprints(self.findings)
+        if not self.baseline:
+            return None
+        if self.update_baseline:
+            save_baseline(self.baseline, self.tool, self.findings)
+            self.suppressed, self.findings = self.findings, []
+        else:
+            self.findings, self.suppressed = split_baseline(self.findings, load_baseline(self.baseline))
+        blocking = SEVERITIES[:SEVERITIES.index(FAIL_SEVERITY) + 1]
+        return not any(f["severity"] in blocking for f in self.findings)
+
+    def finish(self, passed: bool, **stats: Any) -> Dict[str, Any]:
+        """
+        Apply the baseline, write SARIF if requested and, when enabled, all
+        findings plus the summary record. With a baseline the returned
+        summary's "passed" reflects new findings only.
+        """
+        verdict = self.apply_baseline()
+        if verdict is not None:
+            passed = verdict
+            stats = dict(stats, new=len(self.findings), suppressed=len(self.suppressed))
+        summary = self.summary(passed, **stats)
+        if self.sarif:
+            write_sarif(self.sarif, self.tool, self.findings, self.suppressed)
+        if self.enabled:
+            for record in self.findings:
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        return summary
+
+
+def parse_records(text: str) -> List[Dict[str, Any]]:
+    """Read protocol records from script stdout, ignoring any other lines."""
+    records = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and record.get("type") in ("finding", "summary"):
+            records.append(record)
+    return records
+
+
+def dedupe(findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated findings while keeping first-seen order."""
+    seen = set()
+    unique = []
+    for f in findings:
+        key = finding_key(f)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(f)
+    return unique
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Route / Link Graph - Antigravity Kit
+====================================
+
+Compiles the react-router tree of a Vite/React app into a segment trie and
+indexes every in-app link in src/, so link checks are lookups instead of
+string comparisons:
+
+    graph = build_graph(project_root)
+    graph.route_for("/estoque/123")         # -> {"path": "/estoque/:itemId", ...}
+    for link in graph.broken():
+        ...
+    graph.linking_to("/planos")             # every link that lands on /planos
+
+Routes are read starting at src/App.tsx (or src/main.tsx) and following the
+components and route-module calls ({SaudeRoutes()}) it renders into files
+that declare <Route> elements. Nested <Route> children are joined to their
+parent path, index routes take the parent path, <Navigate> elements are
+recorded as redirects, and each route's page component is resolved to its
+module, including lazy(() => import("@/pages/X")) pages.
+
+Links are found by one whole-file regex pass per source file: to= / href=
+attributes and assignments, navigate("..."), and path:/route:/href:/to:/
+target: properties of navigation configs. Template segments (`/carteira/${id}`)
+match any route segment at that position.
+
+Both per-file results are cached under .agent/.cache/routes/ keyed by file
+stat (and content digest), so a re-run reads only files that changed.
+"""
+
+import difflib
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .dist import DistIndex
+from .filecache import FileCache
+from .jsx import parse_markup
+from .scan import LineIndex
+
+ENTRY_POINTS = ("src/App.tsx", "src/App.jsx", "src/main.tsx", "src/main.jsx")
+SOURCE_SUFFIXES = (".tsx", ".ts", ".jsx", ".js")
+RESOLVE_SUFFIXES = ("", ".tsx", ".ts", ".jsx", ".js", "/index.tsx", "/index.ts", "/index.jsx", "/index.js")
+SKIP_DIRS = {"node_modules", ".git", "dist", "build", "coverage", "__snapshots__"}
+
+# Import aliases (tsconfig "paths") -> project-relative directories
+ALIASES = {"@/": "src/", "~/": "src/"}
+
+# Matched by a template segment in a link ("/carteira/${id}")
+DYNAMIC = ":param"
+
+# Bump when parse_route_module / scan_links / scan_imports change what they return
+SCANNER_VERSION = 1
+ROUTE_CACHE = f"routes/modules-v{SCANNER_VERSION}"
+FILE_CACHE = f"routes/files-v{SCANNER_VERSION}"
+
+# Routes users open directly (bookmarks, the PWA start_url) besides "/"
+ENTRY_ROUTES = ("/", "/auth")
+_START_URL = re.compile(r"""["']?start_url["']?\s*:\s*["']([^"']+)["']""")
+
+_HAS_ROUTES = re.compile(r"<Route\b")
+_IMPORT = re.compile(r"""import\s+(?:type\s+)?(?:([\w$]+)\s*,?\s*)?(?:\{([^}]*)\}\s*)?(?:\*\s+as\s+([\w$]+)\s*)?from\s*["']([^"']+)["']""")
+_LAZY = re.compile(r"""(?:const|let|var)\s+([\w$]+)\s*=\s*\w*[lL]azy\w*\(\s*(?:async\s*)?\(\s*\)\s*=>\s*import\(\s*["']([^"']+)["']""")
+_MOUNT_CALL = re.compile(r"\{\s*([A-Z][\w$]*)\(\s*\)\s*\}")
+_COMPONENT = re.compile(r"<([A-Z][\w$]*)")
+_COMPONENT_PROP = re.compile(r"^\{\s*([A-Z][\w$]*)\s*\}$")
+_NAVIGATE_TO = re.compile(r"""<Navigate\b[^>]*?\bto=\{?\s*(["'`])([^"'`]*)\1""")
+
+# One pass per file; each alternative captures its target in its own group
+LINK_PATTERN = re.compile(r"""
+      \b(?:to|href)\s*=\s*\{?\s*(?P<aq>["'])(?P<attr>/[^"'\s]*)(?P=aq)         # to="/x"  href={'/x'}  href = "/x"
+    | \b(?:to|href)\s*=\s*\{?\s*`(?P<atpl>/(?:[^`\\$\s]|\$\{[^{}`]*\}|\$(?!\{))*)  # to={`/x/${id}`}
+    | \bnavigate\(\s*(?P<nq>["'])(?P<call>/[^"'\s]*)(?P=nq)                     # navigate("/x")
+    | \bnavigate\(\s*`(?P<ctpl>/(?:[^`\\$\s]|\$\{[^{}`]*\}|\$(?!\{))*)            # navigate(`/x/${id}`)
+    | \b(?:path|route|href|to|target)\s*:\s*(?P<pq>["'])(?P<prop>/[^"'\s]*)(?P=pq)  # { path: "/x" }
+    | \b(?:path|route|href|to|target)\s*:\s*`(?P<ptpl>/(?:[^`\\$\s]|\$\{[^{}`]*\}|\$(?!\{))*)
+""", re.VERBOSE)
+LINK_KINDS = {"attr": "Link to", "atpl": "Link to", "call": "navigate()", "ctpl": "navigate()",
+              "prop": "config", "ptpl": "config"}
+_IMPORT_SPEC = re.compile(r"""
+      \b(?:import|export)\s+(?!type\b)[\w$*{},\s]*?\bfrom\s*["'](?P<static>[^"']+)["']
+    | \bimport\s*["'](?P<bare>[^"']+)["']
+    | \bimport\(\s*["'](?P<dynamic>[^"']+)["']\s*\)
+""", re.VERBOSE)
+_TEMPLATE_EXPR = re.compile(r"\$\{[^{}]*\}")
+_ASSET = re.compile(r"\.[A-Za-z0-9]{2,5}$")
+
+
+def normalize_path(target: str) -> str:
+    """Drop query, hash and trailing slash; template expressions become :param."""
+    path = _TEMPLATE_EXPR.sub(DYNAMIC, target)
+    path = re.split(r"[?#]", path, 1)[0]
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return path or "/"
+
+
+def join_paths(base: str, path: str) -> str:
+    if path.startswith("/"):
+        return normalize_path(path)
+    return normalize_path(f"{base.rstrip('/')}/{path}" if path else base or "/")
+
+
+def _segments(path: str) -> List[str]:
+    return [s for s in path.split("/") if s]
+
+
+class _Node:
+    __slots__ = ("static", "param", "splat", "route")
+
+    def __init__(self):
+        self.static: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.splat: Optional[Dict[str, Any]] = None
+        self.route: Optional[Dict[str, Any]] = None
+
+
+class RouteTrie:
+    """
+    Route paths by segment. Matching follows react-router's ranking: a
+    static segment beats :param, which beats a trailing *. The top-level
+    "*" (the not-found page) only matches when catch_all is asked for.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.routes: List[Dict[str, Any]] = []
+
+    def insert(self, route: Dict[str, Any]) -> None:
+        self.routes.append(route)
+        variants = [[]]
+        for seg in _segments(route["path"]):
+            if seg.endswith("?"):  # Optional segment: with and without it
+                variants = [v + [seg[:-1]] for v in variants] + variants
+            else:
+                variants = [v + [seg] for v in variants]
+        for segs in variants:
+            node = self.root
+            for seg in segs:
+                if seg == "*":
+                    node.splat = node.splat or route
+                    break
+                if seg.startswith(":"):
+                    node.param = node.param or _Node()
+                    node = node.param
+                else:
+                    node = node.static.setdefault(seg, _Node())
+            else:
+                if node.route is None:
+                    node.route = route
+
+    def match(self, path: str, catch_all: bool = False) -> Optional[Dict[str, Any]]:
+        """Best route for a normalized path, or None."""
+        return self._match(self.root, _segments(path), 0, catch_all)
+
+    def _match(self, node: _Node, segs: List[str], i: int, catch_all: bool) -> Optional[Dict[str, Any]]:
+        if i == len(segs):
+            if node.route is not None:
+                return node.route
+            return node.splat if node.splat and (node is not self.root or catch_all) else None
+        seg = segs[i]
+        if seg == DYNAMIC:
+            candidates = ([node.param] if node.param else []) + list(node.static.values())
+        else:
+            candidates = [c for c in (node.static.get(seg), node.param) if c is not None]
+        for child in candidates:
+            found = self._match(child, segs, i + 1, catch_all)
+            if found is not None:
+                return found
+        if node.splat and (node is not self.root or catch_all):
+            return node.splat
+        return None
+
+    def paths(self) -> List[str]:
+        return sorted({r["path"] for r in self.routes if r["path"] != "*"})
+
+    def suggest(self, path: str) -> Optional[str]:
+        """Closest defined path by spelling, for "did you mean" hints."""
+        close = difflib.get_close_matches(path, self.paths(), n=1, cutoff=0.6)
+        if close:
+            return close[0]
+        # Fall back to the deepest route that is a prefix of the link
+        segs = _segments(path)
+        for depth in range(len(segs) - 1, 0, -1):
+            route = self.match("/" + "/".join(segs[:depth]))
+            if route is not None:
+                return route["path"]
+        return None
+
+
+def scan_links(content: str) -> List[list]:
+    """[target, line, column, kind] for every in-app link in one file."""
+    index = None
+    links = []
+    for m in LINK_PATTERN.finditer(content):
+        group = next(g for g in LINK_KINDS if m.group(g) is not None)
+        target = m.group(group)
+        if target.startswith("//") or _ASSET.search(re.split(r"[?#]", target, 1)[0]):
+            continue  # Protocol-relative URLs and static files
+        index = index or LineIndex(content)
+        line, column = index.position(m.start(group))
+        links.append([target, line, column, LINK_KINDS[group]])
+    return links
+
+
+def scan_imports(content: str) -> List[list]:
+    """[specifier, dynamic] for every import / re-export / import() in one file."""
+    return [[m.group("static") or m.group("bare") or m.group("dynamic"), m.group("dynamic") is not None]
+            for m in _IMPORT_SPEC.finditer(content)]
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8-sig", errors="replace")
+    except OSError:
+        return None
+
+
+def parse_route_module(content: str, name: str = "") -> Dict[str, Any]:
+    """
+    The routing facts of one file: imported and lazy bindings, <Route>
+    elements (paths relative to their parent route) and where other
+    components or route-module calls are mounted.
+    """
+    imports: Dict[str, str] = {}
+    for default, named, star, spec in _IMPORT.findall(content):
+        for binding in filter(None, (default, star)):
+            imports[binding] = spec
+        for part in named.split(","):
+            part = part.strip()
+            if part and not part.startswith("type "):
+                imports[part.split(" as ")[-1].strip()] = spec
+    lazy = {binding: spec for binding, spec in _LAZY.findall(content)}
+    imports.update(lazy)
+
+    tree = parse_markup(content, name or "module.tsx", kind="jsx")
+    route_elements = list(tree.find("Route"))
+    position = {id(e): i for i, e in enumerate(route_elements)}
+    routes = []
+    for element in route_elements:
+        parent = element.parent
+        while parent is not None and tree.elements[parent].tag != "Route":
+            parent = tree.elements[parent].parent
+        source = element.attr("element") or ""
+        components = _COMPONENT.findall(source)
+        prop = _COMPONENT_PROP.match(element.attr("component") or element.attr("Component") or "")
+        if prop:
+            components.append(prop.group(1))
+        redirect = _NAVIGATE_TO.search(source)
+        routes.append({
+            "path": element.attr("path") or "",
+            "index": element.has_attr("index"),
+            "line": element.line,
+            "parent": position[id(tree.elements[parent])] if parent is not None else None,
+            "components": [c for c in components if c != "Navigate"],
+            "redirect": redirect.group(2) if redirect else None,
+        })
+
+    def enclosing(offset: int) -> Optional[int]:
+        inside = [i for i, e in enumerate(route_elements) if e.start <= offset < e.end]
+        return max(inside, key=lambda i: route_elements[i].start) if inside else None
+
+    # Components rendered outside any route may carry <Routes> of their own;
+    # inside a route they are mounted at its path (descendant routes)
+    mounts = [[m.group(1), enclosing(m.start())] for m in _MOUNT_CALL.finditer(content)]
+    mounts += [[e.tag.split(".")[0], enclosing(e.start)] for e in tree.elements
+               if e.tag[:1].isupper() and e.tag not in ("Route", "Routes", "Navigate")]
+    for i, route in enumerate(routes):
+        mounts += [[c, i] for c in route["components"]]
+    return {"imports": imports, "lazy": sorted(lazy), "routes": routes, "mounts": mounts}
+
+
+def resolve_import(spec: str, from_file: Path, root: Path) -> Optional[Path]:
+    """The source file an import specifier points at, or None (packages, assets)."""
+    if spec.startswith("."):
+        base = from_file.parent / spec
+    else:
+        alias = next((a for a in ALIASES if spec.startswith(a)), None)
+        if alias is None:
+            return None
+        base = root / ALIASES[alias] / spec[len(alias):]
+    for suffix in RESOLVE_SUFFIXES:
+        candidate = Path(f"{base}{suffix}")
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def source_files(src: Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if filename.endswith(SOURCE_SUFFIXES) and not filename.endswith(".d.ts"):
+                yield Path(dirpath) / filename
+
+
+class RouteGraph:
+    """Routes of the app, every in-app link and import in src/, and the lookups between them."""
+
+    def __init__(self, root: Path, routes: List[Dict[str, Any]], links: List[Dict[str, Any]],
+                 imports: Dict[str, List[list]], entry: Optional[str], stats: Dict[str, int]):
+        self.root = root
+        self.routes = routes
+        self.links = links
+        self.imports = imports      # project-relative file -> [specifier, dynamic]
+        self.entry = entry
+        self.stats = stats
+        self.trie = RouteTrie()
+        for route in routes:
+            self.trie.insert(route)
+        self._resolved: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def route_for(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.trie.match(normalize_path(path))
+
+    def broken(self) -> List[Dict[str, Any]]:
+        """Links that no route (other than the not-found page) matches."""
+        return [link for link in self.links if self.trie.match(link["route"]) is None]
+
+    def linking_to(self, path: str) -> List[Dict[str, Any]]:
+        """Links that resolve to the same route as `path` (or spell it exactly)."""
+        path = normalize_path(path)
+        target = self.trie.match(path)
+        if target is None:
+            return [link for link in self.links if link["route"] == path]
+        return [link for link in self.links if self.trie.match(link["route"]) is target]
+
+    def redirect_target(self, route: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow <Navigate> redirects to the route that finally renders."""
+        seen = set()
+        while route.get("redirect") and id(route) not in seen:
+            seen.add(id(route))
+            nxt = self.trie.match(normalize_path(route["redirect"]))
+            if nxt is None:
+                break
+            route = nxt
+        return route
+
+    def resolve(self, spec: str, rel: str) -> Optional[str]:
+        """Project-relative file an import in `rel` points at (memoized)."""
+        key = (spec if not spec.startswith(".") else rel.rsplit("/", 1)[0], spec)
+        if key not in self._resolved:
+            target = resolve_import(spec, self.root / rel, self.root)
+            self._resolved[key] = (target.relative_to(self.root).as_posix()
+                                   if target and target.is_relative_to(self.root) else None)
+        return self._resolved[key]
+
+    def closure(self, start: str, pages: Set[str]) -> Set[str]:
+        """
+        Files rendered along with `start`: static imports always, import()
+        unless it loads another route's page (that is reached via its route).
+        """
+        files = {start}
+        stack = [start]
+        while stack:
+            rel = stack.pop()
+            for spec, dynamic in self.imports.get(rel, ()):
+                target = self.resolve(spec, rel)
+                if target is None or target in files or (dynamic and target in pages):
+                    continue
+                files.add(target)
+                stack.append(target)
+        return files
+
+    def importers(self) -> Dict[str, Set[str]]:
+        """Reverse import edges: file -> files that import it."""
+        reverse: Dict[str, Set[str]] = {}
+        for rel, specs in self.imports.items():
+            for spec, _ in specs:
+                target = self.resolve(spec, rel)
+                if target is not None:
+                    reverse.setdefault(target, set()).add(rel)
+        return reverse
+
+    def reachability(self, entries: Iterable[str] = ENTRY_ROUTES) -> Dict[str, Any]:
+        """
+        Walk the route/link graph from the entry routes and from links the
+        shell renders everywhere (navigation bars, global prompts). Returns
+        the reachable routes and files, routes nothing links to (redirect
+        aliases and the not-found page aside) and src/pages files that no
+        route renders and no reachable file imports.
+        """
+        pages = {r["module"] for r in self.routes if r["module"]}
+        links_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        for link in self.links:
+            links_by_file.setdefault(link["file"], []).append(link)
+
+        reached: Dict[int, Dict[str, Any]] = {}
+        queue: List[Dict[str, Any]] = []
+
+        def visit(route: Optional[Dict[str, Any]]) -> None:
+            if route is not None and id(route) not in reached:
+                reached[id(route)] = route
+                queue.append(route)
+
+        def follow(files: Iterable[str]) -> None:
+            for rel in files:
+                for link in links_by_file.get(rel, ()):
+                    visit(self.trie.match(link["route"]))
+
+        files = self.closure(self.entry, pages) if self.entry else set()
+        shell = set(files)
+        for path in entries:
+            visit(self.route_for(path))
+        follow(shell)
+        while queue:
+            route = queue.pop()
+            if route["redirect"]:
+                visit(self.trie.match(route["redirect"]))
+            if route["module"]:
+                rendered = self.closure(route["module"], pages) - files
+                files |= rendered
+                follow(rendered)
+
+        orphans = [r for r in self.routes if id(r) not in reached
+                   and not r["redirect"] and r["path"] != "*"]
+        unrouted = sorted(rel for rel in self.imports
+                          if rel.startswith("src/pages/") and rel not in pages and rel not in files)
+        return {"entries": list(entries), "shell": shell, "files": files,
+                "reachable": [r for r in self.routes if id(r) in reached],
+                "orphans": orphans, "unrouted": unrouted}
+
+    def dead_weight(self, reach: Dict[str, Any], build: Optional[DistIndex] = None) -> List[Dict[str, Any]]:
+        """
+        Bytes each orphan route and unrouted page carries that nothing
+        reachable shares: built chunk sizes when a dist/ is given (via the
+        manifest, or the lazy chunk named after the page), source bytes
+        otherwise. Pages nothing imports never reach the bundle and weigh 0
+        (their source_bytes are still given).
+        """
+        pages = {r["module"] for r in self.routes if r["module"]}
+        bundled = self.closure(self.entry, set()) if self.entry else set()
+        importers = self.importers()
+        kept = set(build.closure(build.entry_keys() + sorted(reach["files"]))) if build and build.manifest else set()
+
+        def measure(module: str) -> Dict[str, Any]:
+            exclusive = self.closure(module, pages) - reach["files"]
+            in_bundle = module in bundled
+            if build is not None and in_bundle:
+                if build.manifest is not None and module in build.manifest:
+                    chunks = build.closure([module]) - kept
+                    return {"bytes": build.bytes_of(chunks), "measured": "manifest", "chunks": sorted(chunks)}
+                chunks = build.chunks_for(module)
+                if chunks:
+                    return {"bytes": build.bytes_of(chunks), "measured": "file-name", "chunks": chunks}
+            size = sum(_size(self.root / rel) for rel in exclusive)
+            return {"bytes": size if in_bundle else 0, "source_bytes": size, "measured": "source",
+                    "files": len(exclusive), "bundled": in_bundle}
+
+        report = []
+        for route in reach["orphans"]:
+            item = {"kind": "orphan-route", "path": route["path"], "file": route["file"],
+                    "line": route["line"], "module": route["module"], "lazy": route["lazy"]}
+            if route["module"] and route["module"] not in reach["files"]:
+                item.update(measure(route["module"]))
+            else:
+                item.update({"bytes": 0, "measured": "shared" if route["module"] else "inline"})
+            report.append(item)
+        for rel in reach["unrouted"]:
+            imported_by = sorted(importers.get(rel, ()))
+            item = {"kind": "unrouted-page", "file": rel, "imported_by": imported_by}
+            item.update(measure(rel))
+            report.append(item)
+        return report
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def default_entries(project_root: str) -> List[str]:
+    """ENTRY_ROUTES plus the PWA start_url from vite.config.* or a web manifest."""
+    root = Path(project_root)
+    entries = list(ENTRY_ROUTES)
+    candidates = [root / f"vite.config.{ext}" for ext in ("ts", "js", "mts", "mjs")]
+    candidates += [root / "public" / name for name in ("manifest.json", "manifest.webmanifest", "site.webmanifest")]
+    for path in candidates:
+        content = _read(path) if path.is_file() else None
+        for url in _START_URL.findall(content or ""):
+            if url.startswith("/") and normalize_path(url) not in entries:
+                entries.append(normalize_path(url))
+    return entries
+
+
+def _load_routes(root: Path, entry: Path, cache: Optional[FileCache],
+                 stats: Dict[str, int]) -> List[Dict[str, Any]]:
+    parsed: Dict[Path, Optional[Dict[str, Any]]] = {}
+
+    def module(path: Path) -> Optional[Dict[str, Any]]:
+        if path in parsed:
+            return parsed[path]
+        value = cache.get(str(path)) if cache else None
+        if value is None:
+            content = _read(path)
+            digest = _digest(content or "")
+            value = cache.get_by_digest(str(path), digest) if cache else None
+            if value is None:
+                stats["route_files_parsed"] += 1
+                has_routes = bool(content and _HAS_ROUTES.search(content))
+                value = parse_route_module(content, path.name) if has_routes else {"routes": None}
+                if cache:
+                    cache.put(str(path), value, digest=digest)
+        parsed[path] = value if value.get("routes") is not None else None
+        return parsed[path]
+
+    routes: List[Dict[str, Any]] = []
+    queue: List[Tuple[Path, str, bool]] = [(entry.resolve(), "/", True)]
+    visited = set()
+    while queue:
+        path, prefix, is_entry = queue.pop(0)
+        if (path, prefix) in visited:
+            continue
+        visited.add((path, prefix))
+        data = module(path)
+        if data is None:
+            if not is_entry:
+                continue
+            # The entry renders the shell that holds the routes: follow its imports
+            content = _read(path) or ""
+            for default, named, star, spec in _IMPORT.findall(content):
+                target = resolve_import(spec, path, root)
+                if target is not None:
+                    queue.append((target, prefix, False))
+            continue
+
+        rel = path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)
+        full: List[str] = []
+        for spec in data["routes"]:
+            base = full[spec["parent"]] if spec["parent"] is not None else prefix
+            full_path = base if spec["index"] else join_paths(base, spec["path"])
+            full.append(full_path)
+            component = spec["components"][-1] if spec["components"] else None
+            target = resolve_import(data["imports"][component], path, root) \
+                if component in data["imports"] else None
+            routes.append({
+                "path": "*" if spec["path"] == "*" and base == "/" else full_path,
+                "file": rel,
+                "line": spec["line"],
+                "component": component,
+                "module": target.relative_to(root).as_posix() if target and target.is_relative_to(root) else None,
+                "lazy": component in data["lazy"],
+                "redirect": join_paths(full_path, spec["redirect"]) if spec["redirect"] else None,
+                "index": spec["index"],
+            })
+
+        for binding, route_index in data["mounts"]:
+            spec = data["imports"].get(binding)
+            target = resolve_import(spec, path, root) if spec else None
+            if target is None:
+                continue
+            mount = prefix if route_index is None else full[route_index]
+            if mount.endswith("/*"):
+                mount = mount[:-2] or "/"
+            queue.append((target, mount, False))
+    return routes
+
+
+def _scan_files(root: Path, src: Path, cache: Optional[FileCache],
+                stats: Dict[str, int]) -> Tuple[List[Dict[str, Any]], Dict[str, List[list]]]:
+    links = []
+    imports = {}
+    for path in source_files(src):
+        key = str(path)
+        found = cache.get(key) if cache else None
+        if found is None:
+            content = _read(path)
+            if content is None:
+                continue
+            digest = _digest(content)
+            found = cache.get_by_digest(key, digest) if cache else None
+            if found is None:
+                stats["link_files_scanned"] += 1
+                found = {"links": scan_links(content), "imports": scan_imports(content)}
+                if cache:
+                    cache.put(key, found, digest=digest)
+        stats["source_files"] += 1
+        rel = path.relative_to(root).as_posix()
+        imports[rel] = found["imports"]
+        for target, line, column, kind in found["links"]:
+            links.append({"file": rel, "line": line, "column": column, "kind": kind,
+                          "target": target, "route": normalize_path(target)})
+    return links, imports
+
+
+def find_entry(root: Path) -> Optional[Path]:
+    for name in ENTRY_POINTS:
+        if (root / name).is_file():
+            return root / name
+    return None
+
+
+def build_graph(project_root: str, entry: Optional[str] = None, use_cache: bool = True) -> RouteGraph:
+    """Routes from the entry file's router tree plus every link and import under src/."""
+    root = Path(project_root).resolve()
+    stats = {"source_files": 0, "link_files_scanned": 0, "route_files_parsed": 0}
+    entry_path = root / entry if entry else find_entry(root)
+    route_cache = FileCache(ROUTE_CACHE) if use_cache else None
+    file_cache = FileCache(FILE_CACHE) if use_cache else None
+    routes = _load_routes(root, entry_path, route_cache, stats) if entry_path and entry_path.is_file() else []
+    links, imports = _scan_files(root, root / "src", file_cache, stats) if (root / "src").is_dir() else ([], {})
+    for cache in (route_cache, file_cache):
+        if cache:
+            cache.save()
+    entry_rel = entry_path.relative_to(root).as_posix() if entry_path else None
+    return RouteGraph(root, routes, links, imports, entry_rel, stats)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+SARIF 2.1.0 Export - Antigravity Kit
+====================================
+
+Converts protocol findings (see results.py) into a SARIF log that code
+review tools can ingest. Findings suppressed by a baseline are kept with an
+external suppression so reviewers can still see them.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+FINGERPRINT_KEY = "antigravity/v1"
+
+_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note",
+    "info": "note",
+}
+
+
+def _result(record: Dict[str, Any], rule_index: int, suppressed: bool) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "ruleId": record["rule"],
+        "ruleIndex": rule_index,
+        "level": _LEVELS.get(record.get("severity"), "warning"),
+        "message": {"text": record.get("message") or record["rule"]},
+        "properties": {"severity": record.get("severity")},
+    }
+    if record.get("file"):
+        location: Dict[str, Any] = {
+            "artifactLocation": {"uri": record["file"], "uriBaseId": "%SRCROOT%"},
+        }
+        if record.get("line"):
+            region = {"startLine": record["line"]}
+            if record.get("column"):
+                region["startColumn"] = record["column"]
+            if record.get("end_line"):
+                region["endLine"] = record["end_line"]
+                if record.get("end_column"):
+                    region["endColumn"] = record["end_column"]
+            location["region"] = region
+        result["locations"] = [{"physicalLocation": location}]
+    if record.get("fingerprint"):
+        result["partialFingerprints"] = {FINGERPRINT_KEY: record["fingerprint"]}
+    if suppressed:
+        result["suppressions"] = [{"kind": "external", "justification": "Listed in baseline"}]
+        result["baselineState"] = "unchanged"
+    else:
+        result["baselineState"] = "new"
+    return result
+
+
+def to_sarif(tool: str, findings: List[Dict[str, Any]],
+             suppressed: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Build a single-run SARIF log for one tool."""
+    suppressed = suppressed or []
+    rule_ids: List[str] = []
+    index: Dict[str, int] = {}
+    for record in findings + suppressed:
+        if record["rule"] not in index:
+            index[record["rule"]] = len(rule_ids)
+            rule_ids.append(record["rule"])
+
+    results = [_result(r, index[r["rule"]], False) for r in findings]
+    results += [_result(r, index[r["rule"]], True) for r in suppressed]
+
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": SARIF_VERSION,
+        "runs": [{
+            "tool": {
+                "driver": {
+                    "name": tool,
+                    "rules": [{"id": rule_id, "shortDescription": {"text": rule_id}} for rule_id in rule_ids],
+                }
+            },
+            "results": results,
+        }],
+    }
+
+
+def write_sarif(path: str, tool: str, findings: List[Dict[str, Any]],
+                suppressed: Optional[List[Dict[str, Any]]] = None) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(to_sarif(tool, findings, suppressed), indent=2), encoding="utf-8")
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+File Scanning Engine - Antigravity Kit
+======================================
+
+Regex rules in the auditors run through a FileScan instead of calling the
+re module directly:
+
+    scan = FileScan(content, name=rel_path, profiler=self.profiler)
+    scan.rule("hicks-law")
+    nav_items = len(scan.findall(r'<NavLink\\b|<Link\\b'))
+
+scan.rule() names the rule that following calls belong to. With a Profiler
+attached every call records wall time, call count and bytes scanned per rule
+and per file.
+
+Findings are located from match offsets. The scan remembers the span of the
+latest match its current rule made on the file, and scan.locate() turns that
+(or an explicit match or element) into line/column/end_line/end_column through
+a line-offset table built once per file and searched with bisect:
+
+    if scan.search(r'transition:\s*all'):
+        where = scan.locate()   # {"line": 12, "column": 5, ..., "span": [301, 316]}
+
+Every FileScan also runs under a ScanGuard that keeps one pathological file
+from stalling a whole audit:
+
+- Patterns are linted for ReDoS shapes (redos.py) when first compiled.
+- Each file gets a wall-time budget. Once it is spent, the remaining rules
+  for that file are skipped and the rule that hit it is reported.
+- Files above max_bytes are scanned in bounded, overlapping windows
+  (oversize="chunk") or skipped (oversize="skip"). Minified files are
+  always skipped.
+- When the optional `regex` module is installed, each call also gets a hard
+  timeout equal to the budget left.
+
+Scanners that must not hold whole files in memory read them with
+stream_windows() (overlapping text windows) or stream_lines() (bounded
+lines) and pass each piece to the scan as text=...; FileScan(head, size=...)
+admits the file from its first window and its size on disk.
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+from .redos import lint_pattern
+
+try:
+    import regex as _regex  # Optional: enables hard per-call timeouts
+    REGEX_AVAILABLE = True
+except ImportError:
+    _regex = None
+    REGEX_AVAILABLE = False
+
+PatternLike = Union[str, Pattern]
+
+# Guard defaults (overridable with --file-budget-ms / --max-file-kb / --oversize)
+FILE_BUDGET_MS = 2000
+MAX_FILE_KB = 512
+CHUNK_KB = 64
+CHUNK_OVERLAP = 2048
+MINIFIED_LINE = 5000  # A line this long (and a high average) marks a minified bundle
+STREAM_LINE = 4096  # stream_lines() splits longer lines into pieces of this size
+
+
+class Profiler:
+    """Accumulates per-rule / per-file regex cost for one tool run."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        # [seconds, calls, bytes]
+        self.rules: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0, 0])
+        self.files: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0, 0])
+        self.stacks: Dict[str, float] = defaultdict(float)
+
+    def record(self, file: str, rule: str, seconds: float, nbytes: int) -> None:
+        for bucket in (self.rules[rule], self.files[file]):
+            bucket[0] += seconds
+            bucket[1] += 1
+            bucket[2] += nbytes
+        self.stacks[f"{self.tool};{rule};{file}"] += seconds
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(v[0] for v in self.rules.values())
+
+    def ranked(self, table: Dict[str, List[float]], top: int) -> List[Dict[str, Any]]:
+        rows = sorted(table.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+        return [
+            {"name": name, "ms": round(sec * 1000, 2), "calls": int(calls), "bytes": int(nbytes)}
+            for name, (sec, calls, nbytes) in rows
+        ]
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "rules": self.ranked(self.rules, top),
+            "files": self.ranked(self.files, top),
+        }
+
+    def report(self, top: int = 20) -> str:
+        """Human-readable ranking of the hottest rules and files."""
+        total = self.total_seconds or 1e-9
+        lines = [f"[PROFILE] {self.tool}: {self.total_seconds * 1000:.1f} ms in regex rules"]
+        for title, table in (("RULES", self.rules), ("FILES", self.files)):
+            lines.append(f"  {title} (top {top} by time)")
+            lines.append(f"    {'ms':>9}  {'%':>5}  {'calls':>7}  {'MB':>8}  name")
+            for row in self.ranked(table, top):
+                share = row["ms"] / 1000 / total * 100
+                lines.append(f"    {row['ms']:9.2f}  {share:5.1f}  {row['calls']:7d}  "
+                             f"{row['bytes'] / 1e6:8.2f}  {row['name']}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str) -> None:
+        """Write tool;rule;file stacks in the collapsed format flamegraph.pl reads (µs)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = int(round(seconds * 1e6))
+                if micros:
+                    f.write(f"{stack.replace(' ', '_')} {micros}\n")
+
+
+def profile_from_argv(tool: str, argv: Optional[List[str]] = None) -> Optional[Profiler]:
+    """A Profiler when --profile is on the command line, else None."""
+    argv = sys.argv if argv is None else argv
+    return Profiler(tool) if "--profile" in argv else None
+
+
+def finish_profile(profiler: Optional[Profiler], argv: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Print the ranked report to stderr and write the collapsed stacks to the
+    path after --profile (default: <tempdir>/<tool>-profile.folded).
+    Returns the stack file path.
+    """
+    if profiler is None:
+        return None
+    argv = sys.argv if argv is None else argv
+    i = argv.index("--profile")
+    if i + 1 < len(argv) and not argv[i + 1].startswith("--"):
+        path = argv[i + 1]
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"{profiler.tool}-profile.folded")
+    profiler.write_collapsed(path)
+    print(profiler.report(), file=sys.stderr)
+    print(f"  Collapsed stacks: {path} (flamegraph.pl / speedscope)", file=sys.stderr)
+    return path
+
+
+class BudgetExceeded(Exception):
+    """Raised by FileScan once a file has used up its time budget."""
+
+
+class ScanGuard:
+    """Run-wide limits plus a record of everything they cut short."""
+
+    def __init__(self, file_budget_ms: float = FILE_BUDGET_MS, max_file_kb: int = MAX_FILE_KB,
+                 oversize: str = "chunk"):
+        self.file_budget = file_budget_ms / 1000
+        self.max_bytes = max_file_kb * 1024
+        self.oversize = oversize
+        self._compiled: Dict[Tuple[Any, int], Pattern] = {}
+        self.lint: Dict[str, List[Tuple[str, str]]] = {}
+        self.skipped: List[Dict[str, Any]] = []
+        self.chunked: List[str] = []
+        self.budget_hits: List[Dict[str, Any]] = []
+        self._admitted: Dict[str, str] = {}
+
+    @classmethod
+    def from_argv(cls, argv: Optional[List[str]] = None) -> "ScanGuard":
+        argv = sys.argv if argv is None else argv
+
+        def value(flag: str, parse: Callable[[str], Any], default, expects: str):
+            if flag not in argv:
+                return default
+            index = argv.index(flag) + 1
+            try:
+                return parse(argv[index])
+            except (IndexError, ValueError):
+                got = repr(argv[index]) if index < len(argv) else "nothing"
+                print(f"usage error: {flag} expects {expects}, got {got}", file=sys.stderr)
+                sys.exit(2)
+
+        def oversize(mode: str) -> str:
+            if mode not in ("chunk", "skip"):
+                raise ValueError(mode)
+            return mode
+
+        return cls(file_budget_ms=value("--file-budget-ms", float, FILE_BUDGET_MS, "a number of milliseconds"),
+                   max_file_kb=value("--max-file-kb", int, MAX_FILE_KB, "a whole number of KB"),
+                   oversize=value("--oversize", oversize, "chunk", "'chunk' or 'skip'"))
+
+    def compile(self, pattern: PatternLike, flags: int = 0) -> Pattern:
+        """Compile once per run, linting the pattern the first time it is seen."""
+        key = (pattern, flags)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            source = pattern.pattern if hasattr(pattern, "pattern") else pattern
+            flags = flags or (pattern.flags if hasattr(pattern, "flags") else 0)
+            issues = lint_pattern(source, flags)
+            if issues:
+                self.lint[source] = issues
+            compiled = (_regex or re).compile(source, flags)
+            self._compiled[key] = compiled
+        return compiled
+
+    def admit(self, name: str, content: str, size: Optional[int] = None) -> str:
+        """
+        Decide how to scan a file: "full", "chunk" or "skip" (once per file per
+        run). Streaming callers pass the file's head as content and its full
+        length as size.
+        """
+        if name in self._admitted:
+            return self._admitted[name]
+        mode = self._admit(name, content, len(content) if size is None else size)
+        if name:
+            self._admitted[name] = mode
+        return mode
+
+    def _admit(self, name: str, content: str, size: int) -> str:
+        if size > self.max_bytes or size > MINIFIED_LINE:
+            longest = max((len(line) for line in content.split("\n", 200)[:200]), default=0)
+            lines = content.count("\n") + 1
+            if longest >= MINIFIED_LINE and len(content) / lines > 500:
+                self.skipped.append({"file": name, "bytes": size, "reason": "minified"})
+                return "skip"
+        if size <= self.max_bytes:
+            return "full"
+        if self.oversize == "skip":
+            self.skipped.append({"file": name, "bytes": size, "reason": "oversize"})
+            return "skip"
+        self.chunked.append(name)
+        return "chunk"
+
+    def hit_budget(self, name: str, rule: str, spent: float) -> None:
+        self.budget_hits.append({"file": name, "rule": rule, "ms": round(spent * 1000, 1)})
+
+    def mark(self) -> Tuple[int, int, int, int]:
+        """Position in the event lists, for events_since()."""
+        return len(self.lint), len(self.skipped), len(self.chunked), len(self.budget_hits)
+
+    def events_since(self, mark: Tuple[int, int, int, int]) -> Dict[str, Any]:
+        """Everything recorded after mark(), in a picklable form that merge() accepts."""
+        return {
+            "lint": dict(list(self.lint.items())[mark[0]:]),
+            "skipped": self.skipped[mark[1]:],
+            "chunked": self.chunked[mark[2]:],
+            "budget_hits": self.budget_hits[mark[3]:],
+        }
+
+    def merge(self, events: Dict[str, Any]) -> None:
+        """Fold in events from another guard (e.g. a worker process's)."""
+        for source, issues in events["lint"].items():
+            self.lint.setdefault(source, issues)
+        self.skipped.extend(events["skipped"])
+        self.chunked.extend(events["chunked"])
+        self.budget_hits.extend(events["budget_hits"])
+
+    @property
+    def eventful(self) -> bool:
+        return bool(self.lint or self.skipped or self.chunked or self.budget_hits)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "risky_patterns": [{"pattern": p, "issues": [f"{sev}: {desc}" for sev, desc in issues]}
+                               for p, issues in self.lint.items()],
+            "skipped_files": self.skipped,
+            "chunked_files": self.chunked,
+            "budget_hits": self.budget_hits,
+        }
+
+    def report(self) -> str:
+        lines = ["[SCAN GUARD]"]
+        for p, issues in self.lint.items():
+            for sev, desc in issues:
+                lines.append(f"  [{sev}] {desc}: {p[:80]}")
+        for s in self.skipped:
+            lines.append(f"  [skipped] {s['file']} ({s['bytes'] // 1024} KB, {s['reason']})")
+        for name in self.chunked:
+            lines.append(f"  [chunked] {name} (> {self.max_bytes // 1024} KB)")
+        for hit in self.budget_hits:
+            lines.append(f"  [budget] {hit['file']}: rule '{hit['rule']}' exhausted the "
+                         f"{self.file_budget * 1000:.0f} ms budget ({hit['ms']} ms); remaining rules skipped")
+        return "\n".join(lines)
+
+
+class LineIndex:
+    """Offset -> (line, column) lookups for one file, both 1-based."""
+
+    def __init__(self, content: str):
+        self.starts = [0]
+        self.starts.extend(m.end() for m in re.finditer("\n", content))
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def locate(self, start: int, end: int) -> Dict[str, Any]:
+        line, column = self.position(start)
+        end_line, end_column = self.position(end)
+        return {"line": line, "column": column, "end_line": end_line,
+                "end_column": end_column, "span": [start, end]}
+
+
+class FileScan:
+    """Regex helpers bound to one file's content, attributed to the current rule."""
+
+    def __init__(self, content: str, name: str = "", profiler: Optional[Profiler] = None,
+                 guard: Optional[ScanGuard] = None, size: Optional[int] = None):
+        self.content = content
+        self.name = name
+        self.profiler = profiler
+        self.guard = guard or ScanGuard()
+        self.current = "setup"
+        self.mode = self.guard.admit(name, content, size)
+        self.spent = 0.0
+        self.last_span: Optional[Tuple[int, int]] = None
+        self._lines: Optional[LineIndex] = None
+
+    @property
+    def skipped(self) -> bool:
+        """True when the guard decided not to scan this file at all."""
+        return self.mode == "skip"
+
+    def rule(self, rule_id: str) -> None:
+        self.current = rule_id
+        self.last_span = None
+
+    def locate(self, at: Any = None) -> Dict[str, Any]:
+        """
+        Position of a match, an element (anything with start/end offsets into
+        the file) or a (start, end) tuple; defaults to the current rule's
+        latest match. Empty when there is nothing to point at.
+        """
+        if at is None:
+            span = self.last_span
+        elif isinstance(at, tuple):
+            span = at
+        elif hasattr(at, "span"):
+            span = at.span()
+        else:
+            span = (at.start, at.end)
+        if span is None:
+            return {}
+        if self._lines is None:
+            self._lines = LineIndex(self.content)
+        return self._lines.locate(*span)
+
+    def _windows(self) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, owned_end) windows; matches starting past owned_end belong to the next one."""
+        size = CHUNK_KB * 1024
+        n = len(self.content)
+        for start in range(0, n, size):
+            yield start, min(n, start + size + CHUNK_OVERLAP), min(n, start + size)
+
+    def _run(self, kind: str, compiled: Pattern, text: str):
+        timeout = {}
+        if REGEX_AVAILABLE:
+            timeout = {"timeout": max(self.guard.file_budget - self.spent, 0.001)}
+        if self.mode == "chunk" and text is self.content:
+            matches = []
+            for start, end, owned in self._windows():
+                for m in compiled.finditer(text, start, end, **timeout):
+                    if m.start() < owned:
+                        matches.append(m)
+                        if kind == "search":
+                            return m
+            return None if kind == "search" else matches
+        if kind == "search":
+            return compiled.search(text, **timeout)
+        return list(compiled.finditer(text, **timeout))
+
+    def _timed(self, kind: str, pattern: PatternLike, text: str, flags: int):
+        """
+        Run one regex call under the file budget. Crossing the budget raises
+        BudgetExceeded so the auditor abandons the file (keeping what it has
+        found) rather than acting on half-evaluated rules.
+        """
+        if self.mode == "skip":
+            raise BudgetExceeded(self.name)
+        compiled = self.guard.compile(pattern, flags)
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            result = self._run(kind, compiled, text)
+        except TimeoutError:  # Only raised by the optional regex module
+            result, timed_out = None, True
+        elapsed = time.perf_counter() - start
+        self.spent += elapsed
+        if self.profiler is not None:
+            self.profiler.record(self.name, self.current, elapsed, len(text))
+        if timed_out or self.spent > self.guard.file_budget:
+            self.guard.hit_budget(self.name, self.current, self.spent)
+            raise BudgetExceeded(self.name)
+        first = result[0] if isinstance(result, list) and result else result
+        if first and text is self.content:
+            self.last_span = first.span()
+        if kind == "findall":
+            return [_findall_item(m, compiled.groups) for m in result]
+        return result
+
+    def search(self, pattern: PatternLike, flags: int = 0, text: Optional[str] = None) -> Optional[re.Match]:
+        return self._timed("search", pattern, self.content if text is None else text, flags)
+
+    def findall(self, pattern: PatternLike, flags: int = 0, text: Optional[str] = None) -> List[Any]:
+        return self._timed("findall", pattern, self.content if text is None else text, flags)
+
+    def finditer(self, pattern: PatternLike, flags: int = 0, text: Optional[str] = None) -> Iterator[re.Match]:
+        return iter(self._timed("finditer", pattern, self.content if text is None else text, flags))
+
+
+def stream_windows(f: IO[str], size: int = CHUNK_KB * 1024,
+                   overlap: int = CHUNK_OVERLAP) -> Iterator[Tuple[int, str, int]]:
+    """
+    Read a text file as (offset, window, owned) tuples without loading it
+    whole. Consecutive windows share `overlap` characters so a match crossing
+    a boundary is still seen; count a match only if it starts before `owned`
+    so it is counted once. At most size + overlap characters are held.
+    """
+    window = f.read(size + overlap)
+    offset = 0
+    while window:
+        more = f.read(size)
+        yield offset, window, (size if more else len(window))
+        if not more:
+            break
+        window = window[size:] + more
+        offset += size
+
+
+def stream_lines(f: IO[str], limit: int = STREAM_LINE) -> Iterator[Tuple[int, str]]:
+    """(line_number, text) for a text file; lines longer than limit arrive in pieces."""
+    line_num = 1
+    for piece in iter(lambda: f.readline(limit), ""):
+        yield line_num, piece
+        if piece.endswith("\n"):
+            line_num += 1
+
+
+def _findall_item(match, groups: int):
+    """Shape a match the way re.findall would."""
+    if groups == 0:
+        return match.group(0)
+    if groups == 1:
+        return match.group(1)
+    return match.groups("")
+
+
+def finish_guard(guard: ScanGuard) -> None:
+    """Print the guard report to stderr when anything was linted, skipped or cut short."""
+    if guard.eventful:
+        print(guard.report(), file=sys.stderr)
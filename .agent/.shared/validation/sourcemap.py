@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Source Map Attribution - Antigravity Kit
+========================================
+
+Splits the bytes of a generated file (a Vite/Rollup chunk) among the
+original sources named in its source map, by decoding the VLQ "mappings":
+
+    sizes = attribute_bytes(code, source_map, base_dir="dist/assets", project_root=".")
+    # {"src/pages/Agenda.tsx": 10234, "node_modules/date-fns/format.js": 5120, "[unmapped]": 310}
+    package_of("node_modules/.pnpm/react-dom@18.3.1/node_modules/react-dom/cjs/x.js")   # "react-dom"
+
+Only the first two fields of each segment (generated column, source index)
+are decoded; the original line/column fields are skipped. Columns are
+UTF-16 code units, so non-ASCII lines are measured by slicing the text.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+UNMAPPED = "[unmapped]"
+APP_PACKAGE = "app"
+
+_BASE64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+_MAPPING_URL = re.compile(r"[#@]\s*sourceMappingURL=(\S+)\s*$")
+
+
+def _vlq(segment: str, pos: int):
+    value = shift = 0
+    while True:
+        digit = _BASE64[segment[pos]]
+        pos += 1
+        value += (digit & 31) << shift
+        if not digit & 32:
+            break
+        shift += 5
+    return (-(value >> 1) if value & 1 else value >> 1), pos
+
+
+def find_source_map(chunk: Path, code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The map named by the chunk's sourceMappingURL comment, or <chunk>.map next to it."""
+    candidates = []
+    if code is not None:
+        m = _MAPPING_URL.search(code[-512:])
+        if m and not m.group(1).startswith("data:"):
+            candidates.append(chunk.parent / m.group(1))
+    candidates.append(chunk.with_name(chunk.name + ".map"))
+    for path in candidates:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and "mappings" in data and "sources" in data:
+            return data
+    return None
+
+
+def source_paths(source_map: Dict[str, Any], base_dir: str, project_root: str) -> List[str]:
+    """Map sources as project-relative paths (virtual modules keep their id)."""
+    root = os.path.abspath(project_root)
+    source_root = source_map.get("sourceRoot") or ""
+    paths = []
+    for source in source_map["sources"]:
+        source = source or ""
+        if source.startswith(("\0", "\x00")) or source.startswith("vite/") or "://" in source:
+            paths.append(source.lstrip("\0"))
+            continue
+        full = os.path.normpath(os.path.join(base_dir, source_root, source))
+        rel = os.path.relpath(full, root)
+        paths.append(rel.replace(os.sep, "/") if not rel.startswith("..") else source)
+    return paths
+
+
+def attribute_bytes(code: str, source_map: Dict[str, Any], base_dir: str = ".",
+                    project_root: str = ".") -> Dict[str, int]:
+    """UTF-8 bytes of `code` per original source, plus UNMAPPED for the rest."""
+    sources = source_paths(source_map, base_dir, project_root)
+    sizes: Dict[str, int] = {}
+    lines = code.split("\n")
+    source = 0
+    for line_no, group in enumerate(source_map["mappings"].split(";")):
+        if line_no >= len(lines):
+            break
+        text = lines[line_no]
+        ascii_line = text.isascii()
+        spans = []  # (start column, source index or None)
+        column = 0
+        for segment in group.split(","):
+            if not segment:
+                continue
+            delta, pos = _vlq(segment, 0)
+            column += delta
+            if pos < len(segment):
+                delta, _ = _vlq(segment, pos)
+                source += delta
+                spans.append((column, source))
+            else:
+                spans.append((column, None))
+        end_of_line = len(text)
+        previous = 0
+        owner = None
+        for start, index in spans + [(end_of_line, None)]:
+            start = min(start, end_of_line)
+            if start > previous:
+                size = start - previous if ascii_line else len(text[previous:start].encode("utf-8"))
+                name = sources[owner] if owner is not None and owner < len(sources) else UNMAPPED
+                sizes[name] = sizes.get(name, 0) + size
+            previous = max(previous, start)
+            owner = index
+    newlines = len(lines) - 1
+    # Newlines and lines beyond the mappings
+    rest = sum(len(t.encode("utf-8")) for t in lines[len(source_map["mappings"].split(";")):])
+    if newlines or rest:
+        sizes[UNMAPPED] = sizes.get(UNMAPPED, 0) + newlines + rest
+    return sizes
+
+
+def package_of(path: str) -> str:
+    """npm package a source path belongs to; APP_PACKAGE for project code."""
+    marker = path.rfind("node_modules/")
+    if marker == -1:
+        return APP_PACKAGE
+    parts = path[marker + len("node_modules/"):].split("/")
+    if parts[0].startswith("@") and len(parts) > 1:
+        return f"{parts[0]}/{parts[1]}"
+    return parts[0]
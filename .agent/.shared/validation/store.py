@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Findings Store - Antigravity Kit
+================================
+
+Keeps every finding of a scan on disk instead of in the report, so reports
+can carry counters and a top-N while nothing is dropped:
+
+    with FindingStore("security_scan", project=path) as store:
+        for record in records:
+            store.add(record)          # False for a repeated (file, line, rule)
+    store.counts                       # {"total": .., "by_severity": {..}, "by_rule": {..}}
+
+    for record in query(FindingStore.records("security_scan"), min_severity="high", path="src/"):
+        ...
+
+The store is a JSON-lines file under .agent/.cache/findings/: a "run" header,
+one protocol finding per line (see results.py), and a closing "summary".
+Findings without a line are told apart by message as well. A run
+appends to a temporary file that replaces the previous run's only when the
+scan completes, so the last complete run stays queryable. From the shell:
+
+    python .agent/.shared/validation/store.py query security_scan --min-severity high --path src/
+    python .agent/.shared/validation/store.py stats security_scan
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+try:
+    from .filecache import CACHE_ROOT
+    from .results import SEVERITIES
+except ImportError:  # Run as a script: python .agent/.shared/validation/store.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from validation.filecache import CACHE_ROOT
+    from validation.results import SEVERITIES
+
+STORE_ROOT = CACHE_ROOT / "findings"
+
+
+def store_path(name: str) -> Path:
+    """A tool name ("security_scan") maps into STORE_ROOT; anything else is a path (.jsonl if no suffix)."""
+    path = Path(name)
+    if path.suffix:
+        return path
+    if len(path.parts) > 1:
+        return path.with_suffix(".jsonl")
+    return STORE_ROOT / f"{name}.jsonl"
+
+
+class FindingStore:
+    """One run's findings, appended as they arrive and deduplicated by (file, line, rule)."""
+
+    def __init__(self, tool: str, path: Optional[str] = None, project: Optional[str] = None):
+        self.tool = tool
+        self.path = store_path(path or tool)
+        self.project = project
+        self.counts: Dict[str, Any] = {"total": 0, "duplicates": 0,
+                                       "by_severity": {sev: 0 for sev in SEVERITIES}, "by_rule": {}}
+        self._seen = set()
+        self._file = None
+        self._tmp = None
+
+    def __enter__(self) -> "FindingStore":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(complete=exc_type is None)
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=self.path.stem, suffix=".tmp")
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._write({"type": "run", "tool": self.tool, "project": self.project,
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Append a protocol finding; False (and nothing written) if already stored."""
+        key = (record.get("file"), record.get("line"), record.get("rule"))
+        if key[1] is None:
+            key += (record.get("message"),)  # File- and project-level findings differ by message
+        if key in self._seen:
+            self.counts["duplicates"] += 1
+            return False
+        self._seen.add(key)
+        self.counts["total"] += 1
+        self.counts["by_severity"][record["severity"]] += 1
+        self.counts["by_rule"][record["rule"]] = self.counts["by_rule"].get(record["rule"], 0) + 1
+        self._write(record)
+        return True
+
+    def close(self, complete: bool = True) -> None:
+        """Finish the run: on success it replaces the previous one, otherwise it is discarded."""
+        if self._file is None:
+            return
+        if complete:
+            self._write({"type": "summary", "tool": self.tool, **self.counts})
+        self._file.close()
+        self._file = None
+        if complete:
+            os.replace(self._tmp, self.path)
+        else:
+            try:
+                os.unlink(self._tmp)
+            except OSError:
+                pass
+
+    @staticmethod
+    def records(name: Union[str, Path], kind: str = "finding") -> Iterator[Dict[str, Any]]:
+        """Stream the stored records of one type ("finding", "run" or "summary").
+
+        A Path is read as is (e.g. a store's own `path`); a string goes through store_path().
+        """
+        with open(name if isinstance(name, Path) else store_path(name), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == kind:
+                    yield record
+
+
+def query(records: Iterable[Dict[str, Any]], severity: Optional[Iterable[str]] = None,
+          min_severity: Optional[str] = None, path: Optional[str] = None,
+          rule: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Filter stored findings. path is a glob ("src/**/*.ts") or, without
+    wildcards, a prefix; rule matches as a substring.
+    """
+    wanted = set(severity or ())
+    if min_severity:
+        wanted |= set(SEVERITIES[:SEVERITIES.index(min_severity) + 1])
+    glob = path and any(ch in path for ch in "*?[")
+    for record in records:
+        if wanted and record["severity"] not in wanted:
+            continue
+        if path:
+            file = record.get("file") or ""
+            if not (fnmatch.fnmatch(file, path) if glob else file.startswith(path)):
+                continue
+        if rule and rule not in (record.get("rule") or ""):
+            continue
+        yield record
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query stored scan findings without re-scanning")
+    sub = parser.add_subparsers(dest="command", required=True)
+    q = sub.add_parser("query", help="List stored findings")
+    q.add_argument("store", help="Tool name (security_scan) or path to a store file")
+    q.add_argument("--severity", help="Comma-separated severities to include")
+    q.add_argument("--min-severity", choices=SEVERITIES, help="Include this severity and above")
+    q.add_argument("--path", help="File glob, or a path prefix")
+    q.add_argument("--rule", help="Substring of the rule id")
+    q.add_argument("--limit", type=int, help="Stop after N findings")
+    q.add_argument("--jsonl", action="store_true", help="Print protocol JSON lines")
+    s = sub.add_parser("stats", help="Show the stored run's header and counters")
+    s.add_argument("store", help="Tool name (security_scan) or path to a store file")
+    args = parser.parse_args(argv)
+    severities = None
+    if getattr(args, "severity", None):
+        severities = [s.strip() for s in args.severity.split(",") if s.strip()]
+        unknown = [s for s in severities if s not in SEVERITIES]
+        if unknown:
+            q.error(f"unknown severity {', '.join(unknown)} (choose from {', '.join(SEVERITIES)})")
+
+    if not store_path(args.store).is_file():
+        print(f"No stored findings at {store_path(args.store)}")
+        return 1
+    if args.command == "stats":
+        for kind in ("run", "summary"):
+            for record in FindingStore.records(args.store, kind):
+                print(json.dumps(record, indent=2))
+        return 0
+
+    shown = 0
+    for record in query(FindingStore.records(args.store), severities, args.min_severity,
+                        args.path, args.rule):
+        if args.limit is not None and shown >= args.limit:
+            break
+        shown += 1
+        if args.jsonl:
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            where = f"{record['file']}:{record['line']}" if record.get("line") else (record.get("file") or "-")
+            print(f"[{record['severity']}] {where} {record['rule']}: {record['message']}")
+    if not args.jsonl:
+        print(f"\n{shown} finding(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
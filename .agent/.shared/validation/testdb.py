@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test History - Antigravity Kit
+==============================
+
+Keeps every test run's per-test durations and outcomes in a local SQLite
+database, so runners can plan from history instead of starting cold:
+
+    with TestHistory() as history:
+        run_id = history.record(files, framework="vitest", tree=tree_state(project))
+        history.file_durations()         # {"src/a.test.ts": 1.9, ...}  median seconds, for sharding
+        history.slowest(5)               # [{"file", "name", "runs", "p50_ms", "p90_ms", "p95_ms"}, ...]
+        history.flaky(5)                 # [{"file", "name", "runs", "failures", "flake_rate", "flips", "same_tree"}, ...]
+
+`files` are the runner's per-file results: {"file", "status", "duration_s",
+"tests": [{"name", "status", "duration_ms"}]}. Statistics look at the last
+WINDOW runs of each test. Only outcome changes a code change cannot explain
+count as flips: between consecutive runs on one identical working tree, or,
+for runs recorded outside git, a pass->fail->pass (fail->pass->fail) bounce.
+A test fixed or broken by an edit is not flaky. The flake rate is flips per
+comparable pair of runs; "same_tree" marks a test that both passed and failed
+on one tree.
+The database lives at .agent/.cache/test_runner/history.sqlite3. From the shell:
+
+    python .agent/.shared/validation/testdb.py slowest --limit 10
+    python .agent/.shared/validation/testdb.py flaky
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .changes import git
+    from .filecache import CACHE_ROOT
+except ImportError:  # Run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from validation.changes import git
+    from validation.filecache import CACHE_ROOT
+
+DB_PATH = CACHE_ROOT / "test_runner" / "history.sqlite3"
+WINDOW = 20          # Recent runs per test that statistics look at
+KEEP_RUNS = 500      # Older runs are deleted
+MIN_RUNS = 3         # Runs needed before a test can be called flaky
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    framework TEXT,
+    tree TEXT,
+    passed INTEGER,
+    wall_s REAL
+);
+CREATE TABLE IF NOT EXISTS file_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file TEXT NOT NULL,
+    status TEXT,
+    duration_s REAL
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    duration_ms REAL
+);
+CREATE INDEX IF NOT EXISTS test_results_key ON test_results (file, name, run_id);
+CREATE INDEX IF NOT EXISTS file_results_key ON file_results (file, run_id);
+"""
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (no interpolation); None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def tree_state(project_root: str) -> Optional[str]:
+    """Hash of HEAD plus the uncommitted diff: runs with equal values ran the same code."""
+    head = git(project_root, "rev-parse", "HEAD")
+    if head is None:
+        return None
+    digest = hashlib.sha1(head.encode())
+    digest.update((git(project_root, "diff", "HEAD") or "").encode())
+    return digest.hexdigest()
+
+
+class TestHistory:
+    """Per-test durations and outcomes across runs, in SQLite."""
+
+    def __init__(self, path: Path = DB_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), timeout=30)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "TestHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def record(self, files: Iterable[Dict[str, Any]], framework: Optional[str] = None,
+               tree: Optional[str] = None, passed: Optional[bool] = None,
+               wall_s: Optional[float] = None) -> int:
+        """Store one run; returns its id."""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started, framework, tree, passed, wall_s) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), framework, tree,
+                 None if passed is None else int(passed), wall_s))
+            run_id = cur.lastrowid
+            for f in files:
+                self.conn.execute("INSERT INTO file_results VALUES (?, ?, ?, ?)",
+                                  (run_id, f["file"], f.get("status"), f.get("duration_s")))
+                self.conn.executemany("INSERT INTO test_results VALUES (?, ?, ?, ?, ?)",
+                                      [(run_id, f["file"], t["name"], t.get("status"), t.get("duration_ms"))
+                                       for t in f.get("tests", [])])
+            self.conn.execute("DELETE FROM runs WHERE id <= ?", (run_id - KEEP_RUNS,))
+        return run_id
+
+    def file_durations(self) -> Dict[str, float]:
+        """Median seconds per test file over its recent runs."""
+        rows = self.conn.execute(
+            "SELECT file, duration_s FROM file_results WHERE duration_s IS NOT NULL ORDER BY run_id DESC")
+        per_file: Dict[str, List[float]] = {}
+        for file, seconds in rows:
+            durations = per_file.setdefault(file, [])
+            if len(durations) < WINDOW:
+                durations.append(seconds)
+        return {file: statistics.median(values) for file, values in per_file.items()}
+
+    def _tests(self) -> Dict[tuple, List[tuple]]:
+        """(file, name) -> recent (status, duration_ms, tree) rows, oldest first."""
+        rows = self.conn.execute(
+            "SELECT t.file, t.name, t.status, t.duration_ms, r.tree FROM test_results t "
+            "JOIN runs r ON r.id = t.run_id ORDER BY t.run_id DESC")
+        per_test: Dict[tuple, List[tuple]] = {}
+        for file, name, status, duration, tree in rows:
+            history = per_test.setdefault((file, name), [])
+            if len(history) < WINDOW:
+                history.append((status, duration, tree))
+        return {key: history[::-1] for key, history in per_test.items()}
+
+    def test_stats(self) -> List[Dict[str, Any]]:
+        """Duration percentiles and flake rate of every test with history."""
+        stats = []
+        for (file, name), history in self._tests().items():
+            durations = [d for _, d, _ in history if d is not None]
+            outcomes = [(s, tree) for s, _, tree in history if s in ("passed", "failed")]
+            by_tree: Dict[str, List[str]] = {}
+            untracked: List[str] = []
+            for status, tree in outcomes:
+                (by_tree.setdefault(tree, []) if tree else untracked).append(status)
+            flips = sum(a != b for seq in by_tree.values() for a, b in zip(seq, seq[1:]))
+            flips += sum(a != b and a == c for a, b, c in zip(untracked, untracked[1:], untracked[2:]))
+            pairs = sum(len(seq) - 1 for seq in by_tree.values()) + max(0, len(untracked) - 2)
+            stats.append({
+                "file": file,
+                "name": name,
+                "runs": len(history),
+                "failures": sum(s == "failed" for s, _ in outcomes),
+                "p50_ms": percentile(durations, 50),
+                "p90_ms": percentile(durations, 90),
+                "p95_ms": percentile(durations, 95),
+                "flips": flips,
+                "flake_rate": round(flips / pairs, 3) if pairs else 0.0,
+                "same_tree": any(len(set(seq)) > 1 for seq in by_tree.values()),
+            })
+        return stats
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        stats = [s for s in self.test_stats() if s["p90_ms"] is not None]
+        stats.sort(key=lambda s: s["p90_ms"], reverse=True)
+        return [{k: s[k] for k in ("file", "name", "runs", "p50_ms", "p90_ms", "p95_ms")} for s in stats[:limit]]
+
+    def flaky(self, limit: int = 10, min_runs: int = MIN_RUNS) -> List[Dict[str, Any]]:
+        """Tests whose outcome flipped without a code change, most erratic first (same-tree flips first)."""
+        stats = [s for s in self.test_stats() if s["runs"] >= min_runs and s["flips"]]
+        stats.sort(key=lambda s: (s["same_tree"], s["flake_rate"], s["runs"]), reverse=True)
+        return [{k: s[k] for k in ("file", "name", "runs", "failures", "flake_rate", "flips", "same_tree")}
+                for s in stats[:limit]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query the test duration/outcome history")
+    parser.add_argument("command", choices=("slowest", "flaky", "files"))
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--db", default=str(DB_PATH), help="History database")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(json.dumps({"error": f"No test history at {args.db}"}))
+        return 1
+    with TestHistory(Path(args.db)) as history:
+        if args.command == "slowest":
+            data: Any = history.slowest(args.limit)
+        elif args.command == "flaky":
+            data = history.flaky(args.limit)
+        else:
+            data = history.file_durations()
+    print(json.dumps(data, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,25 +5,55 @@ Auto Preview - Antigravity Kit
 Manages (start/stop/status) the local development server for previewing the application.
 
 Usage:
-    python .agent/scripts/auto_preview.py start [port]
-    python .agent/scripts/auto_preview.py stop
-    python .agent/scripts/auto_preview.py status
+    python .agent/scripts/auto_preview.py start [port] [--mode dev|preview] [--json]
+    python .agent/scripts/auto_preview.py stop [port | --all]
+    python .agent/scripts/auto_preview.py status [--json]
+
+`start` returns once the server answers over HTTP, and reuses a server
+already running on the port, so repeated checklist/verify runs skip the cold
+start. Each port runs its own server, so parallel audits can use several at
+once; they are tracked in .agent/preview-servers.json (.agent/preview.pid
+keeps the PID of the last one started, for older tooling).
+
+Modes: "dev" runs the dev server (vite, or the package's dev/start script),
+"preview" serves the production build in dist/ with `vite preview`, and
+"auto" (default) picks preview when dist/ exists.
 """
 
 import os
 import sys
 import json
+import time
+import shutil
 import signal
 import argparse
+import tempfile
 import subprocess
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
-AGENT_DIR = Path(".agent")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from validation.preview import wait_for_url  # noqa: E402
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+AGENT_DIR = Path(__file__).resolve().parents[1]
 PID_FILE = AGENT_DIR / "preview.pid"
 LOG_FILE = AGENT_DIR / "preview.log"
+STATE_FILE = AGENT_DIR / "preview-servers.json"
+LOCK_FILE = AGENT_DIR / "preview-servers.lock"
+DEFAULT_PORT = 3000
+READY_TIMEOUT = 90
+MODES = ("auto", "dev", "preview")
+RELEASE_TIMEOUT = 15  # Seconds for a stopped server to let go of its port
 
 def get_project_root():
-    return Path(".").resolve()
+    return AGENT_DIR.parent
 
 def is_running(pid):
     try:
@@ -32,99 +62,280 @@ def is_running(pid):
     except OSError:
         return False
 
-def get_start_command(root):
+def log_file(port):
+    return LOG_FILE if port == DEFAULT_PORT else AGENT_DIR / f"preview-{port}.log"
+
+def server_url(port):
+    return f"http://localhost:{port}"
+
+def load_state():
+    try:
+        state = json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    # Forget servers whose process is gone
+    return {port: s for port, s in state.items() if is_running(s.get("pid", -1))}
+
+def save_state(state):
+    # Unique temp name: concurrent starts must not write into each other's file
+    fd, tmp = tempfile.mkstemp(dir=str(AGENT_DIR), prefix="preview-servers-", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(json.dumps(state, indent=2))
+    os.replace(tmp, STATE_FILE)
+
+@contextmanager
+def locked_state():
+    """
+    Fresh load-modify-save of the server state under an exclusive lock, so
+    starts and stops on other ports (parallel audits) are never lost. The
+    state is saved only if the block completes.
+    """
+    with open(LOCK_FILE, "a+") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            state = load_state()
+            yield state
+            save_state(state)
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+def wait_until_released(url, timeout=RELEASE_TIMEOUT):
+    """Wait for a stopped server to stop answering, so the port is free again."""
+    deadline = time.monotonic() + timeout
+    while wait_for_url(url, timeout=0):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.25)
+    return True
+
+def find_executable(root, name):
+    """Local node_modules/.bin first, then PATH (resolves npm.cmd & co. on Windows)."""
+    local = root / "node_modules" / ".bin" / (name + (".cmd" if sys.platform == "win32" else ""))
+    if local.exists():
+        return str(local)
+    return shutil.which(name)
+
+def uses_vite(root, data):
+    deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
+    return "vite" in deps or any(root.glob("vite.config.*"))
+
+def resolve_mode(root, mode):
+    if mode != "auto":
+        return mode
+    return "preview" if (root / "dist" / "index.html").exists() else "dev"
+
+def get_start_command(root, port, mode="dev"):
+    """Command to run (no shell) and extra environment, or (None, reason)."""
     pkg_file = root / "package.json"
     if not pkg_file.exists():
-        return None
-    
+        return None, "No package.json found"
+
     with open(pkg_file, 'r') as f:
         data = json.load(f)
-    
+
+    if uses_vite(root, data):
+        vite = find_executable(root, "vite")
+        if vite is None:
+            return None, "vite not found (run npm install)"
+        base = [vite]
+        if mode == "preview":
+            if not (root / "dist" / "index.html").exists():
+                return None, "No build in dist/ (run npm run build, or use --mode dev)"
+            return base + ["preview", "--port", str(port), "--strictPort"], {}
+        # --port on the command line wins over server.port in vite.config
+        return base + ["--port", str(port), "--strictPort"], {}
+
+    if mode == "preview":
+        return None, "--mode preview needs a Vite project"
     scripts = data.get("scripts", {})
+    npm = find_executable(root, "npm")
+    if npm is None:
+        return None, "npm not found"
     if "dev" in scripts:
-        return ["npm", "run", "dev"]
+        return [npm, "run", "dev"], {"PORT": str(port)}
     elif "start" in scripts:
-        return ["npm", "start"]
-    return None
+        return [npm, "start"], {"PORT": str(port)}
+    return None, "No 'dev' or 'start' script found in package.json"
 
-def start_server(port=3000):
-    if PID_FILE.exists():
-        try:
-            pid = int(PID_FILE.read_text().strip())
-            if is_running(pid):
-                print(f"⚠️  Preview already running (PID: {pid})")
-                return
-        except:
-            pass # Invalid PID file
+def kill_tree(pid):
+    """Stop the server and the processes it spawned (npm scripts run vite as a child)."""
+    if sys.platform == 'win32':
+        subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except OSError:
+        os.kill(pid, signal.SIGTERM)
 
+def report(result, as_json):
+    if as_json:
+        print(json.dumps(result))
+    elif result.get("error"):
+        print(f"❌ {result['error']}")
+
+def start_server(port=DEFAULT_PORT, mode="auto", timeout=READY_TIMEOUT, as_json=False):
     root = get_project_root()
-    cmd = get_start_command(root)
-    
+    mode = resolve_mode(root, mode)
+    url = server_url(port)
+    state = load_state()
+
+    current = state.get(str(port))
+    if current:
+        if current.get("mode") == mode and wait_for_url(url, timeout=timeout):
+            if not as_json:
+                print(f"♻️  Reusing {current['mode']} server on port {port} (PID: {current['pid']})")
+                print(f"   URL: {url}")
+            report({"url": url, "port": port, "pid": current["pid"], "mode": mode, "reused": True}, as_json)
+            return 0
+        with locked_state() as fresh:
+            stop_port(fresh, str(port), quiet=as_json)
+        if not wait_until_released(url):
+            report({"error": f"Port {port} still answers after stopping the {current.get('mode')} server",
+                    "port": port}, as_json)
+            return 1
+    elif wait_for_url(url, timeout=0):
+        # Something we did not start (e.g. a manual npm run dev) already serves the port
+        if not as_json:
+            print(f"♻️  Port {port} is already serving; reusing it")
+        report({"url": url, "port": port, "pid": None, "mode": "external", "reused": True}, as_json)
+        return 0
+
+    cmd, extra = get_start_command(root, port, mode)
     if not cmd:
-        print("❌ No 'dev' or 'start' script found in package.json")
-        sys.exit(1)
-    
-    # Add port env var if needed (simple heuristic)
+        report({"error": extra, "port": port}, as_json)
+        return 1
+
     env = os.environ.copy()
-    env["PORT"] = str(port)
-    
-    print(f"🚀 Starting preview on port {port}...")
-    
-    with open(LOG_FILE, "w") as log:
+    env.update(extra)
+    log_path = log_file(port)
+    if not as_json:
+        print(f"🚀 Starting {mode} server on port {port}...")
+
+    with open(log_path, "w") as log:
         process = subprocess.Popen(
             cmd,
             cwd=str(root),
             stdout=log,
             stderr=log,
+            stdin=subprocess.DEVNULL,
             env=env,
-            shell=True # Required for npm on windows often, or consistent path handling
+            # Own process group, so stop takes the whole tree down
+            start_new_session=sys.platform != 'win32',
+            creationflags=getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
         )
-    
-    PID_FILE.write_text(str(process.pid))
-    print(f"✅ Preview started! (PID: {process.pid})")
-    print(f"   Logs: {LOG_FILE}")
-    print(f"   URL: http://localhost:{port}")
 
-def stop_server():
-    if not PID_FILE.exists():
-        print("ℹ️  No preview server found.")
-        return
+    # Ready once it answers over HTTP; give up if it exits first
+    deadline = time.monotonic() + timeout
+    ready = False
+    while time.monotonic() < deadline and process.poll() is None:
+        if wait_for_url(url, timeout=0):
+            ready = True
+            break
+        time.sleep(0.5)
+    if not ready:
+        if process.poll() is None:
+            reason = f"not ready after {timeout}s"
+            kill_tree(process.pid)
+        else:
+            reason = f"exited with code {process.returncode}"
+        report({"error": f"Server {reason}; see {log_path}", "port": port}, as_json)
+        return 1
 
+    with locked_state() as state:
+        state[str(port)] = {
+            "pid": process.pid,
+            "mode": mode,
+            "url": url,
+            "command": cmd,
+            "log": str(log_path),
+            "started": datetime.now().isoformat(timespec="seconds"),
+        }
+    PID_FILE.write_text(str(process.pid))
+    if as_json:
+        report({"url": url, "port": port, "pid": process.pid, "mode": mode, "reused": False}, True)
+    else:
+        print(f"✅ Preview ready! (PID: {process.pid})")
+        print(f"   Logs: {log_path}")
+        print(f"   URL: {url}")
+    return 0
+
+def stop_port(state, port, quiet=False):
+    server = state.pop(port, None)
+    if server is None:
+        return False
     try:
-        pid = int(PID_FILE.read_text().strip())
-        if is_running(pid):
-            # Try gentle kill first
-            os.kill(pid, signal.SIGTERM) if sys.platform != 'win32' else subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)])
-            print(f"🛑 Preview stopped (PID: {pid})")
-        else:
+        if is_running(server["pid"]):
+            kill_tree(server["pid"])
+            if not quiet:
+                print(f"🛑 Preview stopped on port {port} (PID: {server['pid']})")
+        elif not quiet:
             print("ℹ️  Process was not running.")
     except Exception as e:
         print(f"❌ Error stopping server: {e}")
-    finally:
-        if PID_FILE.exists():
-            PID_FILE.unlink()
+    return True
+
+def stop_server(port=None, stop_all=False):
+    with locked_state() as state:
+        _stop_server(state, port, stop_all)
 
-def status_server():
-    running = False
+def _stop_server(state, port, stop_all):
+    ports = list(state) if stop_all else [str(port)] if port else []
     pid = None
-    url = "Unknown"
-    
-    if PID_FILE.exists():
+
+    if not ports:
+        # Legacy single-server stop: the last server started (preview.pid)
         try:
             pid = int(PID_FILE.read_text().strip())
-            if is_running(pid):
-                running = True
-                # Heuristic for URL, strictly we should save it
-                url = "http://localhost:3000" 
-        except:
-            pass
-            
+        except (OSError, ValueError):
+            pid = None
+        ports = [p for p, s in state.items() if s["pid"] == pid]
+        if not ports and pid is not None and is_running(pid):
+            kill_tree(pid)
+            print(f"🛑 Preview stopped (PID: {pid})")
+            PID_FILE.unlink()
+            return
+    if not ports:
+        print("ℹ️  No preview server found.")
+        if pid is not None and PID_FILE.exists():
+            PID_FILE.unlink()
+        return
+
+    for p in ports:
+        if not stop_port(state, p):
+            print(f"ℹ️  No preview server on port {p}.")
+    if PID_FILE.exists():
+        try:
+            if not is_running(int(PID_FILE.read_text().strip())):
+                PID_FILE.unlink()
+        except (OSError, ValueError):
+            PID_FILE.unlink()
+
+def status_server(as_json=False):
+    state = load_state()
+    servers = []
+    for port, server in sorted(state.items(), key=lambda item: int(item[0])):
+        servers.append(dict(server, port=int(port), ready=wait_for_url(server["url"], timeout=0)))
+
+    if as_json:
+        print(json.dumps({"servers": servers}, indent=2))
+        return
+
     print("\n=== Preview Status ===")
-    if running:
-        print("✅ Status: Running")
-        print(f"🔢 PID: {pid}")
-        print(f"🌐 URL: {url} (Likely)")
-        print(f"📝 Logs: {LOG_FILE}")
+    if servers:
+        for server in servers:
+            print(f"✅ Status: Running ({server['mode']})" if server["ready"] else f"⏳ Status: Starting ({server['mode']})")
+            print(f"🔢 PID: {server['pid']}")
+            print(f"🌐 URL: {server['url']}")
+            print(f"📝 Logs: {server['log']}")
     else:
         print("⚪ Status: Stopped")
     print("===================\n")
@@ -132,16 +343,21 @@ def status_server():
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("action", choices=["start", "stop", "status"])
-    parser.add_argument("port", nargs="?", default="3000")
-    
+    parser.add_argument("port", nargs="?", type=int)
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help="dev server, production build (vite preview over dist/), or auto")
+    parser.add_argument("--timeout", type=int, default=READY_TIMEOUT, help="Seconds to wait for readiness")
+    parser.add_argument("--all", action="store_true", help="Stop every tracked server")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+
     args = parser.parse_args()
-    
+
     if args.action == "start":
-        start_server(int(args.port))
+        sys.exit(start_server(args.port or DEFAULT_PORT, args.mode, args.timeout, args.json))
     elif args.action == "stop":
-        stop_server()
+        stop_server(args.port, args.all)
     elif args.action == "status":
-        status_server()
+        status_server(args.json)
 
 if __name__ == "__main__":
     main()
@@ -1,190 +1,232 @@
 #!/usr/bin/env python3
 """
 Script para detectar links quebrados e rotas não existentes no HoraMed
+
+As rotas são compiladas a partir de src/App.tsx, seguindo o AppShell, os
+módulos de rotas ({SaudeRoutes()}), <Route> aninhadas e páginas lazy, numa
+trie de segmentos; os links de src/ são indexados numa única passada por
+arquivo (ver .agent/.shared/validation/routes.py). O grafo fica em cache em
+.agent/.cache/routes/, então execuções seguintes só reanalisam arquivos
+alterados.
+
+Depois dos links quebrados, um passe de alcançabilidade parte das rotas de
+entrada ('/', '/auth', start_url do PWA e --entry) e dos links renderizados
+pelo shell, e lista rotas órfãs (nenhum link chega nelas) e páginas de
+src/pages sem rota, com o peso estimado no bundle: tamanho dos chunks em
+dist/ quando houver build, bytes do código-fonte caso contrário.
+
+Uso:
+    python .agent/scripts/check_broken_links.py [raiz_do_projeto]
+    python .agent/scripts/check_broken_links.py --who-links-to /planos
+    python .agent/scripts/check_broken_links.py --entry /convite --entry /compartilhar/:token
+    python .agent/scripts/check_broken_links.py --jsonl
 """
 
-import os
-import re
-from pathlib import Path
+import argparse
+import sys
 from collections import defaultdict
+from pathlib import Path
 
-def extract_routes_from_app_tsx(app_path):
-    """Extrai todas as rotas definidas em App.tsx"""
-    routes = set()
-    
-    with open(app_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    # Padrões para encontrar rotas
-    # <Route path="/rota" ...
-    route_pattern = r'<Route\s+path="([^"]+)"'
-    # <Navigate to="/rota" ...
-    navigate_pattern = r'<Navigate\s+to="([^"]+)"'
-    
-    for match in re.finditer(route_pattern, content):
-        route = match.group(1)
-        # Remove parâmetros dinâmicos
-        route = re.sub(r':[^/]+', ':param', route)
-        routes.add(route)
-    
-    for match in re.finditer(navigate_pattern, content):
-        route = match.group(1)
-        routes.add(route)
-    
-    return routes
-
-def find_navigation_links(src_path):
-    """Encontra todos os links de navegação no código"""
-    links = defaultdict(list)
-    
-    # Padrões para encontrar navegação
-    patterns = [
-        (r'to="(/[^"]*)"', 'Link to'),
-        (r'navigate\([\'"](/[^\'"]*)[\'"]', 'navigate()'),
-        (r'href="(/[^"]*)"', 'href'),
-    ]
-    
-    for root, dirs, files in os.walk(src_path):
-        # Ignorar node_modules e outros diretórios
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '.git', 'dist', 'build']]
-        
-        for file in files:
-            if file.endswith(('.tsx', '.ts', '.jsx', '.js')):
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, src_path)
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        line_num = 0
-                        for line in content.split('\n'):
-                            line_num += 1
-                            for pattern, link_type in patterns:
-                                for match in re.finditer(pattern, line):
-                                    route = match.group(1)
-                                    # Ignorar rotas externas e âncoras
-                                    if route.startswith('http') or route.startswith('#'):
-                                        continue
-                                    # Remover query strings e hashes
-                                    route = route.split('?')[0].split('#')[0]
-                                    # Remover parâmetros dinâmicos
-                                    route = re.sub(r'/[^/]+/[a-f0-9-]{36}', '/:param', route)
-                                    route = re.sub(r'/\d+', '/:param', route)
-                                    
-                                    links[route].append({
-                                        'file': rel_path,
-                                        'line': line_num,
-                                        'type': link_type,
-                                        'original': match.group(0)
-                                    })
-                except Exception as e:
-                    print(f"⚠️  Erro ao ler {rel_path}: {e}")
-    
-    return links
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from validation.results import ResultWriter  # noqa: E402
+from validation.dist import DistIndex  # noqa: E402
+from validation.routes import build_graph, default_entries, normalize_path  # noqa: E402
+
+# Rotas válidas mesmo que não apareçam na árvore de rotas
+EXCEPTIONS = {'/', '/auth', '/landing-preview'}
+
+
+def group_broken_links(graph):
+    """Links sem rota correspondente, agrupados pela rota normalizada"""
+    broken = defaultdict(list)
+    for link in graph.broken():
+        if link['route'] not in EXCEPTIONS:
+            broken[link['route']].append(link)
+    return broken
+
+
+def find_similar_route(link, graph):
+    """Sugere a rota definida mais parecida com o link"""
+    return graph.trie.suggest(link)
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+MEASURED = {"manifest": "dist/manifest", "file-name": "dist/chunk", "source": "código-fonte"}
+
+
+def report_dead_routes(graph, project_root, entries, writer=None):
+    """Rotas órfãs e páginas sem rota, com o peso estimado no bundle"""
+    reach = graph.reachability(entries)
+    build = DistIndex.load(project_root)
+    dead = graph.dead_weight(reach, build)
+
+    print("\n" + "=" * 80)
+    print("🧭 ROTAS ÓRFÃS (nenhum link ou rota de entrada chega nelas):")
+    print("=" * 80)
+    print(f"Entradas: {', '.join(entries)} + links do shell ({len(reach['shell'])} arquivos)")
+    print(f"Alcançáveis: {len(reach['reachable'])} de {len(graph.routes)} rotas\n")
+
+    orphans = [d for d in dead if d['kind'] == 'orphan-route']
+    pages = [d for d in dead if d['kind'] == 'unrouted-page']
+    for item in orphans:
+        if item['measured'] == 'shared':
+            weight = "módulo já usado por rota alcançável"
+        elif item['measured'] == 'inline':
+            weight = "elemento inline"
+        else:
+            weight = f"~{format_bytes(item['bytes'])} ({MEASURED[item['measured']]})"
+        module = f" → {item['module']}{' (lazy)' if item['lazy'] else ''}" if item['module'] else ""
+        print(f"• {item['path']}{module} - {weight}")
+        print(f"  {item['file']}:{item['line']}")
+    if not orphans:
+        print("✅ Nenhuma rota órfã")
 
-def normalize_route(route):
-    """Normaliza uma rota para comparação"""
-    # Remove trailing slash
-    if route != '/' and route.endswith('/'):
-        route = route[:-1]
-    # Substitui parâmetros dinâmicos
-    route = re.sub(r':[^/]+', ':param', route)
-    return route
+    print("\n📄 PÁGINAS SEM ROTA (src/pages):")
+    for item in pages:
+        if not item.get('bundled', True):
+            weight = f"fora do bundle, {format_bytes(item['source_bytes'])} de código-fonte"
+        else:
+            weight = f"~{format_bytes(item['bytes'])} ({MEASURED[item['measured']]})"
+        importers = f", importada por {len(item['imported_by'])} arquivo(s)" if item['imported_by'] else ""
+        print(f"• {item['file']} - {weight}{importers}")
+    if not pages:
+        print("✅ Todas as páginas têm rota alcançável")
 
-def check_broken_links(project_root):
+    # Rotas que compartilham a mesma página contam uma vez só
+    weights = {item.get('module') or item['file']: item['bytes'] for item in dead}
+    source = MEASURED[build.source] if build else MEASURED['source']
+    print(f"\n⚖️  Peso morto estimado: {format_bytes(sum(weights.values()))} ({source})")
+
+    if writer is not None:
+        for item in orphans:
+            writer.add("routes/orphan-route", "low", f"Nenhum link leva à rota {item['path']}",
+                       file=item['file'], line=item['line'], route=item['path'],
+                       module=item['module'], bytes=item['bytes'], measured=item['measured'])
+        for item in pages:
+            writer.add("routes/unrouted-page", "low", f"Página sem rota alcançável: {item['file']}",
+                       file=item['file'], imported_by=item['imported_by'],
+                       bytes=item['bytes'], measured=item['measured'])
+    return dead
+
+
+def check_broken_links(project_root, use_cache=True, writer=None, entries=None):
     """Verifica links quebrados no projeto"""
-    src_path = os.path.join(project_root, 'src')
-    app_tsx = os.path.join(src_path, 'App.tsx')
-    
     print("🔍 Analisando rotas e links do HoraMed...\n")
-    
-    # 1. Extrair rotas definidas
-    print("📋 Extraindo rotas definidas em App.tsx...")
-    defined_routes = extract_routes_from_app_tsx(app_tsx)
-    normalized_routes = {normalize_route(r) for r in defined_routes}
-    
-    print(f"✅ Encontradas {len(defined_routes)} rotas definidas\n")
-    
-    # 2. Encontrar todos os links de navegação
+
+    graph = build_graph(project_root, use_cache=use_cache)
+
+    # 1. Rotas definidas
+    print(f"📋 Extraindo rotas a partir de {graph.entry or 'src/App.tsx'}...")
+    route_files = sorted({r['file'] for r in graph.routes})
+    print(f"✅ Encontradas {len(graph.routes)} rotas definidas em {len(route_files)} arquivo(s)\n")
+
+    # 2. Links de navegação
     print("🔗 Procurando links de navegação no código...")
-    navigation_links = find_navigation_links(src_path)
-    
-    print(f"✅ Encontrados {len(navigation_links)} links únicos\n")
-    
-    # 3. Verificar links quebrados
+    unique_links = {link['route'] for link in graph.links}
+    print(f"✅ Encontrados {len(unique_links)} links únicos "
+          f"({graph.stats['link_files_scanned']} de {graph.stats['source_files']} arquivos reanalisados)\n")
+
+    # 3. Links quebrados
     print("=" * 80)
     print("🚨 LINKS QUEBRADOS ENCONTRADOS:")
     print("=" * 80)
-    
-    broken_links = []
-    
-    for link, occurrences in sorted(navigation_links.items()):
-        normalized_link = normalize_route(link)
-        
-        # Verificar se a rota existe
-        is_broken = normalized_link not in normalized_routes
-        
-        # Exceções: rotas que são válidas mas não estão em App.tsx
-        exceptions = ['/', '/auth', '/landing-preview']
-        if link in exceptions:
-            is_broken = False
-        
-        if is_broken:
-            broken_links.append((link, occurrences))
-            print(f"\n❌ Rota não encontrada: {link}")
-            print(f"   Normalizada: {normalized_link}")
-            print(f"   Ocorrências ({len(occurrences)}):")
-            for occ in occurrences[:5]:  # Mostrar apenas as primeiras 5
-                print(f"   • {occ['file']}:{occ['line']} - {occ['type']}")
-                print(f"     {occ['original']}")
-            if len(occurrences) > 5:
-                print(f"   ... e mais {len(occurrences) - 5} ocorrências")
-    
+
+    broken = group_broken_links(graph)
+    for route, occurrences in sorted(broken.items()):
+        print(f"\n❌ Rota não encontrada: {occurrences[0]['target']}")
+        print(f"   Normalizada: {route}")
+        print(f"   Ocorrências ({len(occurrences)}):")
+        for occ in occurrences[:5]:  # Mostrar apenas as primeiras 5
+            print(f"   • {occ['file']}:{occ['line']} - {occ['kind']}")
+            print(f"     {occ['target']}")
+        if len(occurrences) > 5:
+            print(f"   ... e mais {len(occurrences) - 5} ocorrências")
+        if writer is not None:
+            similar = find_similar_route(route, graph)
+            for occ in occurrences:
+                writer.add("routes/broken-link", "medium", f"Rota não encontrada: {occ['target']}",
+                           file=occ['file'], line=occ['line'], column=occ['column'],
+                           route=route, suggestion=similar)
+
     # 4. Resumo
     print("\n" + "=" * 80)
     print("📊 RESUMO:")
     print("=" * 80)
-    print(f"✅ Rotas definidas: {len(defined_routes)}")
-    print(f"🔗 Links únicos encontrados: {len(navigation_links)}")
-    print(f"❌ Links quebrados: {len(broken_links)}")
-    
-    if broken_links:
+    print(f"✅ Rotas definidas: {len(graph.routes)}")
+    print(f"🔗 Links únicos encontrados: {len(unique_links)}")
+    print(f"❌ Links quebrados: {len(broken)}")
+
+    if broken:
         print("\n🔧 AÇÕES RECOMENDADAS:")
         print("=" * 80)
-        for link, occurrences in broken_links:
-            print(f"\n• Corrigir rota: {link}")
-            # Sugerir rota similar
-            similar = find_similar_route(link, defined_routes)
+        for route in sorted(broken):
+            print(f"\n• Corrigir rota: {route}")
+            similar = find_similar_route(route, graph)
             if similar:
                 print(f"  Sugestão: {similar}")
     else:
         print("\n✅ Nenhum link quebrado encontrado!")
-    
-    return broken_links
-
-def find_similar_route(link, routes):
-    """Encontra rota similar usando distância de edição simples"""
-    link_parts = link.strip('/').split('/')
-    best_match = None
-    best_score = 0
-    
-    for route in routes:
-        route_parts = route.strip('/').split('/')
-        
-        # Calcular similaridade
-        common = set(link_parts) & set(route_parts)
-        if len(common) > best_score:
-            best_score = len(common)
-            best_match = route
-    
-    return best_match if best_score > 0 else None
+
+    entries = entries or sorted(set(default_entries(project_root)) | EXCEPTIONS)
+    report_dead_routes(graph, project_root, entries, writer)
+
+    return sorted(broken.items())
+
+
+def who_links_to(project_root, path, use_cache=True):
+    """Lista os links que levam à mesma rota que `path`"""
+    graph = build_graph(project_root, use_cache=use_cache)
+    route = graph.route_for(path)
+    if route is None:
+        print(f"⚠️  Nenhuma rota corresponde a {normalize_path(path)}")
+    else:
+        where = f"{route['file']}:{route['line']}"
+        target = f" → {route['redirect']}" if route.get('redirect') else ""
+        print(f"📍 Rota {route['path']}{target} ({where})")
+    links = graph.linking_to(path)
+    print(f"🔗 {len(links)} link(s):")
+    for link in sorted(links, key=lambda l: (l['file'], l['line'])):
+        print(f"   • {link['file']}:{link['line']} - {link['kind']}: {link['target']}")
+    return links
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detecta links quebrados e rotas inexistentes")
+    parser.add_argument("project_root", nargs="?", default=str(Path(__file__).resolve().parent.parent.parent),
+                        help="Raiz do projeto (padrão: a que contém .agent/)")
+    parser.add_argument("--who-links-to", metavar="ROTA", help="Lista quem aponta para ROTA e sai")
+    parser.add_argument("--entry", metavar="ROTA", action="append",
+                        help="Rota de entrada extra para a alcançabilidade (repetível)")
+    parser.add_argument("--no-cache", action="store_true", help="Reanalisa todos os arquivos")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    args = parser.parse_args()
+
+    if args.who_links_to:
+        who_links_to(args.project_root, args.who_links_to, use_cache=not args.no_cache)
+        return 0
+
+    writer = ResultWriter("check_broken_links", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+    writer.claim_stdout()
+    entries = sorted(set(default_entries(args.project_root)) | EXCEPTIONS | set(args.entry or ()))
+    broken = check_broken_links(args.project_root, use_cache=not args.no_cache, writer=writer,
+                                entries=entries)
+    summary = writer.finish(not broken, broken_routes=len(broken))
+    return 0 if summary["passed"] else 1
+
 
 if __name__ == "__main__":
-    # Detectar raiz do projeto
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.parent
-    
-    broken = check_broken_links(project_root)
-    
-    # Exit code
-    exit(1 if broken else 0)
+    sys.exit(main())
@@ -9,6 +9,17 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --preview          # ...against the local preview (kept warm)
+    python scripts/checklist.py . --no-cache         # Re-run every check
+    python scripts/checklist.py . --jsonl findings.jsonl  # Save merged findings
+    python scripts/checklist.py . --baseline .agent/baseline.json  # Fail only on new findings
+
+Every script is run with --jsonl and its findings are merged and deduplicated.
+Results are cached in .agent/.cache/checklist/, keyed by script content, the
+git state of the project and the URL, so unchanged checks are not re-run.
+Audits of a live URL are never cached: the served site can change while the
+repository does not. Neither is the test runner, whose every run adds to the
+test history that flaky-test detection relies on.
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -21,11 +32,32 @@ Priority Order:
 """
 
 import sys
+import json
+import hashlib
 import subprocess
 import argparse
 from pathlib import Path
 from typing import List, Optional
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from validation.preview import ensure_preview  # noqa: E402
+from validation.results import SEVERITIES, parse_records, dedupe  # noqa: E402
+
+CACHE_DIR = Path(".agent") / ".cache" / "checklist"
+SHARED_DIR = Path(__file__).resolve().parents[1] / ".shared" / "validation"
+
+# Scripts that understand --baseline/--update-baseline (fingerprint suppression)
+BASELINE_AWARE = {"security_scan.py", "ux_audit.py", "mobile_audit.py",
+                  "accessibility_checker.py", "seo_checker.py"}
+
+# Scripts whose result does not follow from the project's git state
+UNCACHED = {
+    "lighthouse_audit.py",    # Audits a live URL
+    "playwright_runner.py",   # Audits a live URL
+    "test_runner.py",         # Every run feeds the test history (flaky tests show on unchanged trees)
+}
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -88,23 +120,99 @@ def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def _git(project_path: str, *args: str) -> bytes:
+    try:
+        result = subprocess.run(["git", *args], cwd=project_path, capture_output=True, timeout=30)
+        return result.stdout if result.returncode == 0 else b""
+    except (OSError, subprocess.TimeoutExpired):
+        return b""
+
+def project_fingerprint(project_path: str) -> Optional[str]:
+    """
+    Hash of the project's git state: HEAD, the working tree diff and the
+    size/mtime of untracked files. None outside a git repo (no caching).
+    """
+    head = _git(project_path, "rev-parse", "HEAD")
+    if not head:
+        return None
+    digest = hashlib.sha256(head)
+    digest.update(_git(project_path, "diff", "HEAD", "--binary"))
+    status = _git(project_path, "status", "--porcelain", "-z", "--untracked-files=all")
+    digest.update(status)
+    for entry in status.split(b"\0"):
+        if entry.startswith(b"?? "):
+            path = Path(project_path) / entry[3:].decode("utf-8", "replace")
+            try:
+                st = path.stat()
+                digest.update(f"{path}:{st.st_size}:{st.st_mtime_ns}".encode())
+            except OSError:
+                continue
+    return digest.hexdigest()
+
+def cache_key(script_path: Path, fingerprint: Optional[str], url: Optional[str],
+              baseline: Optional[str] = None) -> Optional[str]:
+    if fingerprint is None or script_path.name in UNCACHED:
+        return None
+    digest = hashlib.sha256(script_path.read_bytes())
+    for helper in sorted(SHARED_DIR.glob("*.py")):
+        digest.update(helper.read_bytes())
+    digest.update(fingerprint.encode())
+    digest.update((url or "").encode())
+    if baseline and script_path.name in BASELINE_AWARE:
+        try:
+            digest.update(Path(baseline).read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+def load_cached(project_path: str, key: Optional[str]) -> Optional[dict]:
+    if key is None:
+        return None
+    path = Path(project_path) / CACHE_DIR / f"{key}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def store_cached(project_path: str, key: Optional[str], result: dict):
+    if key is None or result.get("skipped"):
+        return
+    cache_dir = Path(project_path) / CACHE_DIR
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{key}.json").write_text(json.dumps(result), encoding="utf-8")
+    except OSError:
+        pass  # Caching is best-effort
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               fingerprint: Optional[str] = None, baseline: Optional[str] = None) -> dict:
     """
     Run a validation script and capture results
     
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, skipped, findings, summary, cached
     """
     if not check_script_exists(script_path):
         print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "output": "", "skipped": True}
+        return {"name": name, "passed": True, "output": "", "skipped": True, "findings": []}
+    
+    key = cache_key(script_path, fingerprint, url, baseline)
+    cached = load_cached(project_path, key)
+    if cached is not None:
+        status = "PASSED" if cached["passed"] else "FAILED"
+        (print_success if cached["passed"] else print_error)(f"{name}: {status} (cached)")
+        cached["cached"] = True
+        return cached
     
     print_step(f"Running: {name}")
     
     # Build command
-    cmd = ["python", str(script_path), project_path]
+    cmd = [sys.executable, str(script_path), project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
         cmd.append(url)
+    cmd.append("--jsonl")
+    if baseline and script_path.name in BASELINE_AWARE:
+        cmd += ["--baseline", baseline]
     
     # Run script
     try:
@@ -118,29 +226,57 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         )
         
         passed = result.returncode == 0
+        records = parse_records(result.stdout)
+        findings = [r for r in records if r["type"] == "finding"]
+        summary = next((r for r in records if r["type"] == "summary"), None)
         
         if passed:
             print_success(f"{name}: PASSED")
         else:
             print_error(f"{name}: FAILED")
             if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+                print(f"  Error: {result.stderr[-200:]}")
         
-        return {
+        outcome = {
             "name": name,
             "passed": passed,
             "output": result.stdout,
             "error": result.stderr,
-            "skipped": False
+            "skipped": False,
+            "findings": findings,
+            "summary": summary,
         }
+        store_cached(project_path, key, outcome)
+        return outcome
     
     except subprocess.TimeoutExpired:
         print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False, "findings": []}
     
     except Exception as e:
         print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False, "findings": []}
+
+def collect_findings(results: List[dict]) -> List[dict]:
+    """Merge findings from every check, dropping duplicates."""
+    return dedupe(f for r in results for f in r.get("findings", []))
+
+def print_test_history(results: List[dict]):
+    """Slowest and flaky tests from test_runner's history, when it reported them"""
+    stats = {}
+    for r in results:
+        stats.update(((r.get("summary") or {}).get("stats") or {}))
+    if stats.get("slowest_tests"):
+        safe_print("🐢 Slowest tests (p90 over recent runs):", "Slowest tests (p90 over recent runs):")
+        for t in stats["slowest_tests"]:
+            print(f"   {t['p90_ms']:>8.0f} ms  {t['file']} > {t['name']}")
+        print()
+    if stats.get("flaky_tests"):
+        safe_print("🎲 Flaky tests:", "Flaky tests:")
+        for t in stats["flaky_tests"]:
+            same = ", same tree" if t["same_tree"] else ""
+            print(f"   {t['flake_rate']:>4.0%} flips  {t['file']} > {t['name']} ({t['failures']}/{t['runs']} failed{same})")
+        print()
 
 def print_summary(results: List[dict]):
     """Print final summary report"""
@@ -168,10 +304,22 @@ def print_summary(results: List[dict]):
             status_text = f"{Colors.RED}❌{Colors.ENDC}"
             status_fallback = f"{Colors.RED}[ERR]{Colors.ENDC}"
         
-        safe_print(f"{status_text} {r['name']}", f"{status_fallback} {r['name']}")
+        cached = " (cached)" if r.get("cached") else ""
+        safe_print(f"{status_text} {r['name']}{cached}", f"{status_fallback} {r['name']}{cached}")
     
     print()
     
+    findings = collect_findings(results)
+    if findings:
+        counts = {sev: 0 for sev in SEVERITIES}
+        for f in findings:
+            counts[f["severity"]] = counts.get(f["severity"], 0) + 1
+        breakdown = ", ".join(f"{sev}: {n}" for sev, n in counts.items() if n)
+        print(f"Findings: {len(findings)} ({breakdown})")
+        print()
+
+    print_test_history(results)
+
     if failed_count > 0:
         print_error(f"{failed_count} check(s) FAILED - Please fix before proceeding")
         return False
@@ -179,6 +327,16 @@ def print_summary(results: List[dict]):
         print_success("All checks PASSED ✨")
         return True
 
+def write_findings(path: Optional[str], results: List[dict]):
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        for finding in collect_findings(results):
+            f.write(json.dumps(finding, ensure_ascii=False) + "\n")
+        for r in results:
+            if r.get("summary"):
+                f.write(json.dumps(r["summary"], ensure_ascii=False) + "\n")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run Antigravity Kit validation checklist",
@@ -191,7 +349,13 @@ Examples:
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
+    parser.add_argument("--preview", nargs="?", const="auto", choices=("auto", "dev", "preview"),
+                        help="Start or reuse the local preview server and use it as --url (left running)")
+    parser.add_argument("--port", type=int, default=3000, help="Port for --preview")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results and re-run every check")
+    parser.add_argument("--jsonl", metavar="FILE", help="Write merged, deduplicated findings to FILE as JSON lines")
+    parser.add_argument("--baseline", metavar="FILE", help="Baseline of known findings; only new findings fail")
     
     args = parser.parse_args()
     
@@ -201,23 +365,31 @@ Examples:
         print_error(f"Project path does not exist: {project_path}")
         sys.exit(1)
     
+    if args.preview and not args.url and not args.skip_performance:
+        args.url, _ = ensure_preview(str(project_path), args.port, mode=args.preview)
+        if args.url is None:
+            print_warning(f"Preview did not start on port {args.port}; see .agent/preview*.log")
+    
     print_header("🚀 ANTIGRAVITY KIT - MASTER CHECKLIST")
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
+    fingerprint = None if args.no_cache else project_fingerprint(str(project_path))
+    baseline = str(Path(args.baseline).resolve()) if args.baseline else None
     results = []
     
     # Run core checks
     print_header("📋 CORE CHECKS")
     for name, script_path, required in CORE_CHECKS:
         script = project_path / script_path
-        result = run_script(name, script, str(project_path))
+        result = run_script(name, script, str(project_path), fingerprint=fingerprint, baseline=baseline)
         results.append(result)
         
         # If required check fails, stop
         if required and not result["passed"] and not result.get("skipped"):
             print_error(f"CRITICAL: {name} failed. Stopping checklist.")
             print_summary(results)
+            write_findings(args.jsonl, results)
             sys.exit(1)
     
     # Run performance checks if URL provided
@@ -225,11 +397,13 @@ Examples:
         print_header("⚡ PERFORMANCE CHECKS")
         for name, script_path, required in PERFORMANCE_CHECKS:
             script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
+            result = run_script(name, script, str(project_path), args.url, fingerprint=fingerprint,
+                                baseline=baseline)
             results.append(result)
     
     # Print summary
     all_passed = print_summary(results)
+    write_findings(args.jsonl, results)
     
     sys.exit(0 if all_passed else 1)
 
@@ -8,6 +8,7 @@ Use this before deployment or major releases.
 
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --preview [dev|preview]
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -29,6 +30,9 @@ from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from validation.preview import ensure_preview  # noqa: E402
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -268,10 +272,15 @@ def main():
 Examples:
   python scripts/verify_all.py . --url http://localhost:3000
   python scripts/verify_all.py . --url https://staging.example.com --no-e2e
+  python scripts/verify_all.py . --preview preview   # vite preview over dist/, reused across runs
         """
     )
     parser.add_argument("project", help="Project path to validate")
-    parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="URL for performance & E2E checks")
+    target.add_argument("--preview", nargs="?", const="auto", choices=("auto", "dev", "preview"),
+                        help="Start or reuse the local preview server (auto_preview.py) and test it")
+    parser.add_argument("--port", type=int, default=3000, help="Port for --preview")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
     
@@ -283,6 +292,13 @@ Examples:
         print_error(f"Project path does not exist: {project_path}")
         sys.exit(1)
     
+    if args.preview:
+        # Left running afterwards, so the next run skips the cold start
+        args.url, _ = ensure_preview(str(project_path), args.port, mode=args.preview)
+        if args.url is None:
+            print_error(f"Preview did not start on port {args.port}; see .agent/preview*.log")
+            sys.exit(1)
+    
     print_header("🚀 ANTIGRAVITY KIT - FULL VERIFICATION SUITE")
     print(f"Project: {project_path}")
     print(f"URL: {args.url}")
@@ -8,6 +8,10 @@ import json
 import re
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -162,6 +166,9 @@ def check_api_code(file_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
+    is_jsonl = "--jsonl" in sys.argv
+    writer = ResultWriter("api_validator", enabled=is_jsonl)
+    writer.claim_stdout()
     
     print("\n" + "=" * 60)
     print("  API VALIDATOR - Endpoint Best Practices Check")
@@ -172,6 +179,7 @@ def main():
     if not api_files:
         print("[!] No API files found.")
         print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
+        writer.finish(True, files_checked=0)
         sys.exit(0)
     
     results = []
@@ -195,11 +203,17 @@ def main():
             print(f"   {item}")
             if item.startswith("[X]"):
                 total_issues += 1
+            # "[X] GET /users: No responses defined" -> rule api/no-responses-defined
+            message = item[4:]
+            label = re.sub(r'^[A-Z]+ \S+: ', '', message).split(':')[0]
+            writer.add(f"api/{slugify(label)}", "high" if item.startswith("[X]") else "medium",
+                       message, file=str(result['file']))
     
     print("\n" + "=" * 60)
     print(f"[RESULTS] {total_passed} passed, {total_issues} critical issues")
     print("=" * 60)
     
+    writer.finish(total_issues == 0, files_checked=len(results))
     if total_issues == 0:
         print("[OK] API validation passed")
         sys.exit(0)
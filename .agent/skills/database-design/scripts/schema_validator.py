@@ -19,6 +19,11 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+from validation.scan import BudgetExceeded, FileScan, ScanGuard, finish_guard  # noqa: E402
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -44,15 +49,17 @@ def find_schema_files(project_path: Path) -> list:
     return schemas[:10]  # Limit
 
 
-def validate_prisma_schema(file_path: Path) -> list:
+def validate_prisma_schema(file_path: Path, guard: ScanGuard = None) -> list:
     """Validate Prisma schema file."""
     issues = []
     
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
+        scan = FileScan(content, name=file_path.name, guard=guard)
         
         # Find all models
-        models = re.findall(r'model\s+(\w+)\s*{([^}]+)}', content, re.DOTALL)
+        scan.rule("prisma-models")
+        models = scan.findall(r'model\s+(\w+)\s*{([^}]+)}', re.DOTALL)
         
         for model_name, model_body in models:
             # Check naming convention (PascalCase)
@@ -68,23 +75,27 @@ def validate_prisma_schema(file_path: Path) -> list:
                 issues.append(f"Model '{model_name}' missing createdAt field (recommended)")
             
             # Check for @relation without fields
-            relations = re.findall(r'@relation\([^)]*\)', model_body)
+            relations = scan.findall(r'@relation\([^)]*\)', text=model_body)
             for rel in relations:
                 if 'fields:' not in rel and 'references:' not in rel:
                     pass  # Implicit relation, ok
             
             # Check for @@index suggestions
-            foreign_keys = re.findall(r'(\w+Id)\s+\w+', model_body)
+            scan.rule("prisma-foreign-key-index")
+            foreign_keys = scan.findall(r'(\w+Id)\s+\w+', text=model_body)
             for fk in foreign_keys:
                 if f'@@index([{fk}])' not in content and f'@@index(["{fk}"])' not in content:
                     issues.append(f"Consider adding @@index([{fk}]) for better query performance in {model_name}")
         
         # Check for enum definitions
-        enums = re.findall(r'enum\s+(\w+)\s*{', content)
+        scan.rule("prisma-enums")
+        enums = scan.findall(r'enum\s+(\w+)\s*{')
         for enum_name in enums:
             if not enum_name[0].isupper():
                 issues.append(f"Enum '{enum_name}' should be PascalCase")
         
+    except BudgetExceeded:
+        pass  # Reported by the scan guard
     except Exception as e:
         issues.append(f"Error reading schema: {str(e)[:50]}")
     
@@ -93,6 +104,10 @@ def validate_prisma_schema(file_path: Path) -> list:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    is_jsonl = "--jsonl" in sys.argv
+    writer = ResultWriter("schema_validator", enabled=is_jsonl)
+    writer.claim_stdout()
+    guard = ScanGuard.from_argv()
     
     print(f"\n{'='*60}")
     print("[SCHEMA VALIDATOR] Database Schema Validation")
@@ -115,6 +130,7 @@ def main():
             "message": "No schema files found"
         }
         print(json.dumps(output, indent=2))
+        writer.finish(True, schemas_checked=0)
         sys.exit(0)
     
     # Validate each schema
@@ -124,7 +140,7 @@ def main():
         print(f"\nValidating: {file_path.name} ({schema_type})")
         
         if schema_type == 'prisma':
-            issues = validate_prisma_schema(file_path)
+            issues = validate_prisma_schema(file_path, guard)
         else:
             issues = []  # Drizzle validation could be added
         
@@ -134,6 +150,9 @@ def main():
                 "type": schema_type,
                 "issues": issues
             })
+            for issue in issues:
+                writer.add(f"schema/{schema_type}/{slugify(issue)}", "low", issue,
+                           file=str(file_path.relative_to(project_path)))
     
     # Summary
     print("\n" + "="*60)
@@ -162,8 +181,12 @@ def main():
         "passed": passed,
         "issues": all_issues
     }
+    finish_guard(guard)
+    guard_stats = {"scan_guard": guard.to_dict()} if guard.eventful else {}
+    output.update(guard_stats)
     
     print("\n" + json.dumps(output, indent=2))
+    writer.finish(passed, schemas_checked=len(schemas), **guard_stats)
     
     sys.exit(0)
 
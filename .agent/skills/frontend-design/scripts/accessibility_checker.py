@@ -20,6 +20,11 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.jsx import parse_markup  # noqa: E402
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -38,7 +43,7 @@ def find_html_files(project_path: Path) -> list:
             if not any(skip in f.parts for skip in skip_dirs):
                 files.append(f)
     
-    return files[:50]
+    return files
 
 
 def check_accessibility(file_path: Path) -> list:
@@ -47,24 +52,26 @@ def check_accessibility(file_path: Path) -> list:
     
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
+        tree = parse_markup(content, file_path.name)
         
-        # Check for form inputs without labels
-        inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
-        for inp in inputs:
-            if 'type="hidden"' not in inp.lower():
-                if 'aria-label' not in inp.lower() and 'id=' not in inp.lower():
+        # Check for form inputs without labels (<Input> components included)
+        for inp in (e for e in tree.elements if e.tag.lower() == 'input'):
+            if (inp.attr('type') or '').lower() != 'hidden':
+                if not inp.has_attr('aria-label', 'aria-labelledby', 'id'):
                     issues.append("Input without label or aria-label")
                     break
         
         # Check for buttons without accessible text
-        buttons = re.findall(r'<button[^>]*>[^<]*</button>', content, re.IGNORECASE)
-        for btn in buttons:
-            # Check if button has text content or aria-label
-            if 'aria-label' not in btn.lower():
-                text = re.sub(r'<[^>]+>', '', btn)
-                if not text.strip():
-                    issues.append("Button without accessible text")
-                    break
+        for btn in tree.find('button'):
+            # Text, rendered expressions, or a labelled child (icon with alt/aria-label) all count
+            if btn.has_attr('aria-label', 'aria-labelledby', 'title'):
+                continue
+            if tree.text_of(btn).strip() or tree.is_dynamic(btn):
+                continue
+            if any(child.has_attr('alt', 'aria-label') for child in tree.descendants(btn)):
+                continue
+            issues.append("Button without accessible text")
+            break
         
         # Check for missing lang attribute
         if '<html' in content.lower() and 'lang=' not in content.lower():
@@ -95,10 +102,9 @@ def check_accessibility(file_path: Path) -> list:
         
         # Check for role usage
         if 'role="button"' in content.lower():
-            # Divs with role button should have tabindex
-            div_buttons = re.findall(r'<div[^>]*role="button"[^>]*>', content, re.IGNORECASE)
-            for div in div_buttons:
-                if 'tabindex' not in div.lower():
+            # Elements with role button should have tabindex
+            for element in tree.with_attr('role'):
+                if element.attr('role') == 'button' and element.tag != 'button' and not element.has_attr('tabindex'):
                     issues.append("role='button' without tabindex")
                     break
         
@@ -110,6 +116,8 @@ def check_accessibility(file_path: Path) -> list:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    writer = ResultWriter.from_argv("accessibility_checker")
+    writer.claim_stdout()
     
     print(f"\n{'='*60}")
     print("[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
@@ -132,6 +140,7 @@ def main():
             "message": "No HTML files found"
         }
         print(json.dumps(output, indent=2))
+        writer.finish(True, files_checked=0)
         sys.exit(0)
     
     # Check each file
@@ -144,6 +153,10 @@ def main():
                 "file": str(f.name),
                 "issues": issues
             })
+            for issue in issues:
+                severity = "low" if issue.startswith("Consider") else "medium"
+                writer.add(f"a11y/{slugify(issue)}", severity, issue,
+                           file=str(f.relative_to(project_path)))
     
     # Summary
     print("\n" + "="*60)
@@ -164,6 +177,8 @@ def main():
     total_issues = sum(len(item["issues"]) for item in all_issues)
     # Accessibility issues are important but not blocking
     passed = total_issues < 5  # Allow minor issues
+    summary = writer.finish(passed, files_checked=len(files), files_with_issues=len(all_issues))
+    passed = summary["passed"]  # With --baseline, only new issues count
     
     output = {
         "script": "accessibility_checker",
@@ -173,6 +188,9 @@ def main():
         "issues_found": total_issues,
         "passed": passed
     }
+    if "suppressed" in summary["stats"]:
+        output["new_issues"] = summary["stats"]["new"]
+        output["baseline_suppressed"] = summary["stats"]["suppressed"]
     
     print("\n" + json.dumps(output, indent=2))
     
@@ -95,161 +95,232 @@ import re
 import json
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.jsx import parse_markup  # noqa: E402
+from validation.results import ResultWriter, slugify  # noqa: E402
+from validation.scan import (  # noqa: E402
+    BudgetExceeded, FileScan, ScanGuard, finish_guard, finish_profile, profile_from_argv,
+)
+
 class UXAuditor:
-    def __init__(self):
+    def __init__(self, profiler=None, guard=None):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.findings = []  # Structured records behind the issue/warning strings
+        self.root = None  # Paths are reported relative to the audited directory
+        self.scan = None  # FileScan of the file being audited
+        self.profiler = profiler  # validation.scan.Profiler when --profile is set
+        self.guard = guard or ScanGuard()
     
+    def report_issue(self, tag: str, message: str, at=None) -> None:
+        self._report(self.issues, "high", tag, message, at)
+
+    def report_warning(self, tag: str, message: str, at=None) -> None:
+        self._report(self.warnings, "medium", tag, message, at)
+
+    def _report(self, bucket, severity: str, tag: str, message: str, at) -> None:
+        """
+        Record a finding in the current file. It is located at `at` (a match
+        or element) or else at the last match of the rule that raised it.
+        """
+        scan = self.scan
+        bucket.append(f"[{tag}] {scan.name}: {message}")
+        self.findings.append({"tag": tag, "severity": severity, "file": scan.name.replace("\\", "/"),
+                              "message": message, **scan.locate(at)})
+
     def audit_file(self, filepath: str) -> None:
+        try:
+            self._audit_file(filepath)
+        except BudgetExceeded:
+            pass  # Listed in the scan guard report; findings so far are kept
+
+    def _audit_file(self, filepath: str) -> None:
         try:
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
         except Exception:
             return
         
+        name = os.path.relpath(filepath, self.root) if self.root else os.path.basename(filepath)
+        scan = self.scan = FileScan(content, name=name, profiler=self.profiler, guard=self.guard)
+        if scan.skipped:
+            return  # Oversize or minified; listed in the scan guard report
+
         self.files_checked += 1
         filename = os.path.basename(filepath)
 
+        # Element tree for markup rules (empty for stylesheets)
+        scan.rule("parse-markup")
+        tree = parse_markup(content, filepath)
+
         # Pre-calculate common flags
-        has_long_text = bool(re.search(r'<p\b|<div[^>]*class=[^>]*text\b|<article\b|<span[^>]*text\b', content, re.IGNORECASE))
-        has_form = bool(re.search(r'<form\b|<input\b', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input\b|<select\b|<textarea\b|<option\b', content, re.IGNORECASE))
+        scan.rule("common-flags")
+        has_long_text = any(
+            e.tag in ('p', 'article') or (e.tag in ('div', 'span') and re.search(r'text\b', e.class_name))
+            for e in tree.elements
+        )
+        # Case-insensitive so <Form>, <Input> and <Select> components count too
+        has_form = any(e.tag.lower() in ('form', 'input') for e in tree.elements)
+        complex_elements = sum(1 for e in tree.elements if e.tag.lower() in ('input', 'select', 'textarea', 'option'))
 
         # --- 1. PSYCHOLOGY LAWS ---
         # Hick's Law (Exclude standard HTML <link> tags which are head metadata)
-        nav_items = len(re.findall(r'<NavLink\b|<Link\b|<a\s+href|classname="[^"]*nav-item', content))
+        scan.rule("hicks-law")
+        nav_links = [e for e in tree.elements
+                     if e.tag in ('NavLink', 'Link') or (e.tag == 'a' and e.has_attr('href'))
+                     or 'nav-item' in e.class_name]
+        nav_items = len(nav_links)
         if nav_items > 7 and not filename.endswith('.html'):
-            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
+            self.report_issue("Hick's Law", f"{nav_items} nav items (Max 7)", at=nav_links[7])
         
         # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
-            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
+        scan.rule("fitts-law")
+        if scan.search(r'height:\s*([0-3]\d)px') or scan.search(r'h-[1-9]\b|h-10\b'):
+            self.report_warning("Fitts' Law", "Small targets (< 44px)")
         
         # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
-            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
+        scan.rule("millers-law")
+        form_fields = sum(1 for e in tree.elements if e.tag.lower() in ('input', 'select', 'textarea'))
+        if form_fields > 7 and not scan.search(r'step|wizard|stage', re.IGNORECASE):
+            self.report_warning("Miller's Law", f"Complex form ({form_fields} fields)")
             
         # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
-            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
+        scan.rule("von-restorff")
+        if 'button' in content.lower() and not scan.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', re.IGNORECASE):
+            self.report_warning("Von Restorff", "No primary CTA")
 
         # Serial Position Effect - Important items at beginning/end
+        scan.rule("serial-position-effect")
         if nav_items > 3:
             # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
+            nav_content = [tree.text_of(e) for e in nav_links]
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
-                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.")
+                    self.report_warning("Serial Position", "Last nav item may not be important. Place key actions at start/end.", at=nav_links[-1])
 
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
         # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
+        scan.rule("visceral")
+        has_hero = bool(scan.search(r'hero|<h1|banner', re.IGNORECASE))
         if has_hero:
             # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
+            has_gradient = bool(scan.search(r'gradient|linear-gradient|radial-gradient'))
+            has_animation = bool(scan.search(r'@keyframes|transition:|animate-'))
             has_visual_interest = has_gradient or has_animation
 
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
+            if not has_visual_interest and not scan.search(r'background:|bg-'):
+                self.report_warning("Visceral", "Hero section lacks visual appeal. Consider gradients or subtle animations.")
 
         # Behavioral: Instant feedback and usability
+        scan.rule("behavioral")
         if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
+            has_feedback = scan.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', re.IGNORECASE)
+            has_state_change = scan.search(r'setState|useState|disabled|loading')
 
             if not has_feedback and not has_state_change:
-                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
+                self.report_warning("Behavioral", "Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
 
         # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
+        scan.rule("reflective")
+        has_reflective = bool(scan.search(r'about|story|mission|values|why we|our journey|testimonials', re.IGNORECASE))
         if has_long_text and not has_reflective:
-            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
+            self.report_warning("Reflective", "Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
 
         # --- 1.6 TRUST BUILDING (Enhanced) ---
 
         # Security signals
+        scan.rule("security-signals")
         if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
-                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
+            security_signals = scan.findall(r'ssl|secure|encrypt|lock|padlock|https', re.IGNORECASE)
+            if len(security_signals) == 0 and not scan.search(r'checkout|payment', re.IGNORECASE):
+                self.report_warning("Trust", "Form without security indicators. Add 'SSL Secure' or lock icon.")
 
         # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
+        scan.rule("social-proof-elements")
+        social_proof = scan.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', re.IGNORECASE)
         if len(social_proof) > 0:
             self.passed_count += 1
         else:
             if has_long_text:
-                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
+                self.report_warning("Trust", "No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
 
         # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
+        scan.rule("authority-indicators")
+        has_footer = bool(scan.search(r'footer|<footer', re.IGNORECASE))
         if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
+            authority = scan.findall(r'certif|award|media|press|featured|as seen in', re.IGNORECASE)
             if len(authority) == 0:
-                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
+                self.report_warning("Trust", "Footer lacks authority signals. Add certifications, awards, or media mentions.")
 
         # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
 
         # Progressive disclosure
+        scan.rule("progressive-disclosure")
         if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
+            has_progressive = scan.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', re.IGNORECASE)
             if not has_progressive:
-                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
+                self.report_warning("Cognitive Load", "Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
 
         # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
+        scan.rule("visual-noise")
+        has_many_colors = len(scan.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl')) > 15
+        has_many_borders = len(scan.findall(r'border:|border-')) > 10
         if has_many_colors and has_many_borders:
-            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
+            self.report_warning("Cognitive Load", "High visual noise detected. Many colors and borders increase cognitive load.")
 
         # Familiar patterns
+        scan.rule("familiar-patterns")
         if has_form:
-            has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
+            has_standard_labels = bool(scan.search(r'<label|placeholder|aria-label', re.IGNORECASE))
             if not has_standard_labels:
-                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
+                self.report_issue("Cognitive Load", "Form inputs without labels. Use <label> for accessibility and clarity.")
 
         # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
 
         # Smart defaults
+        scan.rule("smart-defaults")
         if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
+            has_defaults = bool(scan.search(r'checked|selected|default|value=["\'].*["\']'))
+            radio_inputs = len(scan.findall(r'type=["\']radio', re.IGNORECASE))
             if radio_inputs > 0 and not has_defaults:
-                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
+                self.report_warning("Persuasion", "Radio buttons without default selection. Pre-select recommended option.")
 
         # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
+        scan.rule("anchoring")
+        if scan.search(r'price|pricing|cost|\$\d+', re.IGNORECASE):
+            has_anchor = bool(scan.search(r'original|was|strike|del|save \d+%', re.IGNORECASE))
             if not has_anchor:
-                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
+                self.report_warning("Persuasion", "Prices without anchoring. Show original price to frame discount value.")
 
         # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
+        scan.rule("social-proof-live-indicators")
+        has_social = bool(scan.search(r'join|subscriber|member|user', re.IGNORECASE))
         if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
+            has_count = bool(scan.findall(r'\d+[+kmb]|\d+,\d+'))
             if not has_count:
-                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
+                self.report_warning("Persuasion", "Social proof without specific numbers. Use 'Join 10,000+' format.")
 
         # Progress indicators
+        scan.rule("progress-indicators")
         if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
+            has_progress = bool(scan.search(r'progress|step \d+|complete|%|bar', re.IGNORECASE))
             if complex_elements > 5 and not has_progress:
-                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
+                self.report_warning("Persuasion", "Long form without progress indicator. Add progress bar or 'Step X of Y'.")
 
         # --- 2. TYPOGRAPHY SYSTEM (Complete Coverage) ---
 
         # 2.1 Font Pairing - Too many font families
+        scan.rule("font-pairing")
         font_families = set()
         # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
+        font_faces = scan.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', re.IGNORECASE)
+        google_fonts = scan.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', re.IGNORECASE)
+        font_family_css = scan.findall(r'font-family:\s*([^;]+)', re.IGNORECASE)
 
         for font in font_faces:
             font_families.add(font.strip().lower())
@@ -264,40 +335,46 @@ class UXAuditor:
                 font_families.add(first_font.lower())
 
         if len(font_families) > 3:
-            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
+            self.report_issue("Typography", f"{len(font_families)} font families detected. Limit to 2-3 for cohesion.")
 
         # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
-            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
+        scan.rule("line-length")
+        if has_long_text and not scan.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch'):
+            self.report_warning("Typography", "No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
-            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
+        scan.rule("line-height")
+        text_elements = sum(1 for e in tree.elements
+                            if e.tag in ('p', 'span', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+                            or (e.tag == 'div' and 'text' in e.class_name))
+        if text_elements > 0 and not scan.search(r'leading-|line-height:'):
+            self.report_warning("Typography", "Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
 
         # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
+        if scan.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', re.IGNORECASE):
             # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
+            line_heights = scan.findall(r'(?:leading-|line-height:\s*)([\d.]+)')
             for lh in line_heights:
                 if float(lh) > 1.5:
-                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
+                    self.report_warning("Typography", f"Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
-                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
+        scan.rule("letter-spacing")
+        if scan.search(r'uppercase|text-transform:\s*uppercase', re.IGNORECASE):
+            if not scan.search(r'tracking-|letter-spacing:'):
+                self.report_warning("Typography", "Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
 
         # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
-                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
+        if scan.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx'):
+            if not scan.search(r'tracking-tight|letter-spacing:\s*-[0-9]'):
+                self.report_warning("Typography", "Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
 
         # 2.5 Weight and Emphasis - Contrast levels
         # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
+        scan.rule("weight-and-emphasis")
+        weights = scan.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', re.IGNORECASE)
         weight_values = []
         for w in weights:
             val = w[0] or w[1]
@@ -314,35 +391,38 @@ class UXAuditor:
         for i in range(len(weight_values) - 1):
             diff = abs(weight_values[i] - weight_values[i+1])
             if diff == 100:
-                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
+                self.report_warning("Typography", f"Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
 
         # Too many weight levels
         unique_weights = set(weight_values)
         if len(unique_weights) > 4:
-            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
+            self.report_warning("Typography", f"{len(unique_weights)} font weights. Limit to 3-4 per page.")
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
-            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
+        scan.rule("responsive-typography")
+        has_font_sizes = bool(scan.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)'))
+        if has_font_sizes and not scan.search(r'clamp\(|responsive:'):
+            self.report_warning("Typography", "Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
 
         # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
+        scan.rule("hierarchy")
+        headings = [e.tag for e in tree.find('h1', 'h2', 'h3', 'h4', 'h5', 'h6')]
         if headings:
             # Check for skipped levels (h1 -> h3)
             for i in range(len(headings) - 1):
                 curr = int(headings[i][1])
                 next_h = int(headings[i+1][1])
                 if next_h > curr + 1:
-                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
+                    self.report_warning("Typography", f"Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
 
             # Check if h1 exists for main content
             if 'h1' not in [h.lower() for h in headings] and has_long_text:
-                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
+                self.report_warning("Typography", "No h1 found. Each page should have one primary heading.")
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
+        scan.rule("modular-scale")
+        font_sizes = scan.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)')
         size_values = []
         for size, unit in font_sizes:
             if unit == 'rem' or unit == 'em':
@@ -362,319 +442,354 @@ class UXAuditor:
             common_ratios = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
             for ratio in ratios[:3]:  # Check first 3 ratios
                 if not any(abs(ratio - cr) < 0.05 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
+                    self.report_warning("Typography", f"Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
                     break
 
         # 2.9 Readability - Content chunking
         # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+        scan.rule("readability")
+        paragraphs = [tree.text_of(e) for e in tree.find('p') if e.text or tree.is_dynamic(e)]
         for p in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
-                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
+                self.report_warning("Typography", f"Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
+            subheadings = sum(1 for _ in tree.find('h2', 'h3', 'h4', 'h5', 'h6'))
             if subheadings == 0:
-                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
+                self.report_warning("Typography", "Long content without subheadings. Add h2/h3 to break up text.")
 
         # --- 3. VISUAL EFFECTS (visual-effects.md) ---
         
         # Glassmorphism Check
+        scan.rule("glassmorphism")
         if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
-                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
+            if not scan.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+'):
+                self.report_warning("Visual", "Blur used without semi-transparent background (Glassmorphism fail)")
         
         # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
+        scan.rule("gpu-acceleration")
+        if scan.search(r'@keyframes|transition:'):
+            expensive_props = scan.findall(r'width|height|top|left|right|bottom|margin|padding')
             if expensive_props:
-                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
+                self.report_warning("Performance", f"Animating expensive properties ({', '.join(sorted(set(expensive_props)))}). Use transform/opacity where possible.")
             
             # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
-                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
+            if not scan.search(r'prefers-reduced-motion'):
+                self.report_warning("Accessibility", "Animations found without prefers-reduced-motion check")
 
         # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        scan.rule("natural-shadows")
+        shadows = scan.findall(r'box-shadow:\s*([^;]+)')
         for shadow in shadows:
             # Check if natural (Y > X) or multiple layers
-            if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
-                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
+            if ',' not in shadow and not scan.search(r'\d+px\s+[1-9]\d*px', text=shadow): # Simple heuristic for Y-offset
+                 self.report_warning("Visual", "Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        scan.rule("neomorphism")
+        neo_shadows = scan.findall(r'box-shadow:\s*([^;]+)')
         for shadow in neo_shadows:
             # Neomorphism has two shadows: positive offset + negative offset
             if ',' in shadow and '-' in shadow:
                 # Check for inset pattern (pressed state)
                 if 'inset' in shadow:
-                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.")
+                    self.report_warning("Visual", "Neomorphism inset detected. Ensure adequate contrast for accessibility.")
 
         # --- 3.2 SHADOW HIERARCHY ---
         # Count shadow levels to check for elevation consistency
+        scan.rule("shadow-hierarchy")
         shadow_count = len(shadows)
         if shadow_count > 0:
             # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
+            opacities = scan.findall(r'rgba?\([^)]+,\s*([\d.]+)\)')
             shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
             if shadow_count >= 3 and len(shadow_opacities) > 0:
                 # Check if there's variety in shadow opacities for different elevations
                 unique_opacities = len(set(shadow_opacities))
                 if unique_opacities < 2:
-                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
+                    self.report_warning("Visual", "All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
+        scan.rule("gradient")
+        has_gradient = bool(scan.search(r'gradient|linear-gradient|radial-gradient|conic-gradient'))
         if has_gradient:
             # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
+            gradient_count = len(scan.findall(r'gradient', re.IGNORECASE))
             if gradient_count > 5:
-                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
+                self.report_warning("Visual", f"Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
         else:
             # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
+            if has_hero and not scan.search(r'background:|bg-'):
+                self.report_warning("Visual", "Hero section without visual interest. Consider gradient for depth.")
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
+        scan.rule("border-effects")
+        has_border = bool(scan.search(r'border:|border-'))
         if has_border:
             # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
+            border_count = len(scan.findall(r'border:'))
             if border_count > 8:
-                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
+                self.report_warning("Visual", f"Many border declarations ({border_count}). Simplify for cleaner look.")
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
+        scan.rule("glow-effects")
+        text_shadows = scan.findall(r'text-shadow:')
         for ts in text_shadows:
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
-                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
+                self.report_warning("Visual", "Text glow effect detected. Ensure readability is maintained.")
 
         # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
+        glow_shadows = scan.findall(r'box-shadow:\s*[^;]*0\s+0\s+')
         if len(glow_shadows) > 2:
-            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
+            self.report_warning("Visual", "Multiple glow effects detected. Use sparingly for emphasis only.")
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
+        scan.rule("overlay-techniques")
+        has_images = bool(scan.search(r'<img|background-image:|bg-\[url'))
         if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
+            has_overlay = bool(scan.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before'))
             if not has_overlay:
-                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
+                self.report_warning("Visual", "Text over image without overlay. Add gradient overlay for readability.")
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
+        scan.rule("will-change")
+        if scan.search(r'will-change:'):
+            will_change_props = scan.findall(r'will-change:\s*([^;]+)')
             for prop in will_change_props:
                 prop = prop.strip().lower()
                 if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
-                    self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
+                    self.report_issue("Performance", f"will-change on '{prop}' (layout property). Use only for transform/opacity.")
 
         # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
+        will_change_count = len(scan.findall(r'will-change:'))
         if will_change_count > 3:
-            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
+            self.report_warning("Performance", f"Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
 
         # --- 3.8 EFFECT SELECTION ---
         # Check for effect overuse (too many visual effects)
+        scan.rule("effect-selection")
         effect_count = (
             (1 if has_gradient else 0) +
             shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
+            len(scan.findall(r'backdrop-filter|blur\(')) +
+            len(scan.findall(r'text-shadow:'))
         )
         if effect_count > 10:
-            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
+            self.report_warning("Visual", f"Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
 
         # Check for static/flat design (no depth)
         if has_long_text and effect_count == 0:
-            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
+            self.report_warning("Visual", "Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
 
         # --- 4. COLOR SYSTEM (color-system.md) ---
 
         # 4.1 PURPLE BAN - Critical check from color-system.md
+        scan.rule("purple-ban")
         purple_hexes = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
                         '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
                         '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
                         'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
         for purple in purple_hexes:
             if purple.lower() in content.lower():
-                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
+                self.report_issue("Color", f"PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
                 break
 
         # 4.2 60-30-10 Rule check
         # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
+        scan.rule("60-30-10-rule")
+        color_hex_count = len(scan.findall(r'#[0-9a-fA-F]{3,6}'))
+        hsl_count = len(scan.findall(r'hsl\('))
         total_colors = color_hex_count + hsl_count
         if total_colors > 3:
             # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
+            bg_declarations = scan.findall(r'(?:background|bg-|bg\[)([^;}\s]+)')
+            text_declarations = scan.findall(r'(?:color|text-)([^;}\s]+)')
             if len(bg_declarations) > 0 and len(text_declarations) > 0:
                 # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
+                unique_hexes = set(scan.findall(r'#[0-9a-fA-F]{6}'))
                 if len(unique_hexes) > 5:
-                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
+                    self.report_warning("Color", f"{len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
+        scan.rule("color-scheme-pattern")
+        hsl_matches = scan.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)')
         if len(hsl_matches) >= 3:
             hues = [int(h) for h in hsl_matches]
             hue_range = max(hues) - min(hues)
             if hue_range < 10:
-                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
+                self.report_warning("Color", f"Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
-            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
+        scan.rule("dark-mode-compliance")
+        if scan.search(r'color:\s*#000000|#000\b'):
+            self.report_warning("Color", "Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
+        if scan.search(r'background:\s*#ffffff|#fff\b') and scan.search(r'dark:\s*|dark:'):
+            self.report_warning("Color", "Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
 
         # 4.5 WCAG Contrast Pattern Check
         # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
+        scan.rule("wcag-contrast-pattern")
+        light_bg_light_text = bool(scan.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]'))
+        dark_bg_dark_text = bool(scan.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]'))
         if light_bg_light_text or dark_bg_dark_text:
-            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
+            self.report_warning("Color", "Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
+        scan.rule("color-psychology-context")
+        has_blue = bool(scan.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}'))
+        has_food_context = bool(scan.search(r'restaurant|food|cooking|recipe|menu|dish|meal', re.IGNORECASE))
         if has_blue and has_food_context:
-            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
+            self.report_warning("Color", "Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
-            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
+        scan.rule("hsl-based-palette")
+        has_color_vars = bool(scan.search(r'--color-|color-|primary-|secondary-'))
+        if has_color_vars and not scan.search(r'hsl\('):
+            self.report_warning("Color", "Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
         # 5.1 Duration Appropriateness
         # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
+        scan.rule("duration-appropriateness")
+        durations = scan.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)')
         for duration, unit in durations:
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
-                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
+                self.report_warning("Animation", f"Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
             elif duration_ms > 1000 and 'transition' in content.lower():
-                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
+                self.report_warning("Animation", f"Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
-            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
-            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
+        scan.rule("easing-function-correctness")
+        if scan.search(r'ease-in\s+.*entry|fade-in.*ease-in'):
+            self.report_warning("Animation", "Entry animation with ease-in. Entry should use ease-out for snappy feel.")
+        if scan.search(r'ease-out\s+.*exit|fade-out.*ease-out'):
+            self.report_warning("Animation", "Exit animation with ease-out. Exit should use ease-in for natural feel.")
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
+        scan.rule("micro-interaction-feedback-patterns")
+        interactive_elements = len(scan.findall(r'<button|<a\s+href|onClick|@click'))
+        has_hover_focus = bool(scan.search(r'hover:|focus:|:hover|:focus'))
         if interactive_elements > 2 and not has_hover_focus:
-            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
+            self.report_warning("Animation", "Interactive elements without hover/focus states. Add micro-interactions for feedback.")
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
+        scan.rule("loading-state-indicators")
+        has_async = bool(scan.search(r'async|await|fetch|axios|loading|isLoading'))
+        has_loading_indicator = bool(scan.search(r'skeleton|spinner|progress|loading|<circle.*animate'))
         if has_async and not has_loading_indicator:
-            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
+            self.report_warning("Animation", "Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
+        scan.rule("page-transition-patterns")
+        has_routing = bool(scan.search(r'router|navigate|Link.*to|useHistory'))
+        has_page_transition = bool(scan.search(r'AnimatePresence|motion\.|transition.*page|fade.*route'))
         if has_routing and not has_page_transition:
-            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
+            self.report_warning("Animation", "Routing detected without page transitions. Consider fade/slide for context continuity.")
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
+        scan.rule("scroll-animation-performance")
+        has_scroll_anim = bool(scan.search(r'onScroll|scroll.*trigger|IntersectionObserver'))
         if has_scroll_anim:
             # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
-                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
+            if scan.search(r'onScroll.*[^\w](width|height|top|left)'):
+                self.report_issue("Animation", "Scroll handler animating layout properties. Use transform/opacity for 60fps.")
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
         # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
+        scan.rule("lottie-animation")
+        has_lottie = bool(scan.search(r'lottie|Lottie|@lottie-react'))
         if has_lottie:
             # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
+            has_lottie_fallback = bool(scan.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop'))
             if not has_lottie_fallback:
-                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
+                self.report_warning("Motion", "Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
 
         # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
+        scan.rule("gsap-memory-leak-risks")
+        has_gsap = bool(scan.search(r'gsap|ScrollTrigger|from\(.*gsap'))
         if has_gsap:
             # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
+            has_gsap_cleanup = bool(scan.search(r'kill\(|revert\(|useEffect.*return.*gsap'))
             if not has_gsap_cleanup:
-                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
+                self.report_issue("Motion", "GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
 
         # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
+        scan.rule("svg-animation-performance")
+        svg_animations = scan.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset')
         if len(svg_animations) > 3:
-            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
+            self.report_warning("Motion", "Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
 
         # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
+        scan.rule("3d-transform-performance")
+        has_3d_transform = bool(scan.search(r'transform3d|perspective\(|rotate3d|translate3d'))
         if has_3d_transform:
             # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
+            has_perspective_parent = bool(scan.search(r'perspective:\s*\d+px|perspective\s*\('))
             if not has_perspective_parent:
-                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
+                self.report_warning("Motion", "3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
 
             # Warn about mobile performance
-            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.")
+            self.report_warning("Motion", "3D transforms detected. Test on mobile; can impact performance on low-end devices.")
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
+        scan.rule("particle-effect-warnings")
+        has_particles = bool(scan.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js'))
         if has_particles:
-            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
+            self.report_warning("Motion", "Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
 
         # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
+        scan.rule("scroll-driven-animation-performance")
+        has_scroll_driven = bool(scan.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline'))
         if has_scroll_driven:
             # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
+            has_throttle = bool(scan.search(r'throttle|debounce|requestAnimationFrame'))
             if not has_throttle:
-                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
+                self.report_issue("Motion", "Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
+        scan.rule("motion-decision-tree")
         total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
+            len(scan.findall(r'@keyframes|transition:|animate-')) +
             (1 if has_lottie else 0) +
             (1 if has_gsap else 0)
         )
         if total_animations > 5:
             # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
+            functional_animations = len(scan.findall(r'hover:|focus:|disabled|loading|error|success'))
             if functional_animations < total_animations / 2:
-                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
+                self.report_warning("Motion", f"Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
 
         # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
-            self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
+        scan.rule("accessibility")
+        missing_alt = next((img for img in tree.find('img') if not img.has_attr('alt')), None)
+        if missing_alt is not None:
+            self.report_issue("Accessibility", "Missing img alt text", at=missing_alt)
 
     def audit_directory(self, directory: str) -> None:
+        self.root = directory
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
         for root, dirs, files in os.walk(directory):
             dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'android', 'ios', 'coverage'}]
@@ -688,43 +803,64 @@ class UXAuditor:
             "issues": self.issues,
             "warnings": self.warnings,
             "passed_checks": self.passed_count,
+            "findings": self.findings,
             "compliant": len(self.issues) == 0
         }
 
+    def write_results(self, writer: ResultWriter) -> None:
+        for finding in self.findings:
+            extra = {k: v for k, v in finding.items() if k not in ("tag", "severity", "message")}
+            writer.add(f"ux/{slugify(finding['tag'])}", finding["severity"], finding["message"], **extra)
+
 def main():
     if len(sys.argv) < 2:
         sys.exit(1)
     
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    writer = ResultWriter.from_argv("ux_audit")
     
-    auditor = UXAuditor()
+    profiler = profile_from_argv("ux_audit")
+    guard = ScanGuard.from_argv()
+    auditor = UXAuditor(profiler=profiler, guard=guard)
     if os.path.isfile(path):
         auditor.audit_file(path)
     else:
         auditor.audit_directory(path)
     
     report = auditor.get_report()
+    if profiler:
+        finish_profile(profiler)
+        report['profile'] = profiler.to_dict()
+    finish_guard(guard)
+    guard_stats = {'scan_guard': guard.to_dict()} if guard.eventful else {}
+    report.update(guard_stats)
+    auditor.write_results(writer)
+    summary = writer.finish(report['compliant'], files_checked=report['files_checked'],
+                            passed_checks=report['passed_checks'], **guard_stats)
     
-    if is_json:
-        print(json.dumps(report))
-    else:
-        # Use ASCII-safe output for Windows console compatibility
-        print(f"\n[UX AUDIT] {report['files_checked']} files checked")
-        print("-" * 50)
-        if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
-            for i in report['issues'][:10]:
-                print(f"  - {i}")
-        if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
-            for w in report['warnings'][:15]:
-                print(f"  - {w}")
-        print(f"[+] PASSED CHECKS: {report['passed_checks']}")
-        status = "PASS" if report['compliant'] else "FAIL"
-        print(f"STATUS: {status}")
-
-    sys.exit(0 if report['compliant'] else 1)
+    if not writer.enabled:
+        if is_json:
+            print(json.dumps(report))
+        else:
+            # Use ASCII-safe output for Windows console compatibility
+            print(f"\n[UX AUDIT] {report['files_checked']} files checked")
+            print("-" * 50)
+            if report['issues']:
+                print(f"[!] ISSUES ({len(report['issues'])}):")
+                for i in report['issues'][:10]:
+                    print(f"  - {i}")
+            if report['warnings']:
+                print(f"[*] WARNINGS ({len(report['warnings'])}):")
+                for w in report['warnings'][:15]:
+                    print(f"  - {w}")
+            print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+            if 'suppressed' in summary['stats']:
+                print(f"[=] BASELINE: {summary['stats']['new']} new, {summary['stats']['suppressed']} known (suppressed)")
+            status = "PASS" if summary['passed'] else "FAIL"
+            print(f"STATUS: {status}")
+
+    sys.exit(0 if summary['passed'] else 1)
 
 if __name__ == "__main__":
     main()
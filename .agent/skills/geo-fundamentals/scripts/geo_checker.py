@@ -21,6 +21,10 @@ import re
 import json
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -222,6 +226,9 @@ def check_page(file_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     target_path = Path(target).resolve()
+    is_jsonl = "--jsonl" in sys.argv
+    writer = ResultWriter("geo_checker", enabled=is_jsonl)
+    writer.claim_stdout()
     
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
@@ -238,6 +245,7 @@ def main():
         print("    Skipping: docs, tests, config files, node_modules")
         output = {"script": "geo_checker", "pages_found": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
+        writer.finish(True, pages_checked=0)
         sys.exit(0)
     
     print(f"Found {len(pages)} public pages to analyze\n")
@@ -247,6 +255,9 @@ def main():
     for page in pages:
         result = check_page(page)
         results.append(result)
+        for issue in result['issues']:
+            writer.add(f"geo/{slugify(issue)}", "low", issue,
+                       file=str(page.relative_to(target_path)))
     
     # Print results
     for result in results:
@@ -281,6 +292,7 @@ def main():
         "passed": avg_score >= 60
     }
     print("\n" + json.dumps(output, indent=2))
+    writer.finish(avg_score >= 60, pages_checked=len(results), average_score=round(avg_score))
     
     sys.exit(0 if avg_score >= 60 else 1)
 
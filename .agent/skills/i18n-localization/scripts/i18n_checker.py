@@ -8,6 +8,10 @@ import re
 import json
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -199,6 +203,9 @@ def check_hardcoded_strings(project_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
+    is_jsonl = "--jsonl" in sys.argv
+    writer = ResultWriter("i18n_checker", enabled=is_jsonl)
+    writer.claim_stdout()
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
@@ -229,6 +236,14 @@ def main():
     # Summary
     critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
     
+    for item in locale_result['issues'] + code_result['issues']:
+        if not item.startswith("["):
+            continue  # indented example lines belong to the issue above
+        message = item[4:]
+        writer.add(f"i18n/{slugify(message.split(':')[-1])}",
+                   "high" if item.startswith("[X]") else "medium", message)
+    writer.finish(critical_issues == 0, locale_files=len(locale_files))
+    
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] i18n CHECK: PASSED")
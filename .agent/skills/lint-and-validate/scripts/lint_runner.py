@@ -5,17 +5,40 @@ Runs appropriate linters based on project type.
 
 Usage:
     python lint_runner.py <project_path>
+    python lint_runner.py <project_path> --since main     # lint files changed since main
+    python lint_runner.py <project_path> --all            # lint every file
 
 Supports:
-    - Node.js: npm run lint, npx tsc --noEmit
-    - Python: ruff check, mypy
+    - Node.js: eslint --cache (changed files), tsc --incremental per tsconfig project
+    - Python: ruff check (changed files), mypy
+
+Linters run concurrently and their output is parsed into diagnostics
+(file, line, column, rule, message). ESLint only sees the files changed in
+the working tree (plus commits since --since); a change to the ESLint config
+or package.json lints everything. ESLint's cache and tsc's .tsbuildinfo
+files live in .agent/.cache/lint_runner/, so repeated runs only redo what
+changed. tsc checks each project a solution-style tsconfig.json references
+(a root config with "files": [] checks nothing on its own).
 """
 
+import argparse
+import json
+import os
+import re
+import shutil
 import subprocess
 import sys
-import json
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.changes import changed_files  # noqa: E402
+from validation.filecache import CACHE_ROOT  # noqa: E402
+from validation.results import ResultWriter  # noqa: E402
 
 # Fix Windows console encoding
 try:
@@ -23,6 +46,81 @@ try:
 except Exception:
     pass
 
+CACHE_DIR = CACHE_ROOT / "lint_runner"
+TIMEOUT = 300
+SHOW_PER_LINTER = 20
+ESLINT_SUFFIXES = (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts")
+ESLINT_CONFIGS = re.compile(r"^(?:eslint\.config\.[cm]?[jt]s|\.eslintrc(?:\.\w+)?|\.eslintignore|package\.json)$")
+
+# src/a.ts(12,5): error TS2322: Type 'x' is not assignable to type 'y'.
+TSC_DIAGNOSTIC = re.compile(r"^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\): (?P<sev>error|warning) (?P<code>TS\d+): (?P<msg>.*)$")
+# app.py:3:5: error: Name "x" is not defined  [name-defined]
+MYPY_DIAGNOSTIC = re.compile(r"^(?P<file>[^:]+):(?P<line>\d+):(?:(?P<col>\d+):)? (?P<sev>error|warning|note): (?P<msg>.*?)(?:  \[(?P<code>[\w-]+)\])?$")
+
+
+def _read_jsonc(path: Path) -> Optional[dict]:
+    """tsconfig-style JSON: comments and trailing commas allowed."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            j = i + 1
+            while j < n and text[j] != '"':
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i:j + 1])
+            i = j + 1
+        elif text.startswith("//", i):
+            i = text.find("\n", i) if "\n" in text[i:] else n
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+        else:
+            out.append(c)
+            i += 1
+    try:
+        return json.loads(re.sub(r",(\s*[}\]])", r"\1", "".join(out)))
+    except ValueError:
+        return None
+
+
+def find_binary(project_path: Path, name: str) -> Optional[str]:
+    """The project's own node_modules/.bin tool, else one on PATH."""
+    local = project_path / "node_modules" / ".bin" / (name + (".cmd" if sys.platform == "win32" else ""))
+    if local.exists():
+        return str(local)
+    return shutil.which(name)
+
+
+def tsc_projects(project_path: Path) -> List[Path]:
+    """tsconfig files to check: the references of a solution-style root, or the root itself."""
+    root = project_path / "tsconfig.json"
+    config = _read_jsonc(root) or {}
+    projects = []
+    for ref in config.get("references", []):
+        path = project_path / ref.get("path", "")
+        if path.is_dir():
+            path = path / "tsconfig.json"
+        if path.is_file():
+            projects.append(path)
+    if projects and config.get("files") == [] and not config.get("include"):
+        return projects
+    return [root] + projects
+
+
+def tsc_label(config: Path, project_path: Path) -> str:
+    """Project-relative path of a tsconfig, so referenced projects get distinct names."""
+    return Path(os.path.relpath(config, project_path)).as_posix()
+
+
+def tsc_buildinfo(label: str) -> Path:
+    """Per-project .tsbuildinfo: packages/a/tsconfig.json -> packages_a_tsconfig.tsbuildinfo."""
+    stem = label[:-len(".json")] if label.endswith(".json") else label
+    return CACHE_DIR / (re.sub(r"[^\w.-]+", "_", stem) + ".tsbuildinfo")
+
 
 def detect_project_type(project_path: Path) -> dict:
     """Detect project type and available linters."""
@@ -30,7 +128,7 @@ def detect_project_type(project_path: Path) -> dict:
         "type": "unknown",
         "linters": []
     }
-    
+
     # Node.js project
     package_json = project_path / "package.json"
     if package_json.exists():
@@ -39,84 +137,250 @@ def detect_project_type(project_path: Path) -> dict:
             pkg = json.loads(package_json.read_text(encoding='utf-8'))
             scripts = pkg.get("scripts", {})
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-            
-            # Check for lint script
-            if "lint" in scripts:
-                result["linters"].append({"name": "npm lint", "cmd": ["npm", "run", "lint"]})
-            elif "eslint" in deps:
-                result["linters"].append({"name": "eslint", "cmd": ["npx", "eslint", "."]})
-            
+
+            if "eslint" in deps:
+                major = re.search(r"\d+", deps["eslint"])
+                result["linters"].append({"name": "eslint", "kind": "eslint",
+                                          "major": int(major.group()) if major else None})
+            elif "lint" in scripts:
+                result["linters"].append({"name": "npm lint", "kind": "command", "cmd": ["npm", "run", "lint"]})
+
             # Check for TypeScript
             if "typescript" in deps or (project_path / "tsconfig.json").exists():
-                result["linters"].append({"name": "tsc", "cmd": ["npx", "tsc", "--noEmit"]})
-                
+                for config in tsc_projects(project_path):
+                    label = tsc_label(config, project_path)
+                    result["linters"].append({"name": f"tsc ({label})", "kind": "tsc", "config": config,
+                                              "buildinfo": tsc_buildinfo(label)})
+
         except Exception:
             pass
-    
+
     # Python project
     if (project_path / "pyproject.toml").exists() or (project_path / "requirements.txt").exists():
         result["type"] = "python"
-        
-        # Check for ruff
-        result["linters"].append({"name": "ruff", "cmd": ["ruff", "check", "."]})
-        
+        result["linters"].append({"name": "ruff", "kind": "ruff"})
+
         # Check for mypy
         if (project_path / "mypy.ini").exists() or (project_path / "pyproject.toml").exists():
-            result["linters"].append({"name": "mypy", "cmd": ["mypy", "."]})
-    
+            result["linters"].append({"name": "mypy", "kind": "mypy"})
+
     return result
 
 
-def run_linter(linter: dict, cwd: Path) -> dict:
+def _run(cmd: List[str], cwd: Path, timeout: int) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True,
+                          encoding='utf-8', errors='replace', timeout=timeout)
+
+
+def _relative(path: str, project_path: Path) -> str:
+    try:
+        return Path(path).resolve().relative_to(project_path).as_posix()
+    except ValueError:
+        return path.replace("\\", "/")
+
+
+def parse_eslint(output: str, project_path: Path) -> List[Dict[str, Any]]:
+    diagnostics = []
+    for entry in json.loads(output or "[]"):
+        for msg in entry.get("messages", []):
+            diagnostics.append({
+                "file": _relative(entry["filePath"], project_path),
+                "line": msg.get("line"),
+                "column": msg.get("column"),
+                "severity": "error" if msg.get("severity") == 2 else "warning",
+                "rule": msg.get("ruleId") or ("parse-error" if msg.get("fatal") else "eslint"),
+                "message": msg.get("message", ""),
+            })
+    return diagnostics
+
+
+def parse_tsc(output: str) -> List[Dict[str, Any]]:
+    """tsc --pretty false output; indented lines continue the previous message."""
+    diagnostics: List[Dict[str, Any]] = []
+    for line in output.splitlines():
+        m = TSC_DIAGNOSTIC.match(line)
+        if m:
+            diagnostics.append({
+                "file": m.group("file").replace("\\", "/"),
+                "line": int(m.group("line")),
+                "column": int(m.group("col")),
+                "severity": m.group("sev"),
+                "rule": m.group("code"),
+                "message": m.group("msg"),
+            })
+        elif line.startswith(" ") and diagnostics:
+            diagnostics[-1]["message"] += "\n" + line.strip()
+        elif line.startswith("error TS"):
+            code, _, msg = line[len("error "):].partition(": ")
+            diagnostics.append({"file": None, "line": None, "column": None,
+                                "severity": "error", "rule": code, "message": msg})
+    return diagnostics
+
+
+def parse_ruff(output: str, project_path: Path) -> List[Dict[str, Any]]:
+    return [{
+        "file": _relative(d["filename"], project_path),
+        "line": (d.get("location") or {}).get("row"),
+        "column": (d.get("location") or {}).get("column"),
+        "severity": "error",
+        "rule": d.get("code") or "ruff",
+        "message": d.get("message", ""),
+    } for d in json.loads(output or "[]")]
+
+
+def parse_mypy(output: str) -> List[Dict[str, Any]]:
+    diagnostics = []
+    for line in output.splitlines():
+        m = MYPY_DIAGNOSTIC.match(line)
+        if m and m.group("sev") != "note":
+            diagnostics.append({
+                "file": m.group("file").replace("\\", "/"),
+                "line": int(m.group("line")),
+                "column": int(m.group("col")) if m.group("col") else None,
+                "severity": m.group("sev"),
+                "rule": m.group("code") or "mypy",
+                "message": m.group("msg"),
+            })
+    return diagnostics
+
+
+def lint_targets(project_path: Path, suffixes: tuple, since: Optional[str], lint_all: bool) -> Optional[List[str]]:
+    """Files to lint (None = the whole project)."""
+    if lint_all:
+        return None
+    files = changed_files(str(project_path), since)
+    if files is None or any(ESLINT_CONFIGS.match(Path(f).name) for f in files):
+        return None
+    return [f for f in files if f.endswith(suffixes)]
+
+
+def run_linter(linter: dict, cwd: Path, targets: Optional[List[str]], timeout: int = TIMEOUT) -> dict:
     """Run a single linter and return results."""
     result = {
         "name": linter["name"],
         "passed": False,
-        "output": "",
+        "files": "all" if targets is None else len(targets),
+        "diagnostics": [],
         "error": ""
     }
-    
+    started = time.monotonic()
+    kind = linter["kind"]
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
     try:
-        proc = subprocess.run(
-            linter["cmd"],
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=120,
-            shell=True
-        )
-        
-        result["output"] = proc.stdout[:2000] if proc.stdout else ""
-        result["error"] = proc.stderr[:500] if proc.stderr else ""
-        result["passed"] = proc.returncode == 0
-        
+        if targets == [] and kind in ("eslint", "ruff"):
+            result["passed"] = True
+            result["skipped"] = "no changed files"
+            return result
+
+        if kind == "eslint":
+            binary = find_binary(cwd, "eslint")
+            if binary is None:
+                result["error"] = "eslint not installed (run npm install)"
+                return result
+            cmd = [binary, "--cache", "--cache-strategy", "content",
+                   "--cache-location", str(CACHE_DIR / "eslintcache"), "--format", "json"]
+            if targets:
+                if (linter.get("major") or 0) >= 9:
+                    cmd.append("--no-warn-ignored")
+                cmd += targets
+            else:
+                cmd.append(".")
+            proc = _run(cmd, cwd, timeout)
+            if proc.returncode not in (0, 1):
+                result["error"] = (proc.stderr or proc.stdout).strip()
+                return result
+            result["diagnostics"] = parse_eslint(proc.stdout, cwd)
+
+        elif kind == "tsc":
+            binary = find_binary(cwd, "tsc")
+            if binary is None:
+                result["error"] = "typescript not installed (run npm install)"
+                return result
+            config = linter["config"]
+            proc = _run([binary, "-p", str(config), "--noEmit", "--incremental",
+                         "--tsBuildInfoFile", str(linter["buildinfo"]), "--pretty", "false"], cwd, timeout)
+            result["diagnostics"] = parse_tsc(proc.stdout)
+            if proc.returncode and not result["diagnostics"]:
+                result["error"] = (proc.stderr or proc.stdout).strip()
+                return result
+
+        elif kind == "ruff":
+            binary = shutil.which("ruff")
+            if binary is None:
+                result["error"] = "Command not found: ruff"
+                return result
+            proc = _run([binary, "check", "--output-format", "json", "--exit-zero"] + (targets or ["."]),
+                        cwd, timeout)
+            result["diagnostics"] = parse_ruff(proc.stdout, cwd)
+
+        elif kind == "mypy":
+            binary = shutil.which("mypy")
+            if binary is None:
+                result["error"] = "Command not found: mypy"
+                return result
+            proc = _run([binary, ".", "--show-column-numbers", "--no-error-summary",
+                         "--cache-dir", str(CACHE_DIR / "mypy")], cwd, timeout)
+            result["diagnostics"] = parse_mypy(proc.stdout)
+            if proc.returncode and not result["diagnostics"]:
+                result["error"] = (proc.stderr or proc.stdout).strip()
+                return result
+
+        else:
+            proc = _run(linter["cmd"], cwd, timeout)
+            result["passed"] = proc.returncode == 0
+            if not result["passed"]:
+                result["error"] = (proc.stderr or proc.stdout).strip()
+            return result
+
+        result["passed"] = not any(d["severity"] == "error" for d in result["diagnostics"])
+
     except FileNotFoundError:
-        result["error"] = f"Command not found: {linter['cmd'][0]}"
+        result["error"] = f"Command not found: {linter.get('cmd', [kind])[0]}"
     except subprocess.TimeoutExpired:
-        result["error"] = "Timeout after 120s"
+        result["error"] = f"Timeout after {timeout}s"
+    except ValueError as e:
+        result["error"] = f"Unreadable {linter['name']} output: {e}"
     except Exception as e:
         result["error"] = str(e)
-    
+    finally:
+        result["duration_s"] = round(time.monotonic() - started, 2)
+
     return result
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
+    parser = argparse.ArgumentParser(description="Unified linting and type checking")
+    parser.add_argument("project_path", nargs="?", default=".")
+    parser.add_argument("--since", metavar="REF", help="Also lint files changed since REF (e.g. main)")
+    parser.add_argument("--all", action="store_true", help="Lint every file, not just changed ones")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT, help="Seconds per linter")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path).resolve()
+    writer = ResultWriter("lint_runner", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+    writer.claim_stdout()
+
     print(f"\n{'='*60}")
     print("[LINT RUNNER] Unified Linting")
     print(f"{'='*60}")
     print(f"Project: {project_path}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
+
     # Detect project type
     project_info = detect_project_type(project_path)
     print(f"Type: {project_info['type']}")
     print(f"Linters: {len(project_info['linters'])}")
     print("-"*60)
-    
+
     if not project_info["linters"]:
         print("No linters found for this project type.")
         output = {
@@ -128,45 +392,69 @@ def main():
             "message": "No linters configured"
         }
         print(json.dumps(output, indent=2))
+        writer.finish(True, linters=0)
         sys.exit(0)
-    
-    # Run each linter
-    results = []
+
+    suffixes = (".py",) if project_info["type"] == "python" else ESLINT_SUFFIXES
+    targets = lint_targets(project_path, suffixes, args.since, args.all)
+    scope = "all files" if targets is None else f"{len(targets)} changed file(s)"
+    print(f"Scope: {scope}")
+
+    # Run all linters at once; tsc is whole-program and ignores the file list
+    with ThreadPoolExecutor(max_workers=len(project_info["linters"])) as pool:
+        futures = [pool.submit(run_linter, linter, project_path,
+                               targets if linter["kind"] in ("eslint", "ruff") else None, args.timeout)
+                   for linter in project_info["linters"]]
+        results = [f.result() for f in futures]
+
     all_passed = True
-    
-    for linter in project_info["linters"]:
-        print(f"\nRunning: {linter['name']}...")
-        result = run_linter(linter, project_path)
-        results.append(result)
-        
-        if result["passed"]:
-            print(f"  [PASS] {linter['name']}")
+    for linter, result in zip(project_info["linters"], results):
+        diagnostics = result["diagnostics"]
+        errors = sum(d["severity"] == "error" for d in diagnostics)
+        if result.get("skipped"):
+            print(f"\n  [SKIP] {linter['name']} ({result['skipped']})")
+        elif result["passed"]:
+            print(f"\n  [PASS] {linter['name']} - {len(diagnostics) - errors} warning(s), {result['duration_s']}s")
         else:
-            print(f"  [FAIL] {linter['name']}")
+            print(f"\n  [FAIL] {linter['name']} - {errors} error(s), {len(diagnostics) - errors} warning(s), {result['duration_s']}s")
+            all_passed = False
             if result["error"]:
                 print(f"  Error: {result['error'][:200]}")
-            all_passed = False
-    
+                writer.add(f"lint/{linter['kind']}", "high", result["error"].splitlines()[0][:300])
+        for d in diagnostics[:SHOW_PER_LINTER]:
+            where = f"{d['file']}:{d['line']}:{d['column']}" if d["file"] else "(project)"
+            print(f"    {where} {d['severity']} {d['rule']}: {d['message'].splitlines()[0]}")
+        if len(diagnostics) > SHOW_PER_LINTER:
+            print(f"    ... and {len(diagnostics) - SHOW_PER_LINTER} more")
+        for d in diagnostics:
+            severity = ("high" if d["severity"] == "error" else "low") if linter["kind"] in ("tsc", "mypy") \
+                else ("medium" if d["severity"] == "error" else "low")
+            writer.add(f"{linter['kind']}/{d['rule']}", severity, d["message"],
+                       file=d["file"], line=d["line"], column=d["column"])
+
     # Summary
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
-    
+
     for r in results:
         icon = "[PASS]" if r["passed"] else "[FAIL]"
         print(f"{icon} {r['name']}")
-    
+
     output = {
         "script": "lint_runner",
         "project": str(project_path),
         "type": project_info["type"],
+        "scope": scope,
         "checks": results,
         "passed": all_passed
     }
-    
+
     print("\n" + json.dumps(output, indent=2))
-    
-    sys.exit(0 if all_passed else 1)
+    summary = writer.finish(all_passed, linters=len(results),
+                            diagnostics=sum(len(r["diagnostics"]) for r in results))
+
+    sys.exit(0 if summary["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,10 @@ import sys
 import re
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -127,6 +131,9 @@ def check_python_coverage(project_path: Path) -> dict:
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(target)
+    is_jsonl = "--jsonl" in sys.argv
+    writer = ResultWriter("type_coverage", enabled=is_jsonl)
+    writer.claim_stdout()
     
     print("\n" + "=" * 60)
     print("  TYPE COVERAGE CHECKER")
@@ -146,6 +153,7 @@ def main():
     
     if not results:
         print("[!] No TypeScript or Python files found.")
+        writer.finish(True, files_checked=0)
         sys.exit(0)
     
     # Print results
@@ -159,7 +167,11 @@ def main():
             print(f"  {item}")
             if item.startswith("[X]"):
                 critical_issues += 1
+            message = item[4:]
+            writer.add(f"types/{result['type']}/{slugify(message)}",
+                       "high" if item.startswith("[X]") else "medium", message)
     
+    writer.finish(critical_issues == 0, files_checked=sum(r['files'] for r in results))
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
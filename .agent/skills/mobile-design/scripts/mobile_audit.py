@@ -2,7 +2,7 @@
 """
 Mobile UX Audit Script - Full Mobile Design Coverage
 
-Analyzes React Native / Flutter code for compliance with:
+Analyzes React Native / Flutter / Capacitor code for compliance with:
 
 1. TOUCH PSYCHOLOGY (touch-psychology.md):
    - Touch Target Sizes (44pt iOS, 48dp Android, 44px WCAG)
@@ -62,318 +62,550 @@ Analyzes React Native / Flutter code for compliance with:
    - Push Notification Support
    - API Response Caching
 
-Total: 50+ mobile-specific checks
+9. CAPACITOR / IONIC (WebView apps with capacitor.config.*):
+   - Release Config (webContentsDebuggingEnabled, server.url, cleartext)
+   - Local/Push Notification Plugin Usage (permissions, listeners)
+   - Synchronous localStorage in the WebView
+   - Unthrottled / Non-Passive Scroll & Touch Handlers
+   - Layout-Thrashing Animations and Forced Layout
+   - Native Bridge Calls in Loops (batching)
+
+Total: 60+ mobile-specific checks
 """
 
 import sys
 import os
 import re
 import json
+import hashlib
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.filecache import FileCache  # noqa: E402
+from validation.jsx import parse_markup  # noqa: E402
+from validation.results import ResultWriter, slugify  # noqa: E402
+from validation.scan import (  # noqa: E402
+    BudgetExceeded, FileScan, ScanGuard, finish_guard, finish_profile, profile_from_argv,
+)
+
+# Files are classified from their import header before being read in full
+HEADER_KB = 4
+CLASSIFIER_VERSION = 3
+FRAMEWORK_MARKERS = (
+    ("react-native", re.compile(r'react-native|@react-navigation|React\.Native')),
+    ("flutter", re.compile(r'import \'package:flutter|MaterialApp|Widget\.build')),
+    ("capacitor", re.compile(r'@capacitor(?:-community|-firebase)?/|@ionic/|\bCapacitor\.')),
+)
+
+# In a Capacitor project every web source file runs inside the native WebView.
+# Only files whose header touches what the WebView rules look at are read in full.
+CAPACITOR_CONFIGS = ('capacitor.config.ts', 'capacitor.config.js', 'capacitor.config.json')
+WEBVIEW_SUFFIXES = {'.ts', '.tsx', '.js', '.jsx'}
+WEBVIEW_MARKER = re.compile(
+    r'\b(?:localStorage|sessionStorage)\.|addEventListener\(|\bon(?:Scroll|TouchMove|Wheel)='
+    r'|framer-motion|motion/react|\.style\.|transition|animate='
+)
+CAPACITOR_PLUGIN_IMPORT = re.compile(
+    r'import\s*\{([^}]*)\}\s*from\s*[\'"](?:@capacitor(?:-community|-firebase)?/[\w-]+|@ionic-native/[\w-]+|capacitor-[\w-]+)[\'"]'
+)
+LOOP_HEAD = re.compile(r'\b(?:for|while)\s*\(|\.(?:forEach|map)\(\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*=>\s*')
+LAYOUT_READS = r'\b(?:offset(?:Height|Width|Top|Left)|client(?:Height|Width)|scroll(?:Height|Width)|getBoundingClientRect\(|getComputedStyle\()'
+
+
+def _closing(text: str, start: int, limit: int = 4000) -> int:
+    """Index just past the bracket matching text[start] (strings are not special-cased)."""
+    pairs = {'(': ')', '{': '}'}
+    opener, closer = text[start], pairs[text[start]]
+    depth = 0
+    end = min(len(text), start + limit)
+    for i in range(start, end):
+        c = text[i]
+        if c == opener:
+            depth += 1
+        elif c == closer:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return end
+
+
+def loop_bodies(text: str):
+    """Source of each for/while/forEach/map body, capped at a few KB each."""
+    for m in LOOP_HEAD.finditer(text):
+        i = m.end()
+        if text[m.end() - 1] == '(':  # for (...) / while (...): skip the header
+            i = _closing(text, m.end() - 1)
+        while i < len(text) and text[i].isspace():
+            i += 1
+        if i < len(text) and text[i] == '{':
+            yield text[i:_closing(text, i)]
+        else:
+            end = text.find('\n', i)
+            yield text[i:end if end >= 0 else len(text)]
+
+
+def detect_framework(text: str) -> str:
+    """
+    "react-native", "flutter", "capacitor", "web" (DOM code the WebView rules
+    apply to inside a Capacitor project) or "none" from (part of) a source file.
+    """
+    for framework, marker in FRAMEWORK_MARKERS:
+        if marker.search(text):
+            return framework
+    if WEBVIEW_MARKER.search(text):
+        return "web"
+    return "none"
+
+
+def find_capacitor_project(path: str):
+    """
+    The Capacitor project `path` (a file or directory) belongs to: the nearest
+    directory at or above it with a capacitor.config.*, not crossing a
+    repository root. Returns {"root", "config", "platforms"} or None.
+    """
+    directory = Path(path).resolve()
+    if not directory.is_dir():
+        directory = directory.parent
+    for candidate in (directory, *directory.parents):
+        config = next((name for name in CAPACITOR_CONFIGS if (candidate / name).is_file()), None)
+        if config:
+            return {
+                "root": str(candidate),
+                "config": config,
+                "platforms": [p for p in ('android', 'ios') if (candidate / p).is_dir()],
+            }
+        if (candidate / '.git').exists():
+            return None
+    return None
+
+
 class MobileAuditor:
-    def __init__(self):
+    def __init__(self, profiler=None, guard=None, header_kb=HEADER_KB, classify_cache=None):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.files_skipped = 0
+        self.bytes_read = 0
+        self.findings = []  # Structured records behind the issue/warning strings
+        self.root = None  # Paths are reported relative to the audited directory
+        self.scan = None  # FileScan of the file being audited
+        self.profiler = profiler  # validation.scan.Profiler when --profile is set
+        self.guard = guard or ScanGuard()
+        self.header_bytes = header_kb * 1024
+        self.classify_cache = classify_cache  # validation.filecache.FileCache, optional
+        self.capacitor = None  # {"config": ..., "platforms": [...]} once a Capacitor project is found
+        self.capacitor_root = None
+        self._head = None  # (filepath, bytes) of the last header read
+        self.frameworks = {}
+
+    def classify(self, filepath: str):
+        """
+        Decide from the first HEADER_KB of a file whether it is React Native,
+        Flutter or Capacitor code, or DOM code for the WebView rules. Returns (framework, content): content is the
+        decoded file when it fit in the header read, otherwise None.
+        """
+        cache = self.classify_cache
+        if cache is not None:
+            framework = cache.get(filepath)
+            if framework is not None:
+                return framework, None
+        try:
+            with open(filepath, 'rb') as f:
+                head = f.read(self.header_bytes + 1)
+        except OSError:
+            return "none", None
+        self.bytes_read += len(head)
+        complete = len(head) <= self.header_bytes
+        head = head[:self.header_bytes]
+        self._head = (filepath, head)  # A full read continues from here
+        # Same newline handling as reading in text mode
+        text = head.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+        digest = hashlib.sha1(head).hexdigest()
+
+        framework = cache.get_by_digest(filepath, digest) if cache is not None else None
+        if framework is None:
+            framework = detect_framework(text)
+            if cache is not None:
+                cache.put(filepath, framework, digest=digest)
+        return framework, (text if complete else None)
+
+    def report_issue(self, tag: str, message: str, at=None) -> None:
+        self._report(self.issues, "high", tag, message, at)
+
+    def report_warning(self, tag: str, message: str, at=None) -> None:
+        self._report(self.warnings, "medium", tag, message, at)
+
+    def _report(self, bucket, severity: str, tag: str, message: str, at) -> None:
+        """
+        Record a finding in the current file. It is located at `at` (a match
+        or element) or else at the last match of the rule that raised it.
+        """
+        scan = self.scan
+        bucket.append(f"[{tag}] {scan.name}: {message}")
+        self.findings.append({"tag": tag, "severity": severity, "file": scan.name.replace("\\", "/"),
+                              "message": message, **scan.locate(at)})
 
     def audit_file(self, filepath: str) -> None:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except Exception:
-            return
+            self._audit_file(filepath)
+        except BudgetExceeded:
+            pass  # Listed in the scan guard report; findings so far are kept
+
+    def _audit_file(self, filepath: str) -> None:
+        framework, content = self.classify(filepath)
+        if framework == "web":
+            framework = "webview" if self.capacitor and Path(filepath).suffix in WEBVIEW_SUFFIXES else "none"
+        if framework == "none":
+            self.files_skipped += 1
+            return  # Not mobile code; never read in full
+
+        if content is None:
+            head = self._head[1] if self._head and self._head[0] == filepath else b''
+            try:
+                with open(filepath, 'rb') as f:
+                    f.seek(len(head))
+                    rest = f.read()
+            except OSError:
+                return
+            self.bytes_read += len(rest)
+            # Same newline handling as reading in text mode
+            content = (head + rest).decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+        name = os.path.relpath(filepath, self.root) if self.root else os.path.basename(filepath)
+        scan = self.scan = FileScan(content, name=name, profiler=self.profiler, guard=self.guard)
+        if scan.skipped:
+            return  # Oversize or minified; listed in the scan guard report
 
         self.files_checked += 1
-        filename = os.path.basename(filepath)
-
+        self.frameworks[framework] = self.frameworks.get(framework, 0) + 1
         # Detect framework
-        is_react_native = bool(re.search(r'react-native|@react-navigation|React\.Native', content))
-        is_flutter = bool(re.search(r'import \'package:flutter|MaterialApp|Widget\.build', content))
+        scan.rule("framework-detection")
+        is_react_native = bool(scan.search(FRAMEWORK_MARKERS[0][1]))
+        is_flutter = bool(scan.search(FRAMEWORK_MARKERS[1][1]))
 
         if not (is_react_native or is_flutter):
-            return  # Skip non-mobile files
+            if framework in ("capacitor", "webview"):
+                self.audit_capacitor(scan)
+            return  # The React Native / Flutter checks below do not apply
 
         # --- 1. TOUCH PSYCHOLOGY CHECKS ---
 
         # 1.1 Touch Target Size Check
         # Look for small touch targets
-        small_sizes = re.findall(r'(?:width|height|size):\s*([0-3]\d)', content)
+        scan.rule("touch-target-size")
+        small_sizes = scan.findall(r'(?:width|height|size):\s*([0-3]\d)')
         for size in small_sizes:
             if int(size) < 44:
-                self.issues.append(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)")
+                self.report_issue("Touch Target", f"Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)")
 
         # 1.2 Touch Target Spacing Check
         # Look for inadequate spacing between touchable elements
-        small_gaps = re.findall(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', content)
+        scan.rule("touch-target-spacing")
+        small_gaps = scan.findall(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)')
         for gap in small_gaps:
             if int(gap) < 8:
-                self.warnings.append(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.")
+                self.report_warning("Touch Spacing", f"Touch target spacing {gap}px < 8px minimum. Accidental taps risk.")
 
         # 1.3 Thumb Zone Placement Check
         # Primary CTAs should be at bottom (easy thumb reach)
-        primary_buttons = re.findall(r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', content, re.IGNORECASE)
-        has_bottom_placement = bool(re.search(r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end', content))
+        scan.rule("thumb-zone-placement")
+        primary_buttons = scan.findall(r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', re.IGNORECASE)
+        has_bottom_placement = bool(scan.search(r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end'))
         if primary_buttons and not has_bottom_placement:
-            self.warnings.append(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.")
+            self.report_warning("Thumb Zone", "Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.")
 
         # 1.4 Gesture Alternatives Check
         # Swipe actions should have visible button alternatives
-        has_swipe_gestures = bool(re.search(r'Swipeable|onSwipe|PanGestureHandler|swipe', content))
-        has_visible_buttons = bool(re.search(r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable', content))
+        scan.rule("gesture-alternatives")
+        has_swipe_gestures = bool(scan.search(r'Swipeable|onSwipe|PanGestureHandler|swipe'))
+        has_visible_buttons = bool(scan.search(r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable'))
         if has_swipe_gestures and not has_visible_buttons:
-            self.warnings.append(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.")
+            self.report_warning("Gestures", "Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.")
 
         # 1.5 Haptic Feedback Check
         # Important actions should have haptic feedback
-        has_important_actions = bool(re.search(r'(?:onPress|onSubmit|delete|remove|confirm|purchase)', content))
-        has_haptics = bool(re.search(r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager', content))
+        scan.rule("haptic-feedback")
+        has_important_actions = bool(scan.search(r'(?:onPress|onSubmit|delete|remove|confirm|purchase)'))
+        has_haptics = bool(scan.search(r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager'))
         if has_important_actions and not has_haptics:
-            self.warnings.append(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.")
+            self.report_warning("Haptics", "Important actions without haptic feedback. Consider adding haptic confirmation.")
 
         # 1.6 Touch Feedback Timing Check
         # Touch feedback should be immediate (<50ms)
+        scan.rule("touch-feedback-timing")
         if is_react_native:
-            has_pressable = bool(re.search(r'Pressable|TouchableOpacity', content))
-            has_feedback_state = bool(re.search(r'pressed|style.*opacity|underlay', content))
+            has_pressable = bool(scan.search(r'Pressable|TouchableOpacity'))
+            has_feedback_state = bool(scan.search(r'pressed|style.*opacity|underlay'))
             if has_pressable and not has_feedback_state:
-                self.warnings.append(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.")
+                self.report_warning("Touch Feedback", "Pressable without visual feedback state. Add opacity/scale change for tap confirmation.")
 
         # --- 2. MOBILE PERFORMANCE CHECKS ---
 
         # 2.1 CRITICAL: ScrollView vs FlatList
-        has_scrollview = bool(re.search(r'<ScrollView|ScrollView\.', content))
-        has_map_in_scrollview = bool(re.search(r'ScrollView.*\.map\(|ScrollView.*\{.*\.map', content))
+        scan.rule("scrollview-vs-flatlist")
+        has_scrollview = bool(scan.search(r'<ScrollView|ScrollView\.'))
+        has_map_in_scrollview = bool(scan.search(r'ScrollView.*\.map\(|ScrollView.*\{.*\.map'))
         if has_scrollview and has_map_in_scrollview:
-            self.issues.append(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.")
+            self.report_issue("Performance CRITICAL", "ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.")
 
         # 2.2 React.memo Check
+        scan.rule("react-memo")
         if is_react_native:
-            has_list = bool(re.search(r'FlatList|FlashList|SectionList', content))
-            has_react_memo = bool(re.search(r'React\.memo|memo\(', content))
+            has_list = bool(scan.search(r'FlatList|FlashList|SectionList'))
+            has_react_memo = bool(scan.search(r'React\.memo|memo\('))
             if has_list and not has_react_memo:
-                self.warnings.append(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.")
+                self.report_warning("Performance", "FlatList without React.memo on list items. Items will re-render on every parent update.")
 
         # 2.3 useCallback Check
+        scan.rule("usecallback")
         if is_react_native:
-            has_flatlist = bool(re.search(r'FlatList|FlashList', content))
-            has_use_callback = bool(re.search(r'useCallback', content))
+            has_flatlist = bool(scan.search(r'FlatList|FlashList'))
+            has_use_callback = bool(scan.search(r'useCallback'))
             if has_flatlist and not has_use_callback:
-                self.warnings.append(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.")
+                self.report_warning("Performance", "FlatList renderItem without useCallback. New function created every render.")
 
         # 2.4 keyExtractor Check (CRITICAL)
+        scan.rule("keyextractor")
         if is_react_native:
-            has_flatlist = bool(re.search(r'FlatList', content))
-            has_key_extractor = bool(re.search(r'keyExtractor', content))
-            uses_index_key = bool(re.search(r'key=\{.*index.*\}|key:\s*index', content))
+            has_flatlist = bool(scan.search(r'FlatList'))
+            has_key_extractor = bool(scan.search(r'keyExtractor'))
+            uses_index_key = bool(scan.search(r'key=\{.*index.*\}|key:\s*index'))
             if has_flatlist and not has_key_extractor:
-                self.issues.append(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.")
+                self.report_issue("Performance CRITICAL", "FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.")
             if uses_index_key:
-                self.issues.append(f"[Performance CRITICAL] {filename}: Using index as key. This causes bugs when list changes. Use unique ID from data.")
+                self.report_issue("Performance CRITICAL", "Using index as key. This causes bugs when list changes. Use unique ID from data.")
 
         # 2.5 useNativeDriver Check
+        scan.rule("usenativedriver")
         if is_react_native:
-            has_animated = bool(re.search(r'Animated\.', content))
-            has_native_driver = bool(re.search(r'useNativeDriver:\s*true', content))
-            has_native_driver_false = bool(re.search(r'useNativeDriver:\s*false', content))
+            has_animated = bool(scan.search(r'Animated\.'))
+            has_native_driver = bool(scan.search(r'useNativeDriver:\s*true'))
+            has_native_driver_false = bool(scan.search(r'useNativeDriver:\s*false'))
             if has_animated and has_native_driver_false:
-                self.warnings.append(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).")
+                self.report_warning("Performance", "Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).")
             if has_animated and not has_native_driver:
-                self.warnings.append(f"[Performance] {filename}: Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.")
+                self.report_warning("Performance", "Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.")
 
         # 2.6 Memory Leak Check
+        scan.rule("memory-leak")
         if is_react_native:
-            has_effect = bool(re.search(r'useEffect', content))
-            has_cleanup = bool(re.search(r'return\s*\(\)\s*=>|return\s+function', content))
-            has_subscriptions = bool(re.search(r'addEventListener|subscribe|\.focus\(\)|\.off\(', content))
+            has_effect = bool(scan.search(r'useEffect'))
+            has_cleanup = bool(scan.search(r'return\s*\(\)\s*=>|return\s+function'))
+            has_subscriptions = bool(scan.search(r'addEventListener|subscribe|\.focus\(\)|\.off\('))
             if has_effect and has_subscriptions and not has_cleanup:
-                self.issues.append(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.")
+                self.report_issue("Memory Leak", "useEffect with subscriptions but no cleanup function. Memory leak on unmount.")
 
         # 2.7 Console.log Detection
-        console_logs = len(re.findall(r'console\.log|console\.warn|console\.error|console\.debug', content))
+        scan.rule("console-log")
+        console_logs = len(scan.findall(r'console\.log|console\.warn|console\.error|console\.debug'))
         if console_logs > 5:
-            self.warnings.append(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).")
+            self.report_warning("Performance", f"{console_logs} console.log statements detected. Remove before production (blocks JS thread).")
 
         # 2.8 Inline Function Detection
+        scan.rule("inline-function")
         if is_react_native:
-            inline_functions = re.findall(r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>', content)
+            inline_functions = scan.findall(r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>')
             if len(inline_functions) > 3:
-                self.warnings.append(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.")
+                self.report_warning("Performance", f"{len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.")
 
         # 2.9 Animation Properties Check
         # Warn if animating expensive properties
-        animating_layout = bool(re.search(r'Animated\.timing.*(?:width|height|margin|padding)', content))
+        scan.rule("animation-properties")
+        animating_layout = bool(scan.search(r'Animated\.timing.*(?:width|height|margin|padding)'))
         if animating_layout:
-            self.issues.append(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.")
+            self.report_issue("Performance", "Animating layout properties (width/height/margin). Use transform/opacity for 60fps.")
 
         # --- 3. MOBILE NAVIGATION CHECKS ---
 
         # 3.1 Tab Bar Max Items Check
-        tab_bar_items = len(re.findall(r'Tab\.Screen|createBottomTabNavigator|BottomTab', content))
+        scan.rule("tab-bar-max-items")
+        tab_bar_items = len(scan.findall(r'Tab\.Screen|createBottomTabNavigator|BottomTab'))
         if tab_bar_items > 5:
-            self.warnings.append(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.")
+            self.report_warning("Navigation", f"{tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.")
 
         # 3.2 Tab State Preservation Check
-        has_tab_nav = bool(re.search(r'createBottomTabNavigator|Tab\.Navigator', content))
+        scan.rule("tab-state-preservation")
+        has_tab_nav = bool(scan.search(r'createBottomTabNavigator|Tab\.Navigator'))
         if has_tab_nav:
             # Look for lazy prop (false preserves state)
-            has_lazy_false = bool(re.search(r'lazy:\s*false', content))
+            has_lazy_false = bool(scan.search(r'lazy:\s*false'))
             if not has_lazy_false:
-                self.warnings.append(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.")
+                self.report_warning("Navigation", "Tab navigation without lazy: false. Tabs may lose state on switch.")
 
         # 3.3 Back Handling Check
-        has_back_listener = bool(re.search(r'BackHandler|useFocusEffect|navigation\.addListener', content))
-        has_custom_back = bool(re.search(r'onBackPress|handleBackPress', content))
+        scan.rule("back-handling")
+        has_back_listener = bool(scan.search(r'BackHandler|useFocusEffect|navigation\.addListener'))
+        has_custom_back = bool(scan.search(r'onBackPress|handleBackPress'))
         if has_custom_back and not has_back_listener:
-            self.warnings.append(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.")
+            self.report_warning("Navigation", "Custom back handling without BackHandler listener. May not work correctly.")
 
         # 3.4 Deep Link Support Check
-        has_linking = bool(re.search(r'Linking\.|Linking\.openURL|deepLink|universalLink', content))
-        has_config = bool(re.search(r'apollo-link|react-native-screens|navigation\.link', content))
+        scan.rule("deep-link-support")
+        has_linking = bool(scan.search(r'Linking\.|Linking\.openURL|deepLink|universalLink'))
+        has_config = bool(scan.search(r'apollo-link|react-native-screens|navigation\.link'))
         if not has_linking and not has_config:
             self.passed_count += 1
         else:
             if has_linking and not has_config:
-                self.warnings.append(f"[Navigation] {filename}: Deep linking detected but may lack proper configuration. Test notification/share flows.")
+                self.report_warning("Navigation", "Deep linking detected but may lack proper configuration. Test notification/share flows.")
 
         # --- 4. MOBILE TYPOGRAPHY CHECKS ---
 
         # 4.1 System Font Check
+        scan.rule("system-font")
         if is_react_native:
-            has_custom_font = bool(re.search(r"fontFamily:\s*[\"'][^\"']+", content))
-            has_system_font = bool(re.search(r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)", content))
+            has_custom_font = bool(scan.search(r"fontFamily:\s*[\"'][^\"']+"))
+            has_system_font = bool(scan.search(r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)"))
             if has_custom_font and not has_system_font:
-                self.warnings.append(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.")
+                self.report_warning("Typography", "Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.")
 
         # 4.2 Text Scaling Check (iOS Dynamic Type)
+        scan.rule("text-scaling")
         if is_react_native:
-            has_font_sizes = bool(re.search(r'fontSize:', content))
-            has_scaling = bool(re.search(r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions', content))
+            has_font_sizes = bool(scan.search(r'fontSize:'))
+            has_scaling = bool(scan.search(r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions'))
             if has_font_sizes and not has_scaling:
-                self.warnings.append(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.")
+                self.report_warning("Typography", "Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.")
 
         # 4.3 Mobile Line Height Check
-        line_heights = re.findall(r'lineHeight:\s*([\d.]+)', content)
+        scan.rule("mobile-line-height")
+        line_heights = scan.findall(r'lineHeight:\s*([\d.]+)')
         for lh in line_heights:
             if float(lh) > 1.8:
-                self.warnings.append(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).")
+                self.report_warning("Typography", f"lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).")
 
         # 4.4 Font Size Limits
-        font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
+        scan.rule("font-size-limits")
+        font_sizes = scan.findall(r'fontSize:\s*([\d.]+)')
         for fs in font_sizes:
             size = float(fs)
             if size < 12:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px below 12px minimum readability.")
+                self.report_warning("Typography", f"fontSize {size}px below 12px minimum readability.")
             elif size > 32:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px very large. Consider using responsive scaling.")
+                self.report_warning("Typography", f"fontSize {size}px very large. Consider using responsive scaling.")
 
         # --- 5. MOBILE COLOR SYSTEM CHECKS ---
 
         # 5.1 Pure Black Avoidance
-        if re.search(r'#000000|color:\s*black|backgroundColor:\s*["\']?black', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.")
+        scan.rule("pure-black-avoidance")
+        if scan.search(r'#000000|color:\s*black|backgroundColor:\s*["\']?black'):
+            self.report_warning("Color", "Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.")
 
         # 5.2 Dark Mode Support
-        has_color_schemes = bool(re.search(r'useColorScheme|colorScheme|appearance:\s*["\']?dark', content))
-        has_dark_mode_style = bool(re.search(r'\\\?.*dark|style:\s*.*dark|isDark', content))
+        scan.rule("dark-mode-support")
+        has_color_schemes = bool(scan.search(r'useColorScheme|colorScheme|appearance:\s*["\']?dark'))
+        has_dark_mode_style = bool(scan.search(r'\\\?.*dark|style:\s*.*dark|isDark'))
         if not has_color_schemes and not has_dark_mode_style:
-            self.warnings.append(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.")
+            self.report_warning("Color", "No dark mode support detected. Consider useColorScheme for system dark mode.")
 
         # --- 6. PLATFORM iOS CHECKS ---
 
         if is_react_native:
             # 6.1 SF Symbols Check
-            has_ios_icons = bool(re.search(r'@expo/vector-icons|ionicons', content))
-            has_sf_symbols = bool(re.search(r'sf-symbol|SF Symbols', content))
+            scan.rule("sf-symbols")
+            has_ios_icons = bool(scan.search(r'@expo/vector-icons|ionicons'))
+            has_sf_symbols = bool(scan.search(r'sf-symbol|SF Symbols'))
             if has_ios_icons and not has_sf_symbols:
                 self.passed_count += 1
 
             # 6.2 iOS Haptic Types
-            has_haptic_import = bool(re.search(r'expo-haptics|react-native-haptic-feedback', content))
-            has_haptic_types = bool(re.search(r'ImpactFeedback|NotificationFeedback|SelectionFeedback', content))
+            scan.rule("ios-haptic-types")
+            has_haptic_import = bool(scan.search(r'expo-haptics|react-native-haptic-feedback'))
+            has_haptic_types = bool(scan.search(r'ImpactFeedback|NotificationFeedback|SelectionFeedback'))
             if has_haptic_import and not has_haptic_types:
-                self.warnings.append(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).")
+                self.report_warning("iOS Haptics", "Haptic library imported but not using typed haptics (Impact/Notification/Selection).")
 
             # 6.3 iOS Safe Area
-            has_safe_area = bool(re.search(r'SafeAreaView|useSafeAreaInsets|safeArea', content))
+            scan.rule("ios-safe-area")
+            has_safe_area = bool(scan.search(r'SafeAreaView|useSafeAreaInsets|safeArea'))
             if not has_safe_area:
-                self.warnings.append(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.")
+                self.report_warning("iOS", "No SafeArea detected. Content may be hidden by notch/home indicator.")
 
         # --- 7. PLATFORM ANDROID CHECKS ---
 
         if is_react_native:
             # 7.1 Material Icons Check
-            has_material_icons = bool(re.search(r'@expo/vector-icons|MaterialIcons', content))
+            scan.rule("material-icons")
+            has_material_icons = bool(scan.search(r'@expo/vector-icons|MaterialIcons'))
             if has_material_icons:
                 self.passed_count += 1
 
             # 7.2 Ripple Effect
-            has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
-            has_pressable = bool(re.search(r'Pressable|Touchable', content))
+            scan.rule("ripple-effect")
+            has_ripple = bool(scan.search(r'ripple|android_ripple|foregroundRipple'))
+            has_pressable = bool(scan.search(r'Pressable|Touchable'))
             if has_pressable and not has_ripple:
-                self.warnings.append(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.")
+                self.report_warning("Android", "Touchable without ripple effect. Android users expect ripple feedback.")
 
             # 7.3 Hardware Back Button
+            scan.rule("hardware-back-button")
             if is_react_native:
-                has_back_button = bool(re.search(r'BackHandler|useBackHandler', content))
-                has_navigation = bool(re.search(r'@react-navigation', content))
+                has_back_button = bool(scan.search(r'BackHandler|useBackHandler'))
+                has_navigation = bool(scan.search(r'@react-navigation'))
                 if has_navigation and not has_back_button:
-                    self.warnings.append(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.")
+                    self.report_warning("Android", "React Navigation detected without BackHandler listener. Android hardware back may not work correctly.")
 
         # --- 8. MOBILE BACKEND CHECKS ---
 
         # 8.1 Secure Storage Check
-        has_async_storage = bool(re.search(r'AsyncStorage|@react-native-async-storage', content))
-        has_secure_storage = bool(re.search(r'SecureStore|Keychain|EncryptedSharedPreferences', content))
-        has_token_storage = bool(re.search(r'token|jwt|auth.*storage', content, re.IGNORECASE))
+        scan.rule("secure-storage")
+        has_async_storage = bool(scan.search(r'AsyncStorage|@react-native-async-storage'))
+        has_secure_storage = bool(scan.search(r'SecureStore|Keychain|EncryptedSharedPreferences'))
+        has_token_storage = bool(scan.search(r'token|jwt|auth.*storage', re.IGNORECASE))
         if has_token_storage and has_async_storage and not has_secure_storage:
-            self.issues.append(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).")
+            self.report_issue("Security", "Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).")
 
         # 8.2 Offline Handling Check
-        has_network = bool(re.search(r'fetch|axios|netinfo|@react-native-community/netinfo', content))
-        has_offline = bool(re.search(r'offline|isConnected|netInfo|cache.*offline', content))
+        scan.rule("offline-handling")
+        has_network = bool(scan.search(r'fetch|axios|netinfo|@react-native-community/netinfo'))
+        has_offline = bool(scan.search(r'offline|isConnected|netInfo|cache.*offline'))
         if has_network and not has_offline:
-            self.warnings.append(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.")
+            self.report_warning("Offline", "Network requests detected without offline handling. Consider NetInfo for connection status.")
 
         # 8.3 Push Notification Support
-        has_push = bool(re.search(r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS', content))
-        has_push_handler = bool(re.search(r'onNotification|addNotificationListener|notification\.open', content))
+        scan.rule("push-notification-support")
+        has_push = bool(scan.search(r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS'))
+        has_push_handler = bool(scan.search(r'onNotification|addNotificationListener|notification\.open'))
         if has_push and not has_push_handler:
-            self.warnings.append(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.")
+            self.report_warning("Push", "Push notifications imported but no handler found. May miss notifications.")
 
         # --- 9. EXTENDED MOBILE TYPOGRAPHY CHECKS ---
 
         # 9.1 iOS Type Scale Check
+        scan.rule("ios-type-scale")
         if is_react_native:
             # Check for iOS text styles that match HIG
             # iOS text styles are checked against the HIG scale below
 
             # Check if following iOS scale roughly
-            font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
+            font_sizes = scan.findall(r'fontSize:\s*([\d.]+)')
             ios_scale_sizes = [34, 28, 22, 20, 17, 16, 15, 13, 12, 11]
             matching_ios = sum(1 for size in font_sizes if any(abs(float(size) - ios_size) < 1 for ios_size in ios_scale_sizes))
 
             if len(font_sizes) > 3 and matching_ios < len(font_sizes) / 2:
-                self.warnings.append(f"[iOS Typography] {filename}: Font sizes don't match iOS type scale. Consider iOS text styles for native feel.")
+                self.report_warning("iOS Typography", "Font sizes don't match iOS type scale. Consider iOS text styles for native feel.")
 
         # 9.2 Android Material Type Scale Check
+        scan.rule("android-material-type-scale")
         if is_react_native:
             # Check for Material 3 text styles
-            has_display = bool(re.search(r'fontSize:\s*[456][0-9]|display', content))
-            has_headline_material = bool(re.search(r'fontSize:\s*[23][0-9]|headline', content))
+            has_display = bool(scan.search(r'fontSize:\s*[456][0-9]|display'))
+            has_headline_material = bool(scan.search(r'fontSize:\s*[23][0-9]|headline'))
             # Material text styles are checked below
-            has_label = bool(re.search(r'fontSize:\s*1[1234].*medium|label', content))
+            has_label = bool(scan.search(r'fontSize:\s*1[1234].*medium|label'))
 
             # Check if using sp (scale-independent pixels)
-            uses_sp = bool(re.search(r'\d+\s*sp\b', content))
+            uses_sp = bool(scan.search(r'\d+\s*sp\b'))
             if has_display or has_headline_material:
                 if not uses_sp:
-                    self.warnings.append(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.")
+                    self.report_warning("Android Typography", "Material typography detected without sp units. Use sp for text to respect user font size preferences.")
 
         # 9.3 Modular Scale Check
         # Check if font sizes follow modular scale
-        font_sizes = re.findall(r'fontSize:\s*(\d+(?:\.\d+)?)', content)
+        scan.rule("modular-scale")
+        font_sizes = scan.findall(r'fontSize:\s*(\d+(?:\.\d+)?)')
         if len(font_sizes) > 3:
             sorted_sizes = sorted(set([float(s) for s in font_sizes]))
             ratios = []
@@ -385,21 +617,23 @@ class MobileAuditor:
             common_ratios = {1.125, 1.2, 1.25, 1.333, 1.5}
             for ratio in ratios[:3]:
                 if not any(abs(ratio - cr) < 0.03 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.")
+                    self.report_warning("Typography", f"Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.")
                     break
 
         # 9.4 Line Length Check (Mobile-specific)
         # Mobile text should be 40-60 characters max
+        scan.rule("line-length")
         if is_react_native:
-            has_long_text = bool(re.search(r'<Text[^>]*>[^<]{40,}', content))
-            has_max_width = bool(re.search(r'maxWidth|max-w-\d+|width:\s*["\']?\d+', content))
+            has_long_text = any(len(e.text) >= 40 for e in parse_markup(content, filepath).find('Text'))
+            has_max_width = bool(scan.search(r'maxWidth|max-w-\d+|width:\s*["\']?\d+'))
             if has_long_text and not has_max_width:
-                self.warnings.append(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.")
+                self.report_warning("Mobile Typography", "Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.")
 
         # 9.5 Font Weight Pattern Check
         # Check for font weight distribution
+        scan.rule("font-weight-pattern")
         if is_react_native:
-            font_weights = re.findall(r'fontWeight:\s*["\']?(\d+|normal|bold|medium|light)', content)
+            font_weights = scan.findall(r'fontWeight:\s*["\']?(\d+|normal|bold|medium|light)')
             weight_map = {'normal': '400', 'light': '300', 'medium': '500', 'bold': '700'}
             numeric_weights = []
             for w in font_weights:
@@ -413,24 +647,26 @@ class MobileAuditor:
             bold_count = sum(1 for w in numeric_weights if w >= 700)
             regular_count = sum(1 for w in numeric_weights if 400 <= w < 500)
             if bold_count > regular_count:
-                self.warnings.append(f"[Mobile Typography] {filename}: More bold weights than regular. Mobile typography should be regular-dominant for readability.")
+                self.report_warning("Mobile Typography", "More bold weights than regular. Mobile typography should be regular-dominant for readability.")
 
         # --- 10. EXTENDED MOBILE COLOR SYSTEM CHECKS ---
 
         # 10.1 OLED Optimization Check
         # Check for near-black colors instead of pure black
-        if re.search(r'#121212|#1A1A1A|#0D0D0D', content):
+        scan.rule("oled-optimization")
+        if scan.search(r'#121212|#1A1A1A|#0D0D0D'):
             self.passed_count += 1  # Good OLED optimization
-        elif re.search(r'backgroundColor:\s*["\']?#000000', content):
+        elif scan.search(r'backgroundColor:\s*["\']?#000000'):
             # Using pure black for background is OK for OLED
             pass
-        elif re.search(r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}', content):
+        elif scan.search(r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}'):
             # Check if using light colors in dark mode (bad for OLED)
-            self.warnings.append(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.")
+            self.report_warning("Mobile Color", "Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.")
 
         # 10.2 Saturated Color Detection (Battery)
         # Highly saturated colors consume more power on OLED
-        hex_colors = re.findall(r'#([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})', content)
+        scan.rule("saturated-color")
+        hex_colors = scan.findall(r'#([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})')
         saturated_count = 0
         for r, g, b in hex_colors:
             # Convert to RGB 0-255
@@ -447,63 +683,70 @@ class MobileAuditor:
                 pass
 
         if saturated_count > 10:
-            self.warnings.append(f"[Mobile Color] {filename}: {saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.")
+            self.report_warning("Mobile Color", f"{saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.")
 
         # 10.3 Outdoor Visibility Check
         # Low contrast combinations fail in outdoor sunlight
         # Contrast is checked below
         # Check for potential low contrast (light gray on white, dark gray on black)
-        potential_low_contrast = bool(re.search(r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000', content))
+        scan.rule("outdoor-visibility")
+        potential_low_contrast = bool(scan.search(r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000'))
         if potential_low_contrast:
-            self.warnings.append(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.")
+            self.report_warning("Mobile Color", "Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.")
 
         # 10.4 Dark Mode Text Color Check
         # In dark mode, text should not be pure white
-        has_dark_mode = bool(re.search(r'dark:\s*|isDark|useColorScheme|colorScheme:\s*["\']?dark', content))
+        scan.rule("dark-mode-text-color")
+        has_dark_mode = bool(scan.search(r'dark:\s*|isDark|useColorScheme|colorScheme:\s*["\']?dark'))
         if has_dark_mode:
-            has_pure_white_text = bool(re.search(r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white', content))
+            has_pure_white_text = bool(scan.search(r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white'))
             if has_pure_white_text:
-                self.warnings.append(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.")
+                self.report_warning("Mobile Color", "Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.")
 
         # --- 11. EXTENDED PLATFORM IOS CHECKS ---
 
         if is_react_native:
             # 11.1 SF Pro Font Detection
-            has_sf_pro = bool(re.search(r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF', content))
-            has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
+            scan.rule("sf-pro-font")
+            has_sf_pro = bool(scan.search(r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF'))
+            has_custom_font = bool(scan.search(r'fontFamily:\s*["\'][^"\']+'))
             if has_custom_font and not has_sf_pro:
-                self.warnings.append(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.")
+                self.report_warning("iOS", "Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.")
 
             # 11.2 iOS System Colors Check
             # Check for semantic color usage
-            has_label = bool(re.search(r'color:\s*["\']?label|\.label', content))
-            has_secondaryLabel = bool(re.search(r'secondaryLabel|\.secondaryLabel', content))
+            scan.rule("ios-system-colors")
+            has_label = bool(scan.search(r'color:\s*["\']?label|\.label'))
+            has_secondaryLabel = bool(scan.search(r'secondaryLabel|\.secondaryLabel'))
             # Semantic colors are checked against hardcoded grays below
 
-            has_hardcoded_gray = bool(re.search(r'#[78]0{4}', content))
+            has_hardcoded_gray = bool(scan.search(r'#[78]0{4}'))
             if has_hardcoded_gray and not (has_label or has_secondaryLabel):
-                self.warnings.append(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.")
+                self.report_warning("iOS", "Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.")
 
             # 11.3 iOS Accent Colors Check
-            ios_blue = bool(re.search(r'#007AFF|#0A84FF|systemBlue', content))
-            ios_green = bool(re.search(r'#34C759|#30D158|systemGreen', content))
-            ios_red = bool(re.search(r'#FF3B30|#FF453A|systemRed', content))
+            scan.rule("ios-accent-colors")
+            ios_blue = bool(scan.search(r'#007AFF|#0A84FF|systemBlue'))
+            ios_green = bool(scan.search(r'#34C759|#30D158|systemGreen'))
+            ios_red = bool(scan.search(r'#FF3B30|#FF453A|systemRed'))
 
-            has_custom_primary = bool(re.search(r'primaryColor|theme.*primary|colors\.primary', content))
+            has_custom_primary = bool(scan.search(r'primaryColor|theme.*primary|colors\.primary'))
             if has_custom_primary and not (ios_blue or ios_green or ios_red):
-                self.warnings.append(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.")
+                self.report_warning("iOS", "Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.")
 
             # 11.4 iOS Navigation Patterns Check
-            has_navigation_bar = bool(re.search(r'navigationOptions|headerStyle|cardStyle', content))
-            has_header_title = bool(re.search(r'title:\s*["\']|headerTitle|navigation\.setOptions', content))
+            scan.rule("ios-navigation-patterns")
+            has_navigation_bar = bool(scan.search(r'navigationOptions|headerStyle|cardStyle'))
+            has_header_title = bool(scan.search(r'title:\s*["\']|headerTitle|navigation\.setOptions'))
             if has_navigation_bar and not has_header_title:
-                self.warnings.append(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.")
+                self.report_warning("iOS", "Navigation bar detected without title. iOS apps should have clear context in nav bar.")
 
             # 11.5 iOS Component Patterns Check
             # Check for iOS-specific components
-            has_alert = bool(re.search(r'Alert\.alert|showAlert', content))
-            has_action_sheet = bool(re.search(r'ActionSheet|ActionSheetIOS|showActionSheetWithOptions', content))
-            has_activity_indicator = bool(re.search(r'ActivityIndicator|ActivityIndic', content))
+            scan.rule("ios-component-patterns")
+            has_alert = bool(scan.search(r'Alert\.alert|showAlert'))
+            has_action_sheet = bool(scan.search(r'ActionSheet|ActionSheetIOS|showActionSheetWithOptions'))
+            has_activity_indicator = bool(scan.search(r'ActivityIndicator|ActivityIndic'))
 
             if has_alert or has_action_sheet or has_activity_indicator:
                 self.passed_count += 1  # Good iOS component usage
@@ -512,52 +755,58 @@ class MobileAuditor:
 
         if is_react_native:
             # 12.1 Roboto Font Detection
-            has_roboto = bool(re.search(r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto', content))
-            has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
+            scan.rule("roboto-font")
+            has_roboto = bool(scan.search(r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto'))
+            has_custom_font = bool(scan.search(r'fontFamily:\s*["\'][^"\']+'))
             if has_custom_font and not has_roboto:
-                self.warnings.append(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.")
+                self.report_warning("Android", "Custom font without Roboto fallback. Roboto is optimized for Android displays.")
 
             # 12.2 Material 3 Dynamic Color Check
-            has_material_colors = bool(re.search(r'MD3|MaterialYou|dynamicColor|useColorScheme', content))
-            has_theme_provider = bool(re.search(r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider', content))
+            scan.rule("material-dynamic-color")
+            has_material_colors = bool(scan.search(r'MD3|MaterialYou|dynamicColor|useColorScheme'))
+            has_theme_provider = bool(scan.search(r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider'))
             if not has_material_colors and not has_theme_provider:
-                self.warnings.append(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
+                self.report_warning("Android", "No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
 
             # 12.3 Material Elevation Check
             # Check for elevation values (Material 3 uses elevation for depth)
-            has_elevation = bool(re.search(r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation', content))
-            has_box_shadow = bool(re.search(r'boxShadow:', content))
+            scan.rule("material-elevation")
+            has_elevation = bool(scan.search(r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation'))
+            has_box_shadow = bool(scan.search(r'boxShadow:'))
             if has_box_shadow and not has_elevation:
-                self.warnings.append(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.")
+                self.report_warning("Android", "CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.")
 
             # 12.4 Material Component Patterns Check
             # Check for Material components
-            has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
-            has_card = bool(re.search(r'Card|Paper|elevation.*\d+', content))
-            has_fab = bool(re.search(r'FAB|FloatingActionButton|fab', content))
-            has_snackbar = bool(re.search(r'Snackbar|showSnackBar|Toast', content))
+            scan.rule("material-component-patterns")
+            has_ripple = bool(scan.search(r'ripple|android_ripple|foregroundRipple'))
+            has_card = bool(scan.search(r'Card|Paper|elevation.*\d+'))
+            has_fab = bool(scan.search(r'FAB|FloatingActionButton|fab'))
+            has_snackbar = bool(scan.search(r'Snackbar|showSnackBar|Toast'))
 
             material_component_count = sum([has_ripple, has_card, has_fab, has_snackbar])
             if material_component_count >= 2:
                 self.passed_count += 1  # Good Material design usage
 
             # 12.5 Android Navigation Patterns Check
-            has_top_app_bar = bool(re.search(r'TopAppBar|AppBar|CollapsingToolbar', content))
-            has_bottom_nav = bool(re.search(r'BottomNavigation|BottomNav', content))
-            has_navigation_rail = bool(re.search(r'NavigationRail', content))
+            scan.rule("android-navigation-patterns")
+            has_top_app_bar = bool(scan.search(r'TopAppBar|AppBar|CollapsingToolbar'))
+            has_bottom_nav = bool(scan.search(r'BottomNavigation|BottomNav'))
+            has_navigation_rail = bool(scan.search(r'NavigationRail'))
 
             if has_bottom_nav:
                 self.passed_count += 1  # Good Android pattern
             elif has_top_app_bar and not (has_bottom_nav or has_navigation_rail):
-                self.warnings.append(f"[Android] {filename}: TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.")
+                self.report_warning("Android", "TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.")
 
         # --- 13. MOBILE TESTING CHECKS ---
 
         # 13.1 Testing Tool Detection
-        has_rntl = bool(re.search(r'react-native-testing-library|@testing-library', content))
-        has_detox = bool(re.search(r'detox|element\(|by\.text|by\.id', content))
-        has_maestro = bool(re.search(r'maestro|\.yaml$', content))
-        has_jest = bool(re.search(r'jest|describe\(|test\(|it\(', content))
+        scan.rule("testing-tool")
+        has_rntl = bool(scan.search(r'react-native-testing-library|@testing-library'))
+        has_detox = bool(scan.search(r'detox|element\(|by\.text|by\.id'))
+        has_maestro = bool(scan.search(r'maestro|\.yaml$'))
+        has_jest = bool(scan.search(r'jest|describe\(|test\(|it\('))
 
         testing_tools = []
         if has_jest:
@@ -570,47 +819,164 @@ class MobileAuditor:
             testing_tools.append('Maestro')
 
         if len(testing_tools) == 0:
-            self.warnings.append(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
+            self.report_warning("Testing", "No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
 
         # 13.2 Test Pyramid Balance Check
-        test_files = len(re.findall(r'\.test\.(tsx|ts|js|jsx)|\.spec\.', content))
-        e2e_tests = len(re.findall(r'detox|maestro|e2e|spec\.e2e', content.lower()))
+        scan.rule("test-pyramid-balance")
+        test_files = len(scan.findall(r'\.test\.(tsx|ts|js|jsx)|\.spec\.'))
+        e2e_tests = len(scan.findall(r'detox|maestro|e2e|spec\.e2e', re.IGNORECASE))
 
         if test_files > 0 and e2e_tests == 0:
-            self.warnings.append(f"[Testing] {filename}: Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.")
+            self.report_warning("Testing", "Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.")
 
         # 13.3 Accessibility Label Check (Mobile-specific)
+        scan.rule("accessibility-label")
         if is_react_native:
-            has_pressable = bool(re.search(r'Pressable|TouchableOpacity|TouchableHighlight', content))
-            has_a11y_label = bool(re.search(r'accessibilityLabel|aria-label|testID', content))
+            has_pressable = bool(scan.search(r'Pressable|TouchableOpacity|TouchableHighlight'))
+            has_a11y_label = bool(scan.search(r'accessibilityLabel|aria-label|testID'))
             if has_pressable and not has_a11y_label:
-                self.warnings.append(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.")
+                self.report_warning("A11y Mobile", "Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.")
 
         # --- 14. MOBILE DEBUGGING CHECKS ---
 
         # 14.1 Performance Profiling Check
-        has_performance = bool(re.search(r'Performance|systrace|profile|Flipper', content))
-        has_console_log = len(re.findall(r'console\.(log|warn|error|debug|info)', content))
+        scan.rule("performance-profiling")
+        has_performance = bool(scan.search(r'Performance|systrace|profile|Flipper'))
+        has_console_log = len(scan.findall(r'console\.(log|warn|error|debug|info)'))
         # Debuggers and console logs are flagged if overused
 
         if has_console_log > 10:
-            self.warnings.append(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.")
+            self.report_warning("Debugging", f"{has_console_log} console.log statements. Remove before production; they block JS thread.")
 
         if has_performance:
             self.passed_count += 1  # Good performance monitoring
 
         # 14.2 Error Boundary Check
-        has_error_boundary = bool(re.search(r'ErrorBoundary|componentDidCatch|getDerivedStateFromError', content))
+        scan.rule("error-boundary")
+        has_error_boundary = bool(scan.search(r'ErrorBoundary|componentDidCatch|getDerivedStateFromError'))
         if not has_error_boundary and is_react_native:
-            self.warnings.append(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
+            self.report_warning("Debugging", "No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
 
         # 14.3 Hermes Check (React Native specific)
+        scan.rule("hermes")
         if is_react_native:
             # Check if using Hermes engine (should be default in modern RN)
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
+    def audit_capacitor(self, scan: FileScan) -> None:
+        """Capacitor/Ionic rule pack: plugin usage, WebView hazards and bridge batching."""
+        content = scan.content
+        plugins = set()
+        for names in scan.findall(CAPACITOR_PLUGIN_IMPORT):
+            for name in names.split(','):
+                name = name.split(' as ')[-1].strip()
+                if name and name != 'type':
+                    plugins.add(name)
+        loops = None
+        if plugins or 'localStorage' in content or '.style.' in content:
+            loops = list(loop_bodies(content))
+
+        # 9.1 Local notifications: permissions are required before schedule() delivers anything
+        scan.rule("capacitor-local-notifications")
+        if 'LocalNotifications' in plugins and scan.search(r'LocalNotifications\.schedule\('):
+            if not scan.search(r'LocalNotifications\.(?:check|request)Permissions\('):
+                self.report_warning("Capacitor Plugins", "LocalNotifications.schedule() without checkPermissions()/requestPermissions(). Android 13+ and iOS drop notifications silently until permission is granted.")
+            else:
+                self.passed_count += 1
+            if scan.search(r'schedule:\s*\{[^}]*\bat:') and not scan.search(r'allowWhileIdle'):
+                self.report_warning("Capacitor Plugins", "Exact-time local notifications without allowWhileIdle. Android Doze can delay them by minutes or hours.")
+
+        # 9.2 Push notifications: the token only arrives through the 'registration' listener
+        scan.rule("capacitor-push-notifications")
+        if 'PushNotifications' in plugins and scan.search(r'PushNotifications\.register\('):
+            if not scan.search(r'addListener\(\s*[\'"]registration[\'"]'):
+                self.report_warning("Capacitor Plugins", "PushNotifications.register() without a 'registration' listener in this file. Make sure the device token is captured somewhere.")
+            if scan.search(r'PushNotifications\.addListener\(') and not scan.search(r'removeAllListeners\(|\.remove\(\)'):
+                self.report_warning("Capacitor Plugins", "PushNotifications listeners are never removed. Re-mounting adds duplicate handlers; call removeAllListeners() or handle.remove() on cleanup.")
+
+        # 9.3 Synchronous storage: localStorage blocks the WebView main thread
+        scan.rule("webview-localstorage")
+        serialized = scan.findall(r'localStorage\.setItem\([^;\n]*JSON\.stringify')
+        if serialized:
+            self.report_warning("WebView Performance", f"{len(serialized)} localStorage.setItem(JSON.stringify(...)) write(s). localStorage is synchronous on the WebView main thread; use @capacitor/preferences or IndexedDB for objects.")
+        if loops and any('localStorage.' in body for body in loops):
+            self.report_warning("WebView Performance", "localStorage accessed inside a loop. Read once into memory and write back once.")
+
+        # 9.4 Scroll/touch handlers: fire at display rate on the main thread
+        scan.rule("webview-scroll-handlers")
+        has_scroll_handler = bool(scan.search(r'addEventListener\(\s*[\'"](?:scroll|touchmove|wheel)[\'"]|\bon(?:Scroll|TouchMove|Wheel)=\{'))
+        if has_scroll_handler and not scan.search(r'throttle|debounce|requestAnimationFrame|IntersectionObserver'):
+            self.report_warning("WebView Performance", "Scroll/touch handler without throttle, debounce or requestAnimationFrame. It runs on every frame in the WebView.")
+        for m in scan.finditer(r'addEventListener\(\s*[\'"](?:touchstart|touchmove|wheel)[\'"]([^;\n]*)'):
+            if 'passive' not in m.group(1):
+                self.report_warning("WebView Performance", "Non-passive touch/wheel listener blocks scrolling until it returns. Pass { passive: true }.")
+                break
+
+        # 9.5 Layout thrashing: animating layout properties or reading layout after style writes
+        scan.rule("webview-layout-thrashing")
+        if scan.search(r'animate=\{\{[^}]*\b(?:height|width|top|left|margin\w*|padding\w*)\s*:'
+                       r'|transition(?:Property)?:\s*[\'"][^\'"]*\b(?:height|width|top|left|margin|padding)\b'
+                       r'|transition-\[(?:height|width|max-height|top|left|margin|padding)'):
+            self.report_warning("WebView Performance", "Animating layout properties (height/width/top/left/margin). Each frame re-runs layout in the WebView; animate transform and opacity instead.")
+        if loops and any('.style.' in body and scan.search(LAYOUT_READS, text=body) for body in loops):
+            self.report_warning("WebView Performance", "Style writes and layout reads (offsetHeight, getBoundingClientRect...) in the same loop force synchronous layout. Batch reads before writes.")
+
+        # 9.6 Bridge batching: every plugin call is a native round-trip
+        scan.rule("capacitor-bridge-batching")
+        if plugins and loops:
+            call = re.compile(r'\b(' + '|'.join(sorted(re.escape(p) for p in plugins)) + r')\.(\w+)\(')
+            for body in loops:
+                m = scan.search(call, text=body)
+                if m:
+                    self.report_warning("Capacitor Bridge", f"{m.group(1)}.{m.group(2)}() called inside a loop. Each call is a separate native bridge round-trip; batch them (e.g. one LocalNotifications.schedule({{ notifications: [...] }})).")
+                    break
+
+    def detect_capacitor(self, path: str) -> None:
+        """Look up the Capacitor project once; file and directory audits both use it."""
+        project = find_capacitor_project(path)
+        if project:
+            self.capacitor = {"config": project["config"], "platforms": project["platforms"]}
+            self.capacitor_root = project["root"]
+
+    def audit_capacitor_config(self, directory: str) -> None:
+        """Check the Capacitor config for release hazards, when it sits in the audited directory."""
+        if not self.capacitor or str(Path(directory).resolve()) != self.capacitor_root:
+            return
+        config = self.capacitor["config"]
+        try:
+            with open(os.path.join(directory, config), 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError:
+            return
+        # Commented-out settings (the usual way to toggle dev servers) do not count
+        text = re.sub(r'/\*.*?\*/', lambda m: '\n' * m.group().count('\n'), text, flags=re.DOTALL)
+        text = re.sub(r'(?m)^[ \t]*//.*$', '', text)
+        # Comment stripping keeps every newline, so reported lines stay correct
+        scan = self.scan = FileScan(text, name=config, profiler=self.profiler, guard=self.guard)
+
+        scan.rule("capacitor-config")
+        checks = (
+            (r'webContentsDebuggingEnabled\W*:\s*true', self.report_issue,
+             "webContentsDebuggingEnabled is true. Remote WebView debugging must be off in release builds."),
+            (r'\bserver\W*:\s*\{[^}]*\burl\W*:', self.report_issue,
+             "server.url is set. The app will load that dev server instead of the bundled webDir."),
+            (r'cleartext\W*:\s*true', self.report_warning,
+             "cleartext is true. Plain-HTTP traffic from the WebView is allowed."),
+            (r'allowMixedContent\W*:\s*true', self.report_warning,
+             "allowMixedContent is true. HTTPS pages may load HTTP resources."),
+        )
+        for pattern, report, message in checks:
+            if scan.search(pattern):
+                report("Capacitor Config", message)
+            else:
+                self.passed_count += 1
+
     def audit_directory(self, directory: str) -> None:
+        self.root = directory
+        if self.capacitor is None:
+            self.detect_capacitor(directory)
+        self.audit_capacitor_config(directory)
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
         for root, dirs, files in os.walk(directory):
             dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
@@ -621,47 +987,92 @@ class MobileAuditor:
     def get_report(self):
         return {
             "files_checked": self.files_checked,
+            "files_skipped": self.files_skipped,
+            "bytes_read": self.bytes_read,
             "issues": self.issues,
             "warnings": self.warnings,
             "passed_checks": self.passed_count,
+            "findings": self.findings,
+            "frameworks": self.frameworks,
+            **({"capacitor": self.capacitor} if self.capacitor else {}),
             "compliant": len(self.issues) == 0
         }
 
+    def write_results(self, writer: ResultWriter) -> None:
+        for finding in self.findings:
+            extra = {k: v for k, v in finding.items() if k not in ("tag", "severity", "message")}
+            writer.add(f"mobile/{slugify(finding['tag'])}", finding["severity"], finding["message"], **extra)
+
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
+        print("Usage: python mobile_audit.py <directory> [--json|--jsonl] [--profile [FILE]] "
+              "[--header-kb N] [--no-cache]")
         sys.exit(1)
 
     path = sys.argv[1]
     is_json = "--json" in sys.argv
-
-    auditor = MobileAuditor()
+    writer = ResultWriter.from_argv("mobile_audit")
+
+    profiler = profile_from_argv("mobile_audit")
+    guard = ScanGuard.from_argv()
+    header_kb = HEADER_KB
+    if "--header-kb" in sys.argv:
+        index = sys.argv.index("--header-kb") + 1
+        value = sys.argv[index] if index < len(sys.argv) else ""
+        if not value.isdigit() or int(value) <= 0:
+            print(f"usage error: --header-kb expects a positive whole number of KB, got {value!r}",
+                  file=sys.stderr)
+            sys.exit(2)
+        header_kb = int(value)
+    classify_cache = None
+    if "--no-cache" not in sys.argv:
+        classify_cache = FileCache(f"mobile_audit/classify-v{CLASSIFIER_VERSION}-{header_kb}k")
+    auditor = MobileAuditor(profiler=profiler, guard=guard, header_kb=header_kb,
+                            classify_cache=classify_cache)
+    auditor.detect_capacitor(path)
     if os.path.isfile(path):
         auditor.audit_file(path)
     else:
         auditor.audit_directory(path)
+    if classify_cache is not None:
+        classify_cache.save()
 
     report = auditor.get_report()
-
-    if is_json:
-        print(json.dumps(report, indent=2))
-    else:
-        print(f"\n[MOBILE AUDIT] {report['files_checked']} mobile files checked")
-        print("-" * 50)
-        if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
-            for i in report['issues'][:10]:
-                print(f"  - {i}")
-        if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
-            for w in report['warnings'][:15]:
-                print(f"  - {w}")
-        print(f"[+] PASSED CHECKS: {report['passed_checks']}")
-        status = "PASS" if report['compliant'] else "FAIL"
-        print(f"STATUS: {status}")
-
-    sys.exit(0 if report['compliant'] else 1)
+    if profiler:
+        finish_profile(profiler)
+        report['profile'] = profiler.to_dict()
+    finish_guard(guard)
+    guard_stats = {'scan_guard': guard.to_dict()} if guard.eventful else {}
+    report.update(guard_stats)
+    auditor.write_results(writer)
+    summary = writer.finish(report['compliant'], files_checked=report['files_checked'],
+                            files_skipped=report['files_skipped'], bytes_read=report['bytes_read'],
+                            passed_checks=report['passed_checks'], frameworks=report['frameworks'],
+                            **guard_stats)
+
+    if not writer.enabled:
+        if is_json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"\n[MOBILE AUDIT] {report['files_checked']} mobile files checked "
+                  f"({report['files_skipped']} non-mobile files skipped)")
+            print("-" * 50)
+            if report['issues']:
+                print(f"[!] ISSUES ({len(report['issues'])}):")
+                for i in report['issues'][:10]:
+                    print(f"  - {i}")
+            if report['warnings']:
+                print(f"[*] WARNINGS ({len(report['warnings'])}):")
+                for w in report['warnings'][:15]:
+                    print(f"  - {w}")
+            print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+            if 'suppressed' in summary['stats']:
+                print(f"[=] BASELINE: {summary['stats']['new']} new, {summary['stats']['suppressed']} known (suppressed)")
+            status = "PASS" if summary['passed'] else "FAIL"
+            print(f"STATUS: {status}")
+
+    sys.exit(0 if summary['passed'] else 1)
 
 
 if __name__ == "__main__":
@@ -7,8 +7,16 @@ Based on Vercel Engineering best practices
 
 import os
 import re
+import sys
 from pathlib import Path
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.jsx import parse_markup  # noqa: E402
+from validation.results import ResultWriter, slugify  # noqa: E402
+
+SOURCE_SKIP_DIRS = {'node_modules', '.git', '.next', 'dist', 'build', 'coverage'}
+
 class PerformanceChecker:
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
@@ -16,6 +24,14 @@ class PerformanceChecker:
         self.warnings = []
         self.passed = []
 
+    def source_files(self, *suffixes):
+        """Project source files with the given suffixes (pathlib globs have no {a,b} syntax)."""
+        for root, dirs, files in os.walk(self.project_path):
+            dirs[:] = [d for d in dirs if d not in SOURCE_SKIP_DIRS]
+            for name in files:
+                if name.endswith(suffixes):
+                    yield Path(root) / name
+
     def check_waterfalls(self):
         """Check for sequential await patterns (Section 1)"""
         print("\n[*] Checking for waterfalls (sequential awaits)...")
@@ -157,15 +173,15 @@ class PerformanceChecker:
         """Check for unoptimized images (Section 6)"""
         print("[*] Checking for image optimization...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
+        for filepath in self.source_files('.ts', '.tsx', '.js', '.jsx'):
             if 'node_modules' in str(filepath):
                 continue
 
             try:
                 content = filepath.read_text(encoding='utf-8')
 
-                # Check for <img> tags instead of next/image
-                if '<img' in content and 'next/image' not in content:
+                # Check for <img> elements instead of next/image
+                if 'next/image' not in content and any(parse_markup(content, filepath.name).find('img')):
                     self.warnings.append({
                         'file': str(filepath.relative_to(self.project_path)),
                         'type': 'MEDIUM',
@@ -212,6 +228,17 @@ class PerformanceChecker:
             print("\n[ACTION REQUIRED] Review and fix issues above")
             print("Priority: CRITICAL > HIGH > MEDIUM > LOW")
 
+    def write_results(self, writer):
+        """Record issues and warnings as protocol findings."""
+        for item in self.issues + self.warnings:
+            severity = item['type']
+            if item in self.warnings and severity == 'CRITICAL':
+                # Warnings carry their section's priority label; keep them below real issues
+                severity = 'high'
+            writer.add(f"react/{slugify(item['issue'])}", severity,
+                       f"{item['issue']} - {item['fix']}", file=item['file'],
+                       reference=item['section'])
+
     def run(self):
         """Run all checks"""
         print("="*60)
@@ -230,13 +257,13 @@ class PerformanceChecker:
 
 
 def main():
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python react_performance_checker.py <project_path>")
         sys.exit(1)
 
     project_path = sys.argv[1]
+    writer = ResultWriter("react_performance_checker", enabled="--jsonl" in sys.argv)
+    writer.claim_stdout()
 
     if not os.path.exists(project_path):
         print(f"[ERROR] Path not found: {project_path}")
@@ -244,6 +271,9 @@ def main():
 
     checker = PerformanceChecker(project_path)
     checker.run()
+    checker.write_results(writer)
+    writer.finish(not any(i['type'] == 'CRITICAL' for i in checker.issues),
+                  issues=len(checker.issues), warnings=len(checker.warnings))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: bundle_analyzer.py
+Purpose: Attribute a Vite build to source modules and npm packages, and enforce size budgets, offline
+Usage: python bundle_analyzer.py <project_path> [--budgets FILE] [--save-baseline] [--output json|summary] [--jsonl]
+Output: JSON with chunk, package and module sizes plus findings
+
+Reads dist/ (run `npm run build` first; nothing is built or fetched here):
+1. Chunks - raw, gzip and brotli size of every JS/CSS file, compressed in a
+   thread pool (brotli needs `pip install brotli`)
+2. Attribution - bytes per source module and npm package from source maps
+   (build.sourcemap: true or "hidden"), else the Vite manifest
+   (build.manifest: true), else chunk file names
+3. Initial load - what index.html loads before any lazy import()
+4. Budgets - per-chunk and initial-load limits in KB, from --budgets FILE or
+   bundle-budgets.json in the project, e.g.
+       {"initial": {"gzip": 300}, "chunk": {"gzip": 200},
+        "chunks": {"assets/index.js": {"gzip": 250}}}
+   ("chunks" keys are globs over hash-free chunk names)
+5. Baseline - growth of chunks, packages and the initial load since the size
+   baseline saved with --save-baseline
+
+Exceeding a budget fails the run. Compressed sizes and attributions are
+cached per chunk in .agent/.cache/ and reused while the file is unchanged.
+"""
+import argparse
+import fnmatch
+import gzip
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.dist import DistIndex  # noqa: E402
+from validation.filecache import CACHE_ROOT, FileCache  # noqa: E402
+from validation.results import ResultWriter  # noqa: E402
+from validation.sourcemap import UNMAPPED, attribute_bytes, find_source_map, package_of  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Fix Windows console encoding for Unicode output
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass  # Python < 3.7
+
+
+# ============================================================================
+#  CONFIGURATION
+# ============================================================================
+
+BUDGET_FILES = ("bundle-budgets.json", ".agent/bundle-budgets.json")
+# KB limits used when the project configures none
+DEFAULT_BUDGETS = {"initial": {"gzip": 350}, "chunk": {"gzip": 250}, "chunks": {}}
+METRICS = ("raw", "gzip", "brotli")
+
+BASELINE_PATH = CACHE_ROOT / "bundle_analyzer" / "baseline.json"
+BASELINE_FORMAT = 1
+# Growth since the baseline worth a finding: both relative and absolute (gzip bytes)
+GROWTH_PERCENT = 10
+GROWTH_MIN_BYTES = 2048
+
+ANALYZER_VERSION = 1
+CHUNK_CACHE = f"bundle_analyzer/chunks-v{ANALYZER_VERSION}{'-br' if brotli else ''}"
+SKIP_SOURCE_DIRS = {"node_modules", ".git", "dist", "build"}
+
+
+# ============================================================================
+#  PER-CHUNK WORK (runs in the thread pool)
+# ============================================================================
+
+def compressed_sizes(data: bytes) -> Dict[str, Optional[int]]:
+    """gzip -9 and brotli (quality 11) sizes, as a server would precompress them."""
+    return {
+        "gzip": len(gzip.compress(data, compresslevel=9, mtime=0)),
+        "brotli": len(brotli.compress(data, quality=11)) if brotli else None,
+    }
+
+
+def analyze_chunk(build: DistIndex, file: str, project_path: str,
+                  stems: Dict[str, str]) -> Dict[str, Any]:
+    """Sizes of one emitted file and the source modules its bytes came from."""
+    path = build.dist / file
+    data = path.read_bytes()
+    result = {"raw": len(data)}
+    result.update(compressed_sizes(data))
+
+    modules: Dict[str, int] = {}
+    attribution = "file-name"
+    if file.endswith((".js", ".mjs")):
+        code = data.decode("utf-8", errors="replace")
+        source_map = find_source_map(path, code)
+        if source_map is not None:
+            try:
+                modules = attribute_bytes(code, source_map, str(path.parent), project_path)
+                attribution = "sourcemap"
+            except (KeyError, IndexError, ValueError):
+                modules = {}
+    if not modules:
+        owner = None
+        for key, chunk in (build.manifest or {}).items():
+            if chunk.get("file") == file or file in chunk.get("css", []):
+                owner = key if not key.startswith("_") else chunk.get("src") or key
+                attribution = "manifest"
+                break
+        if owner is None:
+            name = Path(build.stable_name(file)).stem
+            owner = stems.get(name, f"[chunk] {name}")
+        modules = {owner: len(data)}
+    result["modules"] = modules
+    result["attribution"] = attribution
+    return result
+
+
+def source_stems(project_path: str) -> Dict[str, str]:
+    """File stem -> src/ path, for stems that name exactly one source module."""
+    seen: Dict[str, Optional[str]] = {}
+    src = Path(project_path) / "src"
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_SOURCE_DIRS]
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if ext in (".ts", ".tsx", ".js", ".jsx", ".css"):
+                rel = os.path.relpath(os.path.join(dirpath, filename), project_path).replace(os.sep, "/")
+                seen[stem] = None if stem in seen else rel
+    return {stem: rel for stem, rel in seen.items() if rel}
+
+
+# ============================================================================
+#  BUDGETS AND BASELINE
+# ============================================================================
+
+def load_budgets(project_path: str, path: Optional[str] = None) -> Dict[str, Any]:
+    candidates = [Path(path)] if path else [Path(project_path) / name for name in BUDGET_FILES]
+    for candidate in candidates:
+        if candidate.is_file():
+            data = json.loads(candidate.read_text(encoding="utf-8"))
+            budgets = {"initial": {}, "chunk": {}, "chunks": {}, "source": str(candidate)}
+            budgets.update({k: v for k, v in data.items() if k in ("initial", "chunk", "chunks")})
+            return budgets
+    return dict(DEFAULT_BUDGETS, source="default")
+
+
+def chunk_budget(budgets: Dict[str, Any], key: str) -> Dict[str, float]:
+    for pattern, limits in budgets.get("chunks", {}).items():
+        if fnmatch.fnmatch(key, pattern):
+            return limits
+    return budgets.get("chunk", {})
+
+
+def check_budgets(report: Dict[str, Any], budgets: Dict[str, Any]) -> List[Dict[str, Any]]:
+    findings = []
+    for chunk in report["chunks"]:
+        if chunk["type"] not in ("js", "css"):
+            continue
+        limits = chunk_budget(budgets, chunk["key"])
+        for metric in METRICS:
+            limit = limits.get(metric)
+            if limit is not None and chunk[metric] is not None and chunk[metric] > limit * 1024:
+                findings.append({
+                    "type": "chunk-budget", "severity": "high", "file": f"dist/{chunk['file']}",
+                    "message": f"{chunk['key']} is {_kb(chunk[metric])} {metric}, over its {limit} KB budget",
+                    "metric": metric, "size": chunk[metric], "budget_kb": limit,
+                })
+    for metric in METRICS:
+        limit = budgets.get("initial", {}).get(metric)
+        size = report["initial"][metric]
+        if limit is not None and size is not None and size > limit * 1024:
+            findings.append({
+                "type": "initial-budget", "severity": "high", "file": "dist/index.html",
+                "message": f"Initial load is {_kb(size)} {metric}, over its {limit} KB budget",
+                "metric": metric, "size": size, "budget_kb": limit,
+            })
+    return findings
+
+
+def baseline_snapshot(report: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "format": BASELINE_FORMAT,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "initial": {m: report["initial"][m] for m in METRICS},
+        "chunks": {c["key"]: {m: c[m] for m in METRICS} for c in report["chunks"]},
+        "packages": {p["name"]: p["raw"] for p in report["packages"]},
+    }
+
+
+def save_baseline(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(baseline_snapshot(report), f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if data.get("format") == BASELINE_FORMAT else None
+
+
+def _grew(before: Optional[int], after: Optional[int]) -> bool:
+    if not before or after is None:
+        return False
+    return after - before >= GROWTH_MIN_BYTES and (after - before) * 100 >= GROWTH_PERCENT * before
+
+
+def diff_baseline(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Size changes since the baseline, and findings for significant growth."""
+    metric = "gzip"
+    before_chunks = baseline.get("chunks", {})
+    now_chunks = {c["key"]: c for c in report["chunks"]}
+    changed = []
+    findings = []
+    for key in sorted(set(before_chunks) & set(now_chunks)):
+        before, after = before_chunks[key].get(metric), now_chunks[key][metric]
+        if before != after:
+            changed.append({"key": key, "before": before, "after": after, "delta": (after or 0) - (before or 0)})
+        if _grew(before, after):
+            findings.append({"type": "chunk-growth", "severity": "medium", "file": f"dist/{now_chunks[key]['file']}",
+                             "message": f"{key} grew {_kb(before)} -> {_kb(after)} gzip since the baseline"})
+    before_initial, after_initial = baseline.get("initial", {}).get(metric), report["initial"][metric]
+    if _grew(before_initial, after_initial):
+        findings.append({"type": "initial-growth", "severity": "medium", "file": "dist/index.html",
+                         "message": f"Initial load grew {_kb(before_initial)} -> {_kb(after_initial)} gzip since the baseline"})
+    packages = []
+    now_packages = {p["name"]: p["raw"] for p in report["packages"]}
+    for name in sorted(set(baseline.get("packages", {})) | set(now_packages)):
+        before, after = baseline.get("packages", {}).get(name, 0), now_packages.get(name, 0)
+        if before != after:
+            packages.append({"name": name, "before": before, "after": after, "delta": after - before})
+        if _grew(before, after):
+            findings.append({"type": "package-growth", "severity": "low", "file": None, "package": name,
+                             "message": f"{name} grew {_kb(before)} -> {_kb(after)} in the bundle since the baseline"})
+    changed.sort(key=lambda c: -abs(c["delta"]))
+    packages.sort(key=lambda p: -abs(p["delta"]))
+    return {
+        "created": baseline.get("created"),
+        "initial": {"before": before_initial, "after": after_initial,
+                    "delta": (after_initial or 0) - (before_initial or 0)},
+        "added": sorted(set(now_chunks) - set(before_chunks)),
+        "removed": sorted(set(before_chunks) - set(now_chunks)),
+        "changed": changed,
+        "packages": packages,
+        "findings": findings,
+    }
+
+
+# ============================================================================
+#  ANALYSIS
+# ============================================================================
+
+def _kb(size: Optional[int]) -> str:
+    return "n/a" if size is None else f"{size / 1024:.1f} KB"
+
+
+def _chunk_keys(build: DistIndex, files: List[str], results: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """Stable chunk names across builds; repeated names ("index") are told apart by their main module."""
+    names: Dict[str, List[str]] = {}
+    for file in files:
+        names.setdefault(build.stable_name(file), []).append(file)
+    keys = {}
+    for name, group in names.items():
+        for file in group:
+            if len(group) == 1:
+                keys[file] = name
+                continue
+            modules = {m: b for m, b in results[file]["modules"].items() if m != UNMAPPED}
+            main = max(modules, key=modules.get) if modules else file
+            keys[file] = f"{name}#{main}"
+    return keys
+
+
+def run_analysis(project_path: str, budgets: Dict[str, Any], workers: Optional[int] = None,
+                 top: int = 20) -> Dict[str, Any]:
+    build = DistIndex.load(project_path)
+    report: Dict[str, Any] = {
+        "project": os.path.abspath(project_path),
+        "timestamp": datetime.now().isoformat(),
+        "brotli": brotli is not None,
+        "budgets": budgets,
+        "findings": [],
+    }
+    if build is None:
+        report["dist"] = None
+        report["findings"].append({"type": "no-build", "severity": "info", "file": None,
+                                   "message": "No dist/ build found; run `npm run build` first"})
+        return report
+
+    files = build.code_files()
+    cache = FileCache(CHUNK_CACHE)
+    stems = source_stems(project_path)
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for file in files:
+        cached = cache.get(str(build.dist / file))
+        if cached is not None:
+            results[file] = cached
+        else:
+            pending.append(file)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for file, result in zip(pending, pool.map(lambda f: analyze_chunk(build, f, project_path, stems), pending)):
+            results[file] = result
+            cache.put(str(build.dist / file), result)
+    cache.save()
+
+    initial = build.initial_files()
+    keys = _chunk_keys(build, files, results)
+    chunks = []
+    for file in files:
+        result = results[file]
+        chunks.append({
+            "file": file, "key": keys[file], "type": "css" if file.endswith(".css") else "js",
+            "raw": result["raw"], "gzip": result["gzip"], "brotli": result["brotli"],
+            "initial": file in initial, "attribution": result["attribution"],
+            "modules": sorted(result["modules"].items(), key=lambda kv: -kv[1])[:5],
+        })
+    chunks.sort(key=lambda c: -c["gzip"])
+
+    modules: Dict[str, Dict[str, Any]] = {}
+    packages: Dict[str, Dict[str, Any]] = {}
+    for file in files:
+        result = results[file]
+        ratio = result["gzip"] / result["raw"] if result["raw"] else 0
+        for module, size in result["modules"].items():
+            entry = modules.setdefault(module, {"module": module, "raw": 0, "gzip_estimate": 0, "chunks": []})
+            entry["raw"] += size
+            entry["gzip_estimate"] += round(size * ratio)
+            entry["chunks"].append(keys[file])
+            name = package_of(module) if not module.startswith("[") else module
+            pkg = packages.setdefault(name, {"name": name, "raw": 0, "gzip_estimate": 0, "modules": 0})
+            pkg["raw"] += size
+            pkg["gzip_estimate"] += round(size * ratio)
+            pkg["modules"] += 1
+
+    def total(selected, metric):
+        values = [results[f][metric] for f in selected]
+        return None if any(v is None for v in values) else sum(values)
+
+    js = [f for f in files if not f.endswith(".css")]
+    css = [f for f in files if f.endswith(".css")]
+    report.update({
+        "dist": str(build.dist),
+        "attribution": sorted({r["attribution"] for r in results.values()}),
+        "totals": {
+            "js": {m: total(js, m) for m in METRICS},
+            "css": {m: total(css, m) for m in METRICS},
+            "other_assets": sum(size for f, size in build.sizes.items() if f not in results),
+        },
+        "initial": dict({m: total(initial & set(files), m) for m in METRICS}, files=sorted(initial)),
+        "chunks": chunks,
+        "packages": sorted(packages.values(), key=lambda p: -p["raw"]),
+        "modules": sorted(modules.values(), key=lambda m: -m["raw"])[:top],
+    })
+    report["findings"].extend(check_budgets(report, budgets))
+    return report
+
+
+def write_results(report: Dict[str, Any], writer: ResultWriter) -> None:
+    """Translate the analysis into protocol findings."""
+    for finding in report["findings"]:
+        extra = {k: finding[k] for k in ("metric", "size", "budget_kb", "package") if k in finding}
+        writer.add(f"bundle/{finding['type']}", finding["severity"], finding["message"],
+                   file=finding.get("file"), **extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Attribute Vite build output to modules and packages and enforce size budgets"
+    )
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory (with dist/)")
+    parser.add_argument("--budgets", metavar="FILE", help="Budget JSON (default: bundle-budgets.json)")
+    parser.add_argument("--size-baseline", metavar="FILE", default=str(BASELINE_PATH),
+                        help="Stored size baseline to diff against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this build's sizes as the size baseline")
+    parser.add_argument("--workers", type=int, help="Compression threads (default: Python's pool size)")
+    parser.add_argument("--top", type=int, default=20, help="Modules and packages to list")
+    parser.add_argument("--output", choices=["json", "summary"], default="json",
+                        help="Output format")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+
+    args = parser.parse_args()
+    writer = ResultWriter("bundle_analyzer", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+
+    if not os.path.isdir(args.project_path):
+        if args.jsonl:
+            writer.add("bundle/error", "high", f"Directory not found: {args.project_path}")
+            writer.finish(False)
+        else:
+            print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
+        sys.exit(1)
+
+    try:
+        budgets = load_budgets(args.project_path, args.budgets)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"error": f"Could not read budgets: {e}"}))
+        sys.exit(1)
+
+    report = run_analysis(args.project_path, budgets, workers=args.workers, top=max(1, args.top))
+    size_baseline = Path(args.size_baseline)
+    if report.get("dist"):
+        previous = load_baseline(size_baseline)
+        if previous is not None:
+            report["baseline"] = diff_baseline(report, previous)
+            report["findings"].extend(report["baseline"].pop("findings"))
+        if args.save_baseline:
+            save_baseline(report, size_baseline)
+            report["baseline_saved"] = str(size_baseline)
+    report["packages"] = report.get("packages", [])[:args.top]
+
+    over_budget = [f for f in report["findings"] if f["type"].endswith("-budget")]
+    write_results(report, writer)
+    summary = writer.finish(not over_budget, budget_failures=len(over_budget),
+                            total_findings=len(report["findings"]))
+
+    if not writer.enabled:
+        if args.output == "summary":
+            print(f"\n{'='*60}")
+            print(f"Bundle Analysis: {report['project']}")
+            print(f"{'='*60}")
+            if not report.get("dist"):
+                print("No dist/ build found; run `npm run build` first")
+            else:
+                t = report["totals"]
+                print(f"JS:  {_kb(t['js']['raw'])} raw, {_kb(t['js']['gzip'])} gzip, {_kb(t['js']['brotli'])} brotli")
+                print(f"CSS: {_kb(t['css']['raw'])} raw, {_kb(t['css']['gzip'])} gzip")
+                i = report["initial"]
+                print(f"Initial load ({len(i['files'])} files): {_kb(i['raw'])} raw, {_kb(i['gzip'])} gzip")
+                print(f"Attribution: {', '.join(report['attribution'])} (budgets: {budgets['source']})")
+                print("\nLargest chunks (gzip):")
+                for chunk in report["chunks"][:10]:
+                    flag = " [initial]" if chunk["initial"] else ""
+                    print(f"  {_kb(chunk['gzip']):>10}  {chunk['key']}{flag}")
+                print("\nLargest packages (raw):")
+                for pkg in report["packages"][:10]:
+                    print(f"  {_kb(pkg['raw']):>10}  {pkg['name']}")
+                if "baseline" in report:
+                    b = report["baseline"]
+                    print(f"\nSince baseline ({b['created']}): initial {b['initial']['delta']:+d} B gzip, "
+                          f"{len(b['added'])} added, {len(b['removed'])} removed, {len(b['changed'])} changed")
+            for finding in report["findings"]:
+                print(f"  [{finding['severity']}] {finding['message']}")
+            print()
+        else:
+            print(json.dumps(report, indent=2))
+
+    sys.exit(0 if summary["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,55 +3,112 @@
 Skill: performance-profiling
 Script: lighthouse_audit.py
 Purpose: Run Lighthouse performance audit on a URL
-Usage: python lighthouse_audit.py https://example.com
+Usage: python lighthouse_audit.py https://example.com [--jsonl]
+       python lighthouse_audit.py <project_path> https://example.com
+       python lighthouse_audit.py <project_path> --runs 5 [--concurrency 2] [--preview] [--save-baseline]
 Output: JSON with performance scores
 Note: Requires lighthouse CLI (npm install -g lighthouse)
+
+With --runs N the audit runs N times (up to --concurrency at once; parallel
+runs share the CPU, so keep it low when comparing timings). Every full
+report is kept gzip-compressed under .agent/.cache/lighthouse/reports/
+with an index in runs.jsonl, and the run reports the median LCP, TBT, CLS
+and INP (INP only exists in timespan/user-flow reports; navigation runs
+leave it null). Instead of absolute scores, that mode fails only when a
+median regresses past its tolerance against the baseline stored for the
+URL's path with --save-baseline.
+
+Without a URL, --preview starts the local preview (.agent/scripts/auto_preview.py)
+on --port, waits until it answers over HTTP, audits it and stops it again.
 """
+import argparse
+import gzip
 import subprocess
 import json
+import statistics
 import sys
 import os
 import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.filecache import CACHE_ROOT  # noqa: E402
+from validation.preview import ensure_preview, stop_preview  # noqa: E402
+from validation.results import ResultWriter  # noqa: E402
+
+STORE_DIR = CACHE_ROOT / "lighthouse"
+REPORTS_DIR = STORE_DIR / "reports"
+RUN_INDEX = STORE_DIR / "runs.jsonl"
+BASELINE_FILE = STORE_DIR / "baseline.json"
+STORE_KEEP = 200          # Full reports kept; older ones are pruned
+CATEGORIES = "performance,accessibility,best-practices,seo"
+RUN_TIMEOUT = 120
+
+# metric -> (audit id, relative tolerance, absolute tolerance); a median
+# regresses when it grows by more than both
+METRICS = {
+    "lcp": ("largest-contentful-paint", 0.10, 100),
+    "tbt": ("total-blocking-time", 0.20, 50),
+    "cls": ("cumulative-layout-shift", 0.10, 0.02),
+    "inp": ("interaction-to-next-paint", 0.10, 50),
+}
+
+def lighthouse_command(url: str, output_path: str, categories: str = CATEGORIES) -> List[str]:
+    return [
+        "lighthouse",
+        url,
+        "--output=json",
+        f"--output-path={output_path}",
+        "--chrome-flags=--headless",
+        f"--only-categories={categories}"
+    ]
+
+def extract_scores(categories: dict) -> dict:
+    return {
+        "performance": int((categories.get("performance", {}).get("score") or 0) * 100),
+        "accessibility": int((categories.get("accessibility", {}).get("score") or 0) * 100),
+        "best_practices": int((categories.get("best-practices", {}).get("score") or 0) * 100),
+        "seo": int((categories.get("seo", {}).get("score") or 0) * 100)
+    }
+
+def extract_metrics(report: dict) -> Dict[str, Optional[float]]:
+    """Numeric values of the tracked audits (ms, CLS unitless); None when absent."""
+    audits = report.get("audits", {})
+    return {name: (audits.get(audit) or {}).get("numericValue") for name, (audit, _, _) in METRICS.items()}
 
 def run_lighthouse(url: str) -> dict:
     """Run Lighthouse audit on URL."""
     try:
         with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
             output_path = f.name
-        
+
         result = subprocess.run(
-            [
-                "lighthouse",
-                url,
-                "--output=json",
-                f"--output-path={output_path}",
-                "--chrome-flags=--headless",
-                "--only-categories=performance,accessibility,best-practices,seo"
-            ],
+            lighthouse_command(url, output_path),
             capture_output=True,
             text=True,
-            timeout=120
+            timeout=RUN_TIMEOUT
         )
-        
-        if os.path.exists(output_path):
+
+        if os.path.exists(output_path) and os.path.getsize(output_path):
             with open(output_path, 'r') as f:
                 report = json.load(f)
             os.unlink(output_path)
-            
+
             categories = report.get("categories", {})
             return {
                 "url": url,
-                "scores": {
-                    "performance": int(categories.get("performance", {}).get("score", 0) * 100),
-                    "accessibility": int(categories.get("accessibility", {}).get("score", 0) * 100),
-                    "best_practices": int(categories.get("best-practices", {}).get("score", 0) * 100),
-                    "seo": int(categories.get("seo", {}).get("score", 0) * 100)
-                },
+                "scores": extract_scores(categories),
                 "summary": get_summary(categories)
             }
         else:
             return {"error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
-            
+
     except subprocess.TimeoutExpired:
         return {"error": "Lighthouse audit timed out"}
     except FileNotFoundError:
@@ -59,7 +116,7 @@ def run_lighthouse(url: str) -> dict:
 
 def get_summary(categories: dict) -> str:
     """Generate summary based on scores."""
-    perf = categories.get("performance", {}).get("score", 0) * 100
+    perf = (categories.get("performance", {}).get("score") or 0) * 100
     if perf >= 90:
         return "[OK] Excellent performance"
     elif perf >= 50:
@@ -67,10 +124,229 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
+def write_results(result: dict, writer: ResultWriter) -> bool:
+    """Record low category scores as protocol findings. Returns pass/fail."""
+    if "error" in result:
+        writer.add("lighthouse/error", "high", result["error"], url=result.get("url"))
+        return False
+    for category, score in result["scores"].items():
+        if score < 90:
+            writer.add(f"lighthouse/{category.replace('_', '-')}", "high" if score < 50 else "medium",
+                       f"{category.replace('_', ' ').title()} score {score}/100", url=result["url"], score=score)
+    return result["scores"]["performance"] >= 50
+
+# ----------------------------------------------------------------------------
+# Repeated runs, report store and baseline
+# ----------------------------------------------------------------------------
+
+def url_key(url: str) -> str:
+    """Baseline key: the path and query, so preview ports and hosts may differ."""
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+def store_report(raw: bytes, record: Dict[str, Any]) -> str:
+    """Gzip one full report into the store and index it; returns its path."""
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.json.gz"
+    path = REPORTS_DIR / name
+    with gzip.open(path, "wb", compresslevel=6) as f:
+        f.write(raw)
+    record = dict(record, report=str(path.relative_to(STORE_DIR)))
+    with open(RUN_INDEX, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return str(path)
+
+def prune_store(keep: int = STORE_KEEP) -> None:
+    """Drop the oldest reports past `keep`, and their lines in the index."""
+    reports = sorted(REPORTS_DIR.glob("*.json.gz"))
+    stale = reports[:max(0, len(reports) - keep)]
+    if not stale:
+        return
+    for path in stale:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    dropped = {str(path.relative_to(STORE_DIR)) for path in stale}
+    try:
+        lines = RUN_INDEX.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return
+    kept = [line for line in lines if line.strip() and json.loads(line).get("report") not in dropped]
+    RUN_INDEX.write_text("".join(line + "\n" for line in kept), encoding="utf-8")
+
+def load_stored_report(path: str) -> dict:
+    """A stored report by its path (absolute, or relative to the store)."""
+    full = Path(path) if Path(path).is_absolute() else STORE_DIR / path
+    with gzip.open(full, "rb") as f:
+        return json.loads(f.read())
+
+def run_once(url: str, index: int, series: str) -> dict:
+    """One audit; the full report goes to the store, the metrics come back."""
+    fd, output_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        result = subprocess.run(lighthouse_command(url, output_path), capture_output=True,
+                                text=True, timeout=RUN_TIMEOUT)
+        raw = Path(output_path).read_bytes()
+        if not raw:
+            return {"run": index, "error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
+        report = json.loads(raw)
+    except subprocess.TimeoutExpired:
+        return {"run": index, "error": "Lighthouse audit timed out"}
+    except FileNotFoundError:
+        return {"run": index, "error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
+    except ValueError as e:
+        return {"run": index, "error": f"Unreadable Lighthouse report: {e}"}
+    finally:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+    record = {
+        "series": series, "run": index, "url": url, "key": url_key(url),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "lighthouse": report.get("lighthouseVersion"),
+        "scores": extract_scores(report.get("categories", {})),
+        "metrics": extract_metrics(report),
+    }
+    record["report"] = store_report(raw, record)
+    return record
+
+def summarize(runs: List[dict]) -> Dict[str, Any]:
+    """Median, min and max of every metric and score over the successful runs."""
+    ok = [r for r in runs if "error" not in r]
+    summary: Dict[str, Any] = {"runs": len(runs), "succeeded": len(ok), "metrics": {}, "scores": {}}
+    for name in METRICS:
+        values = [r["metrics"][name] for r in ok if r["metrics"].get(name) is not None]
+        summary["metrics"][name] = ({"median": statistics.median(values), "min": min(values),
+                                     "max": max(values), "samples": len(values)} if values else None)
+    for name in ("performance", "accessibility", "best_practices", "seo"):
+        values = [r["scores"][name] for r in ok]
+        summary["scores"][name] = statistics.median(values) if values else None
+    return summary
+
+def load_baselines(path: Path = BASELINE_FILE) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(key: str, summary: Dict[str, Any], path: Path = BASELINE_FILE) -> None:
+    baselines = load_baselines(path)
+    baselines[key] = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "runs": summary["succeeded"],
+        "metrics": {name: m["median"] for name, m in summary["metrics"].items() if m},
+        "scores": summary["scores"],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2)
+    os.replace(tmp, path)
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Medians that grew past both tolerances of their metric."""
+    regressions = []
+    for name, (audit, relative, absolute) in METRICS.items():
+        before = baseline.get("metrics", {}).get(name)
+        now = summary["metrics"].get(name)
+        if before is None or now is None:
+            continue
+        growth = now["median"] - before
+        if growth > absolute and growth > before * relative:
+            regressions.append({"metric": name, "audit": audit, "baseline": before,
+                                "median": now["median"], "delta": growth})
+    return regressions
+
+def run_series(url: str, runs: int, concurrency: int) -> Dict[str, Any]:
+    series = uuid.uuid4().hex[:12]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(lambda i: run_once(url, i, series), range(1, runs + 1)))
+    prune_store()
+    return {"url": url, "key": url_key(url), "series": series, "results": results,
+            "summary": summarize(results)}
+
+def series_findings(series: Dict[str, Any], regressions: List[dict], writer: ResultWriter) -> bool:
+    """Protocol findings for a series; passes unless a median regressed or every run failed."""
+    summary = series["summary"]
+    for result in series["results"]:
+        if "error" in result:
+            writer.add("lighthouse/error", "high" if not summary["succeeded"] else "low",
+                       f"Run {result['run']}: {result['error']}", url=series["url"])
+    for r in regressions:
+        writer.add(f"lighthouse/regression-{r['metric']}", "high",
+                   f"{r['metric'].upper()} median {r['median']:.4g} vs baseline {r['baseline']:.4g}",
+                   url=series["url"], metric=r["metric"], median=r["median"], baseline=r["baseline"])
+    return bool(summary["succeeded"]) and not regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Lighthouse audits")
+    parser.add_argument("targets", nargs="*", help="[project_path] [url]")
+    parser.add_argument("--runs", type=int, help="Audit N times and report medians")
+    parser.add_argument("--concurrency", type=int, default=1, help="Runs at once (with --runs)")
+    parser.add_argument("--preview", action="store_true", help="Audit the local preview when no URL is given")
+    parser.add_argument("--port", type=int, default=3000, help="Preview port (with --preview)")
+    parser.add_argument("--path", default="/", help="Path to audit on the preview")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the medians as the baseline")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    args = parser.parse_args()
+
+    # checklist.py passes "<project_path> <url>"; standalone use passes just "<url>"
+    urls = [a for a in args.targets if a.startswith(("http://", "https://"))]
+    paths = [a for a in args.targets if a not in urls]
+    project_path = paths[0] if paths else "."
+    writer = ResultWriter("lighthouse_audit", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+
+    started = False
+    url = urls[0] if urls else None
+    if url is None and args.preview:
+        url, started = ensure_preview(project_path, args.port, args.path)
+        if url is None:
+            print(json.dumps({"error": f"Preview did not answer on port {args.port}"}))
+            sys.exit(1)
+    if url is None:
+        if args.runs is not None or not args.targets:
+            print(json.dumps({"error": "Usage: python lighthouse_audit.py <url> (or --preview)"}))
+            sys.exit(1)
+        url = args.targets[-1]
+
+    try:
+        if args.runs is None:
+            result = run_lighthouse(url)
+        else:
+            series = run_series(url, max(1, args.runs), args.concurrency)
+    finally:
+        if started:
+            stop_preview(project_path, args.port)
+
+    if args.runs is None:
+        passed = write_results(result, writer)
+        if not writer.enabled:
+            print(json.dumps(result, indent=2))
+        summary = writer.finish(passed, **result.get("scores", {}))
+        sys.exit(0 if summary["passed"] else 1)
+
+    baseline = load_baselines().get(series["key"])
+    regressions = compare(series["summary"], baseline) if baseline else []
+    series["baseline"] = baseline
+    series["regressions"] = regressions
+    if args.save_baseline and series["summary"]["succeeded"]:
+        save_baseline(series["key"], series["summary"])
+        series["baseline_saved"] = True
+
+    passed = series_findings(series, regressions, writer)
+    if not writer.enabled:
+        print(json.dumps(series, indent=2))
+    summary = writer.finish(passed, runs=series["summary"]["runs"], succeeded=series["summary"]["succeeded"],
+                            **{f"median_{k}": v["median"] for k, v in series["summary"]["metrics"].items() if v})
+    sys.exit(0 if summary["passed"] else 1)
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
-        sys.exit(1)
-    
-    result = run_lighthouse(sys.argv[1])
-    print(json.dumps(result, indent=2))
+    main()
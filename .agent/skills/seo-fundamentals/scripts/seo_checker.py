@@ -23,6 +23,10 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter, slugify  # noqa: E402
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -90,7 +94,7 @@ def find_pages(project_path: Path) -> list:
             if is_page_file(f):
                 files.append(f)
     
-    return files[:50]  # Limit to 50 files
+    return files
 
 
 def check_page(file_path: Path) -> dict:
@@ -147,6 +151,8 @@ def check_page(file_path: Path) -> dict:
 
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    writer = ResultWriter.from_argv("seo_checker")
+    writer.claim_stdout()
     
     print(f"\n{'='*60}")
     print("  SEO CHECKER - Search Engine Optimization Audit")
@@ -163,6 +169,7 @@ def main():
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
         output = {"script": "seo_checker", "files_checked": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
+        writer.finish(True, files_checked=0)
         sys.exit(0)
     
     print(f"Found {len(pages)} page files to analyze\n")
@@ -173,6 +180,9 @@ def main():
         result = check_page(f)
         if result["issues"]:
             all_issues.append(result)
+            for issue in result["issues"]:
+                writer.add(f"seo/{slugify(issue)}", "medium", issue,
+                           file=str(f.relative_to(project_path)))
     
     # Summary
     print("=" * 60)
@@ -200,6 +210,8 @@ def main():
     
     total_issues = sum(len(item["issues"]) for item in all_issues)
     passed = total_issues == 0
+    summary = writer.finish(passed, files_checked=len(pages), files_with_issues=len(all_issues))
+    passed = summary["passed"]  # With --baseline, only new issues count
     
     output = {
         "script": "seo_checker",
@@ -209,6 +221,9 @@ def main():
         "issues_found": total_issues,
         "passed": passed
     }
+    if "suppressed" in summary["stats"]:
+        output["new_issues"] = summary["stats"]["new"]
+        output["baseline_suppressed"] = summary["stats"]["suppressed"]
     
     print("\n" + json.dumps(output, indent=2))
     
@@ -5,17 +5,44 @@ Runs tests and generates coverage report based on project type.
 
 Usage:
     python test_runner.py <project_path> [--coverage]
+    python test_runner.py <project_path> --changed [REF]     # only tests related to changes
+    python test_runner.py <project_path> --shards 4          # 4 vitest processes at once
 
 Supports:
-    - Node.js: npm test, jest, vitest
+    - Node.js: vitest (JSON reporter, --changed, sharding), jest, npm test
     - Python: pytest, unittest
+
+Vitest runs are read from its JSON reporter instead of scraping stdout.
+With --changed, vitest picks the test files related to files changed since
+REF (uncommitted changes by default). --shards N splits the test files into N
+groups balanced by each file's median duration in earlier runs, slowest
+first, runs them as N vitest processes at once and merges the results.
+
+Every vitest run's per-test durations and outcomes go to a SQLite history
+(see .agent/.shared/validation/testdb.py). The summary lists the slowest
+tests by p90 duration and the flakiest ones (outcome flips without a code change), and
+flaky tests are reported as low-severity findings.
 """
 
+import argparse
+import json
+import re
+import shutil
+import sqlite3
+import statistics
 import subprocess
 import sys
-import json
-from pathlib import Path
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.results import ResultWriter  # noqa: E402
+from validation.testdb import TestHistory, tree_state  # noqa: E402
 
 # Fix Windows console encoding
 try:
@@ -23,6 +50,19 @@ try:
 except Exception:
     pass
 
+TIMEOUT = 300  # 5 min timeout for tests
+DEFAULT_FILE_SECONDS = 1.0  # Assumed for test files without history
+SLOWEST_SHOWN = 10
+HISTORY_SHOWN = 5
+
+
+def find_binary(project_path: Path, name: str) -> Optional[str]:
+    """The project's own node_modules/.bin tool, else one on PATH."""
+    local = project_path / "node_modules" / ".bin" / (name + (".cmd" if sys.platform == "win32" else ""))
+    if local.exists():
+        return str(local)
+    return shutil.which(name)
+
 
 def detect_test_framework(project_path: Path) -> dict:
     """Detect test framework and commands."""
@@ -32,7 +72,7 @@ def detect_test_framework(project_path: Path) -> dict:
         "cmd": None,
         "coverage_cmd": None
     }
-    
+
     # Node.js project
     package_json = project_path / "package.json"
     if package_json.exists():
@@ -41,43 +81,38 @@ def detect_test_framework(project_path: Path) -> dict:
             pkg = json.loads(package_json.read_text(encoding='utf-8'))
             scripts = pkg.get("scripts", {})
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-            
+            npm = find_binary(project_path, "npm") or "npm"
+
             # Check for test script
-            if "test" in scripts:
-                result["framework"] = "npm test"
-                result["cmd"] = ["npm", "test"]
-                
-                # Try to detect specific framework for coverage
-                if "vitest" in deps:
-                    result["framework"] = "vitest"
-                    result["coverage_cmd"] = ["npx", "vitest", "run", "--coverage"]
-                elif "jest" in deps:
-                    result["framework"] = "jest"
-                    result["coverage_cmd"] = ["npx", "jest", "--coverage"]
-            elif "vitest" in deps:
+            if "vitest" in deps:
+                vitest = find_binary(project_path, "vitest") or "vitest"
                 result["framework"] = "vitest"
-                result["cmd"] = ["npx", "vitest", "run"]
-                result["coverage_cmd"] = ["npx", "vitest", "run", "--coverage"]
+                result["cmd"] = [vitest, "run"]
+                result["coverage_cmd"] = [vitest, "run", "--coverage"]
             elif "jest" in deps:
+                jest = find_binary(project_path, "jest") or "jest"
                 result["framework"] = "jest"
-                result["cmd"] = ["npx", "jest"]
-                result["coverage_cmd"] = ["npx", "jest", "--coverage"]
-                
+                result["cmd"] = [jest]
+                result["coverage_cmd"] = [jest, "--coverage"]
+            elif "test" in scripts:
+                result["framework"] = "npm test"
+                result["cmd"] = [npm, "test"]
+
         except Exception:
             pass
-    
+
     # Python project
     if (project_path / "pyproject.toml").exists() or (project_path / "requirements.txt").exists():
         result["type"] = "python"
         result["framework"] = "pytest"
-        result["cmd"] = ["python", "-m", "pytest", "-v"]
-        result["coverage_cmd"] = ["python", "-m", "pytest", "--cov", "--cov-report=term-missing"]
-    
+        result["cmd"] = [sys.executable, "-m", "pytest", "-v"]
+        result["coverage_cmd"] = [sys.executable, "-m", "pytest", "--cov", "--cov-report=term-missing"]
+
     return result
 
 
-def run_tests(cmd: list, cwd: Path) -> dict:
-    """Run tests and return results."""
+def run_tests(cmd: list, cwd: Path, timeout: int = TIMEOUT) -> dict:
+    """Run tests and return results (stdout parsing, for runners without a JSON report)."""
     result = {
         "passed": False,
         "output": "",
@@ -86,7 +121,7 @@ def run_tests(cmd: list, cwd: Path) -> dict:
         "tests_passed": 0,
         "tests_failed": 0
     }
-    
+
     try:
         proc = subprocess.run(
             cmd,
@@ -95,66 +130,227 @@ def run_tests(cmd: list, cwd: Path) -> dict:
             text=True,
             encoding='utf-8',
             errors='replace',
-            timeout=300,  # 5 min timeout for tests
-            shell=True
+            timeout=timeout
         )
-        
+
         result["output"] = proc.stdout[:3000] if proc.stdout else ""
         result["error"] = proc.stderr[:500] if proc.stderr else ""
         result["passed"] = proc.returncode == 0
-        
-        # Try to parse test counts from output
+
+        # Jest/pytest pattern: "X passed, Y failed"
         output = proc.stdout or ""
-        
-        # Jest/Vitest pattern: "Tests: X passed, Y failed, Z total"
-        if "passed" in output.lower() and "failed" in output.lower():
-            import re
-            match = re.search(r'(\d+)\s+passed', output, re.IGNORECASE)
-            if match:
-                result["tests_passed"] = int(match.group(1))
-            match = re.search(r'(\d+)\s+failed', output, re.IGNORECASE)
-            if match:
-                result["tests_failed"] = int(match.group(1))
-            result["tests_run"] = result["tests_passed"] + result["tests_failed"]
-        
-        # Pytest pattern: "X passed, Y failed"
-        if "pytest" in str(cmd):
-            import re
-            match = re.search(r'(\d+)\s+passed', output)
-            if match:
-                result["tests_passed"] = int(match.group(1))
-            match = re.search(r'(\d+)\s+failed', output)
-            if match:
-                result["tests_failed"] = int(match.group(1))
-            result["tests_run"] = result["tests_passed"] + result["tests_failed"]
-        
+        match = re.search(r'(\d+)\s+passed', output, re.IGNORECASE)
+        if match:
+            result["tests_passed"] = int(match.group(1))
+        match = re.search(r'(\d+)\s+failed', output, re.IGNORECASE)
+        if match:
+            result["tests_failed"] = int(match.group(1))
+        result["tests_run"] = result["tests_passed"] + result["tests_failed"]
+
     except FileNotFoundError:
         result["error"] = f"Command not found: {cmd[0]}"
     except subprocess.TimeoutExpired:
-        result["error"] = "Timeout after 300s"
+        result["error"] = f"Timeout after {timeout}s"
     except Exception as e:
         result["error"] = str(e)
-    
+
     return result
 
 
+# ----------------------------------------------------------------------------
+# Vitest: JSON reporter, related tests, sharding
+# ----------------------------------------------------------------------------
+
+def _relative(path: str, project_path: Path) -> str:
+    try:
+        return Path(path).resolve().relative_to(project_path).as_posix()
+    except ValueError:
+        return path.replace("\\", "/")
+
+
+def list_test_files(vitest: str, project_path: Path, changed: Optional[str], timeout: int) -> Optional[List[str]]:
+    """Test files vitest would run (related to changes with `changed`); None if listing failed."""
+    cmd = [vitest, "list", "--filesOnly", "--json"]
+    if changed:
+        cmd += ["--changed", changed]
+    try:
+        proc = subprocess.run(cmd, cwd=str(project_path), capture_output=True, text=True,
+                              encoding='utf-8', errors='replace', timeout=timeout)
+        entries = json.loads(proc.stdout or "null")
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+    if proc.returncode != 0 or not isinstance(entries, list):
+        return None
+    files = [e.get("file") if isinstance(e, dict) else e for e in entries]
+    return sorted({_relative(f, project_path) for f in files if f})
+
+
+def balance_shards(files: List[str], file_seconds: Dict[str, float], shards: int) -> List[List[str]]:
+    """Longest-first greedy split into `shards` groups of similar total duration."""
+    known = [file_seconds[f] for f in files if f in file_seconds]
+    default = statistics.median(known) if known else DEFAULT_FILE_SECONDS
+    cost = {f: file_seconds.get(f, default) for f in files}
+    groups: List[List[str]] = [[] for _ in range(max(1, min(shards, len(files))))]
+    loads = [0.0] * len(groups)
+    for f in sorted(files, key=lambda f: (-cost[f], f)):
+        i = loads.index(min(loads))
+        groups[i].append(f)
+        loads[i] += cost[f]
+    return groups
+
+
+def parse_vitest_report(data: Dict[str, Any], project_path: Path) -> List[Dict[str, Any]]:
+    """Per-file results from vitest's (Jest-compatible) JSON reporter."""
+    files = []
+    for suite in data.get("testResults", []):
+        start, end = suite.get("startTime"), suite.get("endTime")
+        tests = [{
+            "name": t.get("fullName") or " ".join(t.get("ancestorTitles", []) + [t.get("title", "")]),
+            "status": t.get("status"),
+            "duration_ms": t.get("duration"),
+            "failure": "\n".join(t.get("failureMessages") or []),
+        } for t in suite.get("assertionResults", [])]
+        files.append({
+            "file": _relative(suite.get("name", ""), project_path),
+            "status": suite.get("status"),
+            "duration_s": round((end - start) / 1000, 3) if start and end else 0.0,
+            "message": suite.get("message") or "",
+            "tests": tests,
+        })
+    return files
+
+
+def run_vitest_shard(vitest: str, project_path: Path, index: int, files: Optional[List[str]],
+                     changed: Optional[str], coverage: bool, out_dir: Path, timeout: int) -> Dict[str, Any]:
+    output = out_dir / f"shard-{index}.json"
+    cmd = [vitest, "run", "--reporter=json", f"--outputFile={output}"]
+    if coverage:
+        cmd.append("--coverage")
+    if files is None and changed:
+        cmd += ["--changed", changed]
+    cmd += files or []
+    shard = {"index": index, "files": len(files) if files is not None else None, "exit_code": None, "error": ""}
+    started = time.monotonic()
+    try:
+        proc = subprocess.run(cmd, cwd=str(project_path), capture_output=True, text=True,
+                              encoding='utf-8', errors='replace', timeout=timeout)
+        shard["exit_code"] = proc.returncode
+        try:
+            shard["report"] = json.loads(output.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            shard["error"] = (proc.stderr or proc.stdout or "vitest wrote no report").strip()[-500:]
+    except FileNotFoundError:
+        shard["error"] = f"Command not found: {cmd[0]}"
+    except subprocess.TimeoutExpired:
+        shard["error"] = f"Timeout after {timeout}s"
+    shard["duration_s"] = round(time.monotonic() - started, 2)
+    return shard
+
+
+def run_vitest(vitest: str, project_path: Path, changed: Optional[str] = None, shards: int = 1,
+               coverage: bool = False, timeout: int = TIMEOUT) -> Dict[str, Any]:
+    """Run vitest (sharded when asked) and merge the JSON reports."""
+    try:
+        with TestHistory() as history:
+            file_seconds = history.file_durations()
+    except sqlite3.Error:
+        file_seconds = {}
+    report: Dict[str, Any] = {"changed": changed, "shards": [], "files": [], "errors": []}
+    files = list_test_files(vitest, project_path, changed, timeout) if shards > 1 or changed else None
+    if files == []:
+        report["message"] = "No test files affected" if changed else "No test files found"
+        return report
+    # Coverage from several processes would need merging; keep it to one run
+    groups = balance_shards(files, file_seconds, 1 if coverage else shards) if files else [None]
+
+    started = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="test_runner-") as tmp, \
+            ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        results = list(pool.map(
+            lambda ig: run_vitest_shard(vitest, project_path, ig[0], ig[1], changed, coverage, Path(tmp), timeout),
+            enumerate(groups, 1)))
+    report["wall_s"] = round(time.monotonic() - started, 2)
+
+    for shard in results:
+        data = shard.pop("report", None)
+        if data is not None:
+            report["files"].extend(parse_vitest_report(data, project_path))
+        if shard["error"]:
+            report["errors"].append(f"shard {shard['index']}: {shard['error']}")
+        report["shards"].append(shard)
+    if report["files"]:
+        try:
+            with TestHistory() as history:
+                history.record(report["files"], framework="vitest", tree=tree_state(str(project_path)),
+                               passed=summarize_vitest(report)["passed"], wall_s=report["wall_s"])
+        except sqlite3.Error as e:
+            report["errors"].append(f"test history not saved: {e}")
+    return report
+
+
+def history_summary() -> Dict[str, Any]:
+    """Slowest (p90) and flakiest tests over the recorded runs."""
+    try:
+        with TestHistory() as history:
+            return {"slowest": history.slowest(HISTORY_SHOWN), "flaky": history.flaky(HISTORY_SHOWN)}
+    except sqlite3.Error:
+        return {"slowest": [], "flaky": []}
+
+
+def summarize_vitest(report: Dict[str, Any]) -> Dict[str, Any]:
+    tests = [t for f in report["files"] for t in f["tests"]]
+    counts = {status: sum(t["status"] == status for t in tests) for status in ("passed", "failed")}
+    slowest = sorted(((f["file"], t) for f in report["files"] for t in f["tests"] if t["duration_ms"] is not None),
+                     key=lambda ft: ft[1]["duration_ms"], reverse=True)[:SLOWEST_SHOWN]
+    return {
+        "tests_run": len(tests),
+        "tests_passed": counts["passed"],
+        "tests_failed": counts["failed"],
+        "tests_skipped": len(tests) - counts["passed"] - counts["failed"],
+        # Files that failed without failing tests (import/setup errors)
+        "files_failed": [f["file"] for f in report["files"]
+                         if f["status"] == "failed" and not any(t["status"] == "failed" for t in f["tests"])],
+        "slowest": [{"file": file, "name": t["name"], "duration_ms": t["duration_ms"]} for file, t in slowest],
+        "passed": not report["errors"] and not counts["failed"] and all(f["status"] != "failed" for f in report["files"]),
+    }
+
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    with_coverage = "--coverage" in sys.argv
-    
+    parser = argparse.ArgumentParser(description="Unified test execution and coverage reporting")
+    parser.add_argument("project_path", nargs="?", default=".")
+    parser.add_argument("--coverage", action="store_true", help="Collect coverage")
+    parser.add_argument("--changed", nargs="?", const="HEAD", metavar="REF",
+                        help="Only tests related to files changed since REF (default: uncommitted changes)")
+    parser.add_argument("--shards", type=int, default=1, help="Vitest processes to split the test files across")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT, help="Seconds per test process")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path).resolve()
+    with_coverage = args.coverage
+    writer = ResultWriter("test_runner", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+    writer.claim_stdout()
+
     print(f"\n{'='*60}")
     print("[TEST RUNNER] Unified Test Execution")
     print(f"{'='*60}")
     print(f"Project: {project_path}")
     print(f"Coverage: {'enabled' if with_coverage else 'disabled'}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
+
     # Detect test framework
     test_info = detect_test_framework(project_path)
     print(f"Type: {test_info['type']}")
     print(f"Framework: {test_info['framework']}")
     print("-"*60)
-    
+
     if not test_info["cmd"]:
         print("No test framework found for this project.")
         output = {
@@ -166,17 +362,101 @@ def main():
             "message": "No tests configured"
         }
         print(json.dumps(output, indent=2))
+        writer.finish(True, tests_run=0)
         sys.exit(0)
-    
+
+    if test_info["framework"] == "vitest":
+        vitest = test_info["cmd"][0]
+        print(f"Running: vitest{' --changed ' + args.changed if args.changed else ''}"
+              f"{f' in {args.shards} shards' if args.shards > 1 else ''}")
+        print("-"*60)
+        report = run_vitest(vitest, project_path, args.changed, args.shards, with_coverage, args.timeout)
+        result = summarize_vitest(report)
+
+        for shard in report["shards"]:
+            files = "changed" if shard["files"] is None else f"{shard['files']} file(s)"
+            print(f"Shard {shard['index']}: {files}, {shard['duration_s']}s, exit {shard['exit_code']}")
+        for f in report["files"]:
+            for t in f["tests"]:
+                if t["status"] == "failed":
+                    print(f"[FAIL] {f['file']} > {t['name']}")
+                    first = t["failure"].strip().splitlines()
+                    if first:
+                        print(f"       {first[0][:200]}")
+                    writer.add("tests/failed", "high", f"{t['name']}: {first[0][:200] if first else 'failed'}",
+                               file=f["file"], test=t["name"])
+        for file in result["files_failed"]:
+            message = next(f["message"] for f in report["files"] if f["file"] == file)
+            print(f"[FAIL] {file} (suite error)")
+            writer.add("tests/suite-error", "high", message.strip().splitlines()[0][:300] if message.strip()
+                       else "Test file failed to run", file=file)
+        for error in report["errors"]:
+            print(f"Error: {error[:200]}")
+            writer.add("tests/error", "high", error.splitlines()[0][:300])
+
+        if result["slowest"]:
+            print("\nSlowest tests:")
+            for t in result["slowest"]:
+                print(f"  {t['duration_ms']:>8.0f} ms  {t['file']} > {t['name']}")
+
+        history = history_summary()
+        if history["slowest"]:
+            print("\nSlowest over history (p50 / p90):")
+            for t in history["slowest"]:
+                print(f"  {t['p50_ms']:>8.0f} / {t['p90_ms']:>8.0f} ms  {t['file']} > {t['name']} ({t['runs']} runs)")
+        if history["flaky"]:
+            print("\nFlaky tests:")
+            for t in history["flaky"]:
+                same = ", on an unchanged tree" if t["same_tree"] else ""
+                print(f"  {t['flake_rate']:.0%} flips  {t['file']} > {t['name']} "
+                      f"({t['failures']}/{t['runs']} failed{same})")
+                writer.add("tests/flaky", "low",
+                           f"{t['name']}: outcome flipped {t['flips']} time(s) in {t['runs']} runs{same}",
+                           file=t["file"], test=t["name"], flake_rate=t["flake_rate"])
+
+        print("\n" + "="*60)
+        print("SUMMARY")
+        print("="*60)
+        if report.get("message"):
+            print(f"[PASS] {report['message']}")
+        elif result["passed"]:
+            print("[PASS] All tests passed")
+        else:
+            print("[FAIL] Some tests failed")
+        if result["tests_run"] > 0:
+            print(f"Tests: {result['tests_run']} total, {result['tests_passed']} passed, "
+                  f"{result['tests_failed']} failed, {result['tests_skipped']} skipped"
+                  f" ({report.get('wall_s', 0)}s wall)")
+
+        output = {
+            "script": "test_runner",
+            "project": str(project_path),
+            "type": test_info["type"],
+            "framework": "vitest",
+            "changed": args.changed,
+            "shards": report["shards"],
+            **{k: result[k] for k in ("tests_run", "tests_passed", "tests_failed", "tests_skipped", "slowest")},
+            "history": history,
+            "passed": result["passed"],
+        }
+        print("\n" + json.dumps(output, indent=2))
+        summary = writer.finish(result["passed"], framework="vitest", tests_run=result["tests_run"],
+                                tests_passed=result["tests_passed"], tests_failed=result["tests_failed"],
+                                shards=len(report["shards"]), slowest_tests=history["slowest"],
+                                flaky_tests=history["flaky"])
+        sys.exit(0 if summary["passed"] else 1)
+
     # Choose command
-    cmd = test_info["coverage_cmd"] if with_coverage and test_info["coverage_cmd"] else test_info["cmd"]
-    
+    cmd = list(test_info["coverage_cmd"] if with_coverage and test_info["coverage_cmd"] else test_info["cmd"])
+    if args.changed and test_info["framework"] == "jest":
+        cmd.append(f"--changedSince={args.changed}")
+
     print(f"Running: {' '.join(cmd)}")
     print("-"*60)
-    
+
     # Run tests
-    result = run_tests(cmd, project_path)
-    
+    result = run_tests(cmd, project_path, args.timeout)
+
     # Print output (truncated)
     if result["output"]:
         lines = result["output"].split("\n")
@@ -184,22 +464,22 @@ def main():
             print(line)
         if len(lines) > 30:
             print(f"... ({len(lines) - 30} more lines)")
-    
+
     # Summary
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
-    
+
     if result["passed"]:
         print("[PASS] All tests passed")
     else:
         print("[FAIL] Some tests failed")
         if result["error"]:
             print(f"Error: {result['error'][:200]}")
-    
+
     if result["tests_run"] > 0:
         print(f"Tests: {result['tests_run']} total, {result['tests_passed']} passed, {result['tests_failed']} failed")
-    
+
     output = {
         "script": "test_runner",
         "project": str(project_path),
@@ -210,10 +490,18 @@ def main():
         "tests_failed": result["tests_failed"],
         "passed": result["passed"]
     }
-    
+
     print("\n" + json.dumps(output, indent=2))
-    
-    sys.exit(0 if result["passed"] else 1)
+    if not result["passed"]:
+        if result["tests_failed"]:
+            message = f"{result['tests_failed']} of {result['tests_run']} tests failed"
+        else:
+            message = result["error"].strip().splitlines()[0] if result["error"].strip() else "Test command failed"
+        writer.add("tests/failed", "high", message)
+    summary = writer.finish(result["passed"], framework=test_info["framework"], tests_run=result["tests_run"],
+                            tests_passed=result["tests_passed"], tests_failed=result["tests_failed"])
+
+    sys.exit(0 if summary["passed"] else 1)
 
 
 if __name__ == "__main__":
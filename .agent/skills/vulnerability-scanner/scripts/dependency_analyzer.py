@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+"""
+Skill: vulnerability-scanner
+Script: dependency_analyzer.py
+Purpose: Report dependency bloat from the lockfile graph, offline
+Usage: python dependency_analyzer.py <project_path> [--top N] [--output json|summary] [--jsonl]
+Output: JSON with the analysis and findings
+
+For the project and nested packages (functions/), this script reports:
+1. Duplicates - packages installed in more than one version, and who pulls each in
+2. Install size - direct dependencies ranked by what they alone bring in
+   (bytes when node_modules is installed, package count otherwise)
+3. Unused - direct dependencies never imported from src/ (or, for dev
+   dependencies, never referenced by configs, scripts or tests)
+4. Lockfile health - manifest/lockfile drift and a bun.lockb kept next to
+   an npm lockfile
+
+The resolved graph of each lockfile is cached in .agent/.cache/ and reused
+while the lockfile is unchanged.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.filecache import FileCache  # noqa: E402
+from validation.lockfile import (  # noqa: E402
+    Lockfile, LockfileError, find_lockfiles, load_installed, load_lockfile,
+)
+from validation.results import ResultWriter, slugify  # noqa: E402
+
+# Fix Windows console encoding for Unicode output
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass  # Python < 3.7
+
+
+# ============================================================================
+#  CONFIGURATION
+# ============================================================================
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage', '.next', '.cache', 'android', 'ios'}
+SOURCE_EXTENSIONS = {'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs', '.mts', '.cts', '.vue', '.svelte',
+                     '.css', '.scss', '.html'}
+# Outside src/, these also count as using a (dev) dependency
+TOOLING_DIRS = ('scripts', 'tests', 'test', 'e2e', 'supabase', 'plugins')
+CONFIG_FILE = re.compile(r'^(?:[\w.-]+\.config|\.[\w-]+rc)\.(?:[cm]?[jt]s|json)$|^index\.html$|^tsconfig[\w.]*\.json$')
+
+# from "x" / import "x" / import("x") / require("x") / @import "x"
+IMPORT_SPEC = re.compile(r'''(?:\bfrom|\bimport(?:\s*\()?|\brequire\s*\()\s*["']([^"'\s]+)["']''')
+
+# CLIs whose command differs from the package name
+BIN_ALIASES = {
+    "typescript": ("tsc", "tsserver"),
+    "firebase-tools": ("firebase",),
+    "@playwright/test": ("playwright",),
+    "@capacitor/cli": ("cap",),
+    "npm-run-all": ("run-p", "run-s"),
+}
+# Used without ever being imported or invoked by name
+IMPLICIT_DEPENDENCIES = {"@types/node", "typescript"}
+# Capacitor platforms are used by their native project when it exists
+NATIVE_PLATFORMS = {"@capacitor/android": "android", "@capacitor/ios": "ios"}
+
+GRAPH_CACHE = "dependency_analyzer/graph"
+IMPORTS_CACHE = "dependency_analyzer/imports"
+SIZES_CACHE = "dependency_analyzer/sizes"
+
+
+# ============================================================================
+#  GRAPH
+# ============================================================================
+
+def load_graph(lock_path: str, cache: FileCache) -> Dict[str, Any]:
+    """
+    Lockfile plus resolved edges, from the cache while the lockfile is
+    unchanged (by stat, then by content digest).
+    """
+    cached = cache.get(lock_path)
+    digest = None
+    if cached is None:
+        with open(lock_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        cached = cache.get_by_digest(lock_path, digest)
+    if cached is not None:
+        return {"lock": Lockfile.from_dict(cached["lock"]), "edges": cached["edges"], "cached": True}
+    lock = load_lockfile(lock_path)
+    edges = lock.edges()
+    cache.put(lock_path, {"lock": lock.to_dict(), "edges": edges}, digest=digest)
+    return {"lock": lock, "edges": edges, "cached": False}
+
+
+def reverse_edges(edges: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    parents: Dict[str, List[str]] = {}
+    for parent, children in edges.items():
+        for child in children:
+            parents.setdefault(child, []).append(parent)
+    return parents
+
+
+def closure(start: str, edges: Dict[str, List[str]]) -> Set[str]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for child in edges.get(stack.pop(), ()):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+# ============================================================================
+#  INSTALL SIZE
+# ============================================================================
+
+def package_bytes(package_dir: str) -> int:
+    """Bytes on disk for one installed package, excluding its nested node_modules."""
+    total = 0
+    stack = [package_dir]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "node_modules":
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+    return total
+
+
+def installed_sizes(base_dir: Path, lock: Lockfile, cache: FileCache) -> Optional[Dict[str, int]]:
+    """Size per install path, or None when node_modules is not installed."""
+    if not (base_dir / "node_modules").is_dir():
+        return None
+    sizes = {}
+    for path, pkg in lock.packages.items():
+        if not path or pkg.link:
+            continue
+        package_dir = base_dir / path
+        manifest = package_dir / "package.json"
+        if not manifest.is_file():
+            continue
+        # A reinstall rewrites package.json, so its stat keys the cached size
+        size = cache.get(str(manifest))
+        if size is None:
+            size = package_bytes(str(package_dir))
+            cache.put(str(manifest), size)
+        sizes[path] = size
+    return sizes
+
+
+def size_contributors(lock: Lockfile, edges: Dict[str, List[str]],
+                      sizes: Optional[Dict[str, int]]) -> List[Dict[str, Any]]:
+    """
+    Each direct dependency with what it alone brings in (packages no other
+    direct dependency reaches) and what it shares with others.
+    """
+    roots, versions = {}, {}
+    for name in {**lock.direct, **lock.direct_dev}:
+        pkg = lock.resolve("", name)
+        if pkg is not None:
+            roots[name] = closure(pkg.path, edges)
+            versions[name] = pkg.version
+    owners: Dict[str, int] = {}
+    for reach in roots.values():
+        for path in reach:
+            owners[path] = owners.get(path, 0) + 1
+
+    contributors = []
+    for name, reach in roots.items():
+        exclusive = [path for path in reach if owners[path] == 1]
+        entry = {
+            "name": name,
+            "version": versions[name],
+            "dev": name in lock.direct_dev and name not in lock.direct,
+            "exclusive_packages": len(exclusive),
+            "total_packages": len(reach),
+        }
+        if sizes is not None:
+            entry["exclusive_bytes"] = sum(sizes.get(path, 0) for path in exclusive)
+            entry["total_bytes"] = sum(sizes.get(path, 0) for path in reach)
+        contributors.append(entry)
+    weight = "exclusive_bytes" if sizes is not None else "exclusive_packages"
+    contributors.sort(key=lambda entry: (-entry[weight], entry["name"]))
+    return contributors
+
+
+# ============================================================================
+#  DUPLICATES
+# ============================================================================
+
+def duplicate_versions(lock: Lockfile, parents: Dict[str, List[str]],
+                       sizes: Optional[Dict[str, int]]) -> List[Dict[str, Any]]:
+    """Packages installed in more than one version, with who requires each."""
+    duplicates = []
+    for name, copies in lock.by_name().items():
+        versions: Dict[str, Set[str]] = {}
+        for pkg in copies:
+            if pkg.link:
+                continue
+            dependents = versions.setdefault(pkg.version, set())
+            for parent in parents.get(pkg.path, ()):
+                dependents.add(lock.packages[parent].name if parent else "<root>")
+        if len(versions) < 2:
+            continue
+        entry = {
+            "name": name,
+            "versions": {version: sorted(dependents) for version, dependents in versions.items()},
+            "copies": len(copies),
+        }
+        if sizes is not None:
+            copy_sizes = sorted((sizes.get(pkg.path, 0) for pkg in copies), reverse=True)
+            entry["duplicate_bytes"] = sum(copy_sizes[1:])
+        duplicates.append(entry)
+    weight = "duplicate_bytes" if sizes is not None else "copies"
+    duplicates.sort(key=lambda entry: (-entry[weight], -len(entry["versions"]), entry["name"]))
+    return duplicates
+
+
+# ============================================================================
+#  UNUSED DEPENDENCIES
+# ============================================================================
+
+def package_of(specifier: str) -> Optional[str]:
+    """npm package name of an import specifier; None for relative paths and aliases."""
+    if specifier.startswith((".", "/", "~", "#", "virtual:", "node:", "http:", "https:", "data:")):
+        return None
+    parts = specifier.split("/")
+    if specifier.startswith("@"):
+        if len(parts) < 2 or len(parts[0]) < 2 or not parts[1]:
+            return None  # "@/components/..." path alias
+        return f"{parts[0]}/{parts[1]}"
+    return parts[0] or None
+
+
+def imported_packages(filepath: Path, cache: FileCache) -> List[str]:
+    cached = cache.get(str(filepath))
+    if cached is not None:
+        return cached
+    try:
+        content = filepath.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return []
+    names = sorted({name for name in map(package_of, IMPORT_SPEC.findall(content)) if name})
+    cache.put(str(filepath), names)
+    return names
+
+
+def source_files(directory: Path):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in files:
+            if Path(name).suffix in SOURCE_EXTENSIONS and not name.endswith(".d.ts"):
+                yield Path(root) / name
+
+
+def collect_usage(base_dir: Path, cache: FileCache) -> Dict[str, Any]:
+    """
+    What the package at base_dir uses: imports from src/, imports from
+    tooling (configs, scripts, tests), config text and npm script commands.
+    """
+    src_imports: Set[str] = set()
+    for filepath in source_files(base_dir / "src"):
+        src_imports.update(imported_packages(filepath, cache))
+
+    tooling_imports: Set[str] = set()
+    config_text = []
+    for entry in sorted(os.scandir(base_dir), key=lambda e: e.name):
+        if entry.is_file() and CONFIG_FILE.match(entry.name):
+            tooling_imports.update(imported_packages(Path(entry.path), cache))
+            try:
+                config_text.append(Path(entry.path).read_text(encoding="utf-8", errors="ignore"))
+            except OSError:
+                pass
+    for name in TOOLING_DIRS:
+        for filepath in source_files(base_dir / name):
+            tooling_imports.update(imported_packages(filepath, cache))
+
+    try:
+        manifest = json.loads((base_dir / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    scripts = " ".join((manifest.get("scripts") or {}).values())
+    return {
+        "src": src_imports,
+        "tooling": tooling_imports,
+        "config_text": "\n".join(config_text),
+        "commands": set(re.findall(r'[\w@./:-]+', scripts)),
+    }
+
+
+def _native_plugin(base_dir: Path, lock: Lockfile, name: str) -> bool:
+    """Capacitor platforms and plugins are loaded by the native projects, not imported."""
+    platform = NATIVE_PLATFORMS.get(name)
+    if platform:
+        return (base_dir / platform).is_dir()
+    pkg = lock.resolve("", name)
+    if pkg is None:
+        return False
+    package_dir = base_dir / (pkg.resolved if pkg.link and pkg.resolved else pkg.path)
+    try:
+        manifest = json.loads((package_dir / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and "capacitor" in manifest
+
+
+def _referenced(name: str, usage: Dict[str, Any]) -> bool:
+    """
+    Whether tooling uses a package: import, CLI command, or a mention in a
+    config as a string or an object key (postcss plugins).
+    """
+    if name in usage["tooling"] or name in IMPLICIT_DEPENDENCIES:
+        return True
+    bins = BIN_ALIASES.get(name, ()) + (name.rsplit("/", 1)[-1],)
+    if any(b in usage["commands"] for b in bins):
+        return True
+    mention = r'''["'`]{0}["'`/]|(?<![\w@/.-]){0}\s*:'''.format(re.escape(name))
+    return re.search(mention, usage["config_text"]) is not None
+
+
+def unused_dependencies(lock: Lockfile, usage: Dict[str, Any], base_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Direct dependencies nothing uses. Runtime dependencies must be imported
+    from src/ (tooling-only ones are reported as misplaced); dev dependencies
+    may be used anywhere. A package is also used when it is the @types/ pair
+    or a peer dependency of one that is.
+    """
+    used = usage["src"] | {name for name in {**lock.direct, **lock.direct_dev}
+                           if _referenced(name, usage) or _native_plugin(base_dir, lock, name)}
+    # Peers and type packages of used packages are used too, transitively
+    changed = True
+    while changed:
+        changed = False
+        for name in list(used):
+            pkg = lock.resolve("", name)
+            peers = set(pkg.peer_dependencies) if pkg is not None else set()
+            typings = {f"@types/{name.lstrip('@').replace('/', '__')}"}
+            for extra in (peers | typings) - used:
+                if extra in lock.direct or extra in lock.direct_dev:
+                    used.add(extra)
+                    changed = True
+
+    unused = []
+    for name in sorted(lock.direct):
+        if name in usage["src"] or _native_plugin(base_dir, lock, name):
+            continue
+        if name in used:
+            unused.append({"name": name, "dev": False, "status": "tooling-only"})
+        else:
+            unused.append({"name": name, "dev": False, "status": "unused"})
+    for name in sorted(lock.direct_dev):
+        if name not in used and name not in lock.direct:
+            unused.append({"name": name, "dev": True, "status": "unused"})
+    return unused
+
+
+# ============================================================================
+#  LOCKFILE HEALTH
+# ============================================================================
+
+def lockfile_health(base_dir: Path, lock: Optional[Lockfile], rel_dir: str) -> List[Dict[str, Any]]:
+    """Manifest/lockfile drift and a binary bun.lockb next to an npm lockfile."""
+    findings = []
+    prefix = f"{rel_dir}/" if rel_dir != "." else ""
+    try:
+        manifest = json.loads((base_dir / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = None
+    if lock is not None and manifest is not None:
+        declared = {**(manifest.get("dependencies") or {}), **(manifest.get("optionalDependencies") or {})}
+        declared_dev = manifest.get("devDependencies") or {}
+        drift = sorted((set(declared) ^ set(lock.direct)) | (set(declared_dev) ^ set(lock.direct_dev)))
+        drift += sorted(name for name, spec in {**declared, **declared_dev}.items()
+                        if name not in drift and {**lock.direct, **lock.direct_dev}.get(name) != spec)
+        if drift:
+            findings.append({
+                "type": "Lockfile Drift", "severity": "medium", "file": f"{prefix}package.json",
+                "message": f"{os.path.basename(lock.path)} does not match package.json for: "
+                           + ", ".join(drift[:10]) + (" ..." if len(drift) > 10 else "")
+            })
+
+    bun_binary = base_dir / "bun.lockb"
+    if bun_binary.is_file():
+        npm_lock = next((base_dir / name for name in ("package-lock.json", "npm-shrinkwrap.json")
+                         if (base_dir / name).is_file()), None)
+        if npm_lock is not None:
+            findings.append({
+                "type": "Multiple Lockfiles", "severity": "medium", "file": f"{prefix}bun.lockb",
+                "message": f"bun.lockb and {npm_lock.name} both pin this project; bun and npm "
+                           "installs can resolve different trees"
+            })
+        # Tolerate checkout jitter: only a lockfile clearly older than the manifest is stale
+        manifest_path = base_dir / "package.json"
+        if manifest_path.is_file() and bun_binary.stat().st_mtime + 1 < manifest_path.stat().st_mtime:
+            findings.append({
+                "type": "Stale Lockfile", "severity": "low", "file": f"{prefix}bun.lockb",
+                "message": "bun.lockb is older than package.json; run bun install to refresh it"
+            })
+    return findings
+
+
+def bun_metadata(base_dir: Path) -> Optional[Dict[str, Any]]:
+    path = base_dir / "bun.lockb"
+    try:
+        with open(path, "rb") as f:
+            header = f.read(64)
+        stat = path.stat()
+    except OSError:
+        return None
+    match = re.search(rb'bun-lockfile-format-(v\d+)', header)
+    return {"file": "bun.lockb", "format": match.group(1).decode() if match else None,
+            "bytes": stat.st_size, "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()}
+
+
+# ============================================================================
+#  MAIN ANALYSIS
+# ============================================================================
+
+def project_dirs(project_path: str) -> List[Dict[str, Any]]:
+    """Every package to analyze: each lockfile, plus bun-only packages read from node_modules."""
+    targets = [{"dir": Path(p).parent, "lockfile": p} for p in find_lockfiles(project_path)]
+    known = {t["dir"].resolve() for t in targets}
+    # Pruned walk to the same depth as find_lockfiles(): never enter node_modules & co
+    root_depth = Path(project_path).resolve().as_posix().count("/")
+    for root, dirs, files in os.walk(project_path):
+        depth = Path(root).resolve().as_posix().count("/") - root_depth
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and depth < 2)
+        base = Path(root)
+        if "bun.lockb" in files and base.resolve() not in known:
+            targets.append({"dir": base, "lockfile": None})
+    return targets
+
+
+def analyze_package(target: Dict[str, Any], project_path: str, caches: Dict[str, FileCache],
+                    top: int) -> Dict[str, Any]:
+    base_dir = target["dir"]
+    rel_dir = os.path.relpath(base_dir, project_path).replace(os.sep, "/")
+    prefix = f"{rel_dir}/" if rel_dir != "." else ""
+    findings: List[Dict[str, Any]] = []
+    result: Dict[str, Any] = {"directory": rel_dir, "bun_lockb": bun_metadata(base_dir)}
+
+    lock = None
+    if target["lockfile"]:
+        try:
+            graph = load_graph(target["lockfile"], caches["graph"])
+        except LockfileError as e:
+            findings.append({"type": "Unreadable Lockfile", "severity": "medium",
+                             "file": f"{prefix}{os.path.basename(target['lockfile'])}", "message": str(e)})
+            result["findings"] = findings
+            return result
+        lock, edges = graph["lock"], graph["edges"]
+        result["lockfile"] = {"file": f"{prefix}{os.path.basename(lock.path)}",
+                              "format": lock.version, "cached": graph["cached"]}
+    elif (base_dir / "node_modules").is_dir():
+        lock = load_installed(str(base_dir))
+        edges = lock.edges()
+        result["lockfile"] = {"file": f"{prefix}node_modules", "format": "installed", "cached": False}
+    findings.extend(lockfile_health(base_dir, lock, rel_dir))
+    if lock is None:
+        findings.append({"type": "No Readable Lockfile", "severity": "low", "file": f"{prefix}bun.lockb",
+                         "message": "Only a binary bun.lockb and nothing installed; run bun install "
+                                    "or commit a text bun.lock to analyze this package"})
+        result["findings"] = findings
+        return result
+
+    sizes = installed_sizes(base_dir, lock, caches["sizes"])
+    parents = reverse_edges(edges)
+    duplicates = duplicate_versions(lock, parents, sizes)
+    contributors = size_contributors(lock, edges, sizes)
+    unused = unused_dependencies(lock, collect_usage(base_dir, caches["imports"]), base_dir)
+    manifest_file = f"{prefix}package.json"
+
+    for dup in duplicates:
+        versions = ", ".join(f"{v} (via {', '.join(d[:3])}{' ...' if len(d) > 3 else ''})"
+                             for v, d in sorted(dup["versions"].items()))
+        findings.append({"type": "Duplicate Package", "severity": "low", "file": result["lockfile"]["file"],
+                         "package": dup["name"], "message": f"{dup['name']}: {versions}"})
+    for entry in unused:
+        if entry["status"] == "tooling-only":
+            findings.append({"type": "Misplaced Dependency", "severity": "low", "file": manifest_file,
+                             "package": entry["name"],
+                             "message": f"{entry['name']} is only used by configs/scripts; "
+                                        "move it to devDependencies"})
+        else:
+            where = "devDependencies" if entry["dev"] else "dependencies"
+            findings.append({"type": "Unused Dependency", "severity": "low" if entry["dev"] else "medium",
+                             "file": manifest_file, "package": entry["name"],
+                             "message": f"{entry['name']} ({where}) is never imported or referenced"})
+
+    installed = [pkg for path, pkg in lock.packages.items() if path and not pkg.link]
+    result.update({
+        "packages": len(installed),
+        "dev_packages": sum(1 for pkg in installed if pkg.dev),
+        "direct": len(lock.direct),
+        "direct_dev": len(lock.direct_dev),
+        "installed_bytes": sum(sizes.values()) if sizes is not None else None,
+        "duplicates": duplicates[:top],
+        "duplicate_count": len(duplicates),
+        "size_contributors": contributors[:top],
+        "unused": unused,
+        "findings": findings,
+    })
+    return result
+
+
+def run_analysis(project_path: str, top: int = 15) -> Dict[str, Any]:
+    caches = {"graph": FileCache(GRAPH_CACHE), "imports": FileCache(IMPORTS_CACHE),
+              "sizes": FileCache(SIZES_CACHE)}
+    report = {
+        "tool": "dependency_analyzer",
+        "project": os.path.abspath(project_path),
+        "timestamp": datetime.now().isoformat(),
+        "packages": [analyze_package(t, project_path, caches, top) for t in project_dirs(project_path)],
+    }
+    for cache in caches.values():
+        cache.save()
+
+    findings = [f for pkg in report["packages"] for f in pkg["findings"]]
+    by_type: Dict[str, int] = {}
+    for f in findings:
+        by_type[f["type"]] = by_type.get(f["type"], 0) + 1
+    report["summary"] = {
+        "total_findings": len(findings),
+        "by_type": by_type,
+        "medium": sum(1 for f in findings if f["severity"] == "medium"),
+        "low": sum(1 for f in findings if f["severity"] == "low"),
+        "cache": {name: {"hits": c.hits, "misses": c.misses} for name, c in caches.items()},
+    }
+    if not report["packages"]:
+        report["summary"]["overall_status"] = "[?] No lockfile found"
+    elif report["summary"]["medium"]:
+        report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
+    else:
+        report["summary"]["overall_status"] = "[OK] Dependencies look lean"
+    return report
+
+
+def write_results(report: Dict[str, Any], writer: ResultWriter) -> None:
+    """Translate the analysis into protocol findings."""
+    for pkg in report["packages"]:
+        for finding in pkg["findings"]:
+            extra = {"package": finding["package"]} if "package" in finding else {}
+            writer.add(f"dependencies/{slugify(finding['type'])}", finding["severity"],
+                       finding["message"], file=finding.get("file"), **extra)
+
+
+def _human_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report duplicate, oversized and unused dependencies from lockfiles"
+    )
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory to analyze")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Duplicates and size contributors to list per package")
+    parser.add_argument("--output", choices=["json", "summary"], default="json",
+                        help="Output format")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+
+    args = parser.parse_args()
+    writer = ResultWriter("dependency_analyzer", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+
+    if not os.path.isdir(args.project_path):
+        if args.jsonl:
+            writer.add("dependencies/error", "high", f"Directory not found: {args.project_path}")
+            writer.finish(False)
+        else:
+            print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
+        sys.exit(1)
+
+    report = run_analysis(args.project_path, top=max(1, args.top))
+    write_results(report, writer)
+    summary = writer.finish(True, overall_status=report["summary"]["overall_status"],
+                            total_findings=report["summary"]["total_findings"],
+                            packages_analyzed=len(report["packages"]))
+    if "suppressed" in summary["stats"]:
+        report["summary"]["new_findings"] = summary["stats"]["new"]
+        report["summary"]["baseline_suppressed"] = summary["stats"]["suppressed"]
+
+    if not writer.enabled:
+        if args.output == "summary":
+            print(f"\n{'='*60}")
+            print(f"Dependency Analysis: {report['project']}")
+            print(f"{'='*60}")
+            print(f"Status: {report['summary']['overall_status']}")
+            print(f"Total Findings: {report['summary']['total_findings']}")
+            for kind, count in sorted(report["summary"]["by_type"].items()):
+                print(f"  {kind}: {count}")
+            print(f"{'='*60}")
+            for pkg in report["packages"]:
+                if "packages" not in pkg:
+                    continue
+                size = f", {_human_bytes(pkg['installed_bytes'])}" if pkg["installed_bytes"] is not None else ""
+                print(f"\n{pkg['directory']}: {pkg['packages']} packages{size}, "
+                      f"{pkg['duplicate_count']} duplicated")
+                for entry in pkg["size_contributors"][:5]:
+                    weight = (_human_bytes(entry["exclusive_bytes"]) if "exclusive_bytes" in entry
+                              else f"{entry['exclusive_packages']} packages")
+                    print(f"  - {entry['name']}@{entry['version']}: {weight} of its own")
+                for entry in pkg["unused"]:
+                    print(f"  - {entry['name']}: {entry['status']}")
+            print()
+        else:
+            print(json.dumps(report, indent=2))
+
+    # Without a baseline the analysis is informational; with one, new findings fail
+    sys.exit(0 if summary["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
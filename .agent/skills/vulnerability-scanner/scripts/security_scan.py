@@ -3,8 +3,10 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--offline]
+Output: JSON with validation counters and the top findings; every finding is
+        kept in .agent/.cache/findings/security_scan.jsonl (query it with
+        python .agent/.shared/validation/store.py query security_scan)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
@@ -18,10 +20,24 @@ import os
 import sys
 import re
 import argparse
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.advisories import AdvisoryDB, fixed_version, version_key  # noqa: E402
+from validation.lockfile import LockfileError, find_lockfiles, load_lockfile  # noqa: E402
+from validation.results import ResultWriter, make_finding, slugify  # noqa: E402
+from validation.scan import (  # noqa: E402
+    CHUNK_KB, FILE_BUDGET_MS, MAX_FILE_KB, BudgetExceeded, FileScan, ScanGuard, finish_guard,
+    stream_lines, stream_windows,
+)
+from validation.store import FindingStore  # noqa: E402
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -34,70 +50,266 @@ except AttributeError:
 #  CONFIGURATION
 # ============================================================================
 
+# Each rule ends with its prefilter: lowercase literals, one of which must
+# appear in the text before the regex is run at all. Secret literals must also
+# be where a match starts (see SECRET_AUTOMATON).
 SECRET_PATTERNS = [
     # API Keys & Tokens
-    (r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']', "API Key", "high"),
-    (r'token\s*[=:]\s*["\'][^"\']{10,}["\']', "Token", "high"),
-    (r'bearer\s+[a-zA-Z0-9\-_.]+', "Bearer Token", "critical"),
+    (r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']', "API Key", "high", ("api",)),
+    (r'token\s*[=:]\s*["\'][^"\']{10,}["\']', "Token", "high", ("token",)),
+    (r'bearer\s+[a-zA-Z0-9\-_.]+', "Bearer Token", "critical", ("bearer",)),
     
     # Cloud Credentials
-    (r'AKIA[0-9A-Z]{16}', "AWS Access Key", "critical"),
-    (r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']', "AWS Secret", "critical"),
-    (r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "Azure Credential", "critical"),
-    (r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "GCP Credential", "critical"),
+    (r'AKIA[0-9A-Z]{16}', "AWS Access Key", "critical", ("akia",)),
+    (r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']', "AWS Secret", "critical", ("aws",)),
+    (r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "Azure Credential", "critical", ("azure",)),
+    (r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "GCP Credential", "critical", ("google",)),
     
     # Database & Connections
-    (r'password\s*[=:]\s*["\'][^"\']{4,}["\']', "Password", "high"),
-    (r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+', "Database Connection String", "critical"),
+    (r'password\s*[=:]\s*["\'][^"\']{4,}["\']', "Password", "high", ("password",)),
+    (r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+', "Database Connection String", "critical", ("mongodb", "postgres", "mysql", "redis")),
     
     # Private Keys
-    (r'-----BEGIN\s+(RSA|PRIVATE|EC)\s+KEY-----', "Private Key", "critical"),
-    (r'ssh-rsa\s+[A-Za-z0-9+/]+', "SSH Key", "critical"),
+    (r'-----BEGIN\s+(RSA|PRIVATE|EC)\s+KEY-----', "Private Key", "critical", ("-----begin",)),
+    (r'ssh-rsa\s+[A-Za-z0-9+/]+', "SSH Key", "critical", ("ssh-rsa",)),
     
     # JWT
-    (r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+', "JWT Token", "high"),
+    (r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+', "JWT Token", "high", ("eyj",)),
+]
+
+# Provider rule pack: Stripe and Firebase credentials. These also run over
+# documentation (see DOC_EXTENSIONS), where pasted keys tend to end up.
+# Placeholders such as sk_live_xxxxxxxx are not reported.
+PROVIDER_SECRET_PATTERNS = [
+    (r'sk_live_(?![xX*]{6})[0-9a-zA-Z]{10,}', "Stripe Secret Key", "critical", ("sk_live_",)),
+    (r'rk_live_(?![xX*]{6})[0-9a-zA-Z]{10,}', "Stripe Restricted Key", "critical", ("rk_live_",)),
+    (r'whsec_(?![xX*]{6})[0-9a-zA-Z]{16,}', "Stripe Webhook Secret", "critical", ("whsec_",)),
+    (r'sk_test_(?![xX*]{6})[0-9a-zA-Z]{10,}', "Stripe Test Key", "low", ("sk_test_",)),
+    (r'"private_key"\s*:\s*"-----BEGIN', "Firebase Service Account Key", "critical", ('"private_key"',)),
+    (r'AAAA[A-Za-z0-9_-]{7}:[A-Za-z0-9_-]{140}', "FCM Server Key", "high", ("aaaa",)),
+    # Firebase web API keys ship in every client; they only need restricting
+    (r'AIza[0-9A-Za-z_-]{35}', "Google API Key", "low", ("aiza",)),
 ]
+SECRET_PATTERNS += PROVIDER_SECRET_PATTERNS
 
 DANGEROUS_PATTERNS = [
     # Injection risks
-    (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk"),
-    (r'exec\s*\(', "exec() usage", "critical", "Code Injection risk"),
-    (r'new\s+Function\s*\(', "Function constructor", "high", "Code Injection risk"),
-    (r'child_process\.exec\s*\(', "child_process.exec", "high", "Command Injection risk"),
-    (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "subprocess with shell=True", "high", "Command Injection risk"),
+    (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk", ("eval",)),
+    (r'exec\s*\(', "exec() usage", "critical", "Code Injection risk", ("exec",)),
+    (r'new\s+Function\s*\(', "Function constructor", "high", "Code Injection risk", ("function",)),
+    (r'child_process\.exec\s*\(', "child_process.exec", "high", "Command Injection risk", ("child_process",)),
+    (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "subprocess with shell=True", "high", "Command Injection risk", ("subprocess",)),
     
     # XSS risks
-    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "high", "XSS risk"),
-    (r'\.innerHTML\s*=', "innerHTML assignment", "medium", "XSS risk"),
-    (r'document\.write\s*\(', "document.write", "medium", "XSS risk"),
+    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "high", "XSS risk", ("dangerouslysetinnerhtml",)),
+    (r'\.innerHTML\s*=', "innerHTML assignment", "medium", "XSS risk", ("innerhtml",)),
+    (r'document\.write\s*\(', "document.write", "medium", "XSS risk", ("document",)),
     
     # SQL Injection indicators
-    (r'["\'][^"\']*\+\s*[a-zA-Z_]+\s*\+\s*["\'].*(?:SELECT|INSERT|UPDATE|DELETE)', "SQL String Concat", "critical", "SQL Injection risk"),
-    (r'f"[^"]*(?:SELECT|INSERT|UPDATE|DELETE)[^"]*\{', "SQL f-string", "critical", "SQL Injection risk"),
+    (r'["\'][^"\']*\+\s*[a-zA-Z_]+\s*\+\s*["\'][^"\'\n]*(?:SELECT|INSERT|UPDATE|DELETE)', "SQL String Concat", "critical", "SQL Injection risk", ("select", "insert", "update", "delete")),
+    (r'f"[^"]*(?:SELECT|INSERT|UPDATE|DELETE)[^"]*\{', "SQL f-string", "critical", "SQL Injection risk", ('f"',)),
     
     # Insecure configurations
-    (r'verify\s*=\s*False', "SSL Verify Disabled", "high", "MITM risk"),
-    (r'--insecure', "Insecure flag", "medium", "Security disabled"),
-    (r'disable[_-]?ssl', "SSL Disabled", "high", "MITM risk"),
+    (r'verify\s*=\s*False', "SSL Verify Disabled", "high", "MITM risk", ("verify",)),
+    (r'--insecure', "Insecure flag", "medium", "Security disabled", ("--insecure",)),
+    (r'disable[_-]?ssl', "SSL Disabled", "high", "MITM risk", ("disable",)),
     
     # Unsafe deserialization
-    (r'pickle\.loads?\s*\(', "pickle usage", "high", "Deserialization risk"),
-    (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
+    (r'pickle\.loads?\s*\(', "pickle usage", "high", "Deserialization risk", ("pickle",)),
+    (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk", ("yaml",)),
 ]
 
-SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
+# Generic secrets: quoted tokens from a key alphabet, scored by Shannon
+# entropy (bits per character). Random base62/base64 keys score ~4.5-5.5;
+# identifiers, words and hex digests stay below the threshold.
+ENTROPY_TOKEN = re.compile(r'[A-Za-z0-9+/_\-=]{%d,%d}(?=["\'`])' % (24, 200))
+ENTROPY_THRESHOLD = 4.3
+# Random-looking tokens that are public identifiers (Stripe object IDs,
+# publishable keys) or already reported by a provider rule
+ENTROPY_KNOWN_PREFIXES = re.compile(
+    r'(?:price|prod|plan|cus|sub|pi|cs_test|cs_live|pk_live|pk_test|sk_live|sk_test|rk_live|rk_test|whsec)_|AIza')
+ENTROPY_SKIP = re.compile(r'integrity|sha(?:1|256|384|512)-|data:[\w/+.-]+;base64|sourceMappingURL', re.IGNORECASE)
+ENTROPY_RULE = ("High-Entropy String", "medium")
+
+# Findings the report keeps per scan; the store keeps all of them
+TOP_FINDINGS = 20
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next', '.cache'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+# Only the provider rule pack runs on these
+DOC_EXTENSIONS = {'.md', '.mdx', '.txt'}
+
+# Bytes scanned per file type; the rest of a larger file is not read.
+# Lockfiles are generated (hashes and registry URLs) and get a tighter cap.
+SIZE_CAPS_KB = {'.json': 2048, '.yaml': 1024, '.yml': 1024, '.toml': 256, '.env': 64,
+                '.md': 512, '.mdx': 512, '.txt': 512}
+CODE_SIZE_CAP_KB = 4096
+LOCKFILE_CAP_KB = 256
+LOCKFILES = {'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'composer.lock', 'Gemfile.lock'}
+
+
+
+def _build_secret_automaton(rules=None, entropy=True):
+    """
+    One alternation of every secret rule's start literals plus a quote that
+    opens a long key-alphabet token (the entropy candidate). It runs on an
+    ASCII-lowercased copy of the window without IGNORECASE: every branch then
+    starts with a plain literal, which lets the re engine skip ahead on first
+    characters instead of trying each branch at every offset. The matched
+    literal names the rule whose full pattern is confirmed at that offset.
+    """
+    owners = {}
+    for index, (_, _, _, literals) in enumerate(SECRET_PATTERNS):
+        if rules is None or SECRET_PATTERNS[index] in rules:
+            for lit in literals:
+                owners[lit] = index
+    branches = [re.escape(lit) for lit in sorted(owners, key=len, reverse=True)]
+    if entropy:
+        branches += [f"{q}(?=[a-z0-9+/_\\-=]{{24}})" for q in ("\"", "'", "`")]
+    return "|".join(branches), owners
+
+
+SECRET_AUTOMATON, SECRET_LITERAL_OWNERS = _build_secret_automaton()
+# Documentation: provider keys only, no entropy candidates
+DOC_AUTOMATON, DOC_LITERAL_OWNERS = _build_secret_automaton(PROVIDER_SECRET_PATTERNS, entropy=False)
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def shannon_entropy(text: str) -> float:
+    """Bits of entropy per character."""
+    counts = Counter(text)
+    n = len(text)
+    return -sum(c / n * math.log2(c / n) for c in counts.values())
+
+
+def is_high_entropy(token: str) -> bool:
+    """Random-looking key material: mixed letters and digits, high entropy."""
+    if not (any(c.isdigit() for c in token) and any(c.isalpha() for c in token)):
+        return False
+    if token.count('/') > 2 or token.count('-') > 3:
+        return False  # Paths, URLs and kebab-case identifiers
+    if ENTROPY_KNOWN_PREFIXES.match(token):
+        return False
+    steps = sum(1 for a, b in zip(token, token[1:]) if ord(b) - ord(a) == 1)
+    if steps > len(token) // 2:
+        return False  # Alphabets such as "ABCDEFGH...2345" used for code generation
+    return shannon_entropy(token) >= ENTROPY_THRESHOLD
+
+
+def match_secrets(scan: FileScan, window: str, owned: int, guard: ScanGuard,
+                  hits: List[tuple], line_base: int = 0, docs: bool = False) -> None:
+    """
+    Collect (type, severity, line) for secrets starting before `owned` in one
+    window with a single pass of SECRET_AUTOMATON (DOC_AUTOMATON for docs);
+    line_base is the number of lines before the window. Per rule, matches do
+    not overlap (like re.findall).
+    """
+    automaton, owners = (DOC_AUTOMATON, DOC_LITERAL_OWNERS) if docs else (SECRET_AUTOMATON, SECRET_LITERAL_OWNERS)
+    scan.rule("secret-automaton")
+    resume = {}  # rule index -> end of its last confirmed match
+    lowered = window.translate(ASCII_LOWER)  # Same length, so offsets carry over
+    for candidate in scan.finditer(automaton, text=lowered):
+        pos = candidate.start()
+        if pos >= owned:
+            break
+        index = owners.get(candidate.group())
+        if index is None:  # Quote opening an entropy candidate
+            if pos < resume.get("quote", 0):
+                continue
+            token = ENTROPY_TOKEN.match(window, pos + 1)
+            if token is None:
+                continue
+            resume["quote"] = token.end()
+            line_start = window.rfind("\n", 0, pos) + 1
+            if ENTROPY_SKIP.search(window, line_start, token.end()) or not is_high_entropy(token.group()):
+                continue
+            hits.append(ENTROPY_RULE + (line_base + window.count("\n", 0, pos) + 1,))
+            continue
+        if pos < resume.get(index, 0):
+            continue
+        pattern, secret_type, severity, _ = SECRET_PATTERNS[index]
+        confirmed = guard.compile(pattern, re.IGNORECASE).match(window, pos)
+        if confirmed:
+            resume[index] = max(confirmed.end(), pos + 1)
+            hits.append((secret_type, severity, line_base + window.count("\n", 0, pos) + 1))
+
+
+def offline_audit(project_path: str, results: Dict[str, Any], advisory_db: Optional[str] = None) -> None:
+    """
+    npm audit without the network: every package in the project's lockfiles
+    (root and nested, e.g. functions/) is matched against the local advisory
+    snapshot (validation/advisories.py).
+    """
+    db = AdvisoryDB.load(advisory_db)
+    summary = {"lockfiles": [], "packages": 0, "vulnerable_packages": 0,
+               "advisory_db": db.meta if db else None,
+               "by_severity": {"critical": 0, "high": 0, "medium": 0, "low": 0}}
+    results["offline_audit"] = summary
+    if db is None:
+        results["findings"].append({
+            "type": "Offline Audit",
+            "severity": "medium",
+            "message": "No advisory snapshot found; import one with "
+                       "python .agent/.shared/validation/advisories.py import <osv-npm-dump.zip>"
+        })
+        return
+    
+    rank = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+    for lock_path in find_lockfiles(project_path):
+        rel_lock = os.path.relpath(lock_path, project_path).replace(os.sep, "/")
+        try:
+            lock = load_lockfile(lock_path)
+        except LockfileError:
+            results["findings"].append({"type": "Offline Audit", "severity": "low", "file": rel_lock,
+                                        "message": f"{rel_lock}: unreadable lockfile"})
+            continue
+        summary["lockfiles"].append(rel_lock)
+        seen = set()
+        for pkg in lock.packages.values():
+            if not pkg.path or pkg.link or (pkg.name, pkg.version) in seen:
+                continue
+            seen.add((pkg.name, pkg.version))
+            summary["packages"] += 1
+            advisories = db.lookup(pkg.name, pkg.version)
+            if not advisories:
+                continue
+            severity = max((a["severity"] for a in advisories), key=lambda sev: rank.get(sev, 1))
+            # The upgrade that clears every advisory: the highest of their fixes
+            fixes = [fixed_version(a, pkg.version) for a in advisories]
+            fix = max(fixes, key=version_key) if fixes and None not in fixes else None
+            ids = ", ".join(a["id"] for a in advisories)
+            summary["vulnerable_packages"] += 1
+            summary["by_severity"][severity] += 1
+            results["findings"].append({
+                "type": "Vulnerable Dependency",
+                "severity": severity,
+                "file": rel_lock,
+                "package": pkg.name,
+                "version": pkg.version,
+                "dev": pkg.dev,
+                "advisories": [a["id"] for a in advisories],
+                "fixed_in": fix,
+                "message": f"{pkg.name}@{pkg.version}: {ids}" + (f" (fixed in {fix})" if fix else " (no fix)")
+            })
+    
+    if summary["by_severity"]["critical"]:
+        results["status"] = "[!!] Critical vulnerabilities"
+    elif summary["by_severity"]["high"]:
+        results["status"] = "[!] High vulnerabilities"
+
+
+def scan_dependencies(project_path: str, offline: bool = False,
+                      advisory_db: Optional[str] = None) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
-    Checks: npm audit, lock file presence, dependency age.
+    Checks: npm audit (or the offline advisory snapshot), lock file presence,
+    dependency age.
     """
     results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
     
@@ -129,7 +341,9 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                 })
     
     # Run npm audit if applicable
-    if (Path(project_path) / "package.json").exists():
+    if offline:
+        offline_audit(project_path, results, advisory_db)
+    elif (Path(project_path) / "package.json").exists():
         try:
             result = subprocess.run(
                 ["npm", "audit", "--json"],
@@ -178,199 +392,507 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def size_cap(filepath: Path) -> int:
+    """Maximum number of bytes to scan in this file."""
+    if filepath.name in LOCKFILES:
+        return LOCKFILE_CAP_KB * 1024
+    return SIZE_CAPS_KB.get(filepath.suffix.lower(), CODE_SIZE_CAP_KB) * 1024
+
+
+# Per-file scanners: each returns a part with "findings", "scanned_files",
+# "scanned_bytes" and "truncated" that merge_part() folds into the scan's
+# results. They never raise; budget hits are recorded by the guard.
+
+def secrets_in_file(filepath: Path, rel_path: str, guard: ScanGuard) -> Dict[str, Any]:
+    """Secrets in one file, streamed in overlapping windows up to its size cap."""
+    part = {"findings": [], "scanned_files": 0, "scanned_bytes": 0, "truncated": []}
+    hits = []
+    docs = filepath.suffix.lower() in DOC_EXTENSIONS
+    try:
+        size = filepath.stat().st_size
+        cap = size_cap(filepath)
+        if size > cap:
+            part["truncated"].append({"file": rel_path, "bytes": size, "scanned": cap})
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            scan = None
+            line_base = 0
+            for offset, window, owned in stream_windows(f):
+                if offset >= cap:
+                    break
+                if scan is None:
+                    scan = FileScan(window, name=rel_path, guard=guard, size=size)
+                    if scan.skipped:
+                        break
+                    part["scanned_files"] = 1
+                owned = min(owned, cap - offset)
+                part["scanned_bytes"] += owned
+                match_secrets(scan, window, owned, guard, hits, line_base, docs)
+                line_base += window.count("\n", 0, owned)
+    except BudgetExceeded:
+        pass  # Reported by the scan guard; hits so far are kept
+    except Exception:
+        pass
+    
+    for secret_type, severity, line in hits:
+        part["findings"].append({
+            "file": rel_path,
+            "line": line,
+            "type": secret_type,
+            "severity": severity
+        })
+    return part
+
+
+def patterns_in_file(filepath: Path, rel_path: str, guard: ScanGuard) -> Dict[str, Any]:
     """
-    Validate no hardcoded secrets (OWASP A04).
-    Checks: API keys, tokens, passwords, cloud credentials.
+    Dangerous code patterns in one file, streamed line by line; a pattern only
+    runs on lines that contain one of its literals.
     """
-    results = {
-        "tool": "secret_scanner",
-        "findings": [],
-        "status": "[OK] No secrets detected",
-        "scanned_files": 0,
-        "by_severity": {"critical": 0, "high": 0, "medium": 0}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
+    part = {"findings": [], "scanned_files": 0, "scanned_bytes": 0, "truncated": []}
+    try:
+        size = filepath.stat().st_size
+        cap = size_cap(filepath)
+        if size > cap:
+            part["truncated"].append({"file": rel_path, "bytes": size, "scanned": cap})
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            scan = FileScan(f.read(CHUNK_KB * 1024), name=rel_path, guard=guard, size=size)
+            if scan.skipped:
+                return part
+            f.seek(0)
+            part["scanned_files"] = 1
+            consumed = 0
             
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
-    
+            for line_num, line in stream_lines(f):
+                consumed += len(line)
+                if consumed > cap:
+                    break
+                lowered = line.lower()
+                for pattern, name, severity, category, literals in DANGEROUS_PATTERNS:
+                    if not any(lit in lowered for lit in literals):
+                        continue
+                    scan.rule(name)
+                    if scan.search(pattern, re.IGNORECASE, text=line):
+                        part["findings"].append({
+                            "file": rel_path,
+                            "line": line_num,
+                            "pattern": name,
+                            "severity": severity,
+                            "category": category,
+                            "snippet": line.strip()[:80]
+                        })
+            part["scanned_bytes"] = min(consumed, cap)
+    except BudgetExceeded:
+        pass  # Reported by the scan guard
+    except Exception:
+        pass
+    return part
+
+
+CONFIG_ISSUES = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+    # Realtime Database rules (database.rules.json)
+    (r'"\.write"\s*:\s*(?:true|"true")', "Realtime Database public write", "critical"),
+    (r'"\.read"\s*:\s*(?:true|"true")', "Realtime Database public read", "high"),
+]
+CONFIG_FILES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+# Firestore / Cloud Storage security rules (firestore.rules, storage.rules)
+RULES_EXTENSION = '.rules'
+
+# One pass over a rules file: scopes open and close, allow statements may span lines
+RULES_TOKEN = re.compile(r'''
+    (?P<match>\bmatch\s+(?P<path>/\S*)\s+\{)
+  | (?P<allow>\ballow\s+(?P<ops>[\w,][\w\s,]*)(?::\s*if\s+(?P<cond>[^\s;][^;]*))?;)
+  | (?P<open>\{)
+  | (?P<close>\})
+''', re.VERBOSE)
+RULES_FUNCTION = re.compile(r'\bfunction\s+(\w+)\s*\(\s*\)\s*\{\s*return\s+([^\s;][^;]*);')
+RULES_COMMENT = re.compile(r'//[^\n]*')
+WRITE_OPS = {"write", "create", "update", "delete"}
+AUTH_ONLY = {"request.auth!=null", "request.auth.uid!=null", "null!=request.auth"}
+TEST_MODE = re.compile(r'request\.time\s*<\s*timestamp\.date\(')
+SECURITY_HEADERS = ("content-security-policy", "strict-transport-security", "x-frame-options",
+                    "x-content-type-options")
+
+
+def _rules_condition(cond: str, functions: Dict[str, str]) -> str:
+    """A rules condition with zero-argument helpers inlined, whitespace and outer parens removed."""
+    for _ in range(5):  # Helpers may call helpers
+        expanded = re.sub(r'\b(\w+)\(\)', lambda m: f"({functions[m.group(1)]})"
+                          if m.group(1) in functions else m.group(0), cond)
+        if expanded == cond:
+            break
+        cond = expanded
+    cond = re.sub(r'\s+', '', cond)
+    while cond.startswith("(") and cond.endswith(")") and _balanced(cond[1:-1]):
+        cond = cond[1:-1]
+    return cond
+
+
+def _balanced(text: str) -> bool:
+    depth = 0
+    for ch in text:
+        depth += {"(": 1, ")": -1}.get(ch, 0)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def firebase_rules_findings(scan: FileScan, rel_path: str) -> List[Dict[str, Any]]:
+    """
+    Permissive Firestore / Storage rules: unconditional access, test-mode
+    expiry dates, and "any signed-in user" on recursive wildcards.
+    """
+    # Blank comments out without moving offsets, so locate() lines stay right
+    content = RULES_COMMENT.sub(lambda m: " " * len(m.group()), scan.content)
+    functions = {name: body for name, body in RULES_FUNCTION.findall(content)}
+    findings = []
+    scopes: List[Optional[str]] = []
+    scan.rule("firebase-rules")
+    for token in scan.finditer(RULES_TOKEN, text=content):
+        kind = token.lastgroup
+        if kind == "match":
+            scopes.append(token.group("path"))
+        elif kind == "open":
+            scopes.append(None)
+        elif kind == "close":
+            if scopes:
+                scopes.pop()
+        elif kind == "allow":
+            ops = {op.strip() for op in token.group("ops").split(",")}
+            writes = bool(ops & WRITE_OPS)
+            raw = token.group("cond")
+            cond = _rules_condition(raw, functions) if raw is not None else "true"
+            path = "".join(p for p in scopes if p) or "/"
+            recursive = "=**}" in path
+            verb = ", ".join(sorted(ops))
+            issue = severity = None
+            if cond == "true":
+                issue = "Firebase rules allow public write" if writes else "Firebase rules allow public read"
+                severity = "critical" if writes else ("high" if recursive else "medium")
+            elif TEST_MODE.search(raw or ""):
+                issue, severity = "Firebase rules in test mode", "high"
+            elif cond in AUTH_ONLY and recursive:
+                issue = "Firebase rules open to any signed-in user"
+                severity = "high" if writes else "medium"
+            if issue:
+                findings.append({
+                    "file": rel_path,
+                    "line": scan.locate(token)["line"],
+                    "issue": issue,
+                    "severity": severity,
+                    "message": f"allow {verb}: if {(raw or 'true').strip()} on {path}"
+                })
+    return findings
+
+
+def config_in_file(filepath: Path, rel_path: str, guard: ScanGuard) -> Dict[str, Any]:
+    """Insecure settings in one configuration file."""
+    part = {"findings": [], "scanned_files": 0, "scanned_bytes": 0, "truncated": []}
+    try:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        scan = FileScan(content, name=rel_path, guard=guard)
+        if scan.skipped:
+            return part
+        part["scanned_files"] = 1
+        part["scanned_bytes"] = len(content)
+        
+        if filepath.suffix == RULES_EXTENSION:
+            part["findings"].extend(firebase_rules_findings(scan, rel_path))
+            return part
+        for pattern, issue, severity in CONFIG_ISSUES:
+            scan.rule(issue)
+            if scan.search(pattern, re.IGNORECASE):
+                part["findings"].append({
+                    "file": rel_path,
+                    "issue": issue,
+                    "severity": severity
+                })
+    except BudgetExceeded:
+        pass  # Reported by the scan guard
+    except Exception:
+        pass
+    return part
+
+
+def finish_secrets(results: Dict[str, Any], project_path: str, record) -> None:
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
     elif results["by_severity"]["high"] > 0:
         results["status"] = "[!] HIGH: Secrets found"
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
-    
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
-    return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
-    """
-    Validate dangerous code patterns (OWASP A05).
-    Checks: Injection risks, XSS, unsafe deserialization.
-    """
-    results = {
-        "tool": "pattern_scanner",
-        "findings": [],
-        "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
-        "by_category": {}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
-    
-    critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
-    high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
+def finish_patterns(results: Dict[str, Any], project_path: str, record) -> None:
+    critical_count = results["by_severity"].get("critical", 0)
+    high_count = results["by_severity"].get("high", 0)
     
     if critical_count > 0:
         results["status"] = f"[!!] CRITICAL: {critical_count} dangerous patterns"
     elif high_count > 0:
         results["status"] = f"[!] HIGH: {high_count} risky patterns"
-    elif results["findings"]:
+    elif results["total_findings"]:
         results["status"] = "[?] Some patterns need review"
-    
-    # Limit findings
-    results["findings"] = results["findings"][:20]
-    
-    return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
-    """
-    Validate security configuration (OWASP A02).
-    Checks: Security headers, CORS, debug modes.
-    """
-    results = {
-        "tool": "config_scanner",
-        "findings": [],
-        "status": "[OK] Configuration secure",
-        "checks": {}
-    }
-    
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
+def finish_configuration(results: Dict[str, Any], project_path: str, record) -> None:
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
-    for hf in header_files:
+    # Hosting configs only count when they actually set a security header
+    hosting_files = ["firebase.json", "vercel.json", "netlify.toml", "public/_headers"]
+    hosting_seen = []
+    for hf in header_files + hosting_files:
         hf_path = Path(project_path) / hf
-        if hf_path.exists():
-            results["checks"]["security_headers_config"] = True
+        if not hf_path.exists():
+            continue
+        if hf in header_files:
+            break
+        hosting_seen.append(hf)
+        try:
+            text = hf_path.read_text(encoding="utf-8", errors="ignore").lower()
+        except OSError:
+            continue
+        if any(header in text for header in SECURITY_HEADERS):
             break
     else:
         results["checks"]["security_headers_config"] = False
-        results["findings"].append({
+        where = f" ({', '.join(hosting_seen)} sets none)" if hosting_seen else ""
+        record({
             "issue": "No security headers configuration found",
             "severity": "medium",
-            "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
+            "recommendation": f"Configure CSP, HSTS, X-Frame-Options headers{where}"
         })
+    if "security_headers_config" not in results["checks"]:
+        results["checks"]["security_headers_config"] = True
     
-    if any(f["severity"] == "critical" for f in results["findings"]):
+    if results["by_severity"].get("critical"):
         results["status"] = "[!!] CRITICAL: Configuration issues"
-    elif any(f["severity"] == "high" for f in results["findings"]):
+    elif results["by_severity"].get("high"):
         results["status"] = "[!] HIGH: Configuration review needed"
-    elif results["findings"]:
+    elif results["total_findings"]:
         results["status"] = "[?] Minor configuration issues"
+
+
+def wants_secrets(filepath: Path) -> bool:
+    ext = filepath.suffix.lower()
+    return ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS or ext in DOC_EXTENSIONS
+
+
+def wants_patterns(filepath: Path) -> bool:
+    return filepath.suffix.lower() in CODE_EXTENSIONS
+
+
+def wants_config(filepath: Path) -> bool:
+    return (filepath.suffix.lower() in CONFIG_EXTENSIONS or filepath.name in CONFIG_FILES
+            or filepath.suffix == RULES_EXTENSION)
+
+
+# scan type -> (report key, fresh results, file filter, per-file scanner, finisher)
+FILE_SCANNERS = {
+    "secrets": ("secrets", lambda: {
+        "tool": "secret_scanner",
+        "findings": [],
+        "total_findings": 0,
+        "status": "[OK] No secrets detected",
+        "scanned_files": 0,
+        "scanned_bytes": 0,
+        "truncated": [],
+        "by_severity": {"critical": 0, "high": 0, "medium": 0}
+    }, wants_secrets, secrets_in_file, finish_secrets),
+    "patterns": ("code_patterns", lambda: {
+        "tool": "pattern_scanner",
+        "findings": [],
+        "total_findings": 0,
+        "status": "[OK] No dangerous patterns",
+        "scanned_files": 0,
+        "scanned_bytes": 0,
+        "truncated": [],
+        "by_severity": {},
+        "by_category": {}
+    }, wants_patterns, patterns_in_file, finish_patterns),
+    "config": ("configuration", lambda: {
+        "tool": "config_scanner",
+        "findings": [],
+        "total_findings": 0,
+        "status": "[OK] Configuration secure",
+        "by_severity": {},
+        "checks": {}
+    }, wants_config, config_in_file, finish_configuration),
+}
+
+
+def to_record(section: str, finding: Dict[str, Any]) -> Dict[str, Any]:
+    """The protocol record for a scanner finding, as stored and emitted with --jsonl."""
+    label = finding.get("pattern") or finding.get("type") or finding.get("issue") or section
+    message = (finding.get("message") or finding.get("issue")
+               or finding.get("category") or label)
+    if finding.get("snippet"):
+        message = f"{label}: {finding['snippet']}"
+    extra = {key: finding[key] for key in ("package", "version", "advisories", "fixed_in") if key in finding}
+    return make_finding("security_scan", f"security/{slugify(section)}/{slugify(label)}",
+                        finding.get("severity", "low"), message,
+                        file=finding.get("file"), line=finding.get("line"), **extra)
+
+
+def record_finding(results: Dict[str, Any], store: FindingStore, section: str,
+                   finding: Dict[str, Any], top: int = TOP_FINDINGS) -> bool:
+    """
+    Store one finding and count it; the scan result keeps only the `top`
+    most severe. Repeats of a stored (file, line, rule) are dropped.
+    """
+    if not store.add(to_record(section, finding)):
+        return False
+    severity = finding.get("severity", "low")
+    results["total_findings"] += 1
+    results["by_severity"][severity] = results["by_severity"].get(severity, 0) + 1
+    if "by_category" in results and finding.get("category"):
+        results["by_category"][finding["category"]] = results["by_category"].get(finding["category"], 0) + 1
+    kept = results["findings"]
+    kept.append(finding)
+    if len(kept) > 2 * top:
+        kept[:] = top_findings(kept, top)
+    return True
+
+
+def top_findings(findings, top: int):
+    """Most severe first; the sort is stable, so ties keep discovery order."""
+    return sorted(findings, key=lambda f: SEVERITY_RANK.get(f.get("severity"), 3))[:top]
+
+
+def merge_part(results: Dict[str, Any], part: Dict[str, Any], record) -> None:
+    for finding in part["findings"]:
+        record(finding)
+    if "scanned_files" in results:
+        results["scanned_files"] += part["scanned_files"]
+        results["scanned_bytes"] += part["scanned_bytes"]
+        results["truncated"].extend(part["truncated"])
+
+
+def walk_project(project_path: str, kinds):
+    """
+    One os.walk for every file scanner: yields (path, rel_path, kinds) for
+    each file at least one of the requested scanners wants.
+    """
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for file in files:
+            filepath = Path(root) / file
+            wanted = tuple(k for k in kinds if FILE_SCANNERS[k][2](filepath))
+            if wanted:
+                yield str(filepath), str(filepath.relative_to(project_path)), wanted
+
+
+_worker_guard: Optional[ScanGuard] = None
+
+
+def _init_worker(file_budget_ms: float, max_file_kb: int, oversize: str) -> None:
+    global _worker_guard
+    _worker_guard = ScanGuard(file_budget_ms=file_budget_ms, max_file_kb=max_file_kb, oversize=oversize)
+
+
+def scan_file(task, guard: Optional[ScanGuard] = None):
+    """
+    Run every requested scanner on one file. Returns the parts by scan type
+    and the guard events the file produced (so workers can report them).
+    """
+    guard = guard or _worker_guard
+    path, rel_path, kinds = task
+    mark = guard.mark()
+    parts = {kind: FILE_SCANNERS[kind][3](Path(path), rel_path, guard) for kind in kinds}
+    return parts, guard.events_since(mark)
+
+
+def run_file_scans(project_path: str, kinds, guard: ScanGuard, jobs: int = 1,
+                   store: Optional[FindingStore] = None, top: int = TOP_FINDINGS) -> Dict[str, Dict[str, Any]]:
+    """
+    Walk the project once and route each file to every applicable scanner.
+    With jobs > 1 files are scanned in a process pool; results are merged in
+    walk order, so the report is the same either way. Findings go to the
+    store; each scan result keeps counters and its top findings.
+    """
+    own_store = store is None
+    if own_store:
+        store = FindingStore("security_scan", project=project_path)
+        store.open()
+    results = {kind: FILE_SCANNERS[kind][1]() for kind in kinds}
+    recorders = {kind: (lambda finding, kind=kind: record_finding(
+        results[kind], store, FILE_SCANNERS[kind][0], finding, top)) for kind in kinds}
+    tasks = walk_project(project_path, kinds)
+    
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(guard.file_budget * 1000, guard.max_bytes // 1024,
+                                           guard.oversize)) as pool:
+            outcomes = list(pool.map(scan_file, tasks, chunksize=16))
+        for parts, events in outcomes:
+            guard.merge(events)
+            for kind, part in parts.items():
+                merge_part(results[kind], part, recorders[kind])
+    else:
+        for task in tasks:
+            parts, _ = scan_file(task, guard)
+            for kind, part in parts.items():
+                merge_part(results[kind], part, recorders[kind])
     
+    for kind in kinds:
+        FILE_SCANNERS[kind][4](results[kind], project_path, recorders[kind])
+        results[kind]["findings"] = top_findings(results[kind]["findings"], top)
+    if own_store:
+        store.close()
     return results
 
 
+def scan_secrets(project_path: str, guard: Optional[ScanGuard] = None) -> Dict[str, Any]:
+    """
+    Validate no hardcoded secrets (OWASP A04).
+    Checks: API keys, tokens, passwords, cloud credentials, and generic
+    high-entropy strings. Files are streamed in overlapping windows up to
+    their size cap; each window gets one pass of the secret automaton.
+    """
+    return run_file_scans(project_path, ["secrets"], guard or ScanGuard())["secrets"]
+
+
+def scan_code_patterns(project_path: str, guard: Optional[ScanGuard] = None) -> Dict[str, Any]:
+    """
+    Validate dangerous code patterns (OWASP A05).
+    Checks: Injection risks, XSS, unsafe deserialization.
+    """
+    return run_file_scans(project_path, ["patterns"], guard or ScanGuard())["patterns"]
+
+
+def scan_configuration(project_path: str, guard: Optional[ScanGuard] = None) -> Dict[str, Any]:
+    """
+    Validate security configuration (OWASP A02).
+    Checks: Security headers, CORS, debug modes.
+    """
+    return run_file_scans(project_path, ["config"], guard or ScanGuard())["config"]
+
+
 # ============================================================================
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all",
+                  guard: Optional[ScanGuard] = None, jobs: int = 1,
+                  offline: bool = False, advisory_db: Optional[str] = None,
+                  store_file: Optional[str] = None, top: int = TOP_FINDINGS) -> Dict[str, Any]:
+    """
+    Execute security validation scans. The dependency audit runs in a
+    background thread while one walk of the tree feeds the file scanners.
+    Every finding is written to the findings store (deduplicated by file,
+    line and rule); the report holds counters and the top findings per scan.
+    """
+    guard = guard or ScanGuard()
+    
+    # Lint the rule tables up front so risky patterns are reported even if no file hits them
+    for pattern, *_ in SECRET_PATTERNS + DANGEROUS_PATTERNS + CONFIG_ISSUES:
+        guard.compile(pattern, re.IGNORECASE)
     
     report = {
         "project": project_path,
@@ -385,27 +907,30 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
-    scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
-    }
+    run_deps = scan_type in ("all", "deps")
+    kinds = [k for k in FILE_SCANNERS if scan_type in ("all", k)]
     
-    for key, (name, scanner) in scanners.items():
-        if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
-            report["scans"][name] = result
-            
-            findings_count = len(result.get("findings", []))
-            report["summary"]["total_findings"] += findings_count
-            
-            for finding in result.get("findings", []):
-                sev = finding.get("severity", "low")
-                if sev == "critical":
-                    report["summary"]["critical"] += 1
-                elif sev == "high":
-                    report["summary"]["high"] += 1
+    with FindingStore("security_scan", path=store_file, project=project_path) as store, \
+            ThreadPoolExecutor(max_workers=1) as background:
+        deps = background.submit(scan_dependencies, project_path, offline, advisory_db) if run_deps else None
+        file_results = run_file_scans(project_path, kinds, guard, jobs, store, top) if kinds else {}
+        # Keep the established section order: dependencies first
+        if deps is not None:
+            dependencies = deps.result()
+            findings, dependencies["findings"] = dependencies["findings"], []
+            dependencies.update(total_findings=0, by_severity={})
+            for finding in findings:
+                record_finding(dependencies, store, "dependencies", finding, top)
+            dependencies["findings"] = top_findings(dependencies["findings"], top)
+            report["scans"]["dependencies"] = dependencies
+    for kind in kinds:
+        report["scans"][FILE_SCANNERS[kind][0]] = file_results[kind]
+    
+    for result in report["scans"].values():
+        report["summary"]["total_findings"] += result["total_findings"]
+        report["summary"]["critical"] += result["by_severity"].get("critical", 0)
+        report["summary"]["high"] += result["by_severity"].get("high", 0)
+    report["store"] = {"path": str(store.path), "duplicates": store.counts["duplicates"]}
     
     # Determine overall status
     if report["summary"]["critical"] > 0:
@@ -415,9 +940,18 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     elif report["summary"]["total_findings"] > 0:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
     
+    if guard.eventful:
+        report["scan_guard"] = guard.to_dict()
+    
     return report
 
 
+def write_results(report: Dict[str, Any], writer: ResultWriter) -> None:
+    """Hand every stored finding (not just the report's top) to the protocol writer."""
+    for record in FindingStore.records(Path(report["store"]["path"])):
+        writer.findings.append(record)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate security principles from vulnerability-scanner skill"
@@ -427,31 +961,81 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    parser.add_argument("--file-budget-ms", type=float, default=FILE_BUDGET_MS,
+                        help="Regex time budget per file before remaining rules are skipped")
+    parser.add_argument("--max-file-kb", type=int, default=MAX_FILE_KB,
+                        help="Files larger than this are chunked or skipped (see --oversize)")
+    parser.add_argument("--oversize", choices=["chunk", "skip"], default="chunk",
+                        help="How to handle files above --max-file-kb")
+    parser.add_argument("--offline", action="store_true",
+                        help="Audit lockfiles against the local advisory snapshot instead of npm audit")
+    parser.add_argument("--advisory-db", metavar="FILE",
+                        help="Advisory snapshot for --offline (default .agent/.cache/advisories/npm.json)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the file scanners (1 = scan in-process)")
+    parser.add_argument("--top", type=int, default=TOP_FINDINGS,
+                        help="Findings kept per scan in the report (all are stored)")
+    parser.add_argument("--store", metavar="FILE",
+                        help="Findings store (default .agent/.cache/findings/security_scan.jsonl)")
     
     args = parser.parse_args()
+    writer = ResultWriter("security_scan", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
     
     if not os.path.isdir(args.project_path):
-        print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
+        if args.jsonl:
+            writer.add("security/error", "high", f"Directory not found: {args.project_path}")
+            writer.finish(False)
+        else:
+            print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
-    
-    if args.output == "summary":
-        print(f"\n{'='*60}")
-        print(f"Security Scan: {result['project']}")
-        print(f"{'='*60}")
-        print(f"Status: {result['summary']['overall_status']}")
-        print(f"Total Findings: {result['summary']['total_findings']}")
-        print(f"  Critical: {result['summary']['critical']}")
-        print(f"  High: {result['summary']['high']}")
-        print(f"{'='*60}\n")
+    guard = ScanGuard(file_budget_ms=args.file_budget_ms, max_file_kb=args.max_file_kb,
+                      oversize=args.oversize)
+    result = run_full_scan(args.project_path, args.scan_type, guard, jobs=max(1, args.jobs),
+                           offline=args.offline, advisory_db=args.advisory_db,
+                           store_file=args.store, top=max(1, args.top))
+    finish_guard(guard)
+    if writer.enabled or writer.sarif or writer.baseline:
+        write_results(result, writer)
+    guard_stats = {"scan_guard": result["scan_guard"]} if "scan_guard" in result else {}
+    summary = writer.finish(True, overall_status=result["summary"]["overall_status"],
+                            total_findings=result["summary"]["total_findings"], **guard_stats)
+    if "suppressed" in summary["stats"]:
+        result["summary"]["new_findings"] = summary["stats"]["new"]
+        result["summary"]["baseline_suppressed"] = summary["stats"]["suppressed"]
+    
+    if not writer.enabled:
+        if args.output == "summary":
+            print(f"\n{'='*60}")
+            print(f"Security Scan: {result['project']}")
+            print(f"{'='*60}")
+            print(f"Status: {result['summary']['overall_status']}")
+            print(f"Total Findings: {result['summary']['total_findings']}")
+            print(f"  Critical: {result['summary']['critical']}")
+            print(f"  High: {result['summary']['high']}")
+            if "baseline_suppressed" in result["summary"]:
+                print(f"Baseline: {result['summary']['new_findings']} new, "
+                      f"{result['summary']['baseline_suppressed']} known (suppressed)")
+            print(f"{'='*60}\n")
         
-        for scan_name, scan_result in result['scans'].items():
-            print(f"\n{scan_name.upper()}: {scan_result['status']}")
-            for finding in scan_result.get('findings', [])[:5]:
-                print(f"  - {finding}")
-    else:
-        print(json.dumps(result, indent=2))
+            for scan_name, scan_result in result['scans'].items():
+                print(f"\n{scan_name.upper()}: {scan_result['status']} ({scan_result['total_findings']} findings)")
+                for finding in scan_result.get('findings', [])[:5]:
+                    print(f"  - {finding}")
+            print(f"\nAll findings: python .agent/.shared/validation/store.py query {result['store']['path']}")
+        else:
+            print(json.dumps(result, indent=2))
+    
+    # Without a baseline the scan is informational; with one, new findings fail
+    sys.exit(0 if summary["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -3,16 +3,47 @@
 Skill: webapp-testing
 Script: playwright_runner.py
 Purpose: Run basic Playwright browser tests
-Usage: python playwright_runner.py <url> [--screenshot]
+Usage: python playwright_runner.py <url> [--screenshot] [--jsonl]
+       python playwright_runner.py <project_path> <url> --routes [--concurrency 4] [--param id=1]
 Output: JSON with page info, health status, and optional screenshot path
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
+
+--routes smokes every route of the app's route tree (see
+.agent/.shared/validation/routes.py) against <url> as the base: one Chromium,
+a pool of --concurrency contexts, all routes visited through the async API.
+Each route records navigation timing, console errors, uncaught page errors
+and JS heap size; the aggregated report is written to
+.agent/.cache/playwright/routes-report.json (or --report). Routes with
+parameters are visited only when --param supplies a value for each one.
+
+--vitals also reads LCP, FCP, CLS, INP (only once the page saw an
+interaction), long tasks with their blocking time, and the largest resources
+per route, from PerformanceObserver entries registered before the app's own
+scripts run. --trace records a Chrome performance trace per route, gzipped
+under .agent/.cache/playwright/traces/ (Chrome traces one page at a time, so
+traced visits take turns). --save-baseline stores the per-route metrics, and
+later runs list the routes whose metrics regressed against it. Without a URL,
+--preview starts the local preview on --port and audits that.
 """
+import argparse
+import asyncio
+import gzip
 import sys
 import json
 import os
 import tempfile
+import time
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Shared validation helpers live in .agent/.shared/validation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from validation.filecache import CACHE_ROOT  # noqa: E402
+from validation.preview import ensure_preview, stop_preview  # noqa: E402
+from validation.results import ResultWriter  # noqa: E402
+from validation.routes import build_graph  # noqa: E402
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -23,10 +54,86 @@ except AttributeError:
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+REPORT_DIR = CACHE_ROOT / "playwright"
+TRACE_DIR = REPORT_DIR / "traces"
+ROUTE_BASELINE = REPORT_DIR / "routes-baseline.json"
+ROUTE_CONCURRENCY = 4
+NAV_TIMEOUT = 30000
+VIEWPORT = {"width": 1280, "height": 720}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# Without this flag Chrome rounds performance.memory to coarse buckets
+CHROMIUM_ARGS = ["--enable-precise-memory-info"]
+TOP_RESOURCES = 5
+LONG_TASK_MS = 50
+
+# metric -> (relative, absolute) tolerance; a route regresses when the value
+# grows past both against the baseline
+ROUTE_METRICS = {
+    "lcp": (0.15, 100),
+    "fcp": (0.15, 100),
+    "cls": (0.10, 0.02),
+    "tbt": (0.25, 50),
+    "load": (0.15, 100),
+    "heap_bytes": (0.20, 2 * 1024 * 1024),
+}
+
+NAV_TIMING_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const heap = performance.memory ? performance.memory.usedJSHeapSize : null;
+    if (!nav) return {heap};
+    return {
+        ttfb: nav.responseStart,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        duration: nav.duration,
+        transfer_size: nav.transferSize,
+        heap,
+    };
+}"""
+
+# Registered on every page of the context before the app's scripts run
+VITALS_INIT_JS = """(() => {
+    const v = window.__routeVitals = {lcp: null, fcp: null, cls: 0, inp: null, long_tasks: []};
+    const observe = (type, handle, extra) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(handle))
+                .observe(Object.assign({type, buffered: true}, extra || {}));
+        } catch (e) { /* entry type not supported */ }
+    };
+    observe('paint', e => { if (e.name === 'first-contentful-paint') v.fcp = e.startTime; });
+    observe('largest-contentful-paint', e => { v.lcp = e.startTime; });
+    // CLS: largest session window (shifts < 1s apart, window < 5s)
+    let win = 0, first = 0, last = 0;
+    observe('layout-shift', e => {
+        if (e.hadRecentInput) return;
+        if (win && e.startTime - last < 1000 && e.startTime - first < 5000) {
+            win += e.value;
+        } else {
+            win = e.value;
+            first = e.startTime;
+        }
+        last = e.startTime;
+        v.cls = Math.max(v.cls, win);
+    });
+    observe('longtask', e => { v.long_tasks.push({start: e.startTime, duration: e.duration}); });
+    observe('event', e => { if (e.interactionId) v.inp = Math.max(v.inp || 0, e.duration); },
+            {durationThreshold: 40});
+})();"""
+
+VITALS_JS = """(top) => {
+    const v = window.__routeVitals || {long_tasks: []};
+    const resources = performance.getEntriesByType('resource')
+        .map(r => ({name: r.name, type: r.initiatorType, transfer_size: r.transferSize,
+                    body_size: r.encodedBodySize, duration: r.duration}))
+        .sort((a, b) => (b.transfer_size || b.body_size) - (a.transfer_size || a.body_size));
+    return Object.assign({}, v, {resource_count: resources.length, largest_resources: resources.slice(0, top)});
+}"""
+
 
 def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     """Run basic browser test on URL."""
@@ -45,10 +152,7 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
+            context = browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
             page = context.new_page()
             
             # Navigate
@@ -149,25 +253,329 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def route_targets(project_path: str, base_url: str, params: Optional[Dict[str, str]] = None,
+                  only: Optional[List[str]] = None) -> Tuple[List[Tuple[str, str]], List[Dict[str, str]]]:
+    """(route, url) pairs to visit, and the routes left out with the reason."""
+    params = params or {}
+    targets, skipped, seen = [], [], set()
+    for route in build_graph(project_path).routes:
+        path = route["path"]
+        if path in seen or (only and path not in only):
+            continue
+        seen.add(path)
+        if route.get("redirect"):
+            skipped.append({"route": path, "reason": f"redirects to {route['redirect']}"})
+            continue
+        if "*" in path:
+            skipped.append({"route": path, "reason": "catch-all"})
+            continue
+        segments, missing = [], []
+        for seg in path.strip("/").split("/"):
+            if seg.startswith(":"):
+                name = seg[1:].rstrip("?")
+                if name in params:
+                    segments.append(params[name])
+                elif not seg.endswith("?"):
+                    missing.append(name)
+            elif seg:
+                segments.append(seg)
+        if missing:
+            skipped.append({"route": path, "reason": f"no --param for {', '.join(missing)}"})
+            continue
+        targets.append((path, base_url.rstrip("/") + "/" + "/".join(segments)))
+    return targets, skipped
+
+
+def summarize_vitals(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Web Vitals plus long tasks; TBT sums the time past 50 ms of each task after FCP."""
+    tasks = raw.get("long_tasks") or []
+    fcp = raw.get("fcp") or 0
+    return {
+        "lcp": raw.get("lcp"),
+        "fcp": raw.get("fcp"),
+        "cls": raw.get("cls"),
+        "inp": raw.get("inp"),
+        "tbt": round(sum(max(0, t["duration"] - LONG_TASK_MS) for t in tasks if t["start"] >= fcp), 1),
+        "long_tasks": {
+            "count": len(tasks),
+            "total_ms": round(sum(t["duration"] for t in tasks), 1),
+            "longest_ms": round(max((t["duration"] for t in tasks), default=0), 1),
+        },
+        "resource_count": raw.get("resource_count"),
+        "largest_resources": raw.get("largest_resources") or [],
+    }
+
+
+def _trace_name(route: str) -> str:
+    return (route.strip("/").replace("/", "_").replace(":", "") or "root") + ".json.gz"
+
+
+async def _visit(pool: "asyncio.Queue", route: str, url: str, timeout: int,
+                 vitals: bool = False, tracer: Optional[Dict[str, Any]] = None) -> dict:
+    """Load one route on a pooled context; the context goes back to the pool afterwards."""
+    if tracer is not None:
+        await tracer["lock"].acquire()
+    context = await pool.get()
+    page = await context.new_page()
+    console_errors: List[str] = []
+    page_errors: List[str] = []
+    page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+    page.on("pageerror", lambda exc: page_errors.append(str(exc)))
+    result = {"route": route, "url": url, "status": "pending"}
+    started = time.monotonic()
+    try:
+        if tracer is not None:
+            await tracer["browser"].start_tracing(page=page, screenshots=False)
+        response = await page.goto(url, wait_until="networkidle", timeout=timeout)
+        result["status_code"] = response.status if response else None
+        result["final_url"] = page.url
+        result["title"] = await page.title()
+        timing = await page.evaluate(NAV_TIMING_JS)
+        result["heap_bytes"] = timing.pop("heap", None)
+        result["timing"] = timing
+        if vitals:
+            result["vitals"] = summarize_vitals(await page.evaluate(VITALS_JS, TOP_RESOURCES))
+        result["status"] = "success" if response is None or response.ok else "failed"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)[:300]
+    finally:
+        result["wall_ms"] = round((time.monotonic() - started) * 1000)
+        result["console_errors"] = console_errors
+        result["page_errors"] = page_errors
+        if tracer is not None:
+            try:
+                trace = await tracer["browser"].stop_tracing()
+                path = TRACE_DIR / _trace_name(route)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(path, "wb") as f:
+                    f.write(trace)
+                result["trace"] = str(path)
+            except Exception as e:
+                result["trace_error"] = str(e)[:200]
+            tracer["lock"].release()
+        await page.close()
+        pool.put_nowait(context)
+    return result
+
+
+async def _run_routes(targets: List[Tuple[str, str]], concurrency: int, timeout: int,
+                      vitals: bool = False, trace: bool = False) -> List[dict]:
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        try:
+            pool: asyncio.Queue = asyncio.Queue()
+            for _ in range(max(1, min(concurrency, len(targets)))):
+                context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+                if vitals:
+                    await context.add_init_script(VITALS_INIT_JS)
+                pool.put_nowait(context)
+            tracer = {"browser": browser, "lock": asyncio.Lock()} if trace else None
+            return list(await asyncio.gather(*(_visit(pool, route, url, timeout, vitals, tracer)
+                                               for route, url in targets)))
+        finally:
+            await browser.close()
+
+
+def route_metrics(result: dict) -> Dict[str, float]:
+    """Comparable numbers of one visited route (vitals, load time, heap)."""
+    values = dict(result.get("vitals") or {})
+    values["load"] = (result.get("timing") or {}).get("load")
+    values["heap_bytes"] = result.get("heap_bytes")
+    return {name: values[name] for name in ROUTE_METRICS if isinstance(values.get(name), (int, float))}
+
+
+def load_route_baseline(path: Path = ROUTE_BASELINE) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_route_baseline(routes: List[dict], path: Path = ROUTE_BASELINE) -> None:
+    """Merge the visited routes' metrics into the baseline (other routes keep theirs)."""
+    baseline = load_route_baseline(path)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    for r in routes:
+        if r["status"] == "success":
+            baseline[r["route"]] = {"recorded": stamp, "metrics": route_metrics(r)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def diff_routes(routes: List[dict], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Route metrics that grew past both tolerances of ROUTE_METRICS."""
+    regressions = []
+    for r in routes:
+        before = (baseline.get(r["route"]) or {}).get("metrics", {})
+        for name, now in route_metrics(r).items():
+            if name not in before:
+                continue
+            relative, absolute = ROUTE_METRICS[name]
+            growth = now - before[name]
+            if growth > absolute and growth > before[name] * relative:
+                regressions.append({"route": r["route"], "url": r["url"], "metric": name,
+                                    "baseline": before[name], "value": now, "delta": growth})
+    return regressions
+
+
+def run_route_smoke(project_path: str, base_url: str, concurrency: int = ROUTE_CONCURRENCY,
+                    params: Optional[Dict[str, str]] = None, only: Optional[List[str]] = None,
+                    timeout: int = NAV_TIMEOUT, report_path: Optional[str] = None,
+                    vitals: bool = False, trace: bool = False, save_baseline: bool = False) -> dict:
+    """Visit every route with one browser and write the aggregated report."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+    targets, skipped = route_targets(project_path, base_url, params, only)
+    report = {
+        "base_url": base_url,
+        "timestamp": datetime.now().isoformat(),
+        "concurrency": concurrency,
+        "skipped": skipped,
+    }
+    if not targets:
+        report["error"] = "No routes to visit"
+        return report
+    started = time.monotonic()
+    try:
+        routes = asyncio.run(_run_routes(targets, concurrency, timeout, vitals, trace))
+    except Exception as e:
+        report["error"] = str(e)
+        return report
+    report["routes"] = sorted(routes, key=lambda r: r["route"])
+    report["totals"] = {
+        "visited": len(routes),
+        "failed": sum(r["status"] != "success" for r in routes),
+        "with_console_errors": sum(bool(r["console_errors"]) for r in routes),
+        "with_page_errors": sum(bool(r["page_errors"]) for r in routes),
+        "skipped": len(skipped),
+        "wall_ms": round((time.monotonic() - started) * 1000),
+    }
+    if vitals:
+        slowest = sorted((r for r in routes if (r.get("vitals") or {}).get("lcp") is not None),
+                         key=lambda r: r["vitals"]["lcp"], reverse=True)
+        report["slowest"] = [{"route": r["route"], "lcp": r["vitals"]["lcp"], "tbt": r["vitals"]["tbt"]}
+                             for r in slowest[:10]]
+    baseline = load_route_baseline()
+    report["regressions"] = diff_routes(routes, baseline) if baseline else []
+    if save_baseline:
+        save_route_baseline(routes)
+        report["baseline_saved"] = str(ROUTE_BASELINE)
+    path = Path(report_path) if report_path else REPORT_DIR / "routes-report.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    report["report"] = str(path)
+    return report
+
+
+def write_route_results(report: dict, writer: ResultWriter) -> bool:
+    """Protocol findings for a route smoke. Fails on routes that did not load or threw;
+    regressions against the route baseline are reported without failing (single visits are noisy)."""
+    if "error" in report:
+        writer.add("e2e/error", "high", report["error"], url=report.get("base_url"))
+        return False
+    for r in report["routes"]:
+        if r["status"] != "success":
+            detail = r.get("error") or f"HTTP {r.get('status_code')}"
+            writer.add("e2e/route-failed", "high", f"{r['route']} did not load: {detail}", url=r["url"], route=r["route"])
+        for error in r["page_errors"]:
+            writer.add("e2e/page-error", "high", f"{r['route']}: {error[:200]}", url=r["url"], route=r["route"])
+        for error in r["console_errors"]:
+            writer.add("e2e/console-error", "medium", f"{r['route']}: {error[:200]}", url=r["url"], route=r["route"])
+    for r in report.get("regressions", []):
+        writer.add(f"e2e/regression-{r['metric'].replace('_', '-')}", "medium",
+                   f"{r['route']}: {r['metric']} {r['value']:.4g} vs baseline {r['baseline']:.4g}",
+                   url=r["url"], route=r["route"], metric=r["metric"], value=r["value"], baseline=r["baseline"])
+    totals = report["totals"]
+    return not totals["failed"] and not totals["with_page_errors"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run basic Playwright browser tests")
+    parser.add_argument("targets", nargs="*", help="[project_path] <url>")
+    parser.add_argument("--screenshot", action="store_true", help="Save a full-page screenshot")
+    parser.add_argument("--a11y", action="store_true", help="Run the basic accessibility check")
+    parser.add_argument("--routes", action="store_true", help="Smoke every route of the app against <url>")
+    parser.add_argument("--route", action="append", metavar="PATH", help="Only this route (repeatable, with --routes)")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                        help="Value for a route parameter, e.g. id=42 (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=ROUTE_CONCURRENCY, help="Browser contexts in the pool")
+    parser.add_argument("--timeout", type=int, default=NAV_TIMEOUT, help="Navigation timeout per route (ms)")
+    parser.add_argument("--report", metavar="FILE", help="Where to write the aggregated route report")
+    parser.add_argument("--vitals", action="store_true", help="Collect Web Vitals, long tasks and largest resources")
+    parser.add_argument("--trace", action="store_true", help="Record a Chrome performance trace per route")
+    parser.add_argument("--save-baseline", action="store_true", help="Store per-route metrics as the baseline")
+    parser.add_argument("--preview", action="store_true", help="Start/reuse the local preview when no URL is given")
+    parser.add_argument("--port", type=int, default=3000, help="Preview port (with --preview)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Emit protocol JSON lines (findings + summary) on stdout")
+    parser.add_argument("--sarif", metavar="FILE", help="Write findings as a SARIF 2.1.0 log")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Suppress findings recorded in FILE; exit 1 only on new findings")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current findings into --baseline FILE")
+    args = parser.parse_args()
+
+    if not args.targets and not (args.routes and args.preview):
         print(json.dumps({
             "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
             "examples": [
                 "python playwright_runner.py https://example.com",
                 "python playwright_runner.py https://example.com --screenshot",
-                "python playwright_runner.py https://example.com --a11y"
+                "python playwright_runner.py https://example.com --a11y",
+                "python playwright_runner.py . http://localhost:3000 --routes"
             ]
         }, indent=2))
         sys.exit(1)
-    
-    url = sys.argv[1]
-    take_screenshot = "--screenshot" in sys.argv
-    check_a11y = "--a11y" in sys.argv
-    
-    if check_a11y:
+
+    # checklist.py passes "<project_path> <url>"; standalone use passes just "<url>"
+    urls = [a for a in args.targets if a.startswith(("http://", "https://"))]
+    paths = [a for a in args.targets if a not in urls]
+    url = urls[0] if urls else (None if args.preview else args.targets[-1])
+    writer = ResultWriter("playwright_runner", enabled=args.jsonl, sarif=args.sarif,
+                          baseline=args.baseline, update_baseline=args.update_baseline)
+
+    if args.routes:
+        project_path = paths[0] if paths else "."
+        params = dict(p.split("=", 1) for p in args.param if "=" in p)
+        started = False
+        if url is None and PLAYWRIGHT_AVAILABLE:
+            url, started = ensure_preview(project_path, args.port)
+        if url is None and PLAYWRIGHT_AVAILABLE:
+            report = {"error": f"Preview did not answer on port {args.port}"}
+        else:
+            try:
+                report = run_route_smoke(project_path, url, args.concurrency, params, args.route,
+                                         args.timeout, args.report, vitals=args.vitals, trace=args.trace,
+                                         save_baseline=args.save_baseline)
+            finally:
+                if started:
+                    stop_preview(project_path, args.port)
+        passed = write_route_results(report, writer)
+        if not writer.enabled:
+            print(json.dumps(report, indent=2))
+        summary = writer.finish(passed, **report.get("totals", {}))
+        sys.exit(0 if summary["passed"] else 1)
+
+    if args.a11y:
         result = run_accessibility_check(url)
     else:
-        result = run_basic_test(url, take_screenshot)
-    
-    print(json.dumps(result, indent=2))
+        result = run_basic_test(url, args.screenshot)
+
+    if "error" in result:
+        writer.add("e2e/error", "high", result["error"], url=url)
+    for check, ok in result.get("health", {}).items():
+        if not ok:
+            writer.add(f"e2e/{check.replace('_', '-')}", "high" if check == "loaded" else "low",
+                       f"Health check failed: {check}", url=url)
+    if not writer.enabled:
+        print(json.dumps(result, indent=2))
+    summary = writer.finish(result.get("status") == "success", **result.get("performance", {}))
+    sys.exit(0 if summary["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()